@@ -3,8 +3,31 @@ TALYS Visualizer 配置文件
 """
 
 import os
+import sys
 from pathlib import Path
 
+
+def user_directory(kind: str) -> Path:
+    """
+    按平台约定的用户目录，运行时生成的缓存和数据不写入源代码树
+
+    Args:
+        kind: 'cache' 或 'data'
+    """
+    home = Path.home()
+    if sys.platform == 'win32':
+        base = Path(os.environ.get('LOCALAPPDATA') or home / "AppData" / "Local")
+        return base / "TALYS Visualizer" / kind.capitalize()
+    if sys.platform == 'darwin':
+        base = home / "Library" / ("Caches" if kind == 'cache' else "Application Support")
+        return base / "TALYS Visualizer"
+    if kind == 'cache':
+        base = Path(os.environ.get('XDG_CACHE_HOME') or home / ".cache")
+    else:
+        base = Path(os.environ.get('XDG_DATA_HOME') or home / ".local" / "share")
+    return base / "talys-visualizer"
+
+
 class Settings:
     """应用程序设置"""
     
@@ -17,12 +40,32 @@ class Settings:
     BASE_DIR = Path(__file__).parent.parent
     CONFIG_DIR = BASE_DIR / "config"
     RESOURCES_DIR = BASE_DIR / "resources"
+    TRANSLATIONS_DIR = RESOURCES_DIR / "translations"  # 翻译源文件 (*.json) 和编译后的目录 (*.cat)
     TEMP_DIR = BASE_DIR / "temp"
     LOGS_DIR = BASE_DIR / "logs"
+    CACHE_DIR = user_directory('cache')  # 数据文件解析结果的二进制缓存
+    EXPERIMENTAL_DATA_DIR = user_directory('data') / "experimental"  # 本地实验数据库（C4导入的数据集和SQLite索引）
     
     # TALYS设置
     TALYS_EXECUTABLE = "talys"  # 可在GUI中配置
     TALYS_TIMEOUT = 300  # 5分钟超时
+    TALYS_UNBUFFERED_OUTPUT = True  # 关闭gfortran标准输出缓冲，中断时可取回已完成能量的结果
+    TALYS_STRUCTURE_DIR = None  # TALYS结构数据库目录，None表示按可执行文件位置推断（<talys>/structure）
+    MASS_TABLE_FILE = None  # 基态质量表，None表示使用结构数据库 masses/ 目录中的 gs-mass-sp.dat
+    TALYS_PARAMETER_DOC = BASE_DIR / "TALYS_Default_Parameters.md"  # 输入关键字的默认值和取值范围
+    
+    # 工作目录池设置
+    WORKDIR_ROOT = None  # 工作目录池所在目录，None表示系统临时目录，可设为 /dev/shm 等tmpfs
+    WORKDIR_POOL_SIZE = 4  # 预先创建的空闲工作目录数
+    WORKDIR_KEEP_LAST = 0  # 保留最近N次计算的工作目录
+    WORKDIR_KEEP_FAILED = False  # 是否保留失败计算的工作目录
+    
+    # TALYS进程资源设置
+    PROCESS_SAMPLE_INTERVAL = 0.5  # 采样 /proc/<pid> 的间隔（秒）
+    TALYS_MEMORY_LIMIT_MB = None  # 单个TALYS进程的地址空间上限 (MB)，None表示不限制
+    TALYS_CPU_TIME_LIMIT = None  # 单个TALYS进程的CPU时间上限（秒），None表示不限制
+    TALYS_NICE = 0  # TALYS进程的nice增量
+    TALYS_CPU_AFFINITY = None  # TALYS进程可用的CPU编号列表，None表示不限制
     
     # GUI设置
     WINDOW_WIDTH = 1400
@@ -39,13 +82,20 @@ class Settings:
     # 绘图设置
     PLOT_DPI = 100
     PLOT_STYLE = "default"
+    LIVE_PLOT_INTERVAL_MS = 100  # 计算进行中实时截面图的最短重绘间隔（毫秒）
+    ENSEMBLE_OVERLAY_LIMIT = 50  # 多次计算叠加超过此数目时改画包络带
+    SMALL_MULTIPLES_MAX = 48  # 小多图最多显示的反应道数
+    INPUT_VALIDATION_DELAY_MS = 150  # 专家模式输入文件停止编辑多久后在后台校验（毫秒）
     
     # 数据设置
     MAX_DATA_POINTS = 10000
-    DATA_CACHE_SIZE = 100
+    DATA_CACHE_SIZE = 100  # 内存中计算结果数组的预算 (MB)，超出后最久未查看的结果转存到磁盘
+    RESULT_SPILL_DIR = None  # 计算结果转存目录，None表示系统临时目录
+    RESAMPLE_CACHE_SIZE = 64  # 重采样结果缓存的条目数
     
     @classmethod
     def ensure_directories(cls):
         """确保必要的目录存在"""
         cls.TEMP_DIR.mkdir(exist_ok=True)
         cls.LOGS_DIR.mkdir(exist_ok=True)
+        cls.CACHE_DIR.mkdir(parents=True, exist_ok=True)
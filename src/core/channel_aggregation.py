@@ -0,0 +1,242 @@
+"""
+反应道汇总模块
+把一次计算中按能级拆分的反应道文件（nn.L01–nn.L20、np.L00–np.L10 等）和
+按同质异能态拆分的残余核文件（rp091234.L00、rp091234.L02）堆叠为二维数组，
+以向量化的归约计算分立能级求和、连续区截面、残余核总产生截面和同质异能比，结果按计算缓存
+"""
+
+import re
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+from core.resampling import get_resampling_service, result_id
+
+# 反应道文件名：<族>.L<能级>，族为入射粒子+出射粒子（如 nn、np）或残余核（如 rp091234）
+LEVEL_FILE_PATTERN = re.compile(r'^(?P<family>.+)\.L(?P<level>\d+)$')
+RESIDUAL_FAMILY_PATTERN = re.compile(r'^rp(?P<z>\d{3})(?P<a>\d{3})$')
+
+# 出射粒子在TALYS独占反应道文件名 xs<n><p><d><t><h><a>.tot 中的位置（γ为全零）
+EJECTILE_INDEX = {'n': 0, 'p': 1, 'd': 2, 't': 3, 'h': 4, 'a': 5}
+
+# 缓存的汇总结果个数
+AGGREGATION_CACHE_SIZE = 16
+
+
+def exclusive_channel_name(ejectile: str) -> Optional[str]:
+    """发射一个出射粒子的独占反应道文件名（不含扩展名），如 'p' -> 'xs010000'，'g' -> 'xs000000'"""
+    if ejectile == 'g':
+        return "xs000000"
+    if ejectile not in EJECTILE_INDEX:
+        return None
+    counts = ['0'] * 6
+    counts[EJECTILE_INDEX[ejectile]] = '1'
+    return "xs" + ''.join(counts)
+
+
+class ChannelStack:
+    """一个反应道族各能级的截面，堆叠在同一能量网格上"""
+
+    def __init__(self, family: str, names: List[str], levels: np.ndarray,
+                 energy: np.ndarray, values: np.ndarray, headers: List[Optional[Dict[str, Any]]]):
+        """
+        Args:
+            family: 族名（如 'nn'、'rp091234'）
+            names: 按能级排序的反应道名
+            levels: 能级编号
+            energy: 能量网格 (MeV)
+            values: (能级数, 网格点数) 截面 (mb)，网格外为0
+            headers: 各反应道的YANDF头部
+        """
+        self.family = family
+        self.names = names
+        self.levels = levels
+        self.energy = energy
+        self.values = values
+        self.headers = headers
+        for array in (self.levels, self.energy, self.values):
+            array.setflags(write=False)
+
+    @classmethod
+    def from_channels(cls, family: str, channels: Mapping[str, Dict[str, Any]],
+                      levels: Dict[str, int], rid: str) -> 'ChannelStack':
+        """
+        由同一族的反应道数据构建
+
+        各文件能量网格相同时直接堆叠，否则由重采样服务线性插值到并集网格上。
+
+        Args:
+            family: 出射粒子族
+            channels: 反应道名称 -> 反应道数据
+            levels: 本族的反应道名称 -> 能级编号
+            rid: 结果ID（重采样缓存键）
+        """
+        names = sorted(levels, key=levels.get)
+        series = [(np.asarray(channels[name]['energy'], dtype=float),
+                   np.asarray(channels[name]['cross_section'], dtype=float)) for name in names]
+        first = series[0][0]
+        if all(len(e) == len(first) and np.array_equal(e, first) for e, _ in series):
+            order = np.argsort(first, kind='stable')
+            energy = first[order]
+            values = np.vstack([v[order] for _, v in series]) if len(first) else np.zeros((len(names), 0))
+        else:
+            energy = np.unique(np.concatenate([e for e, _ in series]))
+            resampled = get_resampling_service().resample(rid, dict(zip(names, series)), energy)
+            values = np.nan_to_num(resampled, nan=0.0)
+        return cls(family, names, np.array([levels[name] for name in names]), energy,
+                   values, [channels[name].get('header') for name in names])
+
+    def sum(self, min_level: int = 0) -> np.ndarray:
+        """能级编号不小于 min_level 的截面之和"""
+        return self.values[self.levels >= min_level].sum(axis=0)
+
+    def level(self, level: int) -> np.ndarray:
+        """某一能级的截面"""
+        index = np.flatnonzero(self.levels == level)
+        if not index.size:
+            raise KeyError(f"{self.family} 没有能级 {level}")
+        return self.values[index[0]]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class ChannelAggregation(LoggerMixin):
+    """一次计算的反应道汇总"""
+
+    def __init__(self, results: Mapping[str, Any]):
+        """
+        Args:
+            results: run_calculation 返回的结果（或结果句柄）
+        """
+        rid = result_id(results)
+        channels = results.get('reaction_channels') or {}
+        families: Dict[str, Dict[str, int]] = {}
+        for name in channels:
+            match = LEVEL_FILE_PATTERN.match(name)
+            if match and len(channels[name].get('energy', [])):
+                families.setdefault(match.group('family'), {})[name] = int(match.group('level'))
+
+        self.stacks: Dict[str, ChannelStack] = {
+            family: ChannelStack.from_channels(family, channels, levels, rid)
+            for family, levels in sorted(families.items())
+        }
+        self.projectile = next((family[0] for family in self.stacks if not family.startswith('rp')), 'n')
+        self._exclusive = results.get('exclusive_channels') or {}
+        self._residual = results.get('residual_production') or {}
+
+    @property
+    def families(self) -> List[str]:
+        """出射粒子族（不含残余核）"""
+        return [family for family in self.stacks if not RESIDUAL_FAMILY_PATTERN.match(family)]
+
+    @property
+    def residuals(self) -> List[str]:
+        """按同质异能态拆分的残余核族"""
+        return [family for family in self.stacks if RESIDUAL_FAMILY_PATTERN.match(family)]
+
+    def discrete_sum(self, family: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        分立能级截面之和
+
+        入射粒子与出射粒子相同时（如 nn）第0能级是弹性散射，不计入，结果即分立能级的非弹性截面。
+
+        Returns:
+            (能量, 截面)
+        """
+        stack = self.stacks[family]
+        elastic = family[0] == family[1:]
+        return stack.energy, stack.sum(min_level=1 if elastic else 0)
+
+    def inelastic(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """分立能级的非弹性散射截面之和"""
+        family = self.projectile * 2
+        return self.discrete_sum(family) if family in self.stacks else None
+
+    def continuum(self, family: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        连续区截面：对应独占反应道（如 (n,n')、(n,p)）的总截面减去分立能级之和
+
+        Returns:
+            (能量, 截面)，计算结果中没有独占反应道文件时返回None
+        """
+        name = exclusive_channel_name(family[1:])
+        total = self._exclusive.get(name) if name else None
+        if not total or not len(total.get('energy', [])):
+            return None
+        energy, discrete = self.discrete_sum(family)
+        total_values = np.interp(energy, np.asarray(total['energy'], dtype=float),
+                                 np.asarray(total['cross_section'], dtype=float), left=0.0, right=0.0)
+        return energy, np.clip(total_values - discrete, 0.0, None)
+
+    def residual_total(self, family: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        残余核的总产生截面
+
+        有 rpZZZAAA.tot 时取其值，否则为各同质异能态之和。
+        """
+        stack = self.stacks[family]
+        total = self._residual.get(family)
+        if total and len(total.get('energy', [])):
+            return stack.energy, np.interp(stack.energy, np.asarray(total['energy'], dtype=float),
+                                           np.asarray(total['cross_section'], dtype=float))
+        return stack.energy, stack.sum()
+
+    def isomeric_ratios(self, family: str) -> Dict[int, np.ndarray]:
+        """
+        各同质异能态（能级编号大于0）的产生截面与总产生截面之比，总截面为0处为0
+
+        Returns:
+            Dict: 能级编号 -> 同质异能比
+        """
+        stack = self.stacks[family]
+        _, total = self.residual_total(family)
+        ratios = np.divide(stack.values, total[None, :], out=np.zeros_like(stack.values),
+                           where=total[None, :] > 0)
+        return {int(level): ratios[index] for index, level in enumerate(stack.levels) if level > 0}
+
+    def derived_channels(self) -> Dict[str, Dict[str, Any]]:
+        """
+        全部汇总量，结构与 reaction_channels 相同，可直接显示和导出
+
+        名称：<族>.sum（分立能级之和）、<族>.con（连续区）、rpZZZAAA.tot（残余核总产生截面）、
+        rpZZZAAA.L<能级>.ratio（同质异能比）
+        """
+        derived: Dict[str, Dict[str, Any]] = {}
+        for family in self.families:
+            energy, values = self.discrete_sum(family)
+            derived[f"{family}.sum"] = {'energy': energy, 'cross_section': values}
+            continuum = self.continuum(family)
+            if continuum is not None:
+                derived[f"{family}.con"] = {'energy': continuum[0], 'cross_section': continuum[1]}
+        for family in self.residuals:
+            energy, total = self.residual_total(family)
+            derived[f"{family}.tot"] = {'energy': energy, 'cross_section': total}
+            for level, ratio in self.isomeric_ratios(family).items():
+                derived[f"{family}.L{level:02d}.ratio"] = {'energy': energy, 'cross_section': ratio}
+        return derived
+
+
+# 按计算缓存的汇总结果
+_aggregations: "OrderedDict[str, ChannelAggregation]" = OrderedDict()
+_aggregations_lock = threading.Lock()
+
+def get_channel_aggregation(results: Mapping[str, Any]) -> ChannelAggregation:
+    """取得一次计算的反应道汇总（按 result_id 缓存）"""
+    rid = result_id(results)
+    with _aggregations_lock:
+        if rid in _aggregations:
+            _aggregations.move_to_end(rid)
+            return _aggregations[rid]
+    aggregation = ChannelAggregation(results)
+    with _aggregations_lock:
+        _aggregations[rid] = aggregation
+        while len(_aggregations) > AGGREGATION_CACHE_SIZE:
+            _aggregations.popitem(last=False)
+    return aggregation
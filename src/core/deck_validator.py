@@ -0,0 +1,316 @@
+"""
+TALYS输入文件校验模块
+按关键字表逐行检查关键字、参数个数、类型和取值范围，再对整个文件检查
+必需关键字、重复关键字和关键字之间的依赖关系。
+逐行检查的结果按行文本缓存，编辑后重新校验时只检查改动过的行
+"""
+
+import difflib
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+from core.input_deck import REQUIRED_KEYWORDS
+from core.input_schema import (ELEMENT_SYMBOLS, ELEMENT_Z, KEYWORD_ALIASES, MASS_RANGE, PARTICLES,
+                               KeywordSchema, KeywordSpec, get_keyword_schema)
+
+# 诊断级别
+ERROR = 'error'
+WARNING = 'warning'
+INFO = 'info'
+
+# 逐行检查缓存的最大行数，超过后只保留当前文件中的行
+LINE_CACHE_LIMIT = 20000
+
+# 默认开启裂变道的最小原子序数（锕系）
+FISSION_DEFAULT_Z = 90
+
+# 只在 fission y 时生效的关键字
+FISSION_KEYWORDS = ('fismodel', 'fismodelalt', 'fymodel', 'fisbar', 'fishw', 'fisbaradjust', 'fishwadjust',
+                    'class2', 'massdis', 'ffmodel', 'pfnsmodel', 'outfission', 'filefission', 'outfy', 'fisfeed')
+
+# 关键字 -> (依赖的关键字, 依赖关键字需要的值)：关键字设为 y（或给出数值）时才检查
+DEPENDENCIES = {
+    'filechannels': ('channels', 'y'),
+    'endfdetail': ('endf', 'y'),
+}
+
+# 只适用于核子入射的关键字
+NUCLEON_KEYWORDS = ('jlmomp',)
+
+_TOKEN = re.compile(r'\S+')
+
+
+class Diagnostic(NamedTuple):
+    """一条诊断信息（行号和列号从0开始，end 为不含的结束列）"""
+    line: int
+    start: int
+    end: int
+    severity: str
+    message: str
+
+
+class LineEntry(NamedTuple):
+    """一行的解析和检查结果（与行号无关，可按行文本缓存）"""
+    keyword: Optional[str]  # 小写关键字，空行和注释行为None
+    args: Tuple[str, ...]
+    problems: Tuple[Tuple[int, int, str, str], ...]  # (起始列, 结束列, 级别, 信息)
+
+
+def _is_int(token: str) -> bool:
+    return token.lstrip('+-').isdigit()
+
+
+def _to_float(token: str) -> Optional[float]:
+    try:
+        return float(token.replace('d', 'e').replace('D', 'e'))
+    except ValueError:
+        return None
+
+
+def _check_token(code: str, token: str, spec: KeywordSpec) -> Optional[str]:
+    """检查一个参数，返回错误信息或None"""
+    lowered = token.lower()
+    if code == 'b':
+        return None if lowered in ('y', 'n') else f"应为 y 或 n，而不是 '{token}'"
+    if code in ('i', 'Z', 'A'):
+        if not _is_int(token):
+            return f"应为整数，而不是 '{token}'"
+        value = int(token)
+        if code == 'Z' and not 1 <= value <= len(ELEMENT_SYMBOLS):
+            return f"原子序数 {value} 超出范围 1–{len(ELEMENT_SYMBOLS)}"
+        if code == 'A' and not 1 <= value <= MASS_RANGE[1]:
+            return f"质量数 {value} 超出范围 1–{MASS_RANGE[1]}"
+        return None
+    if code == 'f':
+        return None if _to_float(token) is not None else f"应为数值，而不是 '{token}'"
+    if code in ('p', 'P'):
+        return None if lowered in PARTICLES else f"未知粒子 '{token}'，应为 {' '.join(PARTICLES)} 之一"
+    if code == 'c':
+        if any(lowered == choice.lower() for choice in spec.choices):
+            return None
+        return f"应为 {' '.join(spec.choices)} 之一，而不是 '{token}'"
+    if code == 'e':
+        if _is_int(token):
+            return None if 1 <= int(token) <= len(ELEMENT_SYMBOLS) else f"原子序数 {token} 超出范围"
+        return None if lowered in ELEMENT_Z else f"未知元素 '{token}'"
+    if code == 'B':
+        return None if lowered in ('y', 'n') or _to_float(token) is not None else \
+            f"应为 y、n 或数值，而不是 '{token}'"
+    return None
+
+
+def _check_range(spec: KeywordSpec, token: str) -> Optional[str]:
+    """检查取值范围，返回错误信息或None"""
+    value = _to_float(token)
+    if spec.valid_range is None or value is None:
+        return None
+    low, high = spec.valid_range
+    if low <= value <= high:
+        return None
+    return f"{spec.name} 的取值 {token} 超出范围 {low:g}–{high:g}"
+
+
+def _check_energy(spec: KeywordSpec, tokens: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str, str]]:
+    """energy：单个能量、'最小 最大 步长' 或能量文件名"""
+    values = [_to_float(token) for _, _, token in tokens]
+    if len(tokens) == 1 and values[0] is None:
+        return []  # 能量文件
+    if len(tokens) not in (1, 3):
+        return [(tokens[0][0], tokens[-1][1], ERROR, "energy 应为单个能量、'最小 最大 步长' 或能量文件名")]
+    problems = [(start, end, ERROR, f"应为数值，而不是 '{token}'")
+                for (start, end, token), value in zip(tokens, values) if value is None]
+    if problems:
+        return problems
+    for start, end, token in tokens[:2]:
+        message = _check_range(spec, token)
+        if message:
+            problems.append((start, end, ERROR, message))
+    if len(tokens) == 3:
+        if values[0] > values[1]:
+            problems.append((tokens[0][0], tokens[1][1], ERROR,
+                             f"能量范围的最小值 {tokens[0][2]} 大于最大值 {tokens[1][2]}"))
+        if values[2] <= 0:
+            problems.append((tokens[2][0], tokens[2][1], ERROR, "能量步长必须大于0"))
+    return problems
+
+
+def check_line(text: str, schema: KeywordSchema) -> LineEntry:
+    """
+    解析并检查一行
+
+    Args:
+        text: 行文本（# 之后为注释）
+        schema: 关键字表
+
+    Returns:
+        LineEntry: 解析结果和问题列表
+    """
+    code = text.split('#', 1)[0]
+    tokens = [(match.start(), match.end(), match.group()) for match in _TOKEN.finditer(code)]
+    if not tokens:
+        return LineEntry(None, (), ())
+
+    (key_start, key_end, keyword), args = tokens[0], tokens[1:]
+    key = keyword.lower()
+    arg_texts = tuple(token for _, _, token in args)
+    spec = schema.get(key)
+    if spec is None:
+        suggestion = difflib.get_close_matches(key, list(schema.keywords), n=1, cutoff=0.75)
+        hint = f"，是否为 {schema.keywords[suggestion[0]].name}？" if suggestion else ""
+        return LineEntry(key, arg_texts, ((key_start, key_end, ERROR, f"未知关键字 '{keyword}'{hint}"),))
+
+    problems: List[Tuple[int, int, str, str]] = []
+    if key in KEYWORD_ALIASES:
+        problems.append((key_start, key_end, INFO,
+                         f"{keyword} 是TALYS内部变量名，输入文件中对应的关键字为 {KEYWORD_ALIASES[key]}"))
+    if len(args) < spec.min_args:
+        problems.append((key_start, key_end, ERROR, f"缺少参数，用法: {spec.usage}"))
+        return LineEntry(key, arg_texts, tuple(problems))
+
+    if spec.signature == ('E',):
+        problems.extend(_check_energy(spec, args))
+        return LineEntry(key, arg_texts, tuple(problems))
+
+    codes = [code.rstrip('?') for code in spec.signature]
+    if codes[-1] == 'P':
+        codes.extend('P' * (len(args) - len(codes)))
+    range_checked = False
+    for index, (start, end, token) in enumerate(args):
+        if index >= len(codes):
+            problems.append((start, args[-1][1], WARNING, f"多余的参数，用法: {spec.usage}"))
+            break
+        message = _check_token(codes[index], token, spec)
+        if message is None and codes[index] in ('i', 'f', 'B') and not range_checked:
+            range_checked = True
+            message = _check_range(spec, token)
+        if message:
+            problems.append((start, end, ERROR, message))
+    return LineEntry(key, arg_texts, tuple(problems))
+
+
+def _leading_key(spec: KeywordSpec, args: Tuple[str, ...]) -> Tuple[str, ...]:
+    """可重复关键字区分各行的参数（粒子或 Z A），其余关键字为空"""
+    if not spec.repeatable:
+        return ()
+    if spec.signature[0] == 'Z':
+        return tuple(arg.lower() for arg in args[:2])
+    return tuple(arg.lower() for arg in args[:1])
+
+
+class DeckValidator(LoggerMixin):
+    """输入文件校验器（逐行检查结果按行文本缓存，只供一个线程使用）"""
+
+    def __init__(self, schema: Optional[KeywordSchema] = None):
+        self.schema = schema or get_keyword_schema()
+        self._cache: Dict[str, LineEntry] = {}
+        self.checked_lines = 0  # 上一次校验中实际检查（未命中缓存）的行数
+
+    def line_entry(self, text: str) -> LineEntry:
+        """一行的检查结果（命中缓存时不重新检查）"""
+        entry = self._cache.get(text)
+        if entry is None:
+            entry = self._cache[text] = check_line(text, self.schema)
+            self.checked_lines += 1
+        return entry
+
+    def validate(self, text: str) -> List[Diagnostic]:
+        """
+        校验整个输入文件
+
+        Args:
+            text: 输入文件内容
+
+        Returns:
+            List[Diagnostic]: 按行号和列号排序的诊断信息
+        """
+        self.checked_lines = 0
+        lines = text.split('\n')
+        entries = [self.line_entry(line) for line in lines]
+        if len(self._cache) > LINE_CACHE_LIMIT:
+            current = set(lines)
+            self._cache = {line: entry for line, entry in self._cache.items() if line in current}
+
+        diagnostics = [Diagnostic(number, start, end, severity, message)
+                       for number, entry in enumerate(entries)
+                       for start, end, severity, message in entry.problems]
+        diagnostics.extend(self.check_document(lines, entries))
+        diagnostics.sort(key=lambda diagnostic: (diagnostic.line, diagnostic.start))
+        return diagnostics
+
+    def check_document(self, lines: List[str], entries: List[LineEntry]) -> List[Diagnostic]:
+        """整个文件的检查：必需关键字、重复关键字和关键字之间的依赖"""
+        diagnostics = []
+        occurrences: Dict[str, List[int]] = defaultdict(list)
+        for number, entry in enumerate(entries):
+            if entry.keyword is not None and entry.keyword in self.schema:
+                occurrences[entry.keyword].append(number)
+
+        def span(number: int) -> Tuple[int, int]:
+            line = lines[number]
+            stripped = line.split('#', 1)[0].rstrip()
+            return len(stripped) - len(stripped.lstrip()), len(stripped)
+
+        def warn(number: int, severity: str, message: str):
+            diagnostics.append(Diagnostic(number, *span(number), severity, message))
+
+        def value(keyword: str) -> Optional[Tuple[str, ...]]:
+            """关键字最后一次出现时的参数"""
+            return entries[occurrences[keyword][-1]].args if occurrences.get(keyword) else None
+
+        missing = [keyword for keyword in REQUIRED_KEYWORDS if keyword not in occurrences]
+        if missing:
+            diagnostics.append(Diagnostic(0, 0, 0, ERROR, f"缺少必需关键字: {', '.join(missing)}"))
+
+        # 重复关键字：TALYS 以最后一次出现为准
+        for keyword, numbers in occurrences.items():
+            spec = self.schema.get(keyword)
+            seen: Dict[Tuple[str, ...], int] = {}
+            for number in numbers:
+                key = _leading_key(spec, entries[number].args)
+                if key in seen:
+                    warn(seen[key], WARNING, f"{spec.name} 在第{number + 1}行重复设置，此行被覆盖")
+                seen[key] = number
+
+        # 质量数不能小于原子序数
+        element, mass = value('element'), value('mass')
+        z = None
+        if element:
+            z = int(element[0]) if element[0].isdigit() else ELEMENT_Z.get(element[0].lower())
+        if z and mass and mass[0].isdigit() and 0 < int(mass[0]) < z:
+            warn(occurrences['mass'][-1], ERROR, f"质量数 {mass[0]} 小于原子序数 {z}")
+
+        # 裂变相关关键字
+        fission = value('fission')
+        fission_on = fission[0].lower() == 'y' if fission else (z is not None and z >= FISSION_DEFAULT_Z)
+        if not fission_on:
+            for keyword in FISSION_KEYWORDS:
+                for number in occurrences.get(keyword, []):
+                    warn(number, WARNING, f"{self.schema.get(keyword).name} 只在 fission y 时生效")
+
+        for keyword, (required, expected) in DEPENDENCIES.items():
+            args = value(keyword)
+            if args and args[0].lower() != 'n':
+                actual = value(required)
+                if not actual or actual[0].lower() != expected:
+                    warn(occurrences[keyword][-1], WARNING, f"{keyword} 只在 {required} {expected} 时生效")
+
+        projectile = value('projectile')
+        if projectile and projectile[0].lower() not in ('n', 'p'):
+            for keyword in NUCLEON_KEYWORDS:
+                args = value(keyword)
+                if args and args[0].lower() == 'y':
+                    warn(occurrences[keyword][-1], WARNING, f"{keyword} 只适用于中子和质子入射")
+        return diagnostics
+
+
+def count_by_severity(diagnostics: List[Diagnostic]) -> Dict[str, int]:
+    """各级别诊断的条数"""
+    counts = {ERROR: 0, WARNING: 0, INFO: 0}
+    for diagnostic in diagnostics:
+        counts[diagnostic.severity] += 1
+    return counts
@@ -0,0 +1,199 @@
+"""
+ECIS输入卡片读取模块
+一次扫描 ecis.inp 建立每个入射能量的块边界索引，按需解析单个块
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+from core.omp_database import fortran_float
+
+BLOCK_INDEX_DTYPE = np.dtype([
+    ('energy', np.float64),
+    ('offset', np.int64),
+    ('length', np.int64),
+])
+
+# 每个ECIS块以标题行开始，如 "0.001 MeV neutron  on 233Pa - Optical model: ... REF#= 2408"
+_TITLE = re.compile(rb'^[ \t]*([0-9.Ee+-]+)[ \t]+MeV[ \t]+\S+[ \t]+on[ \t]', re.MULTILINE)
+_TITLE_FIELDS = re.compile(
+    r'^\s*(?P<energy>[0-9.Ee+-]+)\s+MeV\s+(?P<projectile>\S+)\s+on\s+(?P<target>\S+)'
+    r'\s*-?\s*(?P<model>.*?)\s*(?:REF#=\s*(?P<iref>\d+))?\s*$'
+)
+_END = re.compile(rb'^FIN[ \t]*\r?$', re.MULTILINE)
+
+# 每组光学势参数的行数（ECIS中每个势占8行，每行为深度、半径、弥散）
+POTENTIAL_ROWS = 8
+
+
+def _numbers(line: str) -> np.ndarray:
+    """解析一行数字"""
+    return np.array([fortran_float(token) for token in line.split()])
+
+
+def _flags(line: str) -> np.ndarray:
+    """解析一行T/F逻辑开关"""
+    return np.array([char == 'T' for char in line.rstrip('\r\n')], dtype=bool)
+
+
+def parse_ecis_block(text: str) -> Dict[str, Any]:
+    """
+    解析单个ECIS块
+
+    块结构：标题行、两行逻辑开关、控制行（耦合能级数、最大J、迭代数、势数）、
+    数值参数行、空行、耦合能级表、形变参数、各能级光学势、角度网格。
+    能级激发能中基态记为0，实验室系入射能等运动学量放在 kinematics 中。
+
+    Args:
+        text: 块文本
+
+    Returns:
+        Dict: 块内容，potentials 形状为 (势数, 8, 3)
+    """
+    lines = text.splitlines()
+    title = _TITLE_FIELDS.match(lines[0])
+    if not title:
+        raise ValueError(f"无法识别的ECIS块标题: {lines[0].strip()}")
+
+    control = [int(token) for token in lines[3].split()]
+    n_levels = control[0]
+    n_potentials = control[3] if len(control) > 3 else 0
+
+    # 能级卡片：自旋、IQ、所用光学势编号+宇称、激发能；第一条能级的能量位置为实验室系入射能，
+    # 其后为入射粒子自旋、入射粒子质量、靶核质量和电荷乘积
+    levels = []
+    kinematics = np.empty(0)
+    for number, line in enumerate(lines[6:6 + n_levels]):
+        tokens = line.split()
+        values = [fortran_float(token) for token in tokens[3:]]
+        if number == 0:
+            kinematics = np.array(values)
+            values = [0.0]
+        levels.append({
+            'spin': float(tokens[0]),
+            'iq': int(tokens[1]),
+            'potential': int(tokens[2][:-1]),
+            'parity': tokens[2][-1],
+            'energy': values[0],
+        })
+
+    body = lines[6 + n_levels:]
+    potential_start = len(body) - 1 - n_potentials * POTENTIAL_ROWS
+    potential_lines = body[potential_start:len(body) - 1]
+
+    return {
+        'energy': fortran_float(title.group('energy')),
+        'projectile': title.group('projectile'),
+        'target': title.group('target'),
+        'model': title.group('model'),
+        'iref': int(title.group('iref')) if title.group('iref') else None,
+        'title': lines[0].strip(),
+        'flags': (_flags(lines[1]), _flags(lines[2])),
+        'control': control,
+        'parameters': _numbers(lines[4]),
+        'kinematics': kinematics,
+        'levels': levels,
+        'deformation': [_numbers(line) for line in body[:potential_start]],
+        'potentials': np.array([_numbers(line) for line in potential_lines]).reshape(n_potentials,
+                                                                                     POTENTIAL_ROWS, -1),
+        'angles': _numbers(body[-1]) if body else np.empty(0),
+    }
+
+
+class EcisDeck(LoggerMixin):
+    """ECIS输入卡片（按入射能量分块、按需解析）"""
+
+    def __init__(self, file_path: Union[str, Path]):
+        """
+        初始化读取器并建立块索引
+
+        Args:
+            file_path: ecis.inp 路径
+        """
+        self.file_path = Path(file_path)
+        self.index = self.build_index()
+        self._blocks: Dict[int, Dict[str, Any]] = {}
+
+    def build_index(self) -> np.ndarray:
+        """
+        扫描文件建立块边界索引，只匹配标题行，不解析块内容
+
+        Returns:
+            np.ndarray: BLOCK_INDEX_DTYPE 结构化数组，每个入射能量一行
+        """
+        with open(self.file_path, 'rb') as f:
+            data = f.read()
+
+        end = _END.search(data)
+        stop = end.start() if end else len(data)
+        matches = list(_TITLE.finditer(data, 0, stop))
+
+        index = np.zeros(len(matches), dtype=BLOCK_INDEX_DTYPE)
+        for row, match in enumerate(matches):
+            block_end = matches[row + 1].start() if row + 1 < len(matches) else stop
+            index[row] = (fortran_float(match.group(1).decode('ascii')), match.start(),
+                          block_end - match.start())
+
+        self.logger.debug(f"ECIS卡片索引建立完成，共{len(index)}个能量块")
+        return index
+
+    @property
+    def energies(self) -> np.ndarray:
+        """各块的入射能量 (MeV)"""
+        return self.index['energy']
+
+    def read_text(self, block: int) -> str:
+        """读取指定块的原始文本"""
+        row = self.index[block]
+        with open(self.file_path, 'rb') as f:
+            f.seek(int(row['offset']))
+            return f.read(int(row['length'])).decode('latin-1')
+
+    def block(self, block: int) -> Dict[str, Any]:
+        """
+        解析指定序号的块，结果在内存中缓存
+
+        Args:
+            block: 块序号（从0开始）
+
+        Returns:
+            Dict: 解析后的块
+        """
+        if block < 0:
+            block += len(self.index)
+        if not 0 <= block < len(self.index):
+            raise IndexError(f"ECIS块序号超出范围: {block}")
+
+        if block not in self._blocks:
+            self._blocks[block] = parse_ecis_block(self.read_text(block))
+        return self._blocks[block]
+
+    def find_block(self, energy: float) -> int:
+        """返回入射能量最接近给定值的块序号"""
+        if len(self.index) == 0:
+            raise IndexError("ECIS卡片中没有能量块")
+        return int(np.argmin(np.abs(self.energies - energy)))
+
+    def block_for_energy(self, energy: float) -> Dict[str, Any]:
+        """解析入射能量最接近给定值的块"""
+        return self.block(self.find_block(energy))
+
+    def level_table(self, block: int) -> np.ndarray:
+        """
+        获取指定块的耦合能级表
+
+        Returns:
+            np.ndarray: 形状 (能级数, 3)，每行为 (自旋, 宇称(+1/-1), 激发能)
+        """
+        levels: List[Dict[str, Any]] = self.block(block)['levels']
+        return np.array([(level['spin'], 1 if level['parity'] == '+' else -1, level['energy'])
+                         for level in levels]).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        return len(self.index)
@@ -0,0 +1,466 @@
+"""
+实验数据库模块
+从本地EXFOR计算格式（C4）文件导入实验数据，每个数据集保存为一个 .npy 文件，
+并在SQLite中按 (靶核Z/A, 入射粒子, 反应, MT, 物理量, 产物Z/A) 建立索引，
+供可视化时按YANDF头部中的靶核、反应和残余核查找对应的测量数据
+"""
+
+import hashlib
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from utils.logger import LoggerMixin
+from core.omp_database import PROJECTILES, fortran_float
+
+INDEX_FILE_NAME = "index.sqlite"
+DATA_DIR_NAME = "data"
+
+# 数据集数组的列：能量和数据已换算为MeV和mb（截面类）
+COLUMNS = ['E', 'dE', 'data', 'd_data', 'cos_lo', 'd_cos_lo', 'elv_hl', 'd_elv_hl']
+
+# C4格式的固定列位置（从0开始的切片）
+C4_FIELDS = {
+    'projectile': slice(0, 5),
+    'target': slice(5, 11),
+    'target_meta': slice(11, 12),
+    'mf': slice(12, 15),
+    'mt': slice(15, 19),
+    'product_meta': slice(19, 20),
+    'reference': slice(97, 122),
+    'accession': slice(122, 127),
+    'subaccession': slice(127, 130),
+}
+C4_DATA_START = 22
+C4_DATA_WIDTH = 9
+
+# MF -> (物理量, 数据单位)
+QUANTITIES = {
+    3: ('cross section', 'mb'),
+    4: ('angular distribution', 'b/sr'),
+    5: ('energy spectrum', 'b/eV'),
+    6: ('double differential cross section', 'b/sr/eV'),
+    10: ('cross section', 'mb'),
+}
+
+# 截面类数据由b换算为mb
+MILLIBARN_MF = {3, 10}
+
+# 残余核产生截面的MT，产物ZA写在数据的 ELV/HL 列（COLUMNS 中的序号）
+PRODUCTION_MT = 5
+PRODUCT_ZA_COLUMN = 6
+
+# YANDF头部中残余核的同质异能态序号 -> C4中产物的同质异能态标记（总产生截面为空或 'T'）
+PRODUCT_STATES = {0: ('G', '0'), 1: ('M', '1'), 2: ('N', '2')}
+
+# MT -> 出射道（按中子入射的ENDF约定）
+OUTGOING = {
+    1: 'tot', 2: 'el', 3: 'non', 4: "n'", 5: 'x', 16: '2n', 17: '3n', 18: 'f', 22: 'na',
+    28: 'np', 102: 'g', 103: 'p', 104: 'd', 105: 't', 106: 'h', 107: 'a',
+}
+# 分立能级的MT区间起点 -> 出射粒子
+LEVEL_SERIES = {51: 'n', 600: 'p', 650: 'd', 700: 't', 750: 'h', 800: 'a'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    id INTEGER PRIMARY KEY,
+    target_z INTEGER NOT NULL,
+    target_a INTEGER NOT NULL,
+    target_meta TEXT NOT NULL DEFAULT '',
+    projectile TEXT NOT NULL,
+    reaction TEXT NOT NULL,
+    mt INTEGER NOT NULL,
+    mf INTEGER NOT NULL,
+    quantity TEXT NOT NULL,
+    product_meta TEXT NOT NULL DEFAULT '',
+    product_z INTEGER NOT NULL DEFAULT 0,
+    product_a INTEGER NOT NULL DEFAULT 0,
+    unit TEXT,
+    reference TEXT,
+    year INTEGER,
+    accession TEXT NOT NULL,
+    subaccession TEXT NOT NULL,
+    n_points INTEGER NOT NULL,
+    e_min REAL,
+    e_max REAL,
+    file TEXT NOT NULL,
+    source TEXT,
+    imported REAL,
+    UNIQUE (accession, subaccession, projectile, target_z, target_a, target_meta, mf, mt,
+            product_z, product_a, product_meta)
+);
+CREATE INDEX IF NOT EXISTS idx_datasets_reaction
+    ON datasets (target_z, target_a, projectile, reaction, quantity);
+CREATE INDEX IF NOT EXISTS idx_datasets_mt
+    ON datasets (target_z, target_a, projectile, mt, quantity);
+CREATE INDEX IF NOT EXISTS idx_datasets_product
+    ON datasets (target_z, target_a, projectile, product_z, product_a, quantity);
+"""
+
+# 索引格式版本（PRAGMA user_version），以后修改表结构时据此迁移
+SCHEMA_VERSION = 1
+
+# 写入索引的元数据字段（不含id）
+FIELDS = ['target_z', 'target_a', 'target_meta', 'projectile', 'reaction', 'mt', 'mf', 'quantity',
+          'product_meta', 'product_z', 'product_a', 'unit', 'reference', 'year', 'accession', 'subaccession',
+          'n_points', 'e_min', 'e_max', 'file', 'source', 'imported']
+
+
+class ExperimentalDataError(Exception):
+    """实验数据错误"""
+    pass
+
+
+def projectile_symbol(za: int) -> str:
+    """C4中的入射粒子ZA（中子为1，质子为1001）转换为TALYS符号"""
+    if za == 0:
+        return 'g'
+    symbol = PROJECTILES.get((za // 1000, za % 1000))
+    if symbol is None:
+        raise ExperimentalDataError(f"不支持的入射粒子: {za}")
+    return symbol
+
+
+def reaction_name(projectile: str, mt: int) -> str:
+    """
+    由MT得到与YANDF头部相同写法的反应名，如 (n,n_3)、(n,p_0)、(n,2n)
+
+    Args:
+        projectile: 入射粒子符号
+        mt: ENDF反应编号
+
+    Returns:
+        str: 反应名，未知MT时为 (n,MT<mt>)
+    """
+    if mt in OUTGOING:
+        return f"({projectile},{OUTGOING[mt]})"
+    for start, particle in sorted(LEVEL_SERIES.items(), reverse=True):
+        if start <= mt < start + (40 if start == 51 else 49):
+            level = mt - start + (1 if start == 51 else 0)
+            return f"({projectile},{particle}_{level})"
+    return f"({projectile},MT{mt})"
+
+
+def _parse_year(reference: str) -> Optional[int]:
+    """从C4参考文献字段（如 'A.B.Smith+ (1975)'）中取出年份"""
+    match = re.search(r'\((\d{4})\)', reference) or re.search(r'(\d{4})', reference)
+    return int(match.group(1)) if match else None
+
+
+def parse_c4(lines: Iterable[str]) -> Dict[Tuple, Dict[str, Any]]:
+    """
+    解析EXFOR计算格式（C4）数据
+
+    每行为一个数据点，按 (EXFOR编号, 子编号, 入射粒子, 靶核, MF, MT, 产物, 产物同质异能态) 分组为数据集。
+    残余核产生截面（MT=5）的产物ZA取自 ELV/HL 列，其他反应的产物记为0。
+
+    Args:
+        lines: C4文件的文本行（# 开头的行为注释）
+
+    Returns:
+        Dict: 分组键 -> {'meta': 元数据, 'rows': 数据点列表}
+    """
+    groups: Dict[Tuple, Dict[str, Any]] = OrderedDict()
+    for line in lines:
+        if not line.strip() or line.startswith('#'):
+            continue
+        line = line.rstrip('\r\n').ljust(131)
+        fields = {name: line[span].strip() for name, span in C4_FIELDS.items()}
+        try:
+            projectile = projectile_symbol(int(fields['projectile']))
+            target = int(fields['target'])
+            mf, mt = int(fields['mf']), int(fields['mt'])
+        except ValueError:
+            continue
+        values = [fortran_float(line[start:start + C4_DATA_WIDTH])
+                  for start in range(C4_DATA_START, C4_DATA_START + 8 * C4_DATA_WIDTH, C4_DATA_WIDTH)]
+        product = 0
+        if mt == PRODUCTION_MT:
+            product = values[PRODUCT_ZA_COLUMN]
+            if not np.isfinite(product) or product <= 0:
+                continue  # 没有产物的残余核产生截面无法与计算结果对应
+            product = int(round(product))
+
+        key = (fields['accession'], fields['subaccession'], projectile, target,
+               fields['target_meta'], mf, mt, product, fields['product_meta'])
+        group = groups.get(key)
+        if group is None:
+            quantity, unit = QUANTITIES.get(mf, (f"MF{mf}", None))
+            group = groups[key] = {
+                'meta': {
+                    'target_z': target // 1000, 'target_a': target % 1000,
+                    'target_meta': fields['target_meta'], 'projectile': projectile,
+                    'reaction': reaction_name(projectile, mt), 'mt': mt, 'mf': mf,
+                    'quantity': quantity, 'unit': unit, 'product_meta': fields['product_meta'],
+                    'product_z': product // 1000, 'product_a': product % 1000,
+                    'reference': fields['reference'], 'year': _parse_year(fields['reference']),
+                    'accession': fields['accession'], 'subaccession': fields['subaccession'],
+                },
+                'rows': [],
+            }
+        group['rows'].append(values)
+    return groups
+
+
+def c4_to_array(rows: List[List[float]], mf: int) -> np.ndarray:
+    """把C4数据点转换为按能量排序的数组，能量换算为MeV，截面换算为mb"""
+    data = np.asarray(rows, dtype=float).reshape(-1, len(COLUMNS))
+    data[:, 0:2] *= 1e-6
+    if mf in MILLIBARN_MF:
+        data[:, 2:4] *= 1e3
+    return data[np.argsort(data[:, 0], kind='stable')]
+
+
+class ExperimentalDataset:
+    """实验数据集（索引中的一行），数据在访问时才读取"""
+
+    def __init__(self, database: 'ExperimentalDatabase', dataset_id: int, meta: Dict[str, Any]):
+        self._database = database
+        self.id = dataset_id
+        self.meta = meta
+
+    def __getattr__(self, name: str) -> Any:
+        meta = self.__dict__.get('meta', {})
+        if name in meta:
+            return meta[name]
+        raise AttributeError(name)
+
+    @property
+    def data(self) -> np.ndarray:
+        """(点数, 8) 数组，列见 COLUMNS"""
+        return self._database.load(self)
+
+    @property
+    def energy(self) -> np.ndarray:
+        return self.data[:, 0]
+
+    @property
+    def value(self) -> np.ndarray:
+        return self.data[:, 2]
+
+    @property
+    def uncertainty(self) -> np.ndarray:
+        return self.data[:, 3]
+
+    @property
+    def label(self) -> str:
+        """图例文字，如 'Smith (1975) [12345.002]'"""
+        author = (self.meta.get('reference') or '').split('(')[0].strip() or '?'
+        year = f" ({self.meta['year']})" if self.meta.get('year') else ''
+        return f"{author}{year} [{self.meta['accession']}.{self.meta['subaccession']}]"
+
+    def __repr__(self) -> str:
+        return f"ExperimentalDataset({self.id}, {self.meta['reaction']} {self.label})"
+
+
+class ExperimentalDatabase(LoggerMixin):
+    """本地实验数据库"""
+
+    def __init__(self, root: Optional[Union[str, Path]] = None, cache_size: int = 256):
+        """
+        Args:
+            root: 数据库目录，默认使用配置中的 EXPERIMENTAL_DATA_DIR
+            cache_size: 内存中保留的数据集数组个数
+        """
+        self.root = Path(root) if root else Settings.EXPERIMENTAL_DATA_DIR
+        self.data_dir = self.root / DATA_DIR_NAME
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.root / INDEX_FILE_NAME), check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._create_schema()
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def _create_schema(self):
+        """建立索引表并记录索引格式版本"""
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # ---- 导入 ----
+
+    def import_c4(self, path: Union[str, Path]) -> int:
+        """
+        导入一个C4文件，同一数据集再次导入时覆盖
+
+        Args:
+            path: C4文件路径
+
+        Returns:
+            int: 导入的数据集个数
+        """
+        path = Path(path)
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                groups = parse_c4(f)
+        except OSError as e:
+            raise ExperimentalDataError(f"无法读取实验数据文件 {path}: {e}")
+
+        rows = []
+        imported = time.time()
+        for key, group in groups.items():
+            data = c4_to_array(group['rows'], group['meta']['mf'])
+            digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+            file_name = f"{group['meta']['accession'] or 'local'}_{digest}.npy"
+            np.save(self.data_dir / file_name, data)
+            with self._lock:
+                self._cache.pop(file_name, None)
+
+            meta = dict(group['meta'], n_points=len(data), e_min=float(data[0, 0]),
+                        e_max=float(data[-1, 0]), file=file_name, source=path.name, imported=imported)
+            rows.append(tuple(meta[field] for field in FIELDS))
+
+        placeholders = ', '.join('?' for _ in FIELDS)
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO datasets ({', '.join(FIELDS)}) VALUES ({placeholders})", rows)
+        self.logger.info(f"从 {path.name} 导入 {len(rows)} 个实验数据集")
+        return len(rows)
+
+    def import_directory(self, directory: Union[str, Path], pattern: str = "*.c4") -> int:
+        """导入目录中全部C4文件，返回导入的数据集个数"""
+        return sum(self.import_c4(path) for path in sorted(Path(directory).glob(pattern)))
+
+    # ---- 查询 ----
+
+    def query(self, z: int, a: int, projectile: str = 'n', mt: Optional[int] = None,
+              reaction: Optional[str] = None, quantity: Optional[str] = 'cross section',
+              target_meta: str = '', product: Optional[Tuple[int, int]] = None,
+              product_meta: Optional[Iterable[str]] = None) -> List[ExperimentalDataset]:
+        """
+        查找实验数据集
+
+        Args:
+            z, a: 靶核
+            projectile: 入射粒子符号
+            mt: ENDF反应编号
+            reaction: 反应名（如 '(n,n_3)'），给出MT时可省略
+            quantity: 物理量，None表示不限
+            target_meta: 靶核同质异能态
+            product: 产物 (Z, A)，残余核产生截面用
+            product_meta: 可接受的产物同质异能态标记，None表示不限
+
+        Returns:
+            List: 按年份排序的数据集
+        """
+        conditions = ["target_z = ?", "target_a = ?", "projectile = ?", "target_meta = ?"]
+        values: List[Any] = [int(z), int(a), projectile, target_meta]
+        if mt is not None:
+            conditions.append("mt = ?")
+            values.append(int(mt))
+        elif reaction is not None:
+            conditions.append("reaction = ?")
+            values.append(reaction)
+        if quantity is not None:
+            conditions.append("quantity = ?")
+            values.append(quantity)
+        if product is not None:
+            conditions.append("product_z = ? AND product_a = ?")
+            values.extend(int(number) for number in product)
+        if product_meta is not None:
+            product_meta = list(product_meta)
+            conditions.append(f"product_meta IN ({', '.join('?' for _ in product_meta)})")
+            values.extend(product_meta)
+
+        sql = (f"SELECT * FROM datasets WHERE {' AND '.join(conditions)} "
+               f"ORDER BY year, accession, subaccession")
+        with self._lock:
+            rows = self._connection.execute(sql, values).fetchall()
+        return [self._dataset(row) for row in rows]
+
+    def datasets_for_header(self, header: Dict[str, Any]) -> List[ExperimentalDataset]:
+        """
+        按YANDF头部中的靶核、反应和物理量查找实验数据集
+
+        残余核产生截面（MT=5）的反应名都是 (n,x)，按头部中残余核的Z/A和同质异能态匹配。
+
+        Args:
+            header: parse_yandf_header 得到的头部
+
+        Returns:
+            List: 匹配的数据集，头部信息不全时为空
+        """
+        target = header.get('target') or {}
+        reaction = header.get('reaction') or {}
+        z, a = target.get('Z'), target.get('A')
+        reaction_type = str(reaction.get('type') or '')
+        match = re.match(r'\((\w+),', reaction_type)
+        if z is None or a is None or not match:
+            return []
+        mt = reaction.get('ENDF_MT')
+        quantity = (header.get('datablock') or {}).get('quantity')
+        if mt == PRODUCTION_MT:
+            residual = header.get('residual') or {}
+            if residual.get('Z') is None or residual.get('A') is None:
+                return []
+            level = residual.get('level')
+            if isinstance(level, dict) and level.get('isomer') is not None:
+                states = PRODUCT_STATES.get(level['isomer'], (str(level['isomer']),))
+            else:
+                states = ('', 'T')
+            return self.query(z, a, match.group(1), mt=PRODUCTION_MT, quantity=quantity,
+                              product=(residual['Z'], residual['A']), product_meta=states)
+        return self.query(z, a, match.group(1), mt=mt if isinstance(mt, int) else None,
+                          reaction=reaction_type, quantity=quantity)
+
+    def _dataset(self, row: sqlite3.Row) -> ExperimentalDataset:
+        return ExperimentalDataset(self, row['id'], {key: row[key] for key in row.keys() if key != 'id'})
+
+    def load(self, dataset: ExperimentalDataset) -> np.ndarray:
+        """读取数据集的数组（内存映射，最近使用的保留在缓存中）"""
+        file_name = dataset.meta['file']
+        with self._lock:
+            if file_name in self._cache:
+                self._cache.move_to_end(file_name)
+                return self._cache[file_name]
+        try:
+            data = np.load(self.data_dir / file_name, mmap_mode='r')
+        except OSError as e:
+            raise ExperimentalDataError(f"实验数据文件缺失: {file_name}: {e}")
+        with self._lock:
+            self._cache[file_name] = data
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return data
+
+    def remove(self, dataset: ExperimentalDataset):
+        """删除数据集及其数据文件"""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM datasets WHERE id = ?", (dataset.id,))
+            self._cache.pop(dataset.meta['file'], None)
+        (self.data_dir / dataset.meta['file']).unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM datasets").fetchone()[0]
+
+    def close(self):
+        """关闭索引数据库"""
+        with self._lock:
+            self._cache.clear()
+            self._connection.close()
+
+
+# 全局实验数据库
+_experimental_database = None
+_experimental_database_lock = threading.Lock()
+
+def get_experimental_database() -> ExperimentalDatabase:
+    """获取全局实验数据库（首次调用时打开）"""
+    global _experimental_database
+    with _experimental_database_lock:
+        if _experimental_database is None:
+            _experimental_database = ExperimentalDatabase()
+    return _experimental_database
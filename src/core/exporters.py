@@ -0,0 +1,455 @@
+"""
+数据导出模块
+把计算结果按块流式写出为CSV、Parquet、HDF5和ENDF-6格式的MF3截面表，
+每次只处理一块数据，内存占用与结果大小无关
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+from core.yandf import parse_yandf_header
+from core.mass_table import get_mass_table
+
+# 中子质量 (amu)，ENDF的AWR以中子质量为单位
+NEUTRON_MASS_AMU = 1.00866491595
+
+# 每块的行数
+CHUNK_ROWS = 65536
+
+# 进度回调：(已写出行数, 总行数)
+ProgressCallback = Callable[[int, int], None]
+
+
+class ExportTable:
+    """待导出的一张二维表，数据按块读取"""
+
+    def __init__(self, name: str, columns: Sequence[str], n_rows: int,
+                 chunks: Callable[[], Iterator[np.ndarray]],
+                 units: Optional[Sequence[str]] = None,
+                 header: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            name: 表名（用作文件名或数据集名）
+            columns: 列名
+            n_rows: 总行数
+            chunks: 每次调用返回一个新的数据块迭代器，每块形状为 (行数, 列数)
+            units: 列单位
+            header: YANDF头部（ENDF格式需要其中的 ENDF_MF/ENDF_MT 和靶核信息）
+        """
+        self.name = name
+        self.columns = list(columns)
+        self.n_rows = n_rows
+        self._chunks = chunks
+        self.units = list(units) if units else [''] * len(self.columns)
+        self.header = header or {}
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        return self._chunks()
+
+    @property
+    def endf_id(self) -> Optional[tuple]:
+        """(MF, MT)，头部中没有时为None"""
+        reaction = self.header.get('reaction', {})
+        mf, mt = reaction.get('ENDF_MF'), reaction.get('ENDF_MT')
+        return (int(mf), int(mt)) if isinstance(mf, int) and isinstance(mt, int) else None
+
+    @classmethod
+    def from_arrays(cls, name: str, columns: Dict[str, Sequence[float]],
+                    units: Optional[Sequence[str]] = None,
+                    header: Optional[Dict[str, Any]] = None) -> 'ExportTable':
+        """由内存中的各列数据创建表，按块切片输出"""
+        arrays = [np.asarray(values, dtype=float) for values in columns.values()]
+        n_rows = min((array.size for array in arrays), default=0)
+
+        def chunks():
+            for start in range(0, n_rows, CHUNK_ROWS):
+                yield np.column_stack([array[start:start + CHUNK_ROWS] for array in arrays])
+
+        return cls(name, list(columns), n_rows, chunks, units, header)
+
+    @classmethod
+    def from_yandf(cls, path: Union[str, Path]) -> 'ExportTable':
+        """由YANDF文件创建表，数据区按块从文件读取"""
+        path = Path(path)
+        header_lines = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip() and not line.startswith('#'):
+                    break
+                header_lines.append(line)
+        header, _ = parse_yandf_header(header_lines)
+        datablock = header.get('datablock', {})
+        names = datablock.get('column_names') or []
+        n_columns = int(datablock.get('columns') or len(names) or 2)
+        names = (list(names) + [f"col{i}" for i in range(len(names), n_columns)])[:n_columns]
+        skip = len(header_lines)
+
+        def chunks():
+            with open(path, 'r', encoding='utf-8') as f:
+                for _ in range(skip):
+                    next(f)
+                while True:
+                    lines = [line for _, line in zip(range(CHUNK_ROWS), f)]
+                    if not lines:
+                        return
+                    values = np.array(''.join(lines).split(), dtype=float)
+                    rows = values.size // n_columns
+                    if rows:
+                        yield values[:rows * n_columns].reshape(rows, n_columns)
+
+        return cls(path.name, names, int(datablock.get('entries') or 0), chunks,
+                   datablock.get('column_units'), header)
+
+
+# 结果字典中的一维曲线：分组 -> (纵坐标键, 列名, 单位)
+RESULT_SECTIONS = {
+    'reaction_channels': ('cross_section', ['E', 'xs'], ['MeV', 'mb']),
+    'residual_production': ('cross_section', ['E', 'xs'], ['MeV', 'mb']),
+    'exclusive_channels': ('cross_section', ['E', 'xs'], ['MeV', 'mb']),
+    'spectra': ('intensity', ['E', 'intensity'], ['MeV', '']),
+    'gamma_production': ('intensity', ['E', 'intensity'], ['MeV', '']),
+}
+
+
+def tables_from_results(results: Dict[str, Any],
+                        sections: Optional[Sequence[str]] = None) -> List[ExportTable]:
+    """
+    列出计算结果字典中可导出的表
+
+    Args:
+        results: TalysInterface.run_calculation 返回的结果
+        sections: 只导出这些分组（'total_cross_section' 及 RESULT_SECTIONS 中的键），默认全部
+
+    Returns:
+        List: 总截面、各反应道、残余核产生、能谱和gamma产生数据
+    """
+    sections = ['total_cross_section', *RESULT_SECTIONS] if sections is None else sections
+    tables = []
+    total = results.get('total_cross_section')
+    if 'total_cross_section' in sections and total and len(total['energy']):
+        tables.append(ExportTable.from_arrays(
+            'total.tot', {'E': total['energy'], 'xs': total['cross_section']},
+            ['MeV', 'mb'], total.get('header')))
+
+    for section, (value_key, columns, units) in RESULT_SECTIONS.items():
+        if section not in sections:
+            continue
+        for name, data in sorted(results.get(section, {}).items()):
+            if len(data.get('energy', [])):
+                tables.append(ExportTable.from_arrays(
+                    name, dict(zip(columns, (data['energy'], data[value_key]))), units, data.get('header')))
+    return tables
+
+
+def tables_from_directory(directory: Union[str, Path]) -> List[ExportTable]:
+    """列出计算目录中全部YANDF文件（只读取头部）"""
+    tables = []
+    for path in sorted(Path(directory).iterdir()):
+        if path.is_file():
+            with open(path, 'rb') as f:
+                if f.read(9) != b'# header:':
+                    continue
+            tables.append(ExportTable.from_yandf(path))
+    return tables
+
+
+def safe_file_name(name: str) -> str:
+    """把表名转换为可用作文件名的文本"""
+    return re.sub(r'[^\w.+-]', '_', name)
+
+
+class ExportError(Exception):
+    """导出错误"""
+    pass
+
+
+class ExportCancelled(ExportError):
+    """导出被取消"""
+    pass
+
+
+class Exporter(LoggerMixin):
+    """导出器基类"""
+
+    name = ''
+    extension = ''
+    # True: 每张表一个文件，目标为目录；False: 所有表写入同一个文件
+    per_table_files = True
+
+    def __init__(self):
+        self._rows_done = 0
+        self._rows_total = 0
+        self._progress: Optional[ProgressCallback] = None
+        self._should_cancel: Optional[Callable[[], bool]] = None
+
+    def export(self, tables: Sequence[ExportTable], destination: Union[str, Path],
+               progress_callback: Optional[ProgressCallback] = None,
+               should_cancel: Optional[Callable[[], bool]] = None) -> List[Path]:
+        """
+        导出多张表
+
+        Args:
+            tables: 待导出的表
+            destination: 目标目录（per_table_files 为 True 时）或目标文件
+            progress_callback: 每写出一块调用一次
+            should_cancel: 返回True时在下一块之前停止并抛出 ExportCancelled
+
+        Returns:
+            List: 写出的文件
+        """
+        destination = Path(destination)
+        self._rows_done = 0
+        self._rows_total = sum(table.n_rows for table in tables)
+        self._progress = progress_callback
+        self._should_cancel = should_cancel
+
+        if self.per_table_files:
+            destination.mkdir(parents=True, exist_ok=True)
+            written = []
+            for table in tables:
+                path = destination / f"{safe_file_name(table.name)}{self.extension}"
+                self.write_table(table, path)
+                written.append(path)
+        else:
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            self.write_tables(tables, destination)
+            written = [destination]
+
+        self.logger.info(f"{self.name}导出完成: {len(tables)}张表，{self._rows_done}行 -> {destination}")
+        return written
+
+    def _chunks(self, table: ExportTable) -> Iterator[np.ndarray]:
+        """逐块读取表数据，同时报告进度和检查取消"""
+        for chunk in table.chunks():
+            if self._should_cancel and self._should_cancel():
+                raise ExportCancelled("导出已取消")
+            yield chunk
+            self._rows_done += len(chunk)
+            if self._progress:
+                self._progress(self._rows_done, self._rows_total)
+
+    def write_table(self, table: ExportTable, path: Path):
+        """把一张表写入一个文件（per_table_files 为 True 的格式实现）"""
+        raise NotImplementedError
+
+    def write_tables(self, tables: Sequence[ExportTable], path: Path):
+        """把所有表写入同一个文件（per_table_files 为 False 的格式实现）"""
+        raise NotImplementedError
+
+
+class CsvExporter(Exporter):
+    """CSV导出，每张表一个文件"""
+
+    name = 'CSV'
+    extension = '.csv'
+
+    def __init__(self, float_format: str = '%.6e', delimiter: str = ','):
+        """
+        Args:
+            float_format: 数值格式（printf风格，只含一个数值占位符）
+            delimiter: 分隔符
+
+        Raises:
+            ExportError: 数值格式无效
+        """
+        super().__init__()
+        try:
+            float_format % 1.0
+        except (TypeError, ValueError) as e:
+            raise ExportError(f"无效的数值格式 {float_format!r}: {e}")
+        self.float_format = float_format
+        self.delimiter = delimiter
+
+    def write_table(self, table: ExportTable, path: Path):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(self.delimiter.join(
+                f"{column} [{unit}]" if unit else column
+                for column, unit in zip(table.columns, table.units)) + '\n')
+            for chunk in self._chunks(table):
+                np.savetxt(f, chunk, fmt=self.float_format, delimiter=self.delimiter)
+
+
+class ParquetExporter(Exporter):
+    """Parquet导出（需要pyarrow），每张表一个文件，每块写成一个行组"""
+
+    name = 'Parquet'
+    extension = '.parquet'
+
+    def write_table(self, table: ExportTable, path: Path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportError("Parquet导出需要安装 pyarrow")
+
+        metadata = {'units': ','.join(table.units)}
+        if table.endf_id:
+            metadata['ENDF_MF'], metadata['ENDF_MT'] = (str(value) for value in table.endf_id)
+        schema = pa.schema([(column, pa.float64()) for column in table.columns], metadata=metadata)
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in self._chunks(table):
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(chunk[:, i]) for i in range(chunk.shape[1])], schema=schema))
+
+
+class Hdf5Exporter(Exporter):
+    """HDF5导出（需要h5py），所有表写入同一个文件，每张表一个可扩展的分块数据集"""
+
+    name = 'HDF5'
+    extension = '.h5'
+    per_table_files = False
+
+    def __init__(self, compression: Optional[str] = 'gzip'):
+        super().__init__()
+        self.compression = compression
+
+    def write_tables(self, tables: Sequence[ExportTable], path: Path):
+        try:
+            import h5py
+        except ImportError:
+            raise ExportError("HDF5导出需要安装 h5py")
+
+        with h5py.File(path, 'w') as f:
+            for table in tables:
+                n_columns = len(table.columns)
+                dataset = f.create_dataset(
+                    safe_file_name(table.name), shape=(0, n_columns), maxshape=(None, n_columns),
+                    dtype='f8', chunks=(min(max(table.n_rows, 1), CHUNK_ROWS), n_columns),
+                    compression=self.compression)
+                dataset.attrs['columns'] = table.columns
+                dataset.attrs['units'] = table.units
+                if table.endf_id:
+                    dataset.attrs['ENDF_MF'], dataset.attrs['ENDF_MT'] = table.endf_id
+                for chunk in self._chunks(table):
+                    start = dataset.shape[0]
+                    dataset.resize(start + len(chunk), axis=0)
+                    dataset[start:] = chunk
+
+
+def endf_float(value: float) -> str:
+    """
+    ENDF-6的11字符浮点数格式，如 ' 1.234567+6'、'-2.50000-10'
+    """
+    if value == 0.0:
+        return ' 0.000000+0'
+    mantissa, exponent = f"{value:.6e}".split('e')
+    exponent = int(exponent)
+    if abs(exponent) >= 10:
+        mantissa, exponent = f"{value:.5e}".split('e')
+        exponent = int(exponent)
+    sign = '-' if exponent < 0 else '+'
+    return f"{mantissa}{sign}{abs(exponent)}".rjust(11)
+
+
+def endf_int(value: int) -> str:
+    return f"{int(value):11d}"
+
+
+class EndfMf3Exporter(Exporter):
+    """
+    ENDF-6格式的MF3截面表导出
+
+    头部带 ENDF_MF=3 的截面表按 MT 排序写成TAB1记录（线性-线性插值），
+    能量由MeV换算为eV，截面由mb换算为b，所有表写入同一个文件。
+    """
+
+    name = 'ENDF MF3'
+    extension = '.endf'
+    per_table_files = False
+
+    def __init__(self, mat: int = 9999):
+        """
+        Args:
+            mat: ENDF材料号（TALYS输出中没有，由调用方指定）
+        """
+        super().__init__()
+        self.mat = mat
+
+    def _line(self, f, content: str, mf: int, mt: int):
+        self._sequence = self._sequence % 99999 + 1
+        f.write(f"{content:<66}{self.mat:4d}{mf:2d}{mt:3d}{self._sequence:5d}\n")
+
+    def write_tables(self, tables: Sequence[ExportTable], path: Path):
+        sections = {}
+        for table in tables:
+            if table.endf_id is None or table.endf_id[0] != 3:
+                continue
+            mt = table.endf_id[1]
+            if mt in sections:
+                self.logger.warning(f"MT={mt} 重复，忽略 {table.name}")
+                continue
+            sections[mt] = table
+        if not sections:
+            raise ExportError("没有带 ENDF_MF=3 / ENDF_MT 头部信息的截面数据")
+        self._rows_total = sum(table.n_rows for table in sections.values())
+
+        self._sequence = 0
+        empty = endf_float(0.0) * 2 + endf_int(0) * 4
+        with open(path, 'w', encoding='ascii') as f:
+            f.write(f"{'TALYS Visualizer MF3 export':<66}{1:4d}{0:2d}{0:3d}{0:5d}\n")
+            for mt in sorted(sections):
+                self._write_section(f, mt, sections[mt])
+                f.write(f"{empty}{self.mat:4d}{3:2d}{0:3d}{99999:5d}\n")   # SEND
+            f.write(f"{empty}{self.mat:4d}{0:2d}{0:3d}{0:5d}\n")          # FEND
+            f.write(f"{empty}{0:4d}{0:2d}{0:3d}{0:5d}\n")                  # MEND
+            f.write(f"{empty}{-1:4d}{0:2d}{0:3d}{0:5d}\n")                 # TEND
+
+    def _awr(self, z: int, a: int) -> float:
+        """靶核质量与中子质量之比，质量表中没有时用质量数近似"""
+        try:
+            mass = float(get_mass_table().atomic_mass(z, a))
+        except (OSError, ValueError):
+            mass = float('nan')
+        return mass / NEUTRON_MASS_AMU if np.isfinite(mass) else float(a)
+
+    def _write_section(self, f, mt: int, table: ExportTable):
+        """写出一个MT的HEAD和TAB1记录"""
+        target = table.header.get('target', {})
+        reaction = table.header.get('reaction', {})
+        z, a = int(target.get('Z', 0)), int(target.get('A', 0))
+        q_value = float(reaction.get('Q-value [MeV]') or 0.0) * 1e6
+
+        self._sequence = 0
+        self._line(f, endf_float(z * 1000 + a) + endf_float(self._awr(z, a)) + endf_int(0) * 4, 3, mt)
+        self._line(f, endf_float(q_value) * 2 + endf_int(0) * 2 + endf_int(1) + endf_int(table.n_rows), 3, mt)
+        self._line(f, endf_int(table.n_rows) + endf_int(2), 3, mt)
+
+        pending = ''
+        written = 0
+        for chunk in self._chunks(table):
+            chunk = chunk[:table.n_rows - written]
+            written += len(chunk)
+            for energy, value in zip(chunk[:, 0] * 1e6, chunk[:, 1] * 1e-3):
+                pending += endf_float(energy) + endf_float(value)
+                if len(pending) == 66:
+                    self._line(f, pending, 3, mt)
+                    pending = ''
+        if pending:
+            self._line(f, pending, 3, mt)
+
+
+EXPORTERS = {
+    'csv': CsvExporter,
+    'parquet': ParquetExporter,
+    'hdf5': Hdf5Exporter,
+    'endf': EndfMf3Exporter,
+}
+
+
+def create_exporter(format_name: str, **options) -> Exporter:
+    """
+    按格式名创建导出器
+
+    Args:
+        format_name: 'csv'、'parquet'、'hdf5' 或 'endf'
+        options: 传给导出器构造函数的选项
+    """
+    if format_name not in EXPORTERS:
+        raise ExportError(f"不支持的导出格式: {format_name}")
+    return EXPORTERS[format_name](**options)
@@ -0,0 +1,217 @@
+"""
+裂变位垒(WKB)文件解析模块
+一次读取计算目录中全部 wkbZZAAA 文件，生成按 (Z, A, 极值点) 排列的位垒参数结构化数组
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+
+EXTREMUM_DTYPE = np.dtype([
+    ('Z', np.int16),
+    ('A', np.int16),
+    ('extremum', np.int16),
+    ('deformation', np.float64),
+    ('deformation_fit', np.float64),
+    ('deformation_err', np.float64),
+    ('height', np.float64),
+    ('height_fit', np.float64),
+    ('height_err', np.float64),
+    ('width', np.float64),
+    ('width_err', np.float64),
+])
+
+TRANSMISSION_DTYPE = np.dtype([
+    ('Z', np.int16),
+    ('A', np.int16),
+    ('step', np.int16),
+    ('energy', np.float64),
+    ('barrier', np.int16),
+    ('transmission', np.float64),
+])
+
+_NUMBER = r'([-+]?[0-9.]+(?:[EeDd][-+]?\d+)?)'
+_NUCLEUS = re.compile(r'Z=\s*(\d+)\s+A=\s*(\d+)')
+_DEFORMATION = re.compile(rf'Def:\s*{_NUMBER}\s*\(\s*{_NUMBER}\s*\+/-\s*{_NUMBER}\s*\)')
+_HEIGHT = re.compile(rf'Heigth\s*:\s*{_NUMBER}\s*\(\s*{_NUMBER}\s*\+/-\s*{_NUMBER}\s*\)')
+_WIDTH = re.compile(rf'Width\s*:\s*{_NUMBER}\s*\+/-\s*{_NUMBER}')
+_TRANSMISSION = re.compile(rf'^i=\s*(\d+)\s+E=\s*{_NUMBER}\s+j=\s*(\d+)\s+T=\s*{_NUMBER}', re.MULTILINE)
+
+
+def _float(text: str) -> float:
+    """解析可能带Fortran D指数的数字"""
+    return float(text.replace('D', 'E').replace('d', 'e'))
+
+
+def parse_wkb_text(text: str, file_name: str = "") -> Tuple[List[tuple], List[tuple]]:
+    """
+    解析单个wkb文件的文本
+
+    Args:
+        text: 文件内容
+        file_name: 文件名，头部缺少 Z/A 时从 wkbZZZAAA 文件名推断
+
+    Returns:
+        tuple: (极值点记录列表, 透射系数记录列表)，元素顺序与对应dtype一致
+    """
+    match = _NUCLEUS.search(text)
+    if match:
+        z, a = int(match.group(1)), int(match.group(2))
+    else:
+        digits = re.search(r'(\d{3})(\d{3})$', file_name)
+        if not digits:
+            raise ValueError(f"无法确定wkb文件对应的核素: {file_name}")
+        z, a = int(digits.group(1)), int(digits.group(2))
+
+    extrema = []
+    for number, (deformation, height, width) in enumerate(zip(
+            _DEFORMATION.finditer(text), _HEIGHT.finditer(text), _WIDTH.finditer(text)), start=1):
+        extrema.append((
+            z, a, number,
+            *(_float(value) for value in deformation.groups()),
+            *(_float(value) for value in height.groups()),
+            *(_float(value) for value in width.groups()),
+        ))
+
+    transmissions = [
+        (z, a, int(step), _float(energy), int(barrier), _float(value))
+        for step, energy, barrier, value in _TRANSMISSION.findall(text)
+    ]
+    return extrema, transmissions
+
+
+class FissionBarrierDataset(LoggerMixin):
+    """裂变位垒数据集"""
+
+    FILE_PATTERN = "wkb[0-9]*"
+
+    def __init__(self, extrema: np.ndarray, transmissions: np.ndarray):
+        """
+        初始化数据集
+
+        Args:
+            extrema: EXTREMUM_DTYPE 数组，按 (Z, A, extremum) 排序。
+                extremum 是沿形变路径的极值点序号（位垒与势阱交替出现）
+            transmissions: TRANSMISSION_DTYPE 数组，按 (Z, A, barrier, step) 排序
+        """
+        self.extrema = extrema
+        self.transmissions = transmissions
+        self._keys = extrema['Z'].astype(np.int64) * 1000 + extrema['A']
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """数据集的结构化数组，用于保存项目和转存结果"""
+        return {'extrema': self.extrema, 'transmissions': self.transmissions}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> 'FissionBarrierDataset':
+        """由 to_arrays() 的结果重建数据集（数组不复制）"""
+        return cls(arrays['extrema'], arrays['transmissions'])
+
+    @classmethod
+    def from_files(cls, files: Sequence[Union[str, Path]]) -> 'FissionBarrierDataset':
+        """
+        解析一组wkb文件，每个文件只读取一次
+
+        Args:
+            files: wkb文件路径列表
+
+        Returns:
+            FissionBarrierDataset: 数据集
+        """
+        extrema: List[tuple] = []
+        transmissions: List[tuple] = []
+        for path in files:
+            path = Path(path)
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                file_extrema, file_transmissions = parse_wkb_text(f.read(), path.name)
+            extrema.extend(file_extrema)
+            transmissions.extend(file_transmissions)
+
+        extrema_array = np.array(extrema, dtype=EXTREMUM_DTYPE)
+        extrema_array.sort(order=['Z', 'A', 'extremum'])
+        transmission_array = np.array(transmissions, dtype=TRANSMISSION_DTYPE)
+        transmission_array.sort(order=['Z', 'A', 'barrier', 'step'])
+
+        dataset = cls(extrema_array, transmission_array)
+        dataset.logger.debug(f"解析{len(files)}个wkb文件完成，共{len(extrema_array)}个极值点")
+        return dataset
+
+    @classmethod
+    def from_directory(cls, directory: Union[str, Path]) -> Optional['FissionBarrierDataset']:
+        """
+        读取目录（计算目录或归档目录）中的全部wkb文件
+
+        Returns:
+            FissionBarrierDataset: 数据集，目录中没有wkb文件时返回None
+        """
+        files = sorted(Path(directory).glob(cls.FILE_PATTERN))
+        if not files:
+            return None
+        return cls.from_files(files)
+
+    @property
+    def nuclei(self) -> np.ndarray:
+        """数据集中的全部核素，形状 (n, 2)，每行为 (Z, A)"""
+        keys = np.unique(self._keys)
+        return np.column_stack((keys // 1000, keys % 1000))
+
+    def for_nucleus(self, z: int, a: int) -> np.ndarray:
+        """获取某个核素的全部极值点"""
+        key = z * 1000 + a
+        start, stop = np.searchsorted(self._keys, [key, key + 1])
+        return self.extrema[start:stop]
+
+    def get(self, z: int, a: int, extremum: int) -> Optional[np.void]:
+        """
+        按 (Z, A, 极值点序号) 获取位垒参数
+
+        Returns:
+            np.void: EXTREMUM_DTYPE 记录，不存在时返回None
+        """
+        rows = self.for_nucleus(z, a)
+        rows = rows[rows['extremum'] == extremum]
+        return rows[0] if rows.size else None
+
+    def parameter_table(self, field: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        把某个参数整理为 [核素, 极值点] 的二维数组，便于沿裂变链比较和绘图
+
+        Args:
+            field: EXTREMUM_DTYPE 中的字段名，如 'height'
+
+        Returns:
+            tuple: (核素数组 (n, 2), 参数数组 (n, 最大极值点数)，缺失处为NaN)
+        """
+        keys, row = np.unique(self._keys, return_inverse=True)
+        table = np.full((keys.size, int(self.extrema['extremum'].max(initial=0))), np.nan)
+        table[row, self.extrema['extremum'] - 1] = self.extrema[field]
+        return np.column_stack((keys // 1000, keys % 1000)), table
+
+    def transmission_curves(self, z: int, a: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取某个核素各位垒的WKB透射系数随激发能的变化
+
+        Returns:
+            tuple: (激发能数组 (n_energy,), 透射系数数组 (n_energy, n_barrier))
+        """
+        rows = self.transmissions[(self.transmissions['Z'] == z) & (self.transmissions['A'] == a)]
+        if rows.size == 0:
+            return np.empty(0), np.empty((0, 0))
+
+        steps = rows['step'] - 1
+        barriers = rows['barrier'] - 1
+        values = np.full((steps.max() + 1, barriers.max() + 1), np.nan)
+        values[steps, barriers] = rows['transmission']
+
+        energies = np.full(steps.max() + 1, np.nan)
+        energies[steps] = rows['energy']
+        return energies, values
+
+    def __len__(self) -> int:
+        return len(self.extrema)
@@ -0,0 +1,248 @@
+"""
+瞬发裂变中子谱(PFNS)模块
+将一次计算产生的全部 pfnsXXXX.XXX.fis 文件堆叠为 [入射能量, 出射能量, 列] 的三维数组
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin, get_logger
+from core.yandf import read_yandf_header
+
+
+class PromptFissionSpectra(LoggerMixin):
+    """瞬发裂变中子谱数据集"""
+
+    FILE_PATTERN = "pfns*.fis"
+
+    def __init__(self, e_incident: np.ndarray, e_average: np.ndarray, data: np.ndarray,
+                 column_names: Optional[List[str]] = None,
+                 column_units: Optional[List[str]] = None,
+                 nuclide: str = ""):
+        """
+        初始化数据集
+
+        Args:
+            e_incident: 入射能量 (MeV)，升序，形状 (n_incident,)
+            e_average: 各入射能量下的平均出射能量 (MeV)
+            data: 谱数据，形状 (n_incident, n_out, n_columns)，第0列为出射能量
+            column_names: 列名
+            column_units: 列单位
+            nuclide: 靶核名称
+        """
+        self.e_incident = e_incident
+        self.e_average = e_average
+        self.data = data
+        self.column_names = column_names or []
+        self.column_units = column_units or []
+        self.nuclide = nuclide
+
+    def to_arrays(self) -> Dict[str, Any]:
+        """数据集的数组和标量，用于保存项目和转存结果"""
+        return {'e_incident': self.e_incident, 'e_average': self.e_average, 'data': self.data,
+                'column_names': list(self.column_names), 'column_units': list(self.column_units),
+                'nuclide': self.nuclide}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, Any]) -> 'PromptFissionSpectra':
+        """由 to_arrays() 的结果重建数据集（数组不复制）"""
+        return cls(arrays['e_incident'], arrays['e_average'], arrays['data'],
+                   list(arrays.get('column_names') or []), list(arrays.get('column_units') or []),
+                   arrays.get('nuclide', ''))
+
+    @classmethod
+    def from_files(cls, files: Sequence[Union[str, Path]]) -> 'PromptFissionSpectra':
+        """
+        从PFNS文件列表构建数据集
+
+        先只读取各文件头部确定形状，再一次性分配结果数组并逐个文件填充。
+        计算被中断时最后一个文件可能只写出了一部分：头部不完整的文件跳过，
+        数据不完整的文件只填充已写出的行，其余保持NaN。
+
+        Args:
+            files: pfns*.fis 文件路径列表
+
+        Returns:
+            PromptFissionSpectra: 数据集
+        """
+        logger = get_logger(cls.__name__)
+        paths, headers = [], []
+        for path in files:
+            try:
+                header = read_yandf_header(path)
+                # 头部缺少这些字段说明文件在头部中间被截断
+                float(header['reaction']['E-incident [MeV]'])
+                int(header['datablock']['entries']), int(header['datablock']['columns'])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"跳过头部不完整的PFNS文件 {path}: {e}")
+                continue
+            paths.append(path)
+            headers.append(header)
+        if not paths:
+            raise ValueError("没有可用的PFNS文件")
+
+        e_incident = np.array([h['reaction']['E-incident [MeV]'] for h in headers], dtype=float)
+        e_average = np.array([h['reaction'].get('E-average [MeV]', np.nan) for h in headers], dtype=float)
+        entries = [int(h['datablock']['entries']) for h in headers]
+        columns = int(headers[0]['datablock']['columns'])
+
+        order = np.argsort(e_incident, kind='stable')
+        data = np.full((len(paths), max(entries), columns), np.nan)
+
+        for row, index in enumerate(order):
+            values = cls._read_rows(paths[index], columns)
+            n = min(len(values), entries[index])
+            data[row, :n, :] = values[:n]
+            if n < entries[index]:
+                logger.warning(f"PFNS文件不完整，只读到 {n}/{entries[index]} 行: {paths[index]}")
+
+        datablock = headers[0]['datablock']
+        dataset = cls(
+            e_incident[order],
+            e_average[order],
+            data,
+            datablock.get('column_names'),
+            datablock.get('column_units'),
+            headers[0].get('target', {}).get('nuclide', ''),
+        )
+        dataset.logger.debug(f"解析{len(paths)}个PFNS文件完成，数组形状: {data.shape}")
+        return dataset
+
+    @staticmethod
+    def _read_rows(path: Union[str, Path], columns: int) -> np.ndarray:
+        """
+        读取一个PFNS文件的数据行，在第一行不完整的数据处停止
+
+        Returns:
+            np.ndarray: 形状 (已读行数, columns)
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [line for line in f if line.strip() and not line.startswith('#')]
+        rows = []
+        for number, line in enumerate(lines):
+            fields = line.split()
+            # TALYS每行都以换行结束，没有换行符的最后一行可能在数字中间被截断
+            if len(fields) != columns or (number == len(lines) - 1 and not line.endswith('\n')):
+                break
+            try:
+                rows.append([float(field) for field in fields])
+            except ValueError:
+                break
+        return np.array(rows, dtype=float).reshape(-1, columns)
+
+    @classmethod
+    def from_directory(cls, directory: Union[str, Path]) -> Optional['PromptFissionSpectra']:
+        """
+        读取目录中的全部PFNS文件
+
+        Args:
+            directory: 计算工作目录或归档目录
+
+        Returns:
+            PromptFissionSpectra: 数据集，目录中没有PFNS文件时返回None
+        """
+        files = sorted(Path(directory).glob(cls.FILE_PATTERN))
+        if not files:
+            return None
+        return cls.from_files(files)
+
+    def _matches(self, energies: Sequence[float]) -> np.ndarray:
+        """各入射能量是否在给定能量中（容差与TALYS输出的5位小数一致）"""
+        energies = np.asarray(energies, dtype=float)
+        return np.isclose(self.e_incident[:, np.newaxis], energies[np.newaxis, :],
+                          rtol=1e-5, atol=1e-6).any(axis=1)
+
+    def _subset(self, rows: np.ndarray) -> 'PromptFissionSpectra':
+        return PromptFissionSpectra(self.e_incident[rows], self.e_average[rows], self.data[rows],
+                                    self.column_names, self.column_units, self.nuclide)
+
+    def select(self, energies: Sequence[float]) -> Optional['PromptFissionSpectra']:
+        """
+        只保留给定入射能量的谱
+
+        Returns:
+            PromptFissionSpectra: 数据集，没有任何能量时返回None
+        """
+        rows = np.flatnonzero(self._matches(energies))
+        return self._subset(rows) if rows.size else None
+
+    def merge(self, other: 'PromptFissionSpectra') -> 'PromptFissionSpectra':
+        """
+        与另一次计算（如续算）的谱合并，入射能量相同时取 other 的谱
+
+        出射能量点数不同时按较多者补NaN。
+
+        Returns:
+            PromptFissionSpectra: 按入射能量排序的新数据集
+        """
+        keep = ~self._matches(other.e_incident)
+        n_out = max(self.data.shape[1], other.data.shape[1])
+        columns = max(self.data.shape[2], other.data.shape[2])
+        data = np.full((int(keep.sum()) + len(other), n_out, columns), np.nan)
+        data[:keep.sum(), :self.data.shape[1], :self.data.shape[2]] = self.data[keep]
+        data[keep.sum():, :other.data.shape[1], :other.data.shape[2]] = other.data
+
+        e_incident = np.concatenate([self.e_incident[keep], other.e_incident])
+        order = np.argsort(e_incident, kind='stable')
+        return PromptFissionSpectra(e_incident[order],
+                                    np.concatenate([self.e_average[keep], other.e_average])[order],
+                                    data[order], other.column_names or self.column_names,
+                                    other.column_units or self.column_units, other.nuclide or self.nuclide)
+
+    @property
+    def e_out(self) -> np.ndarray:
+        """出射能量网格（取第一个入射能量的网格）"""
+        return self.data[0, :, 0]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        获取某一列在所有入射能量下的数据
+
+        Args:
+            name: 列名，如 'spectrum'
+
+        Returns:
+            np.ndarray: 形状 (n_incident, n_out)
+        """
+        return self.data[:, :, self.column_names.index(name)]
+
+    def interpolate(self, energies: Union[float, Sequence[float], np.ndarray]) -> np.ndarray:
+        """
+        在入射能量方向上线性插值整套谱数据
+
+        超出入射能量范围的点取边界值（与 np.interp 一致）。
+
+        Args:
+            energies: 目标入射能量 (MeV)
+
+        Returns:
+            np.ndarray: 形状 (len(energies), n_out, n_columns)
+        """
+        energies = np.atleast_1d(np.asarray(energies, dtype=float))
+        e = self.e_incident
+        if e.size == 1:
+            return np.repeat(self.data, energies.size, axis=0)
+
+        lower = np.clip(np.searchsorted(e, energies, side='right') - 1, 0, e.size - 2)
+        weight = np.clip((energies - e[lower]) / (e[lower + 1] - e[lower]), 0.0, 1.0)
+        weight = weight[:, np.newaxis, np.newaxis]
+        return self.data[lower] * (1.0 - weight) + self.data[lower + 1] * weight
+
+    def interpolate_average_energy(self, energies: Union[float, Sequence[float], np.ndarray]) -> np.ndarray:
+        """
+        插值平均出射能量
+
+        Args:
+            energies: 目标入射能量 (MeV)
+
+        Returns:
+            np.ndarray: 平均出射能量 (MeV)
+        """
+        return np.interp(np.atleast_1d(energies), self.e_incident, self.e_average)
+
+    def __len__(self) -> int:
+        return self.e_incident.size
@@ -0,0 +1,277 @@
+"""
+TALYS输入卡片构建模块
+统一生成TALYS输入文件：规范的关键字顺序和数值格式、批量生成、解析已有输入文件，
+规范化后的文本同时作为计算结果缓存的键
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import get_logger
+
+# 必需关键字，按此顺序写在输入文件开头
+REQUIRED_KEYWORDS = ['projectile', 'element', 'mass', 'energy']
+
+# 取值为符号的关键字，解析时保留原文（入射粒子 n 不是布尔值）
+TEXT_KEYWORDS = {'projectile', 'element'}
+
+# 只用于描述能量范围的程序内部参数，不直接写入输入文件
+ENERGY_PARAMETERS = ['energy_mode', 'energy_min', 'energy_max', 'energy_step']
+
+DECK_HEADER = "# TALYS input file generated by TALYS Visualizer"
+
+INPUT_FILE_NAME = "talys.inp"
+
+logger = get_logger(__name__)
+
+
+def format_value(value: Any) -> str:
+    """
+    把参数值格式化为输入文件中的文本
+
+    布尔值写为 y/n，整数值的浮点数写为整数（避免 ldmodel 1.0 这类写法），
+    其余浮点数使用最短的精确表示，列表和元组以空格连接。
+
+    Args:
+        value: 参数值
+
+    Returns:
+        str: 文本
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return 'y' if value else 'n'
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, (list, tuple)):
+        return ' '.join(format_value(item) for item in value)
+    return str(value).strip()
+
+
+def parse_value(text: str) -> Any:
+    """
+    把输入文件中的参数文本转换为Python值（format_value 的逆过程）
+
+    Args:
+        text: 关键字之后的文本
+
+    Returns:
+        y/n 为布尔值，单个数字为int/float，多个数字为元组，其余保留字符串
+    """
+    tokens = text.split()
+    if len(tokens) == 1:
+        token = tokens[0]
+        if token.lower() in ('y', 'n'):
+            return token.lower() == 'y'
+        for convert in (int, float):
+            try:
+                return convert(token)
+            except ValueError:
+                pass
+        return token
+    try:
+        return tuple(int(token) if token.lstrip('+-').isdigit() else float(token) for token in tokens)
+    except ValueError:
+        return text
+
+
+def energy_value(parameters: Dict[str, Any]) -> Any:
+    """取得 energy 关键字的值：单一能量，或 energy_mode='range' 时的 (最小, 最大, 步长)"""
+    if parameters.get('energy_mode') == 'range':
+        return (parameters['energy_min'], parameters['energy_max'], parameters['energy_step'])
+    if 'energy' in parameters:
+        return parameters['energy']
+    raise ValueError("缺少能量参数")
+
+
+class InputDeck:
+    """TALYS输入卡片（关键字及其参数文本的有序列表）"""
+
+    def __init__(self, entries: Optional[Iterable[Tuple[str, str]]] = None):
+        """
+        Args:
+            entries: (关键字, 参数文本) 序列，关键字不区分大小写；同一关键字可以出现多次
+                （如 rvadjust n 1.05 和 rvadjust p 0.98）
+        """
+        self.entries: List[Tuple[str, str]] = [(keyword.lower(), text) for keyword, text in (entries or [])]
+
+    @classmethod
+    def from_parameters(cls, parameters: Dict[str, Any]) -> 'InputDeck':
+        """
+        由程序参数字典构建输入卡片
+
+        Args:
+            parameters: 参数字典，能量可以是 energy 或 energy_mode='range' 加
+                energy_min/energy_max/energy_step
+
+        Returns:
+            InputDeck: 输入卡片
+        """
+        for keyword in ('projectile', 'element', 'mass'):
+            if keyword not in parameters:
+                raise ValueError(f"缺少必需参数: {keyword}")
+
+        entries = [(keyword, format_value(parameters[keyword])) for keyword in REQUIRED_KEYWORDS[:3]]
+        entries.append(('energy', format_value(energy_value(parameters))))
+        for key, value in parameters.items():
+            if key in REQUIRED_KEYWORDS or key in ENERGY_PARAMETERS or value is None:
+                continue
+            if isinstance(value, list) and value and isinstance(value[0], (list, tuple)):
+                # 同一关键字的多行设置
+                entries.extend((key, format_value(item)) for item in value)
+            else:
+                entries.append((key, format_value(value)))
+        return cls(entries)
+
+    @classmethod
+    def parse(cls, text: str) -> 'InputDeck':
+        """
+        解析输入文件文本，忽略注释（# 之后的内容）和空行
+
+        Args:
+            text: 输入文件内容
+
+        Returns:
+            InputDeck: 输入卡片
+        """
+        entries = []
+        for line in text.splitlines():
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split(None, 1)
+            entries.append((parts[0], ' '.join(parts[1].split()) if len(parts) > 1 else ''))
+        return cls(entries)
+
+    @classmethod
+    def read(cls, path: Union[str, Path]) -> 'InputDeck':
+        """读取并解析输入文件"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.parse(f.read())
+
+    def update(self, other: 'InputDeck'):
+        """用另一个卡片中的关键字覆盖本卡片中的同名关键字，新关键字追加到末尾"""
+        replaced = {keyword for keyword, _ in other.entries}
+        self.entries = [entry for entry in self.entries if entry[0] not in replaced] + list(other.entries)
+
+    def canonical_entries(self) -> List[Tuple[str, str]]:
+        """
+        规范顺序：必需关键字在前，其余按关键字字母顺序；同一关键字的多行保持原有相对顺序
+        """
+        required = {keyword: rank for rank, keyword in enumerate(REQUIRED_KEYWORDS)}
+        return sorted(self.entries, key=lambda entry: (required.get(entry[0], len(required)),
+                                                       '' if entry[0] in required else entry[0]))
+
+    def body(self) -> str:
+        """规范化的关键字部分（不含注释）"""
+        return ''.join(f"{keyword} {text}\n" if text else f"{keyword}\n"
+                       for keyword, text in self.canonical_entries())
+
+    def to_text(self, header: bool = True) -> str:
+        """
+        生成输入文件文本
+
+        Args:
+            header: 是否写入注释头（注释头不含时间戳，相同参数总是生成相同文本）
+        """
+        return f"{DECK_HEADER}\n\n{self.body()}" if header else self.body()
+
+    def cache_key(self) -> str:
+        """规范化文本的摘要，用作计算结果缓存的键"""
+        return hashlib.sha1(self.body().encode('utf-8')).hexdigest()[:16]
+
+    def to_parameters(self) -> Dict[str, Any]:
+        """
+        转换为程序参数字典
+
+        energy 有三个数值时转换为 energy_mode='range' 形式；重复出现的关键字
+        转换为元组列表。
+        """
+        parameters: Dict[str, Any] = {}
+        repeated: Dict[str, List[Any]] = {}
+        for keyword, text in self.entries:
+            value = text if keyword in TEXT_KEYWORDS else parse_value(text)
+            if keyword in parameters or keyword in repeated:
+                repeated.setdefault(keyword, [parameters.pop(keyword)] if keyword in parameters else [])
+                repeated[keyword].append(value)
+            else:
+                parameters[keyword] = value
+        parameters.update(repeated)
+
+        energy = parameters.get('energy')
+        if isinstance(energy, tuple) and len(energy) == 3:
+            del parameters['energy']
+            parameters.update(energy_mode='range', energy_min=energy[0],
+                              energy_max=energy[1], energy_step=energy[2])
+        return parameters
+
+    def keywords(self) -> List[str]:
+        """卡片中出现的全部关键字（去重，保持顺序）"""
+        return list(dict.fromkeys(keyword for keyword, _ in self.entries))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, InputDeck):
+            return NotImplemented
+        return self.canonical_entries() == other.canonical_entries()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def build_deck(parameters: Dict[str, Any], header: bool = True) -> str:
+    """由参数字典生成输入文件文本"""
+    return InputDeck.from_parameters(parameters).to_text(header)
+
+
+def build_decks(base_parameters: Dict[str, Any],
+                points: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, str]]:
+    """
+    批量生成输入文件文本
+
+    基础参数只格式化一次，每个参数点只格式化其覆盖的关键字。
+
+    Args:
+        base_parameters: 公共参数
+        points: 各参数点覆盖的参数
+
+    Yields:
+        tuple: (缓存键, 输入文件文本)
+    """
+    base = InputDeck.from_parameters(base_parameters)
+    for point in points:
+        overrides = [(key, format_value(value)) for key, value in point.items()
+                     if key not in ENERGY_PARAMETERS and key != 'energy' and value is not None]
+        if 'energy' in point or any(key in point for key in ENERGY_PARAMETERS):
+            overrides.append(('energy', format_value(energy_value({**base_parameters, **point}))))
+        deck = InputDeck(base.entries)
+        deck.update(InputDeck(overrides))
+        yield deck.cache_key(), deck.to_text()
+
+
+def write_decks(base_parameters: Dict[str, Any], points: Iterable[Dict[str, Any]],
+                directories: Iterable[Union[str, Path]]) -> List[str]:
+    """
+    批量把输入文件直接写入各工作目录
+
+    Args:
+        base_parameters: 公共参数
+        points: 各参数点覆盖的参数
+        directories: 各参数点的工作目录（与 points 一一对应）
+
+    Returns:
+        List: 各参数点的缓存键
+    """
+    keys = []
+    for (key, text), directory in zip(build_decks(base_parameters, points), directories):
+        with open(Path(directory) / INPUT_FILE_NAME, 'w', encoding='utf-8') as f:
+            f.write(text)
+        keys.append(key)
+    logger.debug(f"批量写入{len(keys)}个输入文件")
+    return keys
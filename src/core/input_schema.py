@@ -0,0 +1,568 @@
+"""
+TALYS输入关键字表模块
+TALYS全部常用输入关键字的参数签名、取值范围、默认值和说明；
+TALYS_Default_Parameters.md 中提取的默认值和取值范围在首次使用时合并进来。
+输入文件校验、语法高亮（关键字前缀树）和自动补全共用这张表
+"""
+
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 参数签名中的记号（以空格分隔，方括号内为可选参数）：
+#   b  y/n          i  整数          f  实数          s  任意文本（文件名等）
+#   p  粒子符号      P  一个或多个粒子  c  choices 中的取值
+#   e  元素符号或原子序数              Z  原子序数      A  质量数
+#   E  能量：单个能量、"最小 最大 步长" 或能量文件名
+#   B  y/n 或实数（如 widthfluc 可以给出截止能量）
+PARTICLES = ('n', 'p', 'd', 't', 'h', 'a', 'g')
+
+ELEMENT_SYMBOLS = (
+    'H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne', 'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar',
+    'K', 'Ca', 'Sc', 'Ti', 'V', 'Cr', 'Mn', 'Fe', 'Co', 'Ni', 'Cu', 'Zn', 'Ga', 'Ge', 'As', 'Se', 'Br', 'Kr',
+    'Rb', 'Sr', 'Y', 'Zr', 'Nb', 'Mo', 'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd', 'In', 'Sn', 'Sb', 'Te', 'I', 'Xe',
+    'Cs', 'Ba', 'La', 'Ce', 'Pr', 'Nd', 'Pm', 'Sm', 'Eu', 'Gd', 'Tb', 'Dy', 'Ho', 'Er', 'Tm', 'Yb', 'Lu',
+    'Hf', 'Ta', 'W', 'Re', 'Os', 'Ir', 'Pt', 'Au', 'Hg', 'Tl', 'Pb', 'Bi', 'Po', 'At', 'Rn',
+    'Fr', 'Ra', 'Ac', 'Th', 'Pa', 'U', 'Np', 'Pu', 'Am', 'Cm', 'Bk', 'Cf', 'Es', 'Fm', 'Md', 'No', 'Lr',
+    'Rf', 'Db', 'Sg', 'Bh', 'Hs', 'Mt', 'Ds', 'Rg', 'Cn', 'Nh', 'Fl', 'Mc', 'Lv', 'Ts', 'Og',
+)
+
+# 元素符号（小写）-> 原子序数
+ELEMENT_Z = {symbol.lower(): z for z, symbol in enumerate(ELEMENT_SYMBOLS, 1)}
+
+# 质量数的取值范围（0 表示天然同位素丰度组成的靶）
+MASS_RANGE = (0, 400)
+
+# 以 a/b/c/d 调整系数为参数的光学模型调整关键字：<关键字> <粒子> <系数>
+OMP_ADJUST_KEYWORDS = ('rvadjust', 'avadjust', 'rwadjust', 'awadjust', 'rvdadjust', 'avdadjust',
+                       'rwdadjust', 'awdadjust', 'rvsoadjust', 'avsoadjust', 'rwsoadjust', 'awsoadjust',
+                       'rcadjust', 'v1adjust', 'v2adjust', 'v3adjust', 'w1adjust', 'w2adjust',
+                       'd1adjust', 'd2adjust', 'd3adjust', 'vso1adjust', 'vso2adjust', 'wso1adjust', 'wso2adjust')
+
+# 参数不以粒子或核素开头、但允许多行出现的关键字
+REPEATABLE_KEYWORDS = {'filediscrete', 'fileangle', 'fileddxe', 'fileddxa'}
+
+# 关键字表：(名称, 参数签名, 默认值, 取值范围, 分组, 说明)
+# 取值范围作用于签名中第一个 i/f 参数；默认值 None 表示由TALYS按核素自动确定
+KEYWORD_TABLE: List[Tuple[str, str, Any, Optional[Tuple[float, float]], str, str]] = [
+    # 必需参数
+    ('projectile', 'c', None, None, 'required', "入射粒子（0 表示衰变）"),
+    ('element', 'e', None, None, 'required', "靶核元素符号或原子序数"),
+    ('mass', 'i', None, MASS_RANGE, 'required', "靶核质量数（0 表示天然丰度）"),
+    ('energy', 'E', None, (1e-11, 1000.0), 'required', "入射能量 (MeV)、能量范围或能量文件"),
+
+    # 输出选项
+    ('outmain', 'b', True, None, 'output', "主要输出"),
+    ('outbasic', 'b', False, None, 'output', "基础信息输出"),
+    ('outpopulation', 'b', False, None, 'output', "布居输出"),
+    ('outcheck', 'b', False, None, 'output', "数值检查输出"),
+    ('outlevels', 'b', False, None, 'output', "分立能级输出"),
+    ('outdensity', 'b', False, None, 'output', "能级密度输出"),
+    ('outomp', 'b', False, None, 'output', "光学模型参数输出"),
+    ('outdirect', 'b', False, None, 'output', "直接反应输出"),
+    ('outinverse', 'b', False, None, 'output', "逆反应截面输出"),
+    ('outtransenergy', 'b', True, None, 'output', "按能量输出穿透系数"),
+    ('outecis', 'b', False, None, 'output', "ECIS输出"),
+    ('outgamma', 'b', False, None, 'output', "伽马参数输出"),
+    ('outpreequilibrium', 'b', False, None, 'output', "预平衡输出"),
+    ('outexcitation', 'b', True, None, 'output', "激发函数输出"),
+    ('outspectra', 'b', False, None, 'output', "粒子发射能谱"),
+    ('outbinspectra', 'b', False, None, 'output', "按能格输出能谱"),
+    ('outangle', 'b', False, None, 'output', "角分布输出"),
+    ('outlegendre', 'b', False, None, 'output', "勒让德系数输出"),
+    ('outdiscrete', 'b', False, None, 'output', "分立能级截面输出"),
+    ('outfission', 'b', False, None, 'output', "裂变输出"),
+    ('outdwba', 'b', False, None, 'output', "DWBA输出"),
+    ('outgamdis', 'b', False, None, 'output', "分立伽马射线输出"),
+    ('ddxmode', 'i', 0, (0, 3), 'output', "双微分截面输出方式"),
+    ('channels', 'b', False, None, 'output', "独占反应道截面"),
+    ('filechannels', 'b', False, None, 'output', "独占反应道截面写入文件"),
+    ('filetotal', 'b', False, None, 'output', "总截面写入文件"),
+    ('fileelastic', 'b', False, None, 'output', "弹性散射写入文件"),
+    ('fileresidual', 'b', False, None, 'output', "残余核产生截面写入文件"),
+    ('filerecoil', 'b', False, None, 'output', "反冲能谱写入文件"),
+    ('filegamdis', 'b', False, None, 'output', "分立伽马射线写入文件"),
+    ('filedensity', 'b', False, None, 'output', "能级密度写入文件"),
+    ('filepsf', 'b', False, None, 'output', "伽马强度函数写入文件"),
+    ('filefission', 'b', False, None, 'output', "裂变截面写入文件"),
+    ('filespectrum', 'P', None, None, 'output', "各出射粒子的能谱写入文件"),
+    ('filediscrete', 'i', None, (0, 200), 'output', "某一分立能级的激发函数写入文件"),
+    ('fileangle', 'i', None, (0, 200), 'output', "某一分立能级的角分布写入文件"),
+    ('fileddxe', 'p f', None, (0.0, 1000.0), 'output', "某一出射能量的双微分截面写入文件"),
+    ('fileddxa', 'p f', None, (0.0, 180.0), 'output', "某一出射角度的双微分截面写入文件"),
+    ('outfy', 'b', False, None, 'output', "裂变产额输出"),
+    ('outdecay', 'b', False, None, 'output', "衰变数据输出"),
+    ('filesonly', 'b', False, None, 'output', "只输出到单独的文件"),
+    ('labddx', 'b', False, None, 'output', "实验室系双微分截面"),
+    ('ddxecount', 'i', None, (0, 100), 'output', "双微分截面的出射能量个数"),
+    ('ddxacount', 'i', None, (0, 100), 'output', "双微分截面的出射角度个数"),
+    ('fisfeed', 'b', False, None, 'output', "裂变前各核的布居（裂变馈入）输出"),
+
+    # 反应机制
+    ('fission', 'b', None, None, 'model', "裂变道（锕系核默认开启）"),
+    ('widthfluc', 'B', True, None, 'model', "宽度涨落修正（或给出截止能量）"),
+    ('preequilibrium', 'B', True, None, 'model', "预平衡反应（或给出起始能量）"),
+    ('preeqmode', 'i', 2, (1, 4), 'model', "预平衡模型"),
+    ('mpreeqmode', 'i', 1, (1, 2), 'model', "多步预平衡模型"),
+    ('phmodel', 'i', 1, (1, 2), 'model', "粒子-空穴态密度模型"),
+    ('pairmodel', 'i', 1, (1, 2), 'model', "预平衡对修正模型"),
+    ('astro', 'b', False, None, 'model', "天体物理反应率"),
+    ('recoil', 'b', False, None, 'model', "反冲计算"),
+    ('partable', 'b', False, None, 'model', "输出所用的全部模型参数"),
+    ('best', 'b', False, None, 'model', "使用最佳参数集"),
+    ('endf', 'b', False, None, 'model', "生成ENDF评价用的输出"),
+    ('endfdetail', 'b', True, None, 'model', "ENDF详细输出"),
+    ('isomer', 'f', 1.0, (0.0, 1e38), 'model', "同质异能态的最短寿命 (s)"),
+    ('gammax', 'i', 2, (1, 6), 'model', "伽马跃迁的最大多极性"),
+    ('giantresonance', 'b', True, None, 'model', "巨共振贡献"),
+    ('adddiscrete', 'b', True, None, 'model', "分立能级截面加到连续谱"),
+    ('addelastic', 'b', True, None, 'model', "弹性散射加到能谱"),
+    ('fullhf', 'b', False, None, 'model', "完整的Hauser-Feshbach计算"),
+    ('eciscalc', 'b', True, None, 'model', "调用ECIS计算"),
+    ('inccalc', 'b', True, None, 'model', "计算入射道"),
+    ('ecissave', 'b', False, None, 'model', "保存ECIS结果"),
+    ('relativistic', 'b', True, None, 'model', "相对论运动学"),
+    ('massmodel', 'i', 2, (0, 3), 'model', "理论质量模型"),
+    ('expmass', 'b', True, None, 'model', "使用实验质量"),
+    ('segment', 'i', 1, (1, 4), 'model', "截面在能量上的分段方式"),
+    ('compound', 'b', True, None, 'model', "复合核反应"),
+    ('reaction', 'b', True, None, 'model', "核反应计算（n 时只计算结构量）"),
+    ('multipreeq', 'b', None, None, 'model', "多步预平衡发射"),
+    ('preeqspin', 'B', False, None, 'model', "预平衡自旋分布（y/n 或模型1-3）"),
+    ('preeqsurface', 'b', True, None, 'model', "预平衡表面修正"),
+    ('preeqcomplex', 'b', False, None, 'model', "Kalbach复杂粒子预平衡模型"),
+    ('twocomponent', 'b', True, None, 'model', "双组分激子模型"),
+    ('breakupmodel', 'i', 1, (1, 2), 'model', "破裂反应模型"),
+    ('m2constant', 'f', 1.0, (0.0, 100.0), 'model', "预平衡矩阵元常数"),
+    ('m2limit', 'f', 1.0, (0.0, 100.0), 'model', "预平衡矩阵元渐近值"),
+    ('m2shift', 'f', 1.0, (0.0, 100.0), 'model', "预平衡矩阵元能量平移"),
+    ('Rpinu', 'f', 1.0, (0.0, 100.0), 'model', "质子-中子矩阵元比值"),
+    ('Rnupi', 'f', 1.0, (0.0, 100.0), 'model', "中子-质子矩阵元比值"),
+    ('Rpipi', 'f', 1.0, (0.0, 100.0), 'model', "质子-质子矩阵元比值"),
+    ('Rnunu', 'f', 1.5, (0.0, 100.0), 'model', "中子-中子矩阵元比值"),
+    ('Rgamma', 'f', 2.0, (0.0, 100.0), 'model', "预平衡伽马发射的调整因子"),
+    ('Esurf', 'f', None, (0.0, 38.0), 'model', "表面修正的有效势阱深度 (MeV)"),
+    ('Kph', 'f', 15.0, (1.0, 100.0), 'model', "单粒子能级密度常数"),
+    ('Cbreak', 'p f', 1.0, (0.0, 100.0), 'model', "破裂反应的调整因子"),
+    ('Cknock', 'p f', 1.0, (0.0, 100.0), 'model', "敲出反应的调整因子"),
+    ('Cstrip', 'p f', 1.0, (0.0, 100.0), 'model', "削裂反应的调整因子"),
+    ('ecisdwba', 'b', True, None, 'model', "用ECIS计算DWBA"),
+    ('msdbins', 'i', 6, (2, 100), 'model', "多步直接反应的能格数"),
+    ('Emsdmin', 'f', None, (0.0, 1000.0), 'model', "多步直接反应的最低出射能量 (MeV)"),
+    ('hbstate', 'b', True, None, 'model', "Hauser-Feshbach中使用分立能级"),
+    ('cpang', 'b', False, None, 'model', "复合核角分布的量子力学计算"),
+    ('elow', 'B', False, None, 'model', "低能区计算（y/n 或能量上限）"),
+    ('rpevap', 'b', False, None, 'model', "残余核产生截面按蒸发核逐个输出"),
+    ('recoilaverage', 'b', False, None, 'model', "反冲计算使用平均能量"),
+    ('ffevaporation', 'b', False, None, 'model', "裂变碎片退激的蒸发计算"),
+    ('production', 'b', False, None, 'model', "加速器同位素生产计算"),
+    ('Ebeam', 'f', None, (0.0, 1000.0), 'model', "入射束流能量 (MeV)"),
+    ('Eback', 'f', None, (0.0, 1000.0), 'model', "靶后束流能量 (MeV)"),
+    ('Ibeam', 'f', 1.0, (0.0, 10000.0), 'model', "束流强度 (mA)"),
+    ('Tirrad', 'f [s]', 1, (0.0, 1e10), 'model', "照射时间及单位 (y d h m s)"),
+    ('Tcool', 'f [s]', 1, (0.0, 1e10), 'model', "冷却时间及单位 (y d h m s)"),
+    ('rho', 'f', None, (0.0, 100.0), 'model', "靶材密度 (g/cm^3)"),
+    ('area', 'f', 1.0, (0.0, 1e4), 'model', "靶面积 (cm^2)"),
+    ('radiounit', 'c', 'gbq', None, 'model', "放射性活度单位"),
+    ('yieldunit', 'c', 'num', None, 'model', "产额单位"),
+    ('resonance', 'b', False, None, 'model', "加入共振区截面"),
+    ('reslib', 's', None, None, 'model', "共振参数库"),
+    ('urr', 'b', False, None, 'model', "不可分辨共振区参数"),
+    ('lurr', 'i', 2, (0, 20), 'model', "不可分辨共振区的最大轨道角动量"),
+    ('urrnjoy', 'b', False, None, 'model', "按NJOY方式计算不可分辨共振区"),
+    ('astrogs', 'b', False, None, 'model', "天体物理反应率只考虑靶核基态"),
+    ('astroE', 'f', None, (0.0, 1000.0), 'model', "天体物理计算的能量 (MeV)"),
+    ('astroT9', 'f', None, (0.0001, 10.0), 'model', "天体物理计算的温度 (10^9 K)"),
+    ('nonthermlev', 'i', None, (0, 200), 'model', "非热布居的能级"),
+    ('electronconv', 'b', True, None, 'model', "内转换"),
+    ('skipCN', 'Z A', None, None, 'model', "跳过该复合核的计算"),
+
+    # 光学模型
+    ('localomp', 'b', True, None, 'optical_model', "局域光学模型"),
+    ('dispersion', 'b', False, None, 'optical_model', "色散光学模型"),
+    ('jlmomp', 'b', False, None, 'optical_model', "JLM微观光学模型"),
+    ('spherical', 'b', False, None, 'optical_model', "球形光学模型"),
+    ('statepot', 'b', False, None, 'optical_model', "每个能级使用独立光学势"),
+    ('radialmodel', 'i', 2, (1, 2), 'optical_model', "JLM径向密度模型"),
+    ('alphaomp', 'i', 1, (1, 8), 'optical_model', "α粒子光学模型"),
+    ('deuteronomp', 'i', 1, (1, 5), 'optical_model', "氘核光学模型"),
+    ('rotational', 'P', None, None, 'optical_model', "使用耦合道转动模型的粒子"),
+    ('soukho', 'b', True, None, 'optical_model', "Soukhovitskii锕系光学势"),
+    ('jlmmode', 'i', 0, (0, 3), 'optical_model', "JLM光学势的虚部归一化方式"),
+    ('optmod', 'Z A s p?', None, None, 'optical_model', "指定核素的光学模型参数文件"),
+    ('optmodfileN', 'Z s', None, None, 'optical_model', "中子光学模型参数文件"),
+    ('optmodfileP', 'Z s', None, None, 'optical_model', "质子光学模型参数文件"),
+    ('optmodall', 'b', False, None, 'optical_model', "所有核素都计算光学模型"),
+    ('omponly', 'b', False, None, 'optical_model', "只做光学模型计算"),
+    ('incadjust', 'b', True, None, 'optical_model', "调整系数同样作用于入射道"),
+    ('coulomb', 'b', True, None, 'optical_model', "库仑激发"),
+    ('sysreaction', 'P', None, None, 'optical_model', "使用系统学反应截面的粒子"),
+    ('radialfile', 'Z s', None, None, 'optical_model', "JLM径向密度文件"),
+    ('soswitch', 'f', 3.0, (0.1, 10.0), 'optical_model', "自旋轨道势改用形变参数的能量 (MeV)"),
+    ('maxcoupled', 'i', None, (0, 200), 'optical_model', "耦合道计算的最大能级数"),
+    ('lvadjust', 'p f', 1.0, (0.1, 10.0), 'optical_model', "JLM实部势的调整系数"),
+    ('lwadjust', 'p f', 1.0, (0.1, 10.0), 'optical_model', "JLM虚部势的调整系数"),
+    ('lv1adjust', 'p f', 1.0, (0.1, 10.0), 'optical_model', "JLM实部势等矢分量的调整系数"),
+    ('lw1adjust', 'p f', 1.0, (0.1, 10.0), 'optical_model', "JLM虚部势等矢分量的调整系数"),
+    ('lvsoadjust', 'p f', 1.0, (0.1, 10.0), 'optical_model', "JLM实部自旋轨道势的调整系数"),
+    ('lwsoadjust', 'p f', 1.0, (0.1, 10.0), 'optical_model', "JLM虚部自旋轨道势的调整系数"),
+
+    # 能级密度
+    ('ldmodel', 'i', 1, (1, 6), 'level_density', "能级密度模型"),
+    ('colenhance', 'b', False, None, 'level_density', "集体增强"),
+    ('spincutmodel', 'i', 1, (1, 2), 'level_density', "自旋截断模型"),
+    ('shellmodel', 'i', 1, (1, 2), 'level_density', "壳修正模型"),
+    ('kvibmodel', 'i', 2, (1, 2), 'level_density', "振动增强模型"),
+    ('ctable', 'Z A f [i]', 0.0, (-10.0, 10.0), 'level_density', "微观能级密度表的能量平移"),
+    ('ptable', 'Z A f [i]', 0.0, (-10.0, 10.0), 'level_density', "微观能级密度表的对能修正"),
+    ('a', 'Z A f [i]', None, (1.0, 100.0), 'level_density', "能级密度参数 a (MeV^-1)"),
+    ('alimit', 'Z A f', None, (1.0, 100.0), 'level_density', "渐近能级密度参数"),
+    ('D0', 'Z A f', None, (0.0, 1e8), 'level_density', "s波平均共振间距 (eV)"),
+    ('Rspincut', 'f', 1.0, (0.0, 10.0), 'level_density', "自旋截断参数的倍数"),
+    ('maxlevelstar', 'i', 30, (0, 200), 'level_density', "靶核考虑的最大分立能级数"),
+    ('maxlevelsbin', 'p i', 10, (0, 200), 'level_density', "二元反应残余核的最大分立能级数"),
+    ('maxrot', 'i', 2, (0, 20), 'level_density', "转动带的最大转动量子数"),
+    ('ldmodelracap', 'i', 1, (1, 3), 'level_density', "直接俘获的能级密度模型"),
+    ('asys', 'b', False, None, 'level_density', "所有核素都使用系统学能级密度参数"),
+    ('parity', 'b', False, None, 'level_density', "能级密度的宇称依赖"),
+    ('colldamp', 'b', False, None, 'level_density', "集体增强的阻尼"),
+    ('ctmglobal', 'b', False, None, 'level_density', "常温模型使用全局参数"),
+    ('alphald', 'f', None, (0.01, 0.2), 'level_density', "能级密度参数系统学的常数项"),
+    ('betald', 'f', None, (-0.5, 0.5), 'level_density', "能级密度参数系统学的表面项"),
+    ('gammashell1', 'f', None, (0.0, 1.0), 'level_density', "壳效应阻尼参数"),
+    ('gammashell2', 'f', 0.0, (0.0, 0.2), 'level_density', "壳效应阻尼参数的质量依赖"),
+    ('pairconstant', 'f', 12.0, (0.0, 30.0), 'level_density', "对能常数"),
+    ('Pshiftconstant', 'f', None, (-5.0, 5.0), 'level_density', "对能平移常数"),
+    ('Rspincutff', 'f', 4.0, (0.0, 20.0), 'level_density', "裂变碎片自旋截断参数的倍数"),
+    ('aadjust', 'Z A f', 1.0, (0.5, 2.0), 'level_density', "能级密度参数 a 的调整系数"),
+    ('alimitadjust', 'Z A f', 1.0, (0.5, 2.0), 'level_density', "渐近能级密度参数的调整系数"),
+    ('gammald', 'Z A f', None, (0.0, 1.0), 'level_density', "壳效应阻尼参数"),
+    ('pair', 'Z A f', None, (0.0, 10.0), 'level_density', "对能修正 (MeV)"),
+    ('Pshift', 'Z A f [i]', None, (-10.0, 10.0), 'level_density', "对能平移 (MeV)"),
+    ('Pshiftadjust', 'Z A f [i]', 0.0, (-10.0, 10.0), 'level_density', "对能平移的附加量 (MeV)"),
+    ('deltaW', 'Z A f [i]', None, (-20.0, 20.0), 'level_density', "壳修正能 (MeV)"),
+    ('Exmatch', 'Z A f [i]', None, (0.1, 20.0), 'level_density', "常温模型与费米气体模型的衔接能 (MeV)"),
+    ('Exmatchadjust', 'Z A f [i]', 1.0, (0.2, 2.0), 'level_density', "衔接能的调整系数"),
+    ('T', 'Z A f [i]', None, (0.001, 10.0), 'level_density', "常温模型的核温度 (MeV)"),
+    ('Tadjust', 'Z A f [i]', 1.0, (0.1, 10.0), 'level_density', "核温度的调整系数"),
+    ('E0', 'Z A f [i]', None, (-10.0, 10.0), 'level_density', "常温模型的能量平移 (MeV)"),
+    ('E0adjust', 'Z A f [i]', 1.0, (0.1, 10.0), 'level_density', "能量平移的调整系数"),
+    ('Krotconstant', 'Z A f [i]', 1.0, (0.001, 1000.0), 'level_density', "转动增强的归一化常数"),
+    ('beta2', 'Z A f [i]', None, (-0.5, 1.5), 'level_density', "四极形变参数"),
+    ('Ufermi', 'Z A f', None, (0.0, 1000.0), 'level_density', "集体增强衰减的费米分布中心 (MeV)"),
+    ('cfermi', 'Z A f', None, (0.0, 1000.0), 'level_density', "集体增强衰减的费米分布宽度 (MeV)"),
+    ('s2adjust', 'Z A f [i]', 1.0, (0.01, 10.0), 'level_density', "自旋截断参数平方的调整系数"),
+    ('g', 'Z A f', None, (0.1, 100.0), 'level_density', "单粒子态密度参数"),
+    ('gp', 'Z A f', None, (0.1, 100.0), 'level_density', "质子单粒子态密度参数"),
+    ('gn', 'Z A f', None, (0.1, 100.0), 'level_density', "中子单粒子态密度参数"),
+    ('gadjust', 'Z A f', 1.0, (0.1, 10.0), 'level_density', "单粒子态密度参数的调整系数"),
+    ('gpadjust', 'Z A f', 1.0, (0.1, 10.0), 'level_density', "质子单粒子态密度参数的调整系数"),
+    ('gnadjust', 'Z A f', 1.0, (0.1, 10.0), 'level_density', "中子单粒子态密度参数的调整系数"),
+    ('Nlow', 'Z A i [i]', None, (0, 200), 'level_density', "能级密度拟合使用的最低能级"),
+    ('Ntop', 'Z A i [i]', None, (0, 200), 'level_density', "能级密度拟合使用的最高能级"),
+    ('maxlevelsres', 'i', 10, (0, 200), 'level_density', "其余残余核的最大分立能级数"),
+    ('maxband', 'i', 0, (0, 100), 'level_density', "考虑的最大振动带数"),
+    ('disctable', 'i', 1, (1, 3), 'level_density', "分立能级表"),
+    ('levelfile', 'Z s', None, None, 'level_density', "分立能级文件"),
+    ('deformfile', 'Z s', None, None, 'level_density', "形变参数文件"),
+    ('Ltarget', 'i', 0, (0, 200), 'level_density', "靶核所处的激发能级"),
+    ('elwidth', 'f', 0.5, (1e-6, 100.0), 'level_density', "分立能级截面展宽的宽度 (MeV)"),
+    ('massexcess', 'Z A f', None, (-500.0, 500.0), 'level_density', "质量过剩 (MeV)"),
+    ('massnucleus', 'Z A f', None, (0.0, 500.0), 'level_density', "核质量 (amu)"),
+    ('massdir', 's', None, None, 'level_density', "质量表目录"),
+
+    # 伽马强度函数
+    ('strength', 'i', 9, (1, 10), 'gamma_strength', "E1伽马强度函数模型"),
+    ('strengthM1', 'i', 3, (1, 10), 'gamma_strength', "M1伽马强度函数模型"),
+    ('gnorm', 'f', 1.0, (0.0, 100.0), 'gamma_strength', "伽马强度函数归一化因子"),
+    ('gamgam', 'Z A f', None, (0.0, 10.0), 'gamma_strength', "平均辐射宽度 (eV)"),
+    ('S0', 'Z A f', None, (0.0, 10.0), 'gamma_strength', "s波强度函数 (1e-4)"),
+    ('gamgamadjust', 'Z A f', 1.0, (0.01, 20.0), 'gamma_strength', "平均辐射宽度的调整系数"),
+    ('etable', 'Z A f [i]', 0.0, (-10.0, 10.0), 'gamma_strength', "微观强度函数表的能量平移"),
+    ('ftable', 'Z A f [i]', 1.0, (0.1, 10.0), 'gamma_strength', "微观强度函数表的归一化"),
+    ('wtable', 'Z A f [i]', 1.0, (0.0, 10.0), 'gamma_strength', "微观强度函数表的宽度调整"),
+    ('sgr', 'Z A f c [i]', None, (0.0, 10000.0), 'gamma_strength', "巨共振强度 (mb)"),
+    ('egr', 'Z A f c [i]', None, (1.0, 100.0), 'gamma_strength', "巨共振能量 (MeV)"),
+    ('ggr', 'Z A f c [i]', None, (1.0, 100.0), 'gamma_strength', "巨共振宽度 (MeV)"),
+    ('epr', 'Z A f c [i]', None, (0.001, 100.0), 'gamma_strength', "pygmy共振能量 (MeV)"),
+    ('gpr', 'Z A f c [i]', None, (0.001, 100.0), 'gamma_strength', "pygmy共振宽度 (MeV)"),
+    ('tpr', 'Z A f c [i]', None, (0.0, 10000.0), 'gamma_strength', "pygmy共振强度 (mb)"),
+    ('sgradjust', 'Z A f c [i]', 1.0, (0.1, 10.0), 'gamma_strength', "巨共振强度的调整系数"),
+    ('egradjust', 'Z A f c [i]', 1.0, (0.1, 10.0), 'gamma_strength', "巨共振能量的调整系数"),
+    ('ggradjust', 'Z A f c [i]', 1.0, (0.1, 10.0), 'gamma_strength', "巨共振宽度的调整系数"),
+    ('upbend', 'b', False, None, 'gamma_strength', "低能上弯"),
+    ('E1file', 'Z s', None, None, 'gamma_strength', "E1强度函数表文件"),
+    ('M1file', 'Z s', None, None, 'gamma_strength', "M1强度函数表文件"),
+    ('psfglobal', 'b', False, None, 'gamma_strength', "强度函数使用全局参数"),
+    ('gshell', 'b', False, None, 'gamma_strength', "强度函数中能级密度参数的壳效应"),
+    ('racap', 'b', False, None, 'gamma_strength', "直接辐射俘获"),
+    ('spectfac', 'Z A f [i]', None, (0.0, 10.0), 'gamma_strength', "直接俘获的谱因子"),
+
+    # 裂变
+    ('fismodel', 'i', 1, (1, 5), 'fission', "裂变位垒模型"),
+    ('fismodelalt', 'i', 4, (3, 4), 'fission', "备选裂变位垒模型"),
+    ('fymodel', 'i', 1, (1, 5), 'fission', "裂变产物模型"),
+    ('fisbar', 'Z A f [i]', None, (0.0, 20.0), 'fission', "裂变位垒高度 (MeV)"),
+    ('fishw', 'Z A f [i]', None, (0.01, 10.0), 'fission', "裂变位垒曲率 (MeV)"),
+    ('fisbaradjust', 'Z A f [i]', 1.0, (0.1, 10.0), 'fission', "裂变位垒高度的调整系数"),
+    ('fishwadjust', 'Z A f [i]', 1.0, (0.1, 10.0), 'fission', "裂变位垒曲率的调整系数"),
+    ('class2', 'b', False, None, 'fission', "二类态"),
+    ('class2width', 'Z A f [i]', 0.2, (0.01, 10.0), 'fission', "二类态的宽度 (MeV)"),
+    ('Rclass2mom', 'Z A f [i]', 1.0, (0.1, 10.0), 'fission', "二类态转动惯量的调整系数"),
+    ('Rtransmom', 'Z A f [i]', 1.0, (0.1, 10.0), 'fission', "过渡态转动惯量的调整系数"),
+    ('bdamp', 'Z A f [i]', None, (0.0, 10.0), 'fission', "转动增强的阻尼参数"),
+    ('axtype', 'Z A i [i]', 1, (1, 5), 'fission', "裂变位垒的对称类型"),
+    ('betafiscor', 'Z A f', 1.0, (0.1, 10.0), 'fission', "裂变路径宽度的修正"),
+    ('vfiscor', 'Z A f', 1.0, (0.1, 10.0), 'fission', "裂变路径高度的修正"),
+    ('hbtransfile', 'Z A s', None, None, 'fission', "过渡态文件"),
+    ('massdis', 'b', False, None, 'fission', "裂变碎片质量分布"),
+    ('ffmodel', 'i', 1, (0, 3), 'fission', "裂变碎片衰变模型"),
+    ('pfnsmodel', 'i', 1, (1, 2), 'fission', "瞬发裂变中子谱模型"),
+    ('gefran', 'i', 50000, (1000, 1000000), 'fission', "GEF计算的事件数"),
+    ('fiseps', 'f', 1e-9, (0.0, 1000.0), 'fission', "裂变截面截止值 (mb)"),
+    ('Rfiseps', 'f', 1e-3, (0.0, 1.0), 'fission', "裂变布居截止值的相对值"),
+    ('Cnubar1', 'f', 1.0, (0.1, 10.0), 'fission', "瞬发中子数常数项的调整系数"),
+    ('Cnubar2', 'f', 1.0, (0.1, 10.0), 'fission', "瞬发中子数线性项的调整系数"),
+    ('Tmadjust', 'f', 1.0, (0.1, 10.0), 'fission', "碎片温度的调整系数"),
+    ('Fsadjust', 'f', 1.0, (0.1, 10.0), 'fission', "碎片分布的调整系数"),
+
+    # 数值参数
+    ('bins', 'i', 40, (0, 200), 'numerical', "连续区能格数"),
+    ('maxZ', 'i', None, (0, 100), 'numerical', "残余核的最大质子数损失"),
+    ('maxN', 'i', None, (0, 100), 'numerical', "残余核的最大中子数损失"),
+    ('xseps', 'f', 1e-7, (0.0, 1000.0), 'numerical', "截面截止值 (mb)"),
+    ('popeps', 'f', 1e-3, (0.0, 1000.0), 'numerical', "布居截止值 (mb)"),
+    ('transeps', 'f', 1e-8, (0.0, 1.0), 'numerical', "穿透系数截止值"),
+    ('strucpath', 's', None, None, 'numerical', "结构数据库路径"),
+    ('nbins', 'i', 40, (0, 200), 'numerical', "连续区能格数（bins 的新名称）"),
+    ('maxZrp', 'i', None, (0, 100), 'numerical', "残余核产生截面的最大质子数损失"),
+    ('maxNrp', 'i', None, (0, 100), 'numerical', "残余核产生截面的最大中子数损失"),
+    ('maxchannel', 'i', 4, (0, 8), 'numerical', "独占反应道中出射粒子的最大个数"),
+    ('angles', 'i', 90, (1, 360), 'numerical', "分立能级角分布的角度数"),
+    ('anglescont', 'i', 36, (1, 360), 'numerical', "连续谱角分布的角度数"),
+    ('anglesrec', 'i', 9, (1, 360), 'numerical', "反冲角度数"),
+    ('maxenrec', 'i', 10, (1, 1000), 'numerical', "反冲能格数"),
+    ('transpower', 'i', 5, (2, 20), 'numerical', "穿透系数截止的幂次"),
+    ('bestpath', 's', None, None, 'numerical', "最佳参数集目录"),
+] + [(name, 'p f', 1.0, (0.1, 10.0), 'optical_model', "光学势参数的调整系数")
+     for name in OMP_ADJUST_KEYWORDS]
+
+# 签名为 c 的关键字的可选值
+KEYWORD_CHOICES = {
+    'projectile': ('0',) + PARTICLES,
+    'radiounit': ('bq', 'kbq', 'mbq', 'gbq', 'ci', 'kci', 'mci'),
+    'yieldunit': ('num', 'mug', 'mg', 'g', 'kg'),
+    'sgr': ('E1', 'M1', 'E2'), 'egr': ('E1', 'M1', 'E2'), 'ggr': ('E1', 'M1', 'E2'),
+    'epr': ('E1', 'M1', 'E2'), 'gpr': ('E1', 'M1', 'E2'), 'tpr': ('E1', 'M1', 'E2'),
+    'sgradjust': ('E1', 'M1', 'E2'), 'egradjust': ('E1', 'M1', 'E2'), 'ggradjust': ('E1', 'M1', 'E2'),
+}
+
+# 本程序使用的TALYS内部变量名 -> TALYS输入文件中对应的关键字
+KEYWORD_ALIASES = {
+    'flagmain': 'outmain', 'flagbasic': 'outbasic', 'flagpop': 'outpopulation', 'flagcheck': 'outcheck',
+    'flagspec': 'outspectra', 'flagang': 'outangle', 'flagdisc': 'outdiscrete',
+    'flagchannels': 'channels', 'flagrecoil': 'recoil',
+}
+
+# TALYS_Default_Parameters.md 中的默认值行（name = value ! 说明）和取值范围
+_DEFAULT_LINE = re.compile(r'^\s*(?P<name>[A-Za-z]\w*)\s*=\s*(?P<value>[^!\s]+)\s*(?:!\s*(?P<comment>.*))?$')
+_VALID_RANGE = re.compile(r"name='(?P<name>\w+)'.*?valid_range=\((?P<low>[-\d.eE+]+),\s*(?P<high>[-\d.eE+]+)\)",
+                          re.DOTALL)
+_CODE_BLOCK = re.compile(r'```fortran\n(?P<body>.*?)```', re.DOTALL)
+
+
+class KeywordSpec(NamedTuple):
+    """一个输入关键字"""
+    name: str  # 关键字（TALYS原文大小写）
+    signature: Tuple[str, ...]  # 参数记号，可选参数以 '?' 结尾
+    default: Any
+    valid_range: Optional[Tuple[float, float]]
+    group: str
+    description: str
+    choices: Tuple[str, ...] = ()
+
+    @property
+    def repeatable(self) -> bool:
+        """以粒子或核素开头的关键字可以多行出现（每个粒子、核素一行）"""
+        return self.signature[0] in ('p', 'Z') or self.name.lower() in REPEATABLE_KEYWORDS
+
+    @property
+    def min_args(self) -> int:
+        return sum(1 for code in self.signature if not code.endswith('?'))
+
+    @property
+    def usage(self) -> str:
+        """参数说明文本，如 'ctable Z A f [i]'"""
+        names = {'b': 'y/n', 'i': 'i', 'f': 'f', 's': 'text', 'p': 'particle', 'P': 'particles...',
+                 'c': '|'.join(self.choices), 'e': 'symbol', 'Z': 'Z', 'A': 'A',
+                 'E': 'E | Emin Emax dE | file', 'B': 'y/n | f'}
+        args = [f"[{names[code[:-1]]}]" if code.endswith('?') else names[code] for code in self.signature]
+        return ' '.join([self.name] + args)
+
+
+def _signature(text: str) -> Tuple[str, ...]:
+    """'Z A f [i]' -> ('Z', 'A', 'f', 'i?')"""
+    return tuple(token.strip('[]') + '?' if token.startswith('[') else token for token in text.split())
+
+
+def _md_value(text: str) -> Any:
+    """Fortran 默认值文本转换为Python值"""
+    lowered = text.lower()
+    if lowered in ('.true.', '.false.'):
+        return lowered == '.true.'
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return text.strip("'\"")
+
+
+def _md_signature(value: Any) -> str:
+    if isinstance(value, bool):
+        return 'b'
+    if isinstance(value, int):
+        return 'i'
+    return 'f' if isinstance(value, float) else 's'
+
+
+class KeywordTrie:
+    """关键字前缀树（不区分大小写），供语法高亮逐字符匹配关键字和自动补全按前缀查找"""
+
+    _END = ''  # 终点标记，值为该关键字对应的对象
+
+    def __init__(self):
+        self.root: Dict[str, Any] = {}
+
+    def insert(self, word: str, value: Any):
+        node = self.root
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[self._END] = value
+
+    def lookup(self, word: str) -> Any:
+        """完整匹配 word 的对象，没有时返回None"""
+        node = self.root
+        for char in word.lower():
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(self._END)
+
+    def complete(self, prefix: str) -> List[Any]:
+        """以 prefix 开头的全部关键字的对象（按关键字字母顺序）"""
+        node = self.root
+        for char in prefix.lower():
+            node = node.get(char)
+            if node is None:
+                return []
+        values, stack = [], [node]
+        while stack:
+            node = stack.pop()
+            if self._END in node:
+                values.append(node[self._END])
+            stack.extend(node[char] for char in sorted(node, reverse=True) if char != self._END)
+        return values
+
+
+class KeywordSchema:
+    """TALYS输入关键字表（关键字不区分大小写）"""
+
+    def __init__(self, doc_path: Optional[Path] = None):
+        """
+        Args:
+            doc_path: 默认参数文档，None 使用 Settings.TALYS_PARAMETER_DOC；文档不存在时只使用内置表
+        """
+        self.keywords: Dict[str, KeywordSpec] = {}
+        self._trie: Optional[KeywordTrie] = None
+        for name, signature, default, valid_range, group, description in KEYWORD_TABLE:
+            choices = KEYWORD_CHOICES.get(name, ())
+            self.keywords[name.lower()] = KeywordSpec(name, _signature(signature), default, valid_range,
+                                                      group, description, choices)
+        self.load_defaults(Settings.TALYS_PARAMETER_DOC if doc_path is None else doc_path)
+
+    def load_defaults(self, path: Path):
+        """
+        合并默认参数文档中的默认值和取值范围
+
+        文档中有而内置表中没有的关键字按默认值的类型加入表中。
+        """
+        try:
+            text = Path(path).read_text(encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"无法读取默认参数文档 {path}: {e}")
+            return
+
+        added = 0
+        for block in _CODE_BLOCK.finditer(text):
+            for line in block.group('body').splitlines():
+                match = _DEFAULT_LINE.match(line)
+                if not match:
+                    continue
+                name, value = match.group('name'), _md_value(match.group('value'))
+                key = name.lower()
+                if key in self.keywords:
+                    self.keywords[key] = self.keywords[key]._replace(default=value)
+                else:
+                    self.keywords[key] = KeywordSpec(name, (_md_signature(value),), value, None, 'document',
+                                                     (match.group('comment') or '').strip())
+                    added += 1
+        for match in _VALID_RANGE.finditer(text):
+            key = match.group('name').lower()
+            if key in self.keywords:
+                valid_range = (_md_value(match.group('low')), _md_value(match.group('high')))
+                self.keywords[key] = self.keywords[key]._replace(valid_range=valid_range)
+        self._trie = None
+        logger.debug(f"从 {Path(path).name} 合并默认参数，新增{added}个关键字")
+
+    @property
+    def trie(self) -> KeywordTrie:
+        """关键字 -> KeywordSpec 的前缀树（首次使用时建立）"""
+        if self._trie is None:
+            trie = KeywordTrie()
+            for key, spec in self.keywords.items():
+                trie.insert(key, spec)
+            self._trie = trie
+        return self._trie
+
+    def get(self, keyword: str) -> Optional[KeywordSpec]:
+        return self.keywords.get(keyword.lower())
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword.lower() in self.keywords
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def names(self) -> List[str]:
+        """全部关键字（TALYS原文大小写，按字母顺序）"""
+        return sorted((spec.name for spec in self.keywords.values()), key=str.lower)
+
+    def groups(self) -> Dict[str, List[str]]:
+        """分组 -> 关键字"""
+        groups: Dict[str, List[str]] = {}
+        for spec in self.keywords.values():
+            groups.setdefault(spec.group, []).append(spec.name)
+        return groups
+
+
+_schema: Optional[KeywordSchema] = None
+_schema_lock = threading.Lock()
+
+
+def get_keyword_schema() -> KeywordSchema:
+    """获取全局关键字表（首次调用时读取默认参数文档）"""
+    global _schema
+    with _schema_lock:
+        if _schema is None:
+            _schema = KeywordSchema()
+        return _schema
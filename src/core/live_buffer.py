@@ -0,0 +1,140 @@
+"""
+实时结果缓冲模块
+计算进行中，读取TALYS标准输出的线程把每个入射能量的反应总结写入预分配的NumPy缓冲区；
+界面线程按固定帧间隔检查版本号，有新数据时直接用缓冲区的视图重绘，不逐点发信号也不复制列表
+"""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from core.partial_results import SUMMARY_END, SUMMARY_PATTERN, parse_reaction_summaries
+
+# 反应总结中实时显示的量，与 total_cross_section 的键一致
+SUMMARY_COLUMNS = ('energy', 'cross_section', 'elastic', 'nonelastic')
+SUMMARY_KEYS = {'cross_section': 'total', 'elastic': 'elastic', 'nonelastic': 'nonelastic'}
+
+
+class LiveBuffer:
+    """
+    按列存放的预分配缓冲区
+
+    写满时容量翻倍；设置 max_points 后作为环形缓冲区，只保留最新的 max_points 行。
+    一个线程写、另一个线程读：写入在锁内完成，读取得到的是已写入部分的视图。
+    """
+
+    def __init__(self, columns: Sequence[str] = SUMMARY_COLUMNS, capacity: int = 256,
+                 max_points: Optional[int] = None):
+        """
+        Args:
+            columns: 列名
+            capacity: 初始容量（行）
+            max_points: 环形缓冲区的行数，None表示按需增长
+        """
+        self.columns = tuple(columns)
+        self.max_points = max_points
+        capacity = max_points if max_points else max(int(capacity), 1)
+        self._data = np.full((len(self.columns), capacity), np.nan)
+        self._size = 0  # 已写入的行数（环形缓冲区中不超过容量）
+        self._head = 0  # 环形缓冲区中最早一行的位置
+        self._lock = threading.Lock()
+        self.version = 0  # 每次写入加1，读取方据此判断是否需要重绘
+
+    @property
+    def capacity(self) -> int:
+        return self._data.shape[1]
+
+    def append(self, row: Sequence[float]):
+        """写入一行"""
+        self.extend(np.asarray(row, dtype=float).reshape(1, -1))
+
+    def extend(self, rows: np.ndarray):
+        """写入多行，rows 形状为 (行数, 列数)"""
+        rows = np.asarray(rows, dtype=float)
+        if rows.ndim != 2 or rows.shape[1] != len(self.columns):
+            raise ValueError(f"每行应有 {len(self.columns)} 列")
+        with self._lock:
+            if self.max_points:
+                rows = rows[-self.capacity:]
+                positions = (self._head + self._size + np.arange(len(rows))) % self.capacity
+                self._data[:, positions] = rows.T
+                overflow = max(self._size + len(rows) - self.capacity, 0)
+                self._head = (self._head + overflow) % self.capacity
+                self._size = min(self._size + len(rows), self.capacity)
+            else:
+                needed = self._size + len(rows)
+                if needed > self.capacity:
+                    # 新数组替换旧数组，读取方已持有的视图仍然有效
+                    grown = np.full((len(self.columns), max(needed, 2 * self.capacity)), np.nan)
+                    grown[:, :self._size] = self._data[:, :self._size]
+                    self._data = grown
+                self._data[:, self._size:needed] = rows.T
+                self._size = needed
+            self.version += 1
+
+    def view(self) -> Tuple[np.ndarray, int]:
+        """
+        已写入的数据
+
+        Returns:
+            (数组, 版本号)：数组形状为 (列数, 行数)，未回绕时是缓冲区的只读视图，
+            环形缓冲区回绕后按写入顺序拼接
+        """
+        with self._lock:
+            if self._head == 0 or self._size < self.capacity:
+                data = self._data[:, self._head:self._head + self._size]
+            else:
+                data = np.roll(self._data, -self._head, axis=1)
+            version = self.version
+        data = data.view()
+        data.setflags(write=False)
+        return data, version
+
+    def column(self, name: str) -> np.ndarray:
+        """某一列已写入的数据"""
+        data, _ = self.view()
+        return data[self.columns.index(name)]
+
+    def clear(self):
+        """清空缓冲区"""
+        with self._lock:
+            self._size = 0
+            self._head = 0
+            self.version += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class SummaryStream:
+    """
+    逐行接收TALYS标准输出，每完成一个入射能量的反应总结就写入缓冲区
+
+    只保留最后一个未完成的反应总结块，输出再长也不会重复扫描。
+    """
+
+    def __init__(self, buffer: LiveBuffer):
+        self.buffer = buffer
+        self._block: Optional[list] = None  # 当前反应总结块的各行
+
+    def feed(self, line: str):
+        """接收一行标准输出"""
+        if SUMMARY_PATTERN.search(line):
+            self._block = [line]
+            return
+        if self._block is None:
+            return
+        self._block.append(line)
+        if SUMMARY_END in line:
+            summaries = parse_reaction_summaries(''.join(self._block))
+            self._block = None
+            for energy, summary in summaries.items():
+                self.buffer.append([energy] + [summary.get(SUMMARY_KEYS[column], np.nan)
+                                               for column in self.buffer.columns[1:]])
+
+    __call__ = feed
+
@@ -0,0 +1,354 @@
+"""
+基态质量表模块
+解析 gs-mass-sp.dat（质量过剩、基态自旋和宇称），提供按 (Z, A) 的O(1)查询、分离能和反应阈能估算
+"""
+
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from utils.logger import LoggerMixin
+from utils.data_cache import get_cache_file
+
+# 原子质量单位 (MeV)
+AMU_MEV = 931.49410242
+
+# TALYS粒子符号 -> (Z, A)
+PARTICLES = {
+    'g': (0, 0),
+    'n': (0, 1),
+    'p': (1, 1),
+    'd': (1, 2),
+    't': (1, 3),
+    'h': (2, 3),
+    'a': (2, 4),
+}
+
+# 自旋宇称编码中表示未知的值
+UNKNOWN_SPIN_CODE = 9999.0
+
+# 结构数据库中的质量表
+MASS_TABLE_NAME = Path("masses") / "gs-mass-sp.dat"
+
+_EJECTILE_PATTERN = re.compile(r'(\d*)([gnpdtha])')
+
+
+def talys_structure_dir() -> Optional[Path]:
+    """
+    TALYS结构数据库目录
+
+    优先使用配置中的 TALYS_STRUCTURE_DIR，否则按TALYS的安装布局（<talys>/bin/talys、
+    <talys>/structure）由可执行文件的位置推断。
+
+    Returns:
+        Optional[Path]: 目录，找不到时为None
+    """
+    if Settings.TALYS_STRUCTURE_DIR:
+        return Path(Settings.TALYS_STRUCTURE_DIR)
+    executable = shutil.which(Settings.TALYS_EXECUTABLE)
+    if executable is None:
+        return None
+    structure = Path(executable).resolve().parent.parent / "structure"
+    return structure if structure.is_dir() else None
+
+
+def default_mass_table_file() -> Path:
+    """
+    默认的质量表文件：配置中的 MASS_TABLE_FILE，或结构数据库中的 masses/gs-mass-sp.dat
+
+    Raises:
+        FileNotFoundError: 未配置质量表且找不到TALYS结构数据库
+    """
+    if Settings.MASS_TABLE_FILE:
+        return Path(Settings.MASS_TABLE_FILE)
+    structure = talys_structure_dir()
+    if structure is None:
+        raise FileNotFoundError("找不到TALYS结构数据库，请配置 TALYS_STRUCTURE_DIR 或 MASS_TABLE_FILE")
+    return structure / MASS_TABLE_NAME
+
+
+def decode_spin_parity(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    解码质量表中的自旋宇称编码
+
+    正宇称编码为 100+J，负宇称编码为 J-100，9999 表示未知。
+
+    Args:
+        codes: 编码数组
+
+    Returns:
+        tuple: (自旋数组，未知为NaN；宇称数组，+1/-1，未知为0)
+    """
+    codes = np.asarray(codes, dtype=float)
+    unknown = codes >= UNKNOWN_SPIN_CODE
+    spin = np.where(codes > 0, codes - 100.0, codes + 100.0)
+    parity = np.where(codes > 0, 1, -1).astype(np.int8)
+    spin[unknown] = np.nan
+    parity[unknown] = 0
+    return spin, parity
+
+
+def parse_ejectiles(ejectiles: str) -> Tuple[int, int]:
+    """
+    解析出射粒子组合（如 '2n'、'np'）的总电荷数和质量数
+
+    Args:
+        ejectiles: 出射粒子字符串
+
+    Returns:
+        tuple: (总Z, 总A)
+    """
+    total_z = total_a = 0
+    for count, particle in _EJECTILE_PATTERN.findall(ejectiles):
+        number = int(count) if count else 1
+        z, a = PARTICLES[particle]
+        total_z += number * z
+        total_a += number * a
+    return total_z, total_a
+
+
+class MassTable(LoggerMixin):
+    """基态质量表"""
+
+    def __init__(self, file_path: Optional[Union[str, Path]] = None,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 use_cache: bool = True):
+        """
+        初始化质量表，优先从缓存加载
+
+        Args:
+            file_path: gs-mass-sp.dat 路径，默认见 default_mass_table_file()
+            cache_dir: 缓存目录，默认使用配置中的 CACHE_DIR
+            use_cache: 是否读写解析缓存
+        """
+        self.file_path = Path(file_path) if file_path else default_mass_table_file()
+
+        arrays = self._load(cache_dir, use_cache)
+        self.z = arrays['z']
+        self.a = arrays['a']
+        self.mass_excess_values = arrays['mass_excess']
+        self.spin, self.parity = decode_spin_parity(arrays['spin_parity'])
+        self.grid = arrays['grid']
+
+    def _load(self, cache_dir: Optional[Union[str, Path]], use_cache: bool) -> Dict[str, np.ndarray]:
+        """加载缓存或重新解析"""
+        if not use_cache:
+            return self.parse()
+
+        cache_file = get_cache_file(self.file_path, 'mass', '.npz', cache_dir)
+        if cache_file.exists():
+            try:
+                with np.load(cache_file, allow_pickle=False) as cached:
+                    self.logger.debug(f"从缓存加载质量表: {cache_file}")
+                    return {key: cached[key] for key in cached.files}
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.warning(f"质量表缓存损坏，将重新解析: {e}")
+
+        arrays = self.parse()
+        try:
+            np.savez(cache_file, **arrays)
+        except OSError as e:
+            self.logger.warning(f"写入质量表缓存失败: {e}")
+        return arrays
+
+    def parse(self) -> Dict[str, np.ndarray]:
+        """
+        解析质量表文件
+
+        文件头部为若干说明行和一行条目数，之后每条记录为
+        ZZZAAA、质量过剩(MeV)、自旋宇称编码三项，每行五条。
+
+        Returns:
+            Dict: z、a、mass_excess、spin_parity 数组及 (Z, A) 查找网格
+        """
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+
+        count_line = next(i for i, line in enumerate(lines)
+                          if len(line.split()) == 1 and line.strip().isdigit())
+        count = int(lines[count_line])
+
+        values = np.array(''.join(lines[count_line + 1:]).split(), dtype=float)
+        records = values[:count * 3].reshape(count, 3)
+
+        codes = records[:, 0].astype(np.int64)
+        z = (codes // 1000).astype(np.int16)
+        a = (codes % 1000).astype(np.int16)
+
+        grid = np.full((int(z.max()) + 1, int(a.max()) + 1), -1, dtype=np.int32)
+        grid[z, a] = np.arange(count, dtype=np.int32)
+
+        self.logger.info(f"质量表解析完成，共{count}个核素")
+        return {
+            'z': z,
+            'a': a,
+            'mass_excess': records[:, 1].copy(),
+            'spin_parity': records[:, 2].copy(),
+            'grid': grid,
+        }
+
+    def _lookup(self, z, a) -> np.ndarray:
+        """返回 (Z, A) 在记录数组中的下标，不存在时为-1"""
+        z = np.asarray(z)
+        a = np.asarray(a)
+        inside = (z >= 0) & (a >= 0) & (z < self.grid.shape[0]) & (a < self.grid.shape[1])
+        index = np.full(np.broadcast(z, a).shape, -1, dtype=np.int32)
+        index[inside] = self.grid[np.broadcast_to(z, index.shape)[inside],
+                                  np.broadcast_to(a, index.shape)[inside]]
+        return index
+
+    def _take(self, values: np.ndarray, z, a, missing=np.nan):
+        """按 (Z, A) 取值，支持标量和数组"""
+        index = self._lookup(z, a)
+        result = np.where(index >= 0, values[np.maximum(index, 0)], missing)
+        return result.item() if result.ndim == 0 else result
+
+    def contains(self, z: int, a: int) -> bool:
+        """检查质量表中是否有该核素"""
+        return bool(self._lookup(z, a) >= 0)
+
+    def mass_excess(self, z, a):
+        """
+        质量过剩 (MeV)
+
+        Args:
+            z: 原子序数（标量或数组）
+            a: 质量数（标量或数组）
+
+        Returns:
+            质量过剩，未知核素为NaN
+        """
+        return self._take(self.mass_excess_values, z, a)
+
+    def particle_mass_excess(self, particle: str) -> float:
+        """入射/出射粒子的质量过剩 (MeV)，光子为0"""
+        if particle == 'g':
+            return 0.0
+        return self.mass_excess(*PARTICLES[particle])
+
+    def atomic_mass(self, z, a):
+        """原子质量 (amu)"""
+        return np.asarray(a) + np.asarray(self.mass_excess(z, a)) / AMU_MEV
+
+    def ground_state(self, z: int, a: int) -> Optional[Dict[str, Any]]:
+        """
+        获取基态信息
+
+        Returns:
+            Dict: mass_excess、atomic_mass、spin、parity，未知核素返回None
+        """
+        index = int(self._lookup(z, a))
+        if index < 0:
+            return None
+        return {
+            'mass_excess': float(self.mass_excess_values[index]),
+            'atomic_mass': float(a + self.mass_excess_values[index] / AMU_MEV),
+            'spin': float(self.spin[index]),
+            'parity': int(self.parity[index]),
+        }
+
+    def separation_energy(self, z, a, particle: str = 'n'):
+        """
+        粒子分离能 (MeV)
+
+        Args:
+            z: 原子序数
+            a: 质量数
+            particle: 分离的粒子符号（n, p, d, t, h, a）
+
+        Returns:
+            分离能，涉及未知核素时为NaN
+        """
+        pz, pa = PARTICLES[particle]
+        return (np.asarray(self.mass_excess(np.asarray(z) - pz, np.asarray(a) - pa))
+                + self.particle_mass_excess(particle) - np.asarray(self.mass_excess(z, a)))
+
+    def reaction_q_value(self, z: int, a: int, projectile: str, ejectiles: str) -> float:
+        """
+        反应Q值 (MeV)
+
+        Args:
+            z: 靶核原子序数
+            a: 靶核质量数
+            projectile: 入射粒子符号
+            ejectiles: 出射粒子组合，如 'n'、'2n'、'np'
+
+        Returns:
+            float: Q值，涉及未知核素时为NaN
+        """
+        pz, pa = PARTICLES[projectile]
+        ez, ea = parse_ejectiles(ejectiles)
+        residual_z, residual_a = z + pz - ez, a + pa - ea
+
+        ejectile_excess = sum(
+            (int(count) if count else 1) * self.particle_mass_excess(particle)
+            for count, particle in _EJECTILE_PATTERN.findall(ejectiles)
+        )
+        return float(self.mass_excess(z, a) + self.particle_mass_excess(projectile)
+                     - ejectile_excess - self.mass_excess(residual_z, residual_a))
+
+    def threshold_energy(self, z: int, a: int, projectile: str, ejectiles: str) -> float:
+        """
+        反应阈能估算（非相对论运动学，实验室系，MeV）
+
+        Returns:
+            float: 阈能，放能反应返回0
+        """
+        q_value = self.reaction_q_value(z, a, projectile, ejectiles)
+        if np.isnan(q_value):
+            return q_value
+        if q_value >= 0:
+            return 0.0
+        target_mass = float(self.atomic_mass(z, a))
+        projectile_mass = 0.0 if projectile == 'g' else float(self.atomic_mass(*PARTICLES[projectile]))
+        return -q_value * (target_mass + projectile_mass) / target_mass
+
+    def is_bound(self, z: int, a: int) -> bool:
+        """检查核素对单中子和单质子发射是否稳定"""
+        sn = self.separation_energy(z, a, 'n')
+        sp = self.separation_energy(z, a, 'p')
+        return bool(self.contains(z, a) and not (sn < 0) and not (sp < 0))
+
+    def __len__(self) -> int:
+        return int(self.z.size)
+
+
+# 全局质量表实例
+_mass_table = None
+# 上次加载失败时的质量表配置和错误
+_mass_table_failure: Optional[Tuple[Tuple[Any, ...], Exception]] = None
+
+
+def _mass_table_settings() -> Tuple[Any, ...]:
+    """决定质量表位置的配置项"""
+    return Settings.MASS_TABLE_FILE, Settings.TALYS_STRUCTURE_DIR, Settings.TALYS_EXECUTABLE
+
+
+def get_mass_table() -> MassTable:
+    """
+    获取全局质量表实例（首次调用时加载）
+
+    加载失败时记下错误，相关配置不变时直接抛出该错误，
+    输入核素时不必每次都重新查找可执行文件和结构数据库；修改配置后重新加载。
+
+    Raises:
+        OSError, ValueError: 找不到或无法解析质量表
+    """
+    global _mass_table, _mass_table_failure
+    if _mass_table is None:
+        settings = _mass_table_settings()
+        if _mass_table_failure is not None and _mass_table_failure[0] == settings:
+            raise _mass_table_failure[1].with_traceback(None)
+        try:
+            _mass_table = MassTable()
+        except (OSError, ValueError) as e:
+            _mass_table_failure = (settings, e)
+            raise
+        _mass_table_failure = None
+    return _mass_table
@@ -0,0 +1,372 @@
+"""
+蒙特卡罗不确定度传播模块
+对模型参数抽样、并行运行TALYS，并把每次实现的截面即时并入流式统计量
+（Welford均值/方差、能量间协方差、P²分位数），内存占用与样本数无关
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+from core.parameter_sweep import ChannelData, run_talys_channels
+
+
+class Normal(NamedTuple):
+    """正态分布，可选截断到 [low, high]"""
+    mean: float
+    sigma: float
+    low: float = -np.inf
+    high: float = np.inf
+
+    def sample(self, rng: np.random.Generator) -> float:
+        # 拒绝抽样实现截断，截断区间过窄时退化为裁剪
+        for _ in range(100):
+            value = rng.normal(self.mean, self.sigma)
+            if self.low <= value <= self.high:
+                return float(value)
+        return float(np.clip(value, self.low, self.high))
+
+
+class Uniform(NamedTuple):
+    """均匀分布"""
+    low: float
+    high: float
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(rng.uniform(self.low, self.high))
+
+
+class LogNormal(NamedTuple):
+    """对数正态分布，median 为中位数，sigma 为对数标准差"""
+    median: float
+    sigma: float
+
+    def sample(self, rng: np.random.Generator) -> float:
+        return float(self.median * np.exp(rng.normal(0.0, self.sigma)))
+
+
+class Choice(NamedTuple):
+    """离散取值（如模型编号），可指定概率"""
+    values: Sequence[Any]
+    probabilities: Optional[Sequence[float]] = None
+
+    def sample(self, rng: np.random.Generator) -> Any:
+        return self.values[rng.choice(len(self.values), p=self.probabilities)]
+
+
+Distribution = Union[Normal, Uniform, LogNormal, Choice]
+
+
+class P2Quantile:
+    """
+    P²分位数估计（Jain & Chlamtac 1985），对向量的每个分量独立估计
+
+    每个分量只保存5个标记点的高度和位置，不保存样本。观测中的NaN表示该分量
+    没有数据，各分量分别计数。
+    """
+
+    def __init__(self, p: float, size: int):
+        """
+        Args:
+            p: 分位数 (0, 1)
+            size: 向量长度
+        """
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"分位数必须在0和1之间: {p}")
+        self.p = p
+        self.counts = np.zeros(size, dtype=int)
+        self._initial = np.empty((5, size))
+        self.heights = np.empty((5, size))
+        self.positions = np.tile(np.arange(5, dtype=float)[:, None], (1, size))
+        self.desired = np.tile(np.array([0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0])[:, None], (1, size))
+        self.increments = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])[:, None]
+
+    def add(self, x: np.ndarray):
+        """并入一个观测向量，NaN分量跳过"""
+        x = np.asarray(x, dtype=float)
+        valid = ~np.isnan(x)
+        filling = valid & (self.counts < 5)
+        if filling.any():
+            columns = np.flatnonzero(filling)
+            self._initial[self.counts[columns], columns] = x[columns]
+            self.counts[columns] += 1
+            done = columns[self.counts[columns] == 5]
+            self.heights[:, done] = np.sort(self._initial[:, done], axis=0)
+        active = valid & ~filling
+        if not active.any():
+            return
+        self.counts[active] += 1
+        x = np.where(active, x, 0.0)
+
+        q = self.heights
+        n = self.positions
+        q[0] = np.where(active, np.minimum(q[0], x), q[0])
+        q[4] = np.where(active, np.maximum(q[4], x), q[4])
+        # x 所在的区间 k：q[k] <= x < q[k+1]，k 取 0..3
+        cell = np.sum(x >= q[1:4], axis=0)
+        n += (np.arange(5)[:, None] > cell[None, :]) & active
+        self.desired += self.increments * active
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            adjust = active & (((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1)))
+            if not adjust.any():
+                continue
+            step = np.sign(d)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                parabolic = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                neighbour = np.where(step > 0, i + 1, i - 1)
+                columns = np.arange(q.shape[1])
+                linear = q[i] + step * (q[neighbour, columns] - q[i]) / (n[neighbour, columns] - n[i])
+            new_height = np.where((q[i - 1] < parabolic) & (parabolic < q[i + 1]), parabolic, linear)
+            q[i] = np.where(adjust, new_height, q[i])
+            n[i] = np.where(adjust, n[i] + step, n[i])
+
+    @property
+    def count(self) -> int:
+        """观测最多的分量的观测数"""
+        return int(self.counts.max(initial=0))
+
+    @property
+    def value(self) -> np.ndarray:
+        """当前分位数估计，样本少于5个的分量直接由样本计算，没有样本的分量为NaN"""
+        value = self.heights[2].copy()
+        for count in range(5):
+            columns = np.flatnonzero(self.counts == count)
+            if columns.size:
+                value[columns] = (np.nan if count == 0 else
+                                  np.quantile(self._initial[:count, columns], self.p, axis=0))
+        return value
+
+
+class StreamingStatistics:
+    """
+    固定能量网格上的流式统计量
+
+    能量网格没有覆盖到的点记为NaN，不参与该点的统计：均值和方差按各点的样本数，
+    协方差按两点同时有数据的样本数分别累积。
+    """
+
+    def __init__(self, energies: np.ndarray, quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+                 covariance: bool = True):
+        """
+        Args:
+            energies: 能量网格，后续样本会插值到该网格上
+            quantiles: 需要估计的分位数
+            covariance: 是否累积能量间协方差（内存为网格点数平方的3倍）
+        """
+        self.energies = np.asarray(energies, dtype=float)
+        size = self.energies.size
+        self.count = 0  # 并入的实现数
+        self.counts = np.zeros(size, dtype=int)  # 各能量点的样本数
+        self._mean = np.zeros(size)
+        self._m2 = np.zeros(size)
+        if covariance:
+            # 按能量点对累积：样本数、两点同时有数据时第一个点的均值、协矩
+            self._pair_counts = np.zeros((size, size), dtype=int)
+            self._pair_mean = np.zeros((size, size))
+            self._comoment = np.zeros((size, size))
+        else:
+            self._comoment = None
+        self.quantile_estimators = {p: P2Quantile(p, size) for p in quantiles}
+
+    def add(self, values: np.ndarray, energies: Optional[np.ndarray] = None):
+        """
+        并入一次实现
+
+        Args:
+            values: 截面，NaN表示该点没有数据
+            energies: 对应能量，与统计网格不同时先线性插值，网格范围以外的点没有数据
+        """
+        values = np.asarray(values, dtype=float)
+        if energies is not None and not np.array_equal(energies, self.energies):
+            values = np.interp(self.energies, energies, values, left=np.nan, right=np.nan)
+
+        self.count += 1
+        valid = ~np.isnan(values)
+        x = np.where(valid, values, 0.0)
+        self.counts += valid
+        delta = np.where(valid, x - self._mean, 0.0)
+        self._mean += delta / np.maximum(self.counts, 1)
+        self._m2 += delta * (x - self._mean)
+        if self._comoment is not None:
+            joint = np.outer(valid, valid)
+            self._pair_counts += joint
+            delta = np.where(joint, x[:, None] - self._pair_mean, 0.0)
+            self._pair_mean += delta / np.maximum(self._pair_counts, 1)
+            # 第二个点的均值就是转置位置上的值
+            self._comoment += delta * np.where(joint, x[None, :] - self._pair_mean.T, 0.0)
+        for estimator in self.quantile_estimators.values():
+            estimator.add(values)
+
+    @property
+    def mean(self) -> np.ndarray:
+        """均值，没有样本的点为NaN"""
+        return np.where(self.counts > 0, self._mean, np.nan)
+
+    @property
+    def variance(self) -> np.ndarray:
+        """样本方差（无偏），样本少于2个的点为NaN"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.counts > 1, self._m2 / (self.counts - 1), np.nan)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    @property
+    def relative_std(self) -> np.ndarray:
+        """相对标准差，均值为0处为NaN"""
+        mean = self.mean
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(mean != 0, self.std / np.abs(mean), np.nan)
+
+    @property
+    def covariance(self) -> Optional[np.ndarray]:
+        """能量间协方差矩阵（无偏），同时有数据的样本少于2个的点对为NaN"""
+        if self._comoment is None:
+            return None
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self._pair_counts > 1, self._comoment / (self._pair_counts - 1), np.nan)
+
+    @property
+    def correlation(self) -> Optional[np.ndarray]:
+        """能量间相关系数矩阵"""
+        covariance = self.covariance
+        if covariance is None:
+            return None
+        std = np.sqrt(np.diag(covariance))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return covariance / np.outer(std, std)
+
+    def quantile(self, p: float) -> np.ndarray:
+        """分位数估计"""
+        return self.quantile_estimators[p].value
+
+
+class MonteCarloDriver(LoggerMixin):
+    """蒙特卡罗不确定度传播驱动"""
+
+    def __init__(self, base_parameters: Dict[str, Any], distributions: Dict[str, Distribution],
+                 channels: Sequence[str], max_workers: Optional[int] = None,
+                 quantiles: Sequence[float] = (0.05, 0.5, 0.95), covariance: bool = True,
+                 runner: Optional[Callable[[Dict[str, Any], Sequence[str]], ChannelData]] = None):
+        """
+        初始化驱动
+
+        Args:
+            base_parameters: 基础参数
+            distributions: 参数名 -> 抽样分布
+            channels: 需要统计的反应道文件名
+            max_workers: 同时运行的计算数，默认为CPU核数
+            quantiles: 需要估计的分位数
+            covariance: 是否累积能量间协方差
+            runner: 计算单个实现的函数，默认调用TALYS
+        """
+        self.base_parameters = dict(base_parameters)
+        self.distributions = dict(distributions)
+        self.channels = list(channels)
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.quantiles = tuple(quantiles)
+        self.covariance = covariance
+        self.runner = runner or run_talys_channels
+
+        self.statistics: Dict[str, StreamingStatistics] = {}
+        self.parameter_statistics = StreamingStatistics(np.arange(len(self.distributions)),
+                                                        quantiles=(), covariance=True)
+        self.completed = 0
+        self.failed = 0
+        self._cancelled = False
+
+    def sample_point(self, rng: np.random.Generator) -> Dict[str, Any]:
+        """抽取一组模型参数"""
+        return {name: distribution.sample(rng) for name, distribution in self.distributions.items()}
+
+    def cancel(self):
+        """停止提交新的实现，已在运行的计算会完成"""
+        self._cancelled = True
+
+    def _fold(self, point: Dict[str, Any], data: ChannelData):
+        """把一次实现并入统计量，随后丢弃原始数据"""
+        for channel, (energy, value) in data.items():
+            if channel not in self.statistics:
+                self.statistics[channel] = StreamingStatistics(energy, self.quantiles, self.covariance)
+            self.statistics[channel].add(value, energy)
+
+        numeric = [float(value) if isinstance(value, (int, float, np.number)) else np.nan
+                   for value in point.values()]
+        self.parameter_statistics.add(np.array(numeric))
+        self.completed += 1
+
+    def run(self, n_samples: int, seed: Optional[int] = None,
+            progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, StreamingStatistics]:
+        """
+        运行蒙特卡罗抽样
+
+        参数在主线程中逐个抽取，在途计算不超过 max_workers 个，
+        结果在主线程中并入统计量，不保存任何一次实现的完整输出。
+
+        Args:
+            n_samples: 实现次数
+            seed: 随机种子
+            progress_callback: 每完成一次实现调用一次，参数为 (已完成数, 总数)
+
+        Returns:
+            Dict: 反应道 -> 流式统计量
+        """
+        self._cancelled = False
+        rng = np.random.default_rng(seed)
+        pending: Dict[Future, Dict[str, Any]] = {}
+        submitted = 0
+        finished = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or (submitted < n_samples and not self._cancelled):
+                while submitted < n_samples and not self._cancelled and len(pending) < self.max_workers:
+                    point = self.sample_point(rng)
+                    parameters = {**self.base_parameters, **point}
+                    pending[executor.submit(self.runner, parameters, self.channels)] = point
+                    submitted += 1
+                if not pending:
+                    break
+
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    point = pending.pop(future)
+                    try:
+                        self._fold(point, future.result())
+                    except Exception as e:
+                        self.failed += 1
+                        self.logger.error(f"蒙特卡罗实现计算失败 {point}: {e}")
+                    finished += 1
+                    if progress_callback:
+                        progress_callback(finished, n_samples)
+
+        self.logger.info(f"蒙特卡罗抽样完成: 成功{self.completed}次，失败{self.failed}次")
+        return self.statistics
+
+    def summary(self, channel: str) -> Dict[str, np.ndarray]:
+        """
+        获取某个反应道的统计摘要
+
+        Returns:
+            Dict: energies、mean、std、relative_std 以及各分位数 (键为 'q0.05' 等)
+        """
+        statistics = self.statistics[channel]
+        summary = {
+            'energies': statistics.energies,
+            'mean': statistics.mean,
+            'std': statistics.std,
+            'relative_std': statistics.relative_std,
+        }
+        for p in self.quantiles:
+            summary[f'q{p:g}'] = statistics.quantile(p)
+        return summary
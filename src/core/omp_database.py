@@ -0,0 +1,280 @@
+"""
+RIPL光学模型参数库模块
+解析RIPL格式的 om-parameter-u.dat，建立 (Z, A, 入射粒子, 参考编号) 索引并缓存为二进制文件
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+from utils.data_cache import get_cache_file
+
+# (Z, A) -> TALYS入射粒子符号
+PROJECTILES = {
+    (0, 1): 'n',
+    (1, 1): 'p',
+    (1, 2): 'd',
+    (1, 3): 't',
+    (2, 3): 'h',
+    (2, 4): 'a',
+}
+
+# RIPL中6类势的固定顺序
+POTENTIAL_TYPES = [
+    'real_volume',
+    'imag_volume',
+    'real_surface',
+    'imag_surface',
+    'real_spin_orbit',
+    'imag_spin_orbit',
+]
+
+INDEX_DTYPE = np.dtype([
+    ('iref', np.int32),
+    ('zmin', np.int16),
+    ('zmax', np.int16),
+    ('amin', np.int16),
+    ('amax', np.int16),
+    ('projectile', 'U1'),
+    ('imodel', np.int8),
+    ('emin', np.float64),
+    ('emax', np.float64),
+    ('offset', np.int64),
+    ('length', np.int64),
+    ('author', 'U80'),
+])
+
+_SEPARATOR = re.compile(rb'^\+{20,}[ \t]*\r?$', re.MULTILINE)
+_FORTRAN_EXPONENT = re.compile(r'([0-9.])([+-]\d+)$')
+
+
+def fortran_float(text: str) -> float:
+    """
+    解析Fortran格式的浮点数
+
+    支持省略 E 的指数写法（如 '.00000+0'、'-3.00000-1'）以及 D 指数。
+
+    Args:
+        text: 数字文本
+
+    Returns:
+        float: 数值，空字段返回0.0
+    """
+    text = text.strip().replace('D', 'E').replace('d', 'e')
+    if not text:
+        return 0.0
+    try:
+        return float(text)
+    except ValueError:
+        return float(_FORTRAN_EXPONENT.sub(r'\1E\2', text))
+
+
+def _fortran_values(lines: List[str]) -> np.ndarray:
+    """解析若干行Fortran数字"""
+    return np.array([fortran_float(token) for line in lines for token in line.split()])
+
+
+def _int_fields(line: str) -> List[int]:
+    """解析一行I5整数"""
+    return [int(token) for token in line.split()]
+
+
+def parse_omp_entry(text: str) -> Dict[str, Any]:
+    """
+    解析单个RIPL光学势条目
+
+    Args:
+        text: 条目文本（不含 '+++' 分隔行）
+
+    Returns:
+        Dict: 条目内容，potentials 中每类势是按能量区间排列的系数列表；
+        模型相关的耦合道/形变数据保留为原始行 model_data
+    """
+    lines = text.splitlines()
+    zmin, zmax = _int_fields(lines[8])[:2]
+    amin, amax = _int_fields(lines[9])[:2]
+    imodel, izproj, iaproj, irel, idr = (_int_fields(lines[10]) + [0] * 5)[:5]
+
+    entry: Dict[str, Any] = {
+        'iref': int(lines[0]),
+        'author': lines[1].strip(),
+        'reference': lines[2].strip(),
+        'summary': ' '.join(line.strip() for line in lines[3:7] if line.strip()),
+        'emin': fortran_float(lines[7][:10]),
+        'emax': fortran_float(lines[7][10:20]),
+        'z_range': (zmin, zmax),
+        'a_range': (amin, amax),
+        'imodel': imodel,
+        'projectile': PROJECTILES.get((izproj, iaproj), '?'),
+        'irel': irel,
+        'idr': idr,
+    }
+
+    pos = 11
+    potentials: Dict[str, List[Dict[str, Any]]] = {}
+    for name in POTENTIAL_TYPES:
+        jrange = int(lines[pos])
+        pos += 1
+        ranges = []
+        for _ in range(abs(jrange)):
+            # EPOT + RCO(2行) + ACO(2行) + POT(4行)
+            ranges.append({
+                'energy_max': fortran_float(lines[pos]),
+                'rco': _fortran_values(lines[pos + 1:pos + 3]),
+                'aco': _fortran_values(lines[pos + 3:pos + 5]),
+                'pot': _fortran_values(lines[pos + 5:pos + 9]),
+            })
+            pos += 9
+        potentials[name] = ranges
+    entry['potentials'] = potentials
+
+    jcoul = int(lines[pos])
+    pos += 1
+    entry['coulomb'] = [_fortran_values([line]) for line in lines[pos:pos + jcoul]]
+    pos += jcoul
+    entry['model_data'] = lines[pos:]
+    return entry
+
+
+class OpticalModelDatabase(LoggerMixin):
+    """RIPL光学模型参数库"""
+
+    def __init__(self, file_path: Union[str, Path],
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 use_cache: bool = True):
+        """
+        初始化参数库，优先从二进制缓存加载索引
+
+        Args:
+            file_path: om-parameter-u.dat 路径
+            cache_dir: 缓存目录，默认使用配置中的 CACHE_DIR
+            use_cache: 是否读写索引缓存
+        """
+        self.file_path = Path(file_path)
+        self.index = self._load_index(cache_dir, use_cache)
+        self._entries: Dict[int, Dict[str, Any]] = {}
+
+    def _load_index(self, cache_dir: Optional[Union[str, Path]], use_cache: bool) -> np.ndarray:
+        """加载或重建索引"""
+        if not use_cache:
+            return self.build_index()
+
+        cache_file = get_cache_file(self.file_path, 'omp', '.npy', cache_dir)
+        if cache_file.exists():
+            try:
+                index = np.load(cache_file, allow_pickle=False)
+                if index.dtype == INDEX_DTYPE:
+                    self.logger.debug(f"从缓存加载光学势索引: {cache_file}")
+                    return index
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"光学势索引缓存损坏，将重建: {e}")
+
+        index = self.build_index()
+        try:
+            np.save(cache_file, index, allow_pickle=False)
+        except OSError as e:
+            self.logger.warning(f"写入光学势索引缓存失败: {e}")
+        return index
+
+    def build_index(self) -> np.ndarray:
+        """
+        扫描参数文件建立索引
+
+        Returns:
+            np.ndarray: INDEX_DTYPE 结构化数组，每个条目一行
+        """
+        with open(self.file_path, 'rb') as f:
+            data = f.read()
+
+        spans = []
+        start = 0
+        for match in _SEPARATOR.finditer(data):
+            spans.append((start, match.start()))
+            start = match.end() + 1
+        if data[start:].strip():
+            spans.append((start, len(data)))
+
+        index = np.zeros(len(spans), dtype=INDEX_DTYPE)
+        for row, (begin, end) in enumerate(spans):
+            head = data[begin:end].split(b'\n', 11)[:11]
+            lines = [line.decode('latin-1') for line in head]
+            imodel, izproj, iaproj = (_int_fields(lines[10]) + [0] * 3)[:3]
+            index[row] = (
+                int(lines[0]),
+                *_int_fields(lines[8])[:2],
+                *_int_fields(lines[9])[:2],
+                PROJECTILES.get((izproj, iaproj), '?'),
+                imodel,
+                fortran_float(lines[7][:10]),
+                fortran_float(lines[7][10:20]),
+                begin,
+                end - begin,
+                lines[1].strip()[:80],
+            )
+
+        self.logger.info(f"光学势索引建立完成，共{len(index)}个条目")
+        return index
+
+    def candidates(self, z: int, a: int, projectile: Optional[str] = None) -> np.ndarray:
+        """
+        列出适用于指定核素的全部光学势
+
+        Args:
+            z: 靶核原子序数
+            a: 靶核质量数
+            projectile: 入射粒子符号，None表示不限
+
+        Returns:
+            np.ndarray: 满足条件的索引行
+        """
+        idx = self.index
+        mask = (idx['zmin'] <= z) & (z <= idx['zmax']) & (idx['amin'] <= a) & (a <= idx['amax'])
+        if projectile is not None:
+            mask &= idx['projectile'] == projectile
+        return idx[mask]
+
+    def find(self, z: int, a: int, projectile: str, iref: int) -> Optional[Dict[str, Any]]:
+        """
+        按 (Z, A, 入射粒子, 参考编号) 查找并解析光学势
+
+        Returns:
+            Dict: 解析后的条目，不存在时返回None
+        """
+        rows = self.candidates(z, a, projectile)
+        rows = rows[rows['iref'] == iref]
+        if rows.size == 0:
+            return None
+        return self.read_entry(int(rows[0]['iref']))
+
+    def read_entry(self, iref: int) -> Dict[str, Any]:
+        """
+        读取并解析指定参考编号的条目，结果在内存中缓存
+
+        Args:
+            iref: RIPL参考编号
+
+        Returns:
+            Dict: 解析后的条目
+        """
+        if iref in self._entries:
+            return self._entries[iref]
+
+        rows = self.index[self.index['iref'] == iref]
+        if rows.size == 0:
+            raise KeyError(f"光学势参数库中没有参考编号 {iref}")
+
+        with open(self.file_path, 'rb') as f:
+            f.seek(int(rows[0]['offset']))
+            text = f.read(int(rows[0]['length'])).decode('latin-1')
+
+        entry = parse_omp_entry(text)
+        self._entries[iref] = entry
+        return entry
+
+    def __len__(self) -> int:
+        return len(self.index)
@@ -0,0 +1,348 @@
+"""
+TALYS输出清单读取模块
+一次扫描标准输出（out）建立分立能级表和按宇称能级密度表的块索引，
+按原子核、势垒和宇称按需解析为NumPy数组，绘图时不必重新读取整个清单
+"""
+
+import mmap
+import re
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+from core.resampling import result_id
+
+# 块类型
+DISCRETE_LEVELS = 0
+LEVEL_DENSITY = 1
+
+SECTION_INDEX_DTYPE = np.dtype([
+    ('kind', np.int8),
+    ('z', np.int32),
+    ('n', np.int32),
+    ('barrier', np.int32),  # 0为基态，1起为裂变位垒
+    ('offset', np.int64),
+    ('length', np.int64),
+])
+
+DISCRETE_LEVEL_DTYPE = np.dtype([
+    ('number', np.int32),
+    ('energy', np.float64),  # MeV
+    ('spin', np.float64),
+    ('parity', np.int8),  # +1/-1
+    ('lifetime', np.float64),  # 秒，未给出为NaN
+    ('jp', 'U24'),  # ENSDF中的自旋宇称，没有时为空
+    ('assignment', 'U24'),  # 自旋宇称的来源标记和说明，如 'J'、'X'、'JP level density'
+])
+
+BRANCHING_DTYPE = np.dtype([
+    ('level', np.int32),
+    ('final', np.int32),
+    ('ratio', np.float64),  # %
+])
+
+# 块标题；能级密度块本身不含原子核，取之前最近的 "Level density parameters" 行
+_SECTION = re.compile(
+    rb'^ (?:Level density parameters for Z=\s*(?P<ldz>\d+) N=\s*(?P<ldn>\d+)'
+    rb'|Discrete levels of Z=\s*(?P<dz>\d+) N=\s*(?P<dn>\d+)'
+    rb'|Level density per parity for (?:ground state|fission barrier\s+(?P<barrier>\d+)))',
+    re.MULTILINE)
+_DISCRETE_END = re.compile(rb'^ Level density parameters', re.MULTILINE)
+_LEVEL_DENSITY_END = re.compile(rb'^ (?:Normalization:|Discrete levels versus total level density)', re.MULTILINE)
+_SPIN = re.compile(r'JP=\s*(\S+)')
+_BRANCH = re.compile(r'^\s*--->\s*(\d+)\s+(\S+)')
+
+# 缓存的输出清单个数
+LISTING_CACHE_SIZE = 8
+
+
+class LevelDensityTable:
+    """一个原子核（基态或某个裂变位垒）一种宇称的能级密度表"""
+
+    def __init__(self, z: int, n: int, barrier: int, parity: int, spins: np.ndarray,
+                 ex: np.ndarray, a: np.ndarray, sigma: np.ndarray, total: np.ndarray, rho: np.ndarray,
+                 extra: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Args:
+            z, n: 质子数和中子数
+            barrier: 0为基态，1起为裂变位垒
+            parity: +1/-1，宇称无关的表为0
+            spins: 各列的自旋J
+            ex: 激发能 (MeV)
+            a: 能级密度参数（表格模型不输出，为NaN）
+            sigma: 自旋截断参数（同上）
+            total: 该宇称的总能级密度 (MeV^-1)
+            rho: (激发能数, 自旋数) 各自旋的能级密度
+            extra: 表头中自旋之后的其他列（如集体增强因子 Krot、Kvib、Kcoll）
+        """
+        self.z = z
+        self.n = n
+        self.barrier = barrier
+        self.parity = parity
+        self.spins = spins
+        self.ex = ex
+        self.a = a
+        self.sigma = sigma
+        self.total = total
+        self.rho = rho
+        self.extra = extra or {}
+
+    @property
+    def mass(self) -> int:
+        return self.z + self.n
+
+    def __len__(self) -> int:
+        return len(self.ex)
+
+
+def parse_level_density_block(text: str, z: int, n: int, barrier: int) -> Dict[int, LevelDensityTable]:
+    """
+    解析 "Level density per parity" 块
+
+    每行为 Ex、a、sigma、总能级密度、表头中各 JP 的能级密度以及其他列；表格模型不输出 a 和 sigma，
+    据每行的数字个数区分。没有 "Positive/Negative parity" 小标题的表与宇称无关，记为宇称0。
+
+    Returns:
+        Dict: 宇称(+1/-1/0) -> LevelDensityTable
+    """
+    spins = None
+    extra: List[str] = []
+    rows: Dict[int, List[List[float]]] = {}
+    parity = 0
+    for line in text.splitlines():
+        stripped = line.strip()
+        if 'JP=' in line:
+            spins = np.array([float(value) for value in _SPIN.findall(line)])
+            extra = line[list(_SPIN.finditer(line))[-1].end():].split()
+        elif stripped.startswith('Positive parity'):
+            parity = 1
+        elif stripped.startswith('Negative parity'):
+            parity = -1
+        elif spins is not None and stripped:
+            try:
+                values = [float(token) for token in stripped.split()]
+            except ValueError:
+                break
+            if len(values) in (len(spins) + 2, len(spins) + 2 + len(extra)):
+                values = values[:1] + [np.nan, np.nan] + values[1:]
+            if len(values) not in (len(spins) + 4, len(spins) + 4 + len(extra)):
+                continue
+            rows.setdefault(parity, []).append(values)
+
+    tables = {}
+    for parity, values in rows.items():
+        width = max(len(row) for row in values)
+        data = np.array([row + [np.nan] * (width - len(row)) for row in values])
+        columns = data[:, 4 + len(spins):]
+        tables[parity] = LevelDensityTable(
+            z, n, barrier, parity, spins, data[:, 0], data[:, 1], data[:, 2], data[:, 3],
+            data[:, 4:4 + len(spins)], {name: columns[:, i] for i, name in enumerate(extra[:columns.shape[1]])})
+    return tables
+
+
+def parse_discrete_levels_block(text: str) -> Dict[str, np.ndarray]:
+    """
+    解析 "Discrete levels of Z= .. N= .." 块
+
+    能级行为编号、能量、自旋、宇称，之后按表头的列位置取寿命、赋值标记和ENSDF自旋宇称：
+    ENSDF自旋宇称右对齐到 "ENSDF" 表头之后一列，没有到达该列的文字（如 'X'、
+    'JP   level density'）属于赋值标记列。"--->" 行为该能级的γ分支比。
+
+    Returns:
+        Dict: 'levels' (DISCRETE_LEVEL_DTYPE)，'branching' (BRANCHING_DTYPE)
+    """
+    levels = []
+    branches = []
+    lifetime_start = lifetime_end = jp_end = None
+    for line in text.splitlines():
+        if lifetime_start is None:
+            position = line.find('Lifetime(sec)')
+            if position >= 0:
+                # 寿命为右对齐的E格式，与表头 "Lifetime(sec)" 的位置大致对齐
+                lifetime_start, lifetime_end = position - 4, position + len('Lifetime(sec)')
+                ensdf = line.find('ENSDF')
+                jp_end = ensdf + len('ENSDF') + 1 if ensdf >= 0 else None
+            continue
+        branch = _BRANCH.match(line)
+        if branch:
+            if levels:
+                branches.append((levels[-1][0], int(branch.group(1)), float(branch.group(2))))
+            continue
+        tokens = line.split()
+        if len(tokens) < 4 or not tokens[0].isdigit():
+            continue
+        lifetime = line[lifetime_start:lifetime_end].strip()
+        rest = line[lifetime_end:jp_end].split()
+        jp = ''
+        if rest and (jp_end is None or line[jp_end - 1:jp_end].strip()):
+            jp = rest.pop()
+        levels.append((int(tokens[0]), float(tokens[1]), float(tokens[2]), 1 if tokens[3] == '+' else -1,
+                       float(lifetime) if lifetime else np.nan, jp, ' '.join(rest)))
+
+    return {'levels': np.array(levels, dtype=DISCRETE_LEVEL_DTYPE),
+            'branching': np.array(branches, dtype=BRANCHING_DTYPE)}
+
+
+class OutputListing(LoggerMixin):
+    """TALYS输出清单（按块建立索引、按需解析）"""
+
+    def __init__(self, source: Union[str, Path, bytes]):
+        """
+        初始化读取器并建立块索引
+
+        Args:
+            source: 输出文件路径（内存映射读取），或已读入的输出内容
+        """
+        self._file = None
+        if isinstance(source, bytes):
+            self._data: Union[bytes, mmap.mmap] = source
+        else:
+            self._file = open(source, 'rb')
+            try:
+                self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self._data = b''  # 空文件
+        self.index = self.build_index()
+        self._blocks: Dict[int, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_text(cls, text: str) -> 'OutputListing':
+        """由标准输出文本创建"""
+        return cls(text.encode('utf-8'))
+
+    def build_index(self) -> np.ndarray:
+        """
+        扫描清单建立块索引，只匹配标题行，不解析块内容
+
+        Returns:
+            np.ndarray: SECTION_INDEX_DTYPE 结构化数组，每个分立能级表或能级密度表一行
+        """
+        data = self._data
+        starts = []
+        nucleus = (0, 0)
+        for match in _SECTION.finditer(data):
+            if match.group('ldz'):
+                nucleus = (int(match.group('ldz')), int(match.group('ldn')))
+            elif match.group('dz'):
+                starts.append((DISCRETE_LEVELS, int(match.group('dz')), int(match.group('dn')), 0, match.start()))
+            else:
+                barrier = int(match.group('barrier') or 0)
+                starts.append((LEVEL_DENSITY, nucleus[0], nucleus[1], barrier, match.start()))
+
+        index = np.zeros(len(starts), dtype=SECTION_INDEX_DTYPE)
+        for row, (kind, z, n, barrier, start) in enumerate(starts):
+            stop = starts[row + 1][4] if row + 1 < len(starts) else len(data)
+            end = (_DISCRETE_END if kind == DISCRETE_LEVELS else _LEVEL_DENSITY_END).search(data, start, stop)
+            index[row] = (kind, z, n, barrier, start, (end.start() if end else stop) - start)
+
+        self.logger.debug(f"输出清单索引建立完成，共{len(index)}个表")
+        return index
+
+    def _find(self, kind: int, z: int, n: int, barrier: int = 0) -> int:
+        rows = np.flatnonzero((self.index['kind'] == kind) & (self.index['z'] == z) &
+                              (self.index['n'] == n) & (self.index['barrier'] == barrier))
+        if not rows.size:
+            raise KeyError((z, n, barrier))
+        return int(rows[0])
+
+    def read_text(self, row: int) -> str:
+        """读取指定块的原始文本"""
+        entry = self.index[row]
+        start = int(entry['offset'])
+        return bytes(self._data[start:start + int(entry['length'])]).decode('utf-8', errors='replace')
+
+    def _block(self, row: int) -> Any:
+        with self._lock:
+            if row in self._blocks:
+                return self._blocks[row]
+        entry = self.index[row]
+        text = self.read_text(row)
+        if entry['kind'] == DISCRETE_LEVELS:
+            block = parse_discrete_levels_block(text)
+        else:
+            block = parse_level_density_block(text, int(entry['z']), int(entry['n']), int(entry['barrier']))
+        with self._lock:
+            self._blocks[row] = block
+        return block
+
+    def nuclides(self) -> List[Tuple[int, int]]:
+        """有能级密度或分立能级表的原子核 (Z, N)，按出现顺序"""
+        seen = OrderedDict()
+        for entry in self.index:
+            seen[(int(entry['z']), int(entry['n']))] = None
+        return list(seen)
+
+    def barriers(self, z: int, n: int) -> List[int]:
+        """某个原子核有能级密度表的基态(0)和裂变位垒编号"""
+        rows = (self.index['kind'] == LEVEL_DENSITY) & (self.index['z'] == z) & (self.index['n'] == n)
+        return sorted(int(barrier) for barrier in self.index['barrier'][rows])
+
+    def discrete_levels(self, z: int, n: int) -> Dict[str, np.ndarray]:
+        """
+        某个原子核的分立能级
+
+        Returns:
+            Dict: 'levels' (DISCRETE_LEVEL_DTYPE)，'branching' (BRANCHING_DTYPE)
+        """
+        return self._block(self._find(DISCRETE_LEVELS, z, n))
+
+    def level_density(self, z: int, n: int, parity: int = 1, barrier: int = 0) -> LevelDensityTable:
+        """
+        某个原子核基态或裂变位垒一种宇称的能级密度
+
+        Args:
+            z, n: 质子数和中子数
+            parity: +1/-1；宇称无关的表（宇称0）对两种宇称都返回
+            barrier: 0为基态，1起为裂变位垒
+        """
+        tables = self._block(self._find(LEVEL_DENSITY, z, n, barrier))
+        if parity not in tables:
+            parity = 0
+        if parity not in tables:
+            raise KeyError((z, n, barrier, parity))
+        return tables[parity]
+
+    def level_densities(self) -> Dict[Tuple[int, int, int, int], LevelDensityTable]:
+        """全部能级密度表，键为 (Z, N, 势垒, 宇称)"""
+        tables = {}
+        for row in np.flatnonzero(self.index['kind'] == LEVEL_DENSITY):
+            for parity, table in self._block(int(row)).items():
+                tables[(table.z, table.n, table.barrier, parity)] = table
+        return tables
+
+    def close(self):
+        """关闭文件"""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+# 按计算缓存的输出清单
+_listings: "OrderedDict[str, OutputListing]" = OrderedDict()
+_listings_lock = threading.Lock()
+
+def get_output_listing(results: Mapping[str, Any]) -> OutputListing:
+    """取得一次计算标准输出的清单（按 result_id 缓存，首次调用时建立索引）"""
+    rid = result_id(results)
+    with _listings_lock:
+        if rid in _listings:
+            _listings.move_to_end(rid)
+            return _listings[rid]
+    listing = OutputListing.from_text(results.get('stdout') or "")
+    with _listings_lock:
+        _listings[rid] = listing
+        while len(_listings) > LISTING_CACHE_SIZE:
+            _listings.popitem(last=False)[1].close()
+    return listing
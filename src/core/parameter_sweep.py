@@ -0,0 +1,368 @@
+"""
+参数扫描模块
+按全因子、拉丁超立方或随机设计生成参数点，惰性生成输入并有限并行地运行TALYS，
+跳过已计算过的参数点，把结果汇总为 (参数点 × 反应道 × 能量) 三维数组
+"""
+
+import itertools
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from utils.logger import LoggerMixin
+from core.yandf import read_yandf_file
+from core.talys_interface import TalysInterface
+from core.input_deck import InputDeck
+
+# 单个参数点的反应道数据：反应道文件名 -> (能量数组, 数值数组)
+ChannelData = Dict[str, Tuple[np.ndarray, np.ndarray]]
+
+
+class Range(NamedTuple):
+    """连续参数的取值范围（用于拉丁超立方和随机设计）"""
+    low: float
+    high: float
+    log: bool = False
+
+
+ParameterSpace = Dict[str, Union[Sequence[Any], Range]]
+
+
+def full_factorial(space: ParameterSpace) -> Iterator[Dict[str, Any]]:
+    """
+    全因子设计，逐个生成参数点
+
+    Args:
+        space: 参数名 -> 离散取值列表
+
+    Yields:
+        Dict: 参数点
+    """
+    names = list(space)
+    for name in names:
+        if isinstance(space[name], Range):
+            raise ValueError(f"全因子设计需要离散取值，参数 {name} 是连续范围")
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def _map_unit_samples(space: ParameterSpace, samples: np.ndarray) -> Iterator[Dict[str, Any]]:
+    """把 [0, 1) 上的样本映射到参数取值"""
+    names = list(space)
+    columns = []
+    for column, name in enumerate(names):
+        dimension = space[name]
+        u = samples[:, column]
+        if isinstance(dimension, Range):
+            if dimension.log:
+                low, high = np.log(dimension.low), np.log(dimension.high)
+                columns.append(np.exp(low + u * (high - low)).tolist())
+            else:
+                columns.append((dimension.low + u * (dimension.high - dimension.low)).tolist())
+        else:
+            choices = list(dimension)
+            picks = np.minimum((u * len(choices)).astype(int), len(choices) - 1)
+            columns.append([choices[i] for i in picks])
+
+    for values in zip(*columns):
+        yield dict(zip(names, values))
+
+
+def latin_hypercube(space: ParameterSpace, n_points: int,
+                    seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    拉丁超立方设计
+
+    离散参数按分层样本均匀映射到各取值，连续参数在 Range 内线性或对数映射。
+
+    Args:
+        space: 参数空间
+        n_points: 参数点数
+        seed: 随机种子
+
+    Yields:
+        Dict: 参数点
+    """
+    from scipy.stats import qmc
+
+    samples = qmc.LatinHypercube(d=len(space), seed=seed).random(n_points)
+    yield from _map_unit_samples(space, samples)
+
+
+def random_design(space: ParameterSpace, n_points: int,
+                  seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    均匀随机设计
+
+    Args:
+        space: 参数空间
+        n_points: 参数点数
+        seed: 随机种子
+
+    Yields:
+        Dict: 参数点
+    """
+    samples = np.random.default_rng(seed).random((n_points, len(space)))
+    yield from _map_unit_samples(space, samples)
+
+
+def point_key(parameters: Dict[str, Any]) -> str:
+    """
+    计算完整参数集的唯一键，即规范化输入卡片的摘要，参数顺序和数值写法不影响结果
+
+    Args:
+        parameters: 完整参数字典（基础参数 + 扫描参数）
+
+    Returns:
+        str: 16位十六进制摘要
+    """
+    return InputDeck.from_parameters(parameters).cache_key()
+
+
+def read_channels(directory: Union[str, Path], channels: Sequence[str]) -> ChannelData:
+    """
+    从计算目录读取指定反应道文件的前两列（能量、截面）
+
+    Args:
+        directory: TALYS工作目录
+        channels: 反应道文件名，如 'total.tot'、'nn.L01'
+
+    Returns:
+        ChannelData: 存在的反应道数据
+    """
+    data: ChannelData = {}
+    for channel in channels:
+        path = Path(directory) / channel
+        if path.exists():
+            _, values = read_yandf_file(path)
+            if values.ndim == 2 and values.shape[1] >= 2:
+                data[channel] = (values[:, 0].copy(), values[:, 1].copy())
+    return data
+
+
+def run_talys_channels(parameters: Dict[str, Any], channels: Sequence[str]) -> ChannelData:
+    """
+    在独立工作目录中运行一次TALYS并读取指定反应道，随后删除工作目录
+
+    Args:
+        parameters: 计算参数
+        channels: 反应道文件名
+
+    Returns:
+        ChannelData: 反应道数据
+    """
+    interface = TalysInterface()
+    try:
+        interface.run_calculation(parameters)
+        return read_channels(interface.temp_dir, channels)
+    finally:
+        interface.cleanup_temp_directory()
+
+
+class SweepResult:
+    """参数扫描结果"""
+
+    def __init__(self, points: List[Dict[str, Any]], keys: List[str], channels: List[str],
+                 energies: np.ndarray, values: np.ndarray, failures: Dict[str, str]):
+        """
+        Args:
+            points: 参数点（只含扫描参数）
+            keys: 各参数点的唯一键
+            channels: 反应道名
+            energies: 公共能量网格（各参数点能量的并集）
+            values: 形状 (参数点, 反应道, 能量)，缺失为NaN
+            failures: 失败参数点的键 -> 错误信息
+        """
+        self.points = points
+        self.keys = keys
+        self.channels = channels
+        self.energies = energies
+        self.values = values
+        self.failures = failures
+
+    def parameter_values(self, name: str) -> np.ndarray:
+        """某个扫描参数在各参数点上的取值"""
+        return np.array([point.get(name) for point in self.points])
+
+    def channel(self, channel: str) -> np.ndarray:
+        """某个反应道在各参数点上的数据，形状 (参数点, 能量)"""
+        return self.values[:, self.channels.index(channel), :]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+
+class ParameterSweep(LoggerMixin):
+    """参数扫描引擎"""
+
+    def __init__(self, base_parameters: Dict[str, Any], channels: Sequence[str],
+                 max_workers: Optional[int] = None,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 use_cache: bool = True,
+                 runner: Optional[Callable[[Dict[str, Any], Sequence[str]], ChannelData]] = None):
+        """
+        初始化扫描引擎
+
+        Args:
+            base_parameters: 基础参数（与 TalysInterface.run_calculation 的参数相同）
+            channels: 需要汇总的反应道文件名
+            max_workers: 同时运行的计算数，默认为CPU核数
+            cache_dir: 已计算参数点的缓存目录，默认使用 CACHE_DIR/sweep
+            use_cache: 是否读写参数点缓存
+            runner: 计算单个参数点的函数，默认调用TALYS
+        """
+        self.base_parameters = dict(base_parameters)
+        self.channels = list(channels)
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.cache_dir = Path(cache_dir) if cache_dir else Settings.CACHE_DIR / "sweep"
+        self.use_cache = use_cache
+        self.runner = runner or run_talys_channels
+        self._memory: Dict[str, ChannelData] = {}
+        self._cancelled = False
+
+    def cancel(self):
+        """停止提交新的参数点，已在运行的计算会完成"""
+        self._cancelled = True
+
+    def _cache_file(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def _load_cached(self, key: str) -> Optional[ChannelData]:
+        """从内存或磁盘缓存读取参数点结果"""
+        if key in self._memory:
+            return self._memory[key]
+        if not self.use_cache:
+            return None
+
+        cache_file = self._cache_file(key)
+        if not cache_file.exists():
+            return None
+        try:
+            with np.load(cache_file, allow_pickle=False) as cached:
+                # 缓存时未请求过的反应道需要重新计算
+                stored = set(cached['|channels'].tolist()) if '|channels' in cached.files else set()
+                if not set(self.channels) <= stored:
+                    return None
+                data = {channel: (cached[f"{channel}|energy"], cached[f"{channel}|value"])
+                        for channel in self.channels if f"{channel}|energy" in cached.files}
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"参数点缓存损坏，将重新计算: {e}")
+            return None
+        self._memory[key] = data
+        return data
+
+    def _store(self, key: str, data: ChannelData):
+        """保存参数点结果到内存和磁盘缓存"""
+        self._memory[key] = data
+        if not self.use_cache:
+            return
+        arrays = {}
+        for channel, (energy, value) in data.items():
+            arrays[f"{channel}|energy"] = energy
+            arrays[f"{channel}|value"] = value
+        arrays['|channels'] = np.array(self.channels)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            np.savez(self._cache_file(key), **arrays)
+        except OSError as e:
+            self.logger.warning(f"写入参数点缓存失败: {e}")
+
+    def run(self, design: Iterable[Dict[str, Any]],
+            progress_callback: Optional[Callable[[int, Dict[str, Any]], None]] = None) -> SweepResult:
+        """
+        运行参数扫描
+
+        设计点按需从 design 中取出，同时在途的计算不超过 max_workers 个；
+        与已计算参数点（本次或缓存中）完全相同的点直接复用结果。
+
+        Args:
+            design: 参数点序列（可以是生成器）
+            progress_callback: 每完成一个参数点调用一次，参数为 (已完成数, 参数点)
+
+        Returns:
+            SweepResult: 扫描结果
+        """
+        self._cancelled = False
+        points: List[Dict[str, Any]] = []
+        keys: List[str] = []
+        failures: Dict[str, str] = {}
+        # 在途计算 -> (参数集键, 等待该计算结果的参数点)
+        pending: Dict[Future, Tuple[str, List[Dict[str, Any]]]] = {}
+        in_flight: Dict[str, Future] = {}
+        done_count = 0
+
+        def finish(point: Dict[str, Any]):
+            nonlocal done_count
+            done_count += 1
+            if progress_callback:
+                progress_callback(done_count, point)
+
+        design_iter = iter(design)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            exhausted = False
+            while not exhausted or pending:
+                # 补充任务直到在途数量达到上限
+                while not exhausted and not self._cancelled and len(pending) < self.max_workers:
+                    point = next(design_iter, None)
+                    if point is None:
+                        exhausted = True
+                        break
+
+                    parameters = {**self.base_parameters, **point}
+                    key = point_key(parameters)
+                    points.append(dict(point))
+                    keys.append(key)
+
+                    # 相同参数集正在计算时，等该计算完成后再一起结束，失败时同样记为失败
+                    if key in in_flight:
+                        pending[in_flight[key]][1].append(point)
+                        continue
+                    if self._load_cached(key) is not None:
+                        finish(point)
+                        continue
+                    future = executor.submit(self.runner, parameters, self.channels)
+                    pending[future] = (key, [point])
+                    in_flight[key] = future
+
+                if self._cancelled:
+                    exhausted = True
+                if not pending:
+                    continue
+
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    key, waiting = pending.pop(future)
+                    del in_flight[key]
+                    try:
+                        self._store(key, future.result())
+                    except Exception as e:
+                        failures[key] = str(e)
+                        self.logger.error(f"参数点计算失败 {waiting[0]}: {e}")
+                    for point in waiting:
+                        finish(point)
+
+        self.logger.info(f"参数扫描完成: {len(points)}个参数点，{len(set(keys))}个不同参数集，"
+                         f"{len(failures)}个失败")
+        return self._aggregate(points, keys, failures)
+
+    def _aggregate(self, points: List[Dict[str, Any]], keys: List[str],
+                   failures: Dict[str, str]) -> SweepResult:
+        """把各参数点的反应道数据汇总到公共能量网格上的三维数组"""
+        data = [self._memory.get(key, {}) for key in keys]
+        energy_arrays = [energy for point_data in data for energy, _ in point_data.values()]
+        energies = np.unique(np.concatenate(energy_arrays)) if energy_arrays else np.empty(0)
+
+        values = np.full((len(points), len(self.channels), energies.size), np.nan)
+        for row, point_data in enumerate(data):
+            for column, channel in enumerate(self.channels):
+                if channel in point_data:
+                    energy, value = point_data[channel]
+                    values[row, column, np.searchsorted(energies, energy)] = value
+
+        return SweepResult(points, keys, self.channels, energies, values, failures)
@@ -0,0 +1,327 @@
+"""
+不完整计算结果模块
+TALYS超时或被取消时，从已经输出的内容中取出计算完成的入射能量，
+把结果标记为不完整并记录缺失的能量；之后只计算缺失的能量再与之前的结果合并
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import get_logger
+
+# 以入射能量为横坐标的结果分组，只有这些分组按能量筛选和合并
+ENERGY_SECTIONS = ('total_cross_section', 'residual_production', 'exclusive_channels', 'reaction_channels')
+
+# 每个入射能量（或每个出射粒子）一个文件的结果分组，续算后按文件名合并
+FILE_SECTIONS = ('spectra', 'angular', 'gamma_production')
+
+# TALYS写出的入射能量列表文件
+ENERGIES_FILE_NAME = "energies"
+
+# 续算时写给TALYS的能量列表文件（energy 关键字的参数为文件名）
+RESUME_ENERGY_FILE = "resume_energies"
+
+# 判断两个入射能量相同的容差（TALYS输出中的能量有5位小数）
+ENERGY_RTOL = 1e-5
+ENERGY_ATOL = 1e-6
+
+SUMMARY_PATTERN = re.compile(r"#+ REACTION SUMMARY FOR E=\s*(\S+)\s*#+")
+SUMMARY_VALUES = {
+    'Total           =': 'total',
+    'Total elastic   =': 'elastic',
+    'Non-elastic     =': 'nonelastic',
+}
+RESIDUAL_PATTERN = re.compile(r"^\s+(\d+)\s+(\d+)\s+\(\s*\w+\)\s+(\S+)")
+# 反应总结中残余核产生截面之后的一行，出现说明前面的数据已经完整写出
+SUMMARY_END = "Non-elastic cross section"
+
+logger = get_logger(__name__)
+
+
+def parse_reaction_summaries(text: str) -> Dict[float, Dict[str, Any]]:
+    """
+    解析TALYS标准输出中各入射能量的反应总结（REACTION SUMMARY）
+
+    只返回完整的块：被中断的最后一个块缺少残余核产生截面之后的汇总行，不计入。
+
+    Args:
+        text: TALYS标准输出
+
+    Returns:
+        Dict: 入射能量 -> {'total', 'elastic', 'nonelastic', 'residual': {(Z, A): 截面}}
+    """
+    matches = list(SUMMARY_PATTERN.finditer(text))
+    summaries = {}
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        block = text[match.end():end]
+        if SUMMARY_END not in block:
+            continue
+        block = block[:block.index(SUMMARY_END)]
+
+        try:
+            energy = float(match.group(1))
+        except ValueError:
+            continue
+        summary: Dict[str, Any] = {'residual': {}}
+        in_residual = False
+        for line in block.splitlines():
+            stripped = line.strip()
+            for label, key in SUMMARY_VALUES.items():
+                if stripped.startswith(label) and key not in summary:
+                    summary[key] = float(stripped.split('=')[1].split()[0])
+            if stripped.startswith('a. Per isotope'):
+                in_residual = True
+            elif stripped.startswith('b. Per mass'):
+                in_residual = False
+            elif in_residual:
+                residual = RESIDUAL_PATTERN.match(line)
+                if residual:
+                    z, a, xs = residual.groups()
+                    summary['residual'][(int(z), int(a))] = float(xs)
+        summaries[energy] = summary
+    return summaries
+
+
+def requested_energies(parameters: Dict[str, Any], workdir: Optional[Union[str, Path]] = None) -> np.ndarray:
+    """
+    计算要求的全部入射能量
+
+    优先读取TALYS在工作目录中写出的能量列表，否则按参数中的单一能量或 (最小, 最大, 步长) 生成。
+
+    Args:
+        parameters: 计算参数
+        workdir: TALYS工作目录
+
+    Returns:
+        np.ndarray: 升序排列的入射能量 (MeV)，无法确定时为空数组
+    """
+    if workdir is not None and (Path(workdir) / ENERGIES_FILE_NAME).exists():
+        try:
+            energies = np.loadtxt(Path(workdir) / ENERGIES_FILE_NAME, ndmin=1, usecols=0)
+            if energies.size:
+                return np.unique(energies)
+        except ValueError:
+            pass
+
+    if parameters.get('energy_mode') == 'range':
+        start, stop, step = (float(parameters[key]) for key in ('energy_min', 'energy_max', 'energy_step'))
+    else:
+        energy = parameters.get('energy')
+        if isinstance(energy, str):
+            try:
+                values = [float(token) for token in energy.split()]
+            except ValueError:
+                return np.empty(0)  # 能量列表文件名
+        elif isinstance(energy, (list, tuple, np.ndarray)):
+            values = [float(value) for value in energy]
+        elif energy is None:
+            return np.empty(0)
+        else:
+            values = [float(energy)]
+        if len(values) != 3:
+            return np.unique(values)
+        start, stop, step = values
+    if step <= 0:
+        return np.array([start])
+    count = int(np.floor((stop - start) / step + ENERGY_RTOL)) + 1
+    return np.round(start + step * np.arange(count), 10)
+
+
+def energy_mask(energies: Iterable[float], selected: Iterable[float]) -> np.ndarray:
+    """energies 中每个能量是否在 selected 中（按容差比较）"""
+    energies = np.asarray(energies, dtype=float)
+    selected = np.asarray(selected, dtype=float)
+    if not energies.size or not selected.size:
+        return np.zeros(energies.shape, dtype=bool)
+    return np.isclose(energies[:, None], selected[None, :], rtol=ENERGY_RTOL, atol=ENERGY_ATOL).any(axis=1)
+
+
+def _series_columns(series: Dict[str, Any]) -> List[str]:
+    """与 energy 等长的数值列"""
+    length = len(series.get('energy', []))
+    return [key for key, value in series.items()
+            if key != 'header' and isinstance(value, (list, np.ndarray)) and len(value) == length]
+
+
+def select_energies(series: Dict[str, Any], energies: Iterable[float]) -> Dict[str, Any]:
+    """只保留一组截面数据中属于给定入射能量的点"""
+    mask = energy_mask(series.get('energy', []), energies)
+    selected = dict(series)
+    for key in _series_columns(series):
+        selected[key] = np.asarray(series[key], dtype=float)[mask].tolist()
+    return selected
+
+
+def merge_series(previous: Dict[str, Any], resumed: Dict[str, Any]) -> Dict[str, Any]:
+    """合并两组截面数据，能量相同时取续算的值，按能量排序"""
+    previous_columns = _series_columns(previous)
+    columns = [key for key in previous_columns if key in _series_columns(resumed)]
+    keep = ~energy_mask(previous.get('energy', []), resumed.get('energy', []))
+    # 只有一方有的列无法合并，丢弃
+    merged = {key: value for key, value in previous.items() if key not in previous_columns}
+    merged.update({key: value for key, value in resumed.items() if key not in _series_columns(resumed)})
+    energy = np.concatenate([np.asarray(previous['energy'], dtype=float)[keep],
+                             np.asarray(resumed['energy'], dtype=float)])
+    order = np.argsort(energy, kind='stable')
+    for key in columns:
+        values = np.concatenate([np.asarray(previous[key], dtype=float)[keep],
+                                 np.asarray(resumed[key], dtype=float)])
+        merged[key] = values[order].tolist()
+    return merged
+
+
+def summaries_to_results(summaries: Dict[float, Dict[str, Any]]) -> Dict[str, Any]:
+    """把反应总结转换为与输出文件相同结构的总截面和残余核产生截面"""
+    energies = sorted(summaries)
+    if not energies:
+        return {}
+    results: Dict[str, Any] = {
+        'total_cross_section': {
+            'energy': energies,
+            'cross_section': [summaries[e].get('total', 0.0) for e in energies],
+            'elastic': [summaries[e].get('elastic', 0.0) for e in energies],
+            'nonelastic': [summaries[e].get('nonelastic', 0.0) for e in energies],
+        },
+    }
+    nuclides = sorted({key for e in energies for key in summaries[e]['residual']})
+    if nuclides:
+        results['residual_production'] = {
+            f"rp{z:03d}{a:03d}": {'energy': energies,
+                                  'cross_section': [summaries[e]['residual'].get((z, a), 0.0) for e in energies]}
+            for z, a in nuclides
+        }
+    return results
+
+
+def fill_from_summaries(results: Dict[str, Any], summaries: Dict[float, Dict[str, Any]]):
+    """输出文件中没有的总截面和残余核产生截面由反应总结补上"""
+    for section, value in summaries_to_results(summaries).items():
+        existing = results.get(section)
+        if not existing or (section == 'total_cross_section' and not len(existing.get('energy', []))):
+            results[section] = value
+
+
+def salvage_results(file_results: Dict[str, Any], stdout: str, requested: Sequence[float],
+                    reason: str) -> Optional[Dict[str, Any]]:
+    """
+    从被中断的计算中取出已完成入射能量的结果
+
+    完成的能量以标准输出中完整的反应总结为准；已经写出的输出文件中只保留这些能量的点，
+    输出文件中没有的总截面和残余核产生截面由反应总结补上。
+
+    Args:
+        file_results: parse_output_files 解析工作目录得到的结果
+        stdout: 中断前收到的标准输出
+        requested: 要求的全部入射能量
+        reason: 中断原因（'timeout'、'cancelled' 或 'failed'）
+
+    Returns:
+        Dict: 带 'partial' 标记的结果，没有完成任何能量时返回None
+    """
+    summaries = parse_reaction_summaries(stdout or "")
+    completed = np.array(sorted(summaries), dtype=float)
+    if not completed.size:
+        return None
+
+    results = dict(file_results)
+    for section in ENERGY_SECTIONS:
+        if section == 'total_cross_section':
+            if section in results:
+                results[section] = select_energies(results[section], completed)
+        elif section in results:
+            results[section] = {name: select_energies(series, completed)
+                                for name, series in results[section].items()}
+    fill_from_summaries(results, summaries)
+    # 未完成的能量的裂变谱可能只写了一半
+    if results.get('pfns') is not None:
+        results['pfns'] = results['pfns'].select(completed)
+        if results['pfns'] is None:
+            del results['pfns']
+
+    requested = np.asarray(requested, dtype=float)
+    results['partial'] = partial_info(requested, completed, reason)
+    results['stdout'] = stdout
+    logger.info(f"计算中断（{reason}），取回 {completed.size} 个入射能量的结果，"
+                f"缺少 {len(results['partial']['missing'])} 个")
+    return results
+
+
+def partial_info(requested: Sequence[float], completed: Sequence[float], reason: str) -> Dict[str, Any]:
+    """不完整结果的标记：要求的能量、完成的能量、缺失的能量和中断原因"""
+    requested = np.asarray(requested, dtype=float)
+    completed = np.asarray(completed, dtype=float)
+    missing = requested[~energy_mask(requested, completed)]
+    return {'reason': reason, 'requested': requested.tolist(),
+            'completed': completed.tolist(), 'missing': missing.tolist()}
+
+
+def missing_energies(results: Dict[str, Any]) -> List[float]:
+    """不完整结果中缺失的入射能量，完整结果返回空列表"""
+    partial = results.get('partial')
+    return list(partial['missing']) if partial else []
+
+
+def merge_results(previous: Dict[str, Any], resumed: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    把续算结果合并到之前的不完整结果中
+
+    按入射能量的分组逐条合并；能谱、角分布等逐文件的分组和输出文件列表取并集（同名时取续算的），
+    裂变中子谱按入射能量重新堆叠，其余分组取续算的结果。合并后仍有缺失能量时保留 'partial' 标记，
+    'resumed_from' 记录之前结果的ID。
+
+    Args:
+        previous: 不完整的结果
+        resumed: 只计算了缺失能量的结果
+
+    Returns:
+        Dict: 合并后的结果
+    """
+    # 之前的结果可能只有反应总结中的数据，续算结果也同样补上
+    resumed = dict(resumed)
+    fill_from_summaries(resumed, parse_reaction_summaries(resumed.get('stdout') or ""))
+
+    merged = {key: value for key, value in previous.items() if key not in ENERGY_SECTIONS}
+    merged.update({key: value for key, value in resumed.items() if key not in ENERGY_SECTIONS})
+
+    for section in ENERGY_SECTIONS:
+        old, new = previous.get(section), resumed.get(section)
+        if not old or not new:
+            if old or new:
+                merged[section] = old or new
+        elif section == 'total_cross_section':
+            merged[section] = merge_series(old, new)
+        else:
+            merged[section] = {name: merge_series(old[name], new[name]) if name in old and name in new
+                               else old.get(name) or new.get(name)
+                               for name in sorted(set(old) | set(new))}
+
+    for section in FILE_SECTIONS:
+        if previous.get(section) or resumed.get(section):
+            merged[section] = {**(previous.get(section) or {}), **(resumed.get(section) or {})}
+    merged['output_files'] = sorted(set(previous.get('output_files') or []) |
+                                    set(resumed.get('output_files') or []))
+    old, new = previous.get('pfns'), resumed.get('pfns')
+    if old is not None and new is not None:
+        merged['pfns'] = old.merge(new)
+
+    # 续算只计算了之前缺失的能量，续算完整结束时这些能量全部完成
+    partial = previous.get('partial') or {}
+    resumed_partial = resumed.get('partial')
+    resumed_completed = resumed_partial['completed'] if resumed_partial else partial.get('missing', [])
+    info = partial_info(partial.get('requested', []),
+                        np.union1d(partial.get('completed', []), resumed_completed),
+                        resumed_partial['reason'] if resumed_partial else partial.get('reason', ''))
+    if info['missing']:
+        merged['partial'] = info
+    else:
+        merged.pop('partial', None)
+    merged['resumed_from'] = previous.get('result_id')
+    merged['calculation_time'] = (previous.get('calculation_time') or 0.0) + (resumed.get('calculation_time') or 0.0)
+    merged['stdout'] = (previous.get('stdout') or '') + (resumed.get('stdout') or '')
+    return merged
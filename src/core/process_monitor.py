@@ -0,0 +1,244 @@
+"""
+进程资源监控模块
+在后台线程中定期读取 /proc/<pid> 记录TALYS进程的内存、CPU时间和I/O，
+并提供在子进程启动前设置资源上限、nice值和CPU亲和性的 preexec_fn
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from utils.logger import LoggerMixin
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROC_DIR = Path("/proc")
+MB = 1024 * 1024
+
+
+def read_proc_sample(pid: int, proc_dir: Path = PROC_DIR) -> Optional[Dict[str, float]]:
+    """
+    读取进程当前的资源占用
+
+    Args:
+        pid: 进程号
+        proc_dir: proc文件系统的挂载点
+
+    Returns:
+        Dict: rss_bytes/peak_rss_bytes（来自status）、cpu_user/cpu_system（秒，来自stat）、
+              read_bytes/write_bytes（来自io，无权限时缺省）；进程已结束或没有/proc时返回None
+    """
+    base = proc_dir / str(pid)
+    sample: Dict[str, float] = {}
+    try:
+        with open(base / "status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    sample['rss_bytes'] = int(line.split()[1]) * 1024
+                elif line.startswith("VmHWM:"):
+                    sample['peak_rss_bytes'] = int(line.split()[1]) * 1024
+
+        # 进程名可能含空格和括号，从最后一个右括号之后开始分割
+        with open(base / "stat") as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        ticks = os.sysconf('SC_CLK_TCK')
+        sample['cpu_user'] = int(fields[11]) / ticks
+        sample['cpu_system'] = int(fields[12]) / ticks
+    except (OSError, IndexError, ValueError):
+        return None
+
+    try:
+        with open(base / "io") as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('read_bytes', 'write_bytes'):
+                    sample[key] = int(value)
+    except (OSError, ValueError):
+        pass
+    return sample
+
+
+def directory_size(directory: Union[str, Path]) -> int:
+    """工作目录中文件的总字节数（TALYS输出文件都在工作目录顶层）"""
+    total = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                except FileNotFoundError:
+                    pass
+    except OSError:
+        pass
+    return total
+
+
+class ResourceLimits:
+    """TALYS子进程的资源限制"""
+
+    def __init__(self, memory_mb: Optional[float] = None,
+                 cpu_seconds: Optional[int] = None,
+                 nice: Optional[int] = None,
+                 cpu_affinity: Optional[Iterable[int]] = None):
+        """
+        Args:
+            memory_mb: 地址空间上限 (MB)，超出时TALYS分配内存失败并退出
+            cpu_seconds: CPU时间上限（秒），超出时进程收到SIGXCPU
+            nice: nice增量，降低TALYS的调度优先级
+            cpu_affinity: 允许使用的CPU编号
+        """
+        self.memory_mb = memory_mb
+        self.cpu_seconds = cpu_seconds
+        self.nice = nice or 0
+        self.cpu_affinity = sorted(cpu_affinity) if cpu_affinity else None
+
+    @classmethod
+    def from_settings(cls) -> 'ResourceLimits':
+        """按配置创建"""
+        return cls(Settings.TALYS_MEMORY_LIMIT_MB, Settings.TALYS_CPU_TIME_LIMIT,
+                   Settings.TALYS_NICE, Settings.TALYS_CPU_AFFINITY)
+
+    @property
+    def active(self) -> bool:
+        """是否设置了任何限制"""
+        return bool(self.memory_mb or self.cpu_seconds or self.nice or self.cpu_affinity)
+
+    def preexec_fn(self) -> Optional[Callable[[], None]]:
+        """
+        返回在子进程 exec 之前执行的函数，没有限制或平台不支持时返回None
+
+        该函数在fork出的子进程中运行，只做系统调用，不写日志。
+        """
+        if not self.active or resource is None:
+            return None
+
+        memory = int(self.memory_mb * MB) if self.memory_mb else None
+        cpu_seconds = int(self.cpu_seconds) if self.cpu_seconds else None
+        nice = self.nice
+        affinity = self.cpu_affinity
+
+        def apply_limits():
+            if memory:
+                resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+            if cpu_seconds:
+                resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+            if nice:
+                os.nice(nice)
+            if affinity and hasattr(os, 'sched_setaffinity'):
+                os.sched_setaffinity(0, affinity)
+
+        return apply_limits
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'memory_mb': self.memory_mb, 'cpu_seconds': self.cpu_seconds,
+                'nice': self.nice, 'cpu_affinity': self.cpu_affinity}
+
+
+class ProcessMonitor(LoggerMixin):
+    """
+    在后台线程中定期采样一个子进程的资源占用
+
+    进程结束后 /proc 中的记录随之消失，因此结果为最后一次采样时的值；
+    峰值内存取自内核记录的 VmHWM，不受采样间隔影响。
+    """
+
+    def __init__(self, pid: int, workdir: Optional[Union[str, Path]] = None,
+                 interval: Optional[float] = None,
+                 callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Args:
+            pid: 子进程号
+            workdir: 子进程的工作目录，用于统计输出文件大小
+            interval: 采样间隔（秒），默认使用配置中的 PROCESS_SAMPLE_INTERVAL
+            callback: 每次采样后以当前指标调用（在监控线程中）
+        """
+        self.pid = pid
+        self.workdir = Path(workdir) if workdir else None
+        self.interval = Settings.PROCESS_SAMPLE_INTERVAL if interval is None else interval
+        self.callback = callback
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_time = time.time()
+        self._last: Dict[str, float] = {}
+        self._max_rss = 0
+        self._output_bytes = 0
+        self.samples = 0
+
+    def start(self) -> 'ProcessMonitor':
+        """启动监控线程"""
+        self._start_time = time.time()
+        self._thread = threading.Thread(target=self._run, name=f"talys-monitor-{self.pid}", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            self.sample()
+            if self._stop_event.wait(self.interval):
+                break
+
+    def sample(self) -> Dict[str, Any]:
+        """采样一次并返回当前指标"""
+        sample = read_proc_sample(self.pid)
+        output_bytes = directory_size(self.workdir) if self.workdir else 0
+        with self._lock:
+            if sample is not None:
+                self._last = sample
+                self._max_rss = max(self._max_rss, int(sample.get('rss_bytes', 0)))
+                self.samples += 1
+            self._output_bytes = max(self._output_bytes, output_bytes)
+            metrics = self._metrics()
+        if self.callback is not None:
+            try:
+                self.callback(metrics)
+            except Exception as e:
+                self.logger.warning(f"资源监控回调出错: {e}")
+        return metrics
+
+    def stop(self) -> Dict[str, Any]:
+        """停止监控并返回最终指标（最后再统计一次输出文件）"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.workdir:
+            with self._lock:
+                self._output_bytes = max(self._output_bytes, directory_size(self.workdir))
+        return self.metrics()
+
+    def metrics(self) -> Dict[str, Any]:
+        """当前指标"""
+        with self._lock:
+            return self._metrics()
+
+    def _metrics(self) -> Dict[str, Any]:
+        last = self._last
+        return {
+            'rss_mb': last.get('rss_bytes', 0) / MB,
+            'peak_rss_mb': max(last.get('peak_rss_bytes', 0), self._max_rss) / MB,
+            'cpu_user_s': last.get('cpu_user', 0.0),
+            'cpu_system_s': last.get('cpu_system', 0.0),
+            'read_bytes': int(last.get('read_bytes', 0)),
+            'write_bytes': int(last.get('write_bytes', 0)),
+            'output_bytes': self._output_bytes,
+            'wall_time_s': time.time() - self._start_time,
+            'samples': self.samples,
+        }
+
+
+def format_resource_usage(metrics: Dict[str, Any]) -> str:
+    """把资源指标格式化为一行文字"""
+    cpu = metrics.get('cpu_user_s', 0.0) + metrics.get('cpu_system_s', 0.0)
+    return (f"内存 {metrics.get('rss_mb', 0.0):.1f} MB（峰值 {metrics.get('peak_rss_mb', 0.0):.1f} MB）"
+            f" | CPU {cpu:.1f} s"
+            f" | 输出 {metrics.get('output_bytes', 0) / MB:.1f} MB")
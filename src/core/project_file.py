@@ -0,0 +1,383 @@
+"""
+项目文件模块
+项目文件是一个zip容器：参数集和输入卡片写在 project.json 中，每个归档计算的结果
+按分组保存为一个JSON成员和一个存放全部数组的 .bin 成员。打开项目时只读取索引，结果分组在首次访问时才从文件中读取
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+import zipfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from utils.logger import LoggerMixin
+from core.fission_barriers import FissionBarrierDataset
+from core.fission_spectra import PromptFissionSpectra
+from core.result_manager import ResultHandle
+from core.run_ensemble import merge_channel_names, run_channel_names
+
+PROJECT_FORMAT_VERSION = 1
+PROJECT_EXTENSION = ".tvproj"
+INDEX_MEMBER = "project.json"
+
+
+class ProjectFileError(Exception):
+    """项目文件错误"""
+    pass
+
+
+# 以数组形式保存的数据集类型（提供 to_arrays / from_arrays）
+DATASET_TYPES = {cls.__name__: cls for cls in (PromptFissionSpectra, FissionBarrierDataset)}
+
+
+def _encode(value: Any, arrays: List[np.ndarray]) -> Any:
+    """
+    把结果中的值转换为可写入JSON的结构，数值序列替换为对数组的引用
+
+    Args:
+        value: 结果中的值
+        arrays: 收集需要写出的数组，引用为其在列表中的下标
+
+    Returns:
+        可JSON序列化的结构，无法保存的对象返回None
+    """
+    if isinstance(value, tuple(DATASET_TYPES.values())):
+        return {'__dataset__': type(value).__name__, 'value': _encode(value.to_arrays(), arrays)}
+    if isinstance(value, dict):
+        return {'__dict__': {str(key): _encode(item, arrays) for key, item in value.items()}}
+    if isinstance(value, np.ndarray) or (
+            isinstance(value, (list, tuple)) and value and
+            all(isinstance(item, (int, float, np.number)) and not isinstance(item, bool) for item in value)):
+        array = np.asarray(value)
+        if array.dtype.kind in 'biuf' or (array.dtype.names and not array.dtype.hasobject):
+            arrays.append(np.ascontiguousarray(array))
+            return {'__array__': len(arrays) - 1}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item, arrays) for item in value]
+    if isinstance(value, (str, bool, int, float)) or value is None:
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    # 其他对象无法保存
+    return None
+
+
+def _decode(value: Any, arrays: List[np.ndarray]) -> Any:
+    """_encode 的逆过程"""
+    if isinstance(value, dict):
+        if '__array__' in value:
+            return arrays[value['__array__']]
+        if '__dataset__' in value:
+            return DATASET_TYPES[value['__dataset__']].from_arrays(_decode(value['value'], arrays))
+        if '__dict__' in value:
+            return {key: _decode(item, arrays) for key, item in value['__dict__'].items()}
+    if isinstance(value, list):
+        return [_decode(item, arrays) for item in value]
+    return value
+
+
+def _dtype_spec(dtype: np.dtype) -> Any:
+    """数组类型的JSON表示，结构化数组保存各字段的名称和类型"""
+    return dtype.descr if dtype.names else dtype.str
+
+
+def _dtype_from_spec(spec: Any) -> np.dtype:
+    """_dtype_spec 的逆过程"""
+    if isinstance(spec, list):
+        return np.dtype([tuple(field) for field in spec])
+    return np.dtype(spec)
+
+
+class RunRecord:
+    """项目中的一次归档计算（只含索引信息）"""
+
+    def __init__(self, run_id: str, label: str, created: float,
+                 sections: List[str], summary: Dict[str, Any]):
+        self.run_id = run_id
+        self.label = label
+        self.created = created
+        self.sections = sections
+        self.summary = summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.run_id, 'label': self.label, 'created': self.created,
+                'sections': self.sections, 'summary': self.summary}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RunRecord':
+        return cls(data['id'], data.get('label', data['id']), data.get('created', 0.0),
+                   list(data.get('sections', [])), dict(data.get('summary', {})))
+
+
+class LazyRunResults(Mapping):
+    """
+    惰性加载的计算结果，用法与 run_calculation 返回的结果字典相同
+
+    各分组（如 'reaction_channels'）在第一次访问时从项目文件读取并缓存。
+    """
+
+    def __init__(self, project: 'Project', record: RunRecord):
+        self._project = project
+        self._record = record
+        self._loaded: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'result_id' and key not in self._record.sections:
+            return self._record.run_id
+        if key not in self._record.sections:
+            raise KeyError(key)
+        if key not in self._loaded:
+            self._loaded[key] = self._project._read_section(self._record.run_id, key)
+        return self._loaded[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._record.sections)
+
+    def __len__(self) -> int:
+        return len(self._record.sections)
+
+    @property
+    def loaded_sections(self) -> List[str]:
+        """已经读入内存的分组"""
+        return list(self._loaded)
+
+
+class Project(LoggerMixin):
+    """TALYS Visualizer 项目"""
+
+    def __init__(self, parameters: Optional[Dict[str, Any]] = None, input_deck: str = ""):
+        """
+        Args:
+            parameters: ParameterSynchronizer.export_to_dict() 的结果
+            input_deck: 输入卡片文本
+        """
+        self.parameters = parameters or {}
+        self.input_deck = input_deck
+        self.runs: Dict[str, RunRecord] = {}
+        self.path: Optional[Path] = None
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._archive: Optional[zipfile.ZipFile] = None
+        self._lock = threading.Lock()
+        self._results: Dict[str, LazyRunResults] = {}
+        # 加入项目的结果管理器句柄，删除计算或关闭项目时释放
+        self._handles: Dict[str, ResultHandle] = {}
+
+    # ---- 计算结果 ----
+
+    def add_run(self, results: Dict[str, Any], label: Optional[str] = None) -> str:
+        """
+        把一次计算的结果加入项目（保存项目时写入文件）
+
+        Args:
+            results: run_calculation 返回的结果
+            label: 显示名称
+
+        Returns:
+            str: 计算ID
+        """
+        # 没有ID的结果（未经结果管理器登记）在加入项目时分配一个
+        run_id = str(results.get('result_id') or uuid.uuid4().hex)
+        summary = {
+            'calculation_time': results.get('calculation_time'),
+            'output_file_count': len(results.get('output_files', [])),
+            # 反应道列表放在索引中，列出项目的反应道时不必读取结果
+            'channels': run_channel_names(results),
+            # 进程资源指标放在索引中，无需读取结果即可用于容量规划
+            'resources': {key: value for key, value in (results.get('resources') or {}).items()
+                          if isinstance(value, (int, float))},
+        }
+        self.runs[run_id] = RunRecord(run_id, label or f"run {len(self.runs) + 1}", time.time(),
+                                      list(results), summary)
+        self._pending[run_id] = results
+        if isinstance(results, ResultHandle):
+            self._handles[run_id] = results
+        return run_id
+
+    def remove_run(self, run_id: str):
+        """从项目中删除一次计算（结果管理器中的结果一并释放）"""
+        self.runs.pop(run_id)
+        self._pending.pop(run_id, None)
+        self._results.pop(run_id, None)
+        handle = self._handles.pop(run_id, None)
+        if handle is not None:
+            handle.release()
+
+    def channel_names(self) -> List[str]:
+        """
+        项目中各次计算出现的反应道（有总截面时 total.tot 在最前）
+
+        取自索引；旧版本保存、索引中没有反应道列表的计算读取一次结果补上（下次保存时写入索引）。
+        """
+        channel_lists = []
+        for run_id, record in self.runs.items():
+            if 'channels' not in record.summary:
+                record.summary['channels'] = run_channel_names(self.run_results(run_id))
+            channel_lists.append(record.summary['channels'])
+        return merge_channel_names(channel_lists)
+
+    def run_results(self, run_id: str) -> Mapping:
+        """
+        取得一次计算的结果
+
+        尚未保存的计算返回原始结果字典，已保存的计算返回惰性加载的结果。
+        """
+        if run_id in self._pending:
+            return self._pending[run_id]
+        if run_id not in self.runs:
+            raise KeyError(run_id)
+        if run_id not in self._results:
+            self._results[run_id] = LazyRunResults(self, self.runs[run_id])
+        return self._results[run_id]
+
+    def _read_section(self, run_id: str, section: str) -> Any:
+        """
+        从项目文件读取一次计算的一个分组
+
+        分组的全部数组连续存放在一个 .bin 成员中，JSON中记录各数组的偏移、类型和形状；
+        返回的数组直接引用读入的缓冲区，为只读。
+        """
+        if self._archive is None:
+            raise ProjectFileError("项目文件未打开")
+        prefix = f"runs/{run_id}/{section}"
+        with self._lock:
+            document = json.loads(self._archive.read(f"{prefix}.json"))
+            layout = document.get('arrays', [])
+            buffer = self._archive.read(f"{prefix}.bin") if layout else b''
+        arrays = [np.frombuffer(buffer, dtype=_dtype_from_spec(dtype), count=int(np.prod(shape)),
+                                offset=offset).reshape(shape)
+                  for offset, dtype, shape in layout]
+        return _decode(document['value'], arrays)
+
+    # ---- 读写 ----
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> 'Project':
+        """
+        打开项目文件，只读取索引
+
+        Args:
+            path: 项目文件路径
+
+        Returns:
+            Project: 项目（结果在访问时才读取，项目文件保持打开直到 close()）
+        """
+        path = Path(path)
+        try:
+            archive = zipfile.ZipFile(path, 'r')
+            index = json.loads(archive.read(INDEX_MEMBER))
+        except (OSError, KeyError, zipfile.BadZipFile, json.JSONDecodeError) as e:
+            raise ProjectFileError(f"无法读取项目文件 {path}: {e}")
+
+        if index.get('format_version', 0) > PROJECT_FORMAT_VERSION:
+            archive.close()
+            raise ProjectFileError(f"项目文件版本过新: {index.get('format_version')}")
+
+        project = cls(index.get('parameters', {}), index.get('input_deck', ''))
+        project.runs = {data['id']: RunRecord.from_dict(data) for data in index.get('runs', [])}
+        project.path = path
+        project._archive = archive
+        project.logger.info(f"打开项目 {path}: {len(project.runs)}次计算")
+        return project
+
+    def save(self, path: Optional[Union[str, Path]] = None):
+        """
+        保存项目
+
+        已保存过的计算直接从原文件复制成员，不解码数据；新计算的数组以不压缩的
+        二进制成员写入。先写入临时文件，完成后替换原文件。
+
+        Args:
+            path: 目标路径，默认为打开时的路径
+        """
+        path = Path(path) if path else self.path
+        if path is None:
+            raise ProjectFileError("没有指定项目文件路径")
+
+        index = {
+            'format_version': PROJECT_FORMAT_VERSION,
+            'app_version': Settings.APP_VERSION,
+            'saved': time.time(),
+            'parameters': self.parameters,
+            'input_deck': self.input_deck,
+        }
+
+        temp_path = path.with_name(path.name + ".tmp")
+        try:
+            with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+                for run_id in self.runs:
+                    if run_id in self._pending:
+                        self._write_run(archive, run_id, self._pending[run_id])
+                    else:
+                        self._copy_run(archive, run_id)
+                index['runs'] = [record.to_dict() for record in self.runs.values()]
+                archive.writestr(INDEX_MEMBER, json.dumps(index, ensure_ascii=False, indent=1),
+                                 compress_type=zipfile.ZIP_DEFLATED)
+        except Exception:
+            # 写入失败时删除不完整的临时文件，原项目文件保持不变
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        if self._archive is not None:
+            self._archive.close()
+        os.replace(temp_path, path)
+        self._archive = zipfile.ZipFile(path, 'r')
+        self.path = path
+
+        # 新计算已写入文件，改为惰性读取
+        self._pending.clear()
+        self._results.clear()
+        self.logger.info(f"项目已保存: {path}（{len(self.runs)}次计算）")
+
+    def _write_run(self, archive: zipfile.ZipFile, run_id: str, results: Dict[str, Any]):
+        """写出一次新计算的全部分组，无法保存的分组从索引中去掉"""
+        sections = []
+        for section, value in results.items():
+            arrays: List[np.ndarray] = []
+            encoded = _encode(value, arrays)
+            if encoded is None and value is not None:
+                self.logger.warning(f"计算 {run_id} 的分组 {section} 无法保存（{type(value).__name__}），已跳过")
+                continue
+
+            layout = []
+            prefix = f"runs/{run_id}/{section}"
+            if arrays:
+                offset = 0
+                size = sum(array.nbytes for array in arrays)
+                with archive.open(f"{prefix}.bin", 'w', force_zip64=size > 2 ** 31) as f:
+                    for array in arrays:
+                        f.write(array.tobytes())
+                        layout.append((offset, _dtype_spec(array.dtype), list(array.shape)))
+                        offset += array.nbytes
+            archive.writestr(f"{prefix}.json",
+                             json.dumps({'value': encoded, 'arrays': layout}, ensure_ascii=False),
+                             compress_type=zipfile.ZIP_DEFLATED)
+            sections.append(section)
+        self.runs[run_id].sections = sections
+
+    def _copy_run(self, archive: zipfile.ZipFile, run_id: str):
+        """从原项目文件复制一次计算的全部成员"""
+        if self._archive is None:
+            raise ProjectFileError(f"找不到计算 {run_id} 的数据")
+        prefix = f"runs/{run_id}/"
+        for info in self._archive.infolist():
+            if info.filename.startswith(prefix):
+                with self._lock:
+                    archive.writestr(info, self._archive.read(info))
+
+    def close(self):
+        """关闭项目文件，释放结果管理器中属于本项目的结果"""
+        for handle in self._handles.values():
+            handle.release()
+        self._handles.clear()
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
@@ -0,0 +1,286 @@
+"""
+公共网格重采样模块
+不同输出文件使用不同的能量网格（入射能量网格、各能级文件的阈能、裂变谱的出射能量网格），
+求和或比较之前需要先插值。本模块用线性、双对数或PCHIP插值把整组反应道一次性重采样到目标网格，
+并按 (结果ID, 网格摘要) 缓存重采样结果
+"""
+
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from utils.logger import LoggerMixin
+
+METHODS = ('linear', 'loglog', 'pchip')
+
+# 反应道数据：名称 -> (能量, 数值)
+ChannelArrays = Mapping[str, Tuple[np.ndarray, np.ndarray]]
+
+
+def grid_hash(grid: np.ndarray) -> str:
+    """能量网格的摘要，用作缓存键"""
+    return hashlib.sha1(np.ascontiguousarray(grid, dtype=float).tobytes()).hexdigest()[:16]
+
+
+def channels_hash(channels: ChannelArrays) -> str:
+    """反应道数据的摘要，没有结果ID的数据（如从计算目录读取的反应道）用它作缓存键"""
+    digest = hashlib.sha1()
+    for name, (energy, value) in channels.items():
+        digest.update(repr(name).encode())
+        digest.update(np.ascontiguousarray(energy, dtype=float).tobytes())
+        digest.update(np.ascontiguousarray(value, dtype=float).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def result_id(results: Mapping[str, Any]) -> str:
+    """
+    计算结果的ID
+
+    ID在创建结果时写入（TalysInterface 返回结果时、ResultManager.add 登记结果时），
+    这里只读取，不修改传入的结果。
+
+    Raises:
+        KeyError: 结果没有ID
+    """
+    rid = results.get('result_id')
+    if not rid:
+        raise KeyError("计算结果没有 result_id，请先用 ResultManager.add 登记结果")
+    return str(rid)
+
+
+def batched_interp(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    对多条曲线同时做线性插值
+
+    各行的横坐标各不相同，用NaN补齐到相同长度。把第 i 行整体平移 i*span，
+    所有行就可以放进同一个有序数组里，用一次 searchsorted 完成全部查找。
+
+    Args:
+        x: 公共网格 (n_grid,)
+        xp: 各曲线横坐标 (n_rows, n_points)，行内递增，末尾可为NaN
+        fp: 各曲线纵坐标 (n_rows, n_points)
+
+    Returns:
+        np.ndarray: (n_rows, n_grid)，超出各行范围处为NaN
+    """
+    n_rows, n_points = xp.shape
+    valid = ~np.isnan(xp)
+    counts = valid.sum(axis=1)
+    result = np.full((n_rows, x.size), np.nan)
+    if n_rows == 0 or x.size == 0 or not counts.any():
+        return result
+
+    low = np.nanmin(xp)
+    span = max(np.nanmax(xp), x.max()) - min(low, x.min()) + 1.0
+    offsets = np.arange(n_rows)[:, None] * span
+
+    flat_x = (np.where(valid, xp, np.inf) + offsets)[valid]
+    flat_f = fp[valid]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    query = x[None, :] + offsets
+    position = np.searchsorted(flat_x, query.ravel()).reshape(n_rows, x.size)
+    first = starts[:, None]
+    last = (starts + counts - 1)[:, None]
+
+    right = np.clip(position, first, np.maximum(last, first))
+    left = np.clip(position - 1, first, np.maximum(last, first))
+    x_left, x_right = flat_x[left], flat_x[right]
+    f_left, f_right = flat_f[left], flat_f[right]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.where(x_right > x_left, (query - x_left) / (x_right - x_left), 0.0)
+    values = f_left + weight * (f_right - f_left)
+
+    row_min = np.where(counts > 0, flat_x[np.minimum(starts, flat_x.size - 1)], np.inf)[:, None]
+    row_max = np.where(counts > 0, flat_x[np.minimum(starts + counts - 1, flat_x.size - 1)], -np.inf)[:, None]
+    inside = (query >= row_min - 1e-12 * span) & (query <= row_max + 1e-12 * span) & (counts[:, None] > 0)
+    result[inside] = values[inside]
+    return result
+
+
+def _loglog_interp(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """双对数插值，端点含零或负值的区间退回线性插值"""
+    tiny = np.finfo(float).tiny
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_f = np.where(fp > 0, np.log(fp), np.nan)
+        values = np.exp(batched_interp(np.log(np.maximum(x, tiny)), np.log(np.maximum(xp, tiny)), log_f))
+    linear = batched_interp(x, xp, fp)
+    return np.where(np.isnan(values), linear, values)
+
+
+def _pchip_interp(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """
+    PCHIP插值（保单调，不产生过冲）
+
+    横坐标完全相同的行归为一组，每组只构建一个 PchipInterpolator（纵坐标按列堆叠），
+    TALYS同一计算的反应道大多共用入射能量网格，因此通常只需要很少几次调用。
+    """
+    from scipy.interpolate import PchipInterpolator
+
+    result = np.full((xp.shape[0], x.size), np.nan)
+    groups: Dict[bytes, List[int]] = {}
+    for row in range(xp.shape[0]):
+        groups.setdefault(xp[row][~np.isnan(xp[row])].tobytes(), []).append(row)
+
+    for rows in groups.values():
+        row_x = xp[rows[0]][~np.isnan(xp[rows[0]])]
+        if row_x.size < 2 or np.any(np.diff(row_x) <= 0):
+            result[rows] = batched_interp(x, xp[rows], fp[rows])
+            continue
+        y = fp[rows][:, :row_x.size].T
+        result[rows] = PchipInterpolator(row_x, y, axis=0, extrapolate=False)(x).T
+    return result
+
+
+def resample_stack(xp: np.ndarray, fp: np.ndarray, grid: np.ndarray, method: str = 'linear') -> np.ndarray:
+    """
+    把一组曲线重采样到目标网格
+
+    Args:
+        xp: 各曲线横坐标 (n_rows, n_points)，行内递增，末尾用NaN补齐
+        fp: 各曲线纵坐标 (n_rows, n_points)
+        grid: 目标网格
+        method: 'linear'、'loglog' 或 'pchip'
+
+    Returns:
+        np.ndarray: (n_rows, n_grid)，超出各曲线范围处为NaN
+    """
+    grid = np.asarray(grid, dtype=float)
+    if method == 'linear':
+        return batched_interp(grid, xp, fp)
+    if method == 'loglog':
+        return _loglog_interp(grid, xp, fp)
+    if method == 'pchip':
+        return _pchip_interp(grid, xp, fp)
+    raise ValueError(f"未知的插值方法: {method}")
+
+
+def stack_channels(channels: Sequence[Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    把各反应道的 (能量, 数值) 按能量排序后堆叠为NaN补齐的二维数组
+
+    Returns:
+        tuple: (xp, fp)，形状均为 (n_channels, 最大点数)
+    """
+    length = max((np.size(energy) for energy, _ in channels), default=0)
+    xp = np.full((len(channels), length), np.nan)
+    fp = np.full((len(channels), length), np.nan)
+    for row, (energy, value) in enumerate(channels):
+        energy = np.asarray(energy, dtype=float)
+        order = np.argsort(energy, kind='stable')
+        xp[row, :energy.size] = energy[order]
+        fp[row, :energy.size] = np.asarray(value, dtype=float)[order]
+    return xp, fp
+
+
+class ResamplingService(LoggerMixin):
+    """带缓存的重采样服务"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Args:
+            max_entries: 重采样结果缓存的条目上限（最近最少使用的先淘汰）
+        """
+        self.max_entries = Settings.RESAMPLE_CACHE_SIZE if max_entries is None else max_entries
+        self._lock = threading.Lock()
+        self._stacks: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key: tuple, stack: np.ndarray):
+        with self._lock:
+            self._stacks[key] = stack
+            self._stacks.move_to_end(key)
+            while len(self._stacks) > self.max_entries:
+                self._stacks.popitem(last=False)
+
+    def _lookup(self, key: tuple) -> Optional[np.ndarray]:
+        with self._lock:
+            stack = self._stacks.get(key)
+            if stack is not None:
+                self._stacks.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return stack
+
+    def resample(self, rid: str, channels: ChannelArrays, grid: np.ndarray,
+                 method: str = 'linear') -> np.ndarray:
+        """
+        把一组反应道重采样到目标网格，结果按 (结果ID, 网格摘要, 方法, 反应道) 缓存
+
+        同一结果的数据不会改变，因此结果ID足以代表数据本身。返回的数组为只读，
+        调用方需要修改时应先复制。
+
+        Args:
+            rid: 结果ID
+            channels: 反应道名称 -> (能量, 数值)，按插入顺序排列为输出的行
+            grid: 目标网格
+            method: 插值方法
+
+        Returns:
+            np.ndarray: (n_channels, n_grid)
+        """
+        grid = np.asarray(grid, dtype=float)
+        key = (rid, grid_hash(grid), method, tuple(channels))
+        stack = self._lookup(key)
+        if stack is None:
+            xp, fp = stack_channels(list(channels.values()))
+            stack = resample_stack(xp, fp, grid, method)
+            stack.setflags(write=False)
+            self._remember(key, stack)
+        return stack
+
+    def resample_results(self, results: Dict[str, Any], grid: np.ndarray, method: str = 'linear',
+                         section: str = 'reaction_channels',
+                         names: Optional[Sequence[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        重采样计算结果字典中的一类数据
+
+        Args:
+            results: TalysInterface.run_calculation 返回的结果
+            grid: 目标网格
+            method: 插值方法
+            section: 结果中的分组，如 'reaction_channels'、'residual_production'
+            names: 只重采样这些条目，默认全部
+
+        Returns:
+            tuple: (条目名称列表, (n, n_grid) 数组)
+        """
+        entries = results.get(section, {})
+        names = sorted(entries) if names is None else [name for name in names if name in entries]
+        channels = {name: (np.asarray(entries[name]['energy'], dtype=float),
+                           np.asarray(entries[name]['cross_section'], dtype=float))
+                    for name in names}
+        return names, self.resample(result_id(results), channels, grid, method)
+
+    def invalidate(self, rid: str):
+        """删除某个结果的全部缓存"""
+        with self._lock:
+            for key in [key for key in self._stacks if key[0] == rid]:
+                del self._stacks[key]
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._stacks.clear()
+
+
+# 全局重采样服务
+_resampling_service = None
+_resampling_service_lock = threading.Lock()
+
+def get_resampling_service() -> ResamplingService:
+    """获取全局重采样服务"""
+    global _resampling_service
+    with _resampling_service_lock:
+        if _resampling_service is None:
+            _resampling_service = ResamplingService()
+    return _resampling_service
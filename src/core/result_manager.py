@@ -0,0 +1,291 @@
+"""
+计算结果管理模块
+统一持有各次计算的结果并统计其数组占用的内存，超出预算时把最久未查看的结果
+转存到磁盘，之后通过只读内存映射访问（由操作系统按页读入），界面只持有结果句柄
+"""
+
+import atexit
+import shutil
+import sys
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from utils.logger import LoggerMixin
+
+# 超过此长度的字符串（如TALYS标准输出）也转存到磁盘，只支持结果的顶层键
+SPILL_STRING_BYTES = 64 * 1024
+
+# 转存文件中数组的对齐字节数
+ALIGNMENT = 64
+
+
+def compact(value: Any) -> Any:
+    """把结果中的数值列表转换为NumPy数组（每个数8字节，而列表中每个数约32字节）"""
+    if isinstance(value, dict):
+        return {key: compact(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(
+            isinstance(item, (int, float)) and not isinstance(item, bool) for item in value):
+        return np.asarray(value, dtype=float)
+    return value
+
+
+def _spillable(array: np.ndarray) -> bool:
+    """数值数组和不含对象字段的结构化数组可以转存"""
+    return array.dtype.kind in 'biufc' or bool(array.dtype.names and not array.dtype.hasobject)
+
+
+def nbytes(value: Any) -> int:
+    """估计结果中数组和长字符串占用的字节数（裂变谱等数据集按其 to_arrays() 的数组计算）"""
+    if hasattr(value, 'to_arrays'):
+        return nbytes(value.to_arrays())
+    if isinstance(value, np.ndarray):
+        return 0 if isinstance(value, np.memmap) or isinstance(value.base, np.memmap) else value.nbytes
+    if isinstance(value, dict):
+        return sum(nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(item) for item in value)
+    if isinstance(value, str):
+        return len(value)
+    return 0
+
+
+def _extract(value: Any, blocks: List[Union[np.ndarray, str]]) -> Any:
+    """把数组和长字符串替换为占位符，收集到 blocks 中；数据集拆成数组，恢复时重建"""
+    if hasattr(value, 'to_arrays'):
+        return ('__dataset__', type(value), _extract(value.to_arrays(), blocks))
+    if isinstance(value, dict):
+        return {key: _extract(item, blocks) for key, item in value.items()}
+    if isinstance(value, np.ndarray) and _spillable(value):
+        blocks.append(value)
+        return ('__spilled__', len(blocks) - 1)
+    if isinstance(value, str) and len(value) > SPILL_STRING_BYTES:
+        blocks.append(value)
+        return ('__spilled__', len(blocks) - 1)
+    if isinstance(value, list):
+        return [_extract(item, blocks) for item in value]
+    return value
+
+
+def _restore(value: Any, blocks: List[Any]) -> Any:
+    """_extract 的逆过程"""
+    if isinstance(value, dict):
+        return {key: _restore(item, blocks) for key, item in value.items()}
+    if isinstance(value, tuple) and len(value) == 2 and value[0] == '__spilled__':
+        return blocks[value[1]]
+    if isinstance(value, tuple) and len(value) == 3 and value[0] == '__dataset__':
+        return value[1].from_arrays(_restore(value[2], blocks))
+    if isinstance(value, list):
+        return [_restore(item, blocks) for item in value]
+    return value
+
+
+class SpilledText:
+    """转存到磁盘的长字符串，访问时才读取"""
+
+    def __init__(self, mapped: np.ndarray, start: int, length: int):
+        self._mapped = mapped
+        self._start = start
+        self._length = length
+
+    def __str__(self) -> str:
+        return bytes(self._mapped[self._start:self._start + self._length]).decode('utf-8')
+
+
+class ResultHandle(Mapping):
+    """
+    计算结果句柄，用法与结果字典相同
+
+    界面组件应持有句柄而不是结果字典，这样结果被转存后内存才能真正释放。
+    每次访问都会刷新该结果的最近查看时间。
+    """
+
+    def __init__(self, manager: 'ResultManager', result_id: str, keys: List[str]):
+        self._manager = manager
+        self.result_id = result_id
+        self._keys = keys
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._manager._access(self.result_id)[key]
+        return str(value) if isinstance(value, SpilledText) else value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @property
+    def spilled(self) -> bool:
+        """是否已转存到磁盘"""
+        return self._manager.is_spilled(self.result_id)
+
+    def release(self):
+        """不再需要该结果时删除其数据和转存文件，之后句柄不可再访问"""
+        self._manager.release(self.result_id)
+
+
+class ResultManager(LoggerMixin):
+    """有内存预算的计算结果管理器"""
+
+    def __init__(self, budget_mb: Optional[float] = None,
+                 spill_dir: Optional[Union[str, Path]] = None):
+        """
+        Args:
+            budget_mb: 内存中结果数组的预算 (MB)，默认使用配置中的 DATA_CACHE_SIZE
+            spill_dir: 转存文件所在的父目录，默认使用配置中的 RESULT_SPILL_DIR（None时为系统临时目录）
+        """
+        budget_mb = Settings.DATA_CACHE_SIZE if budget_mb is None else budget_mb
+        self.budget = int(budget_mb * 1024 * 1024)
+        root = spill_dir or Settings.RESULT_SPILL_DIR or tempfile.gettempdir()
+        self.spill_dir = Path(tempfile.mkdtemp(prefix="talys_spill_", dir=root))
+
+        self._lock = threading.RLock()
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()   # 内存中的结果，按最近查看排序
+        self._spilled: Dict[str, Path] = {}
+        self.spill_count = 0
+
+    def add(self, results: Dict[str, Any]) -> ResultHandle:
+        """
+        登记一次计算的结果
+
+        数值列表转换为数组后计入内存预算，超出预算时转存最久未查看的结果。
+
+        Args:
+            results: run_calculation 返回的结果
+
+        Returns:
+            ResultHandle: 结果句柄
+        """
+        if isinstance(results, ResultHandle):
+            return results
+        # 没有ID的结果在登记时分配一个，不修改调用者的字典
+        rid = str(results.get('result_id') or uuid.uuid4().hex)
+        data = compact(dict(results, result_id=rid))
+        with self._lock:
+            self._results[rid] = data
+            self._sizes[rid] = nbytes(data)
+            self._sizes.move_to_end(rid)
+            self._spilled.pop(rid, None)
+            self._enforce_budget(keep=rid)
+        return ResultHandle(self, rid, list(data))
+
+    def get(self, rid: str) -> ResultHandle:
+        """按结果ID取得句柄"""
+        with self._lock:
+            if rid not in self._results:
+                raise KeyError(rid)
+            return ResultHandle(self, rid, list(self._results[rid]))
+
+    def _access(self, rid: str) -> Dict[str, Any]:
+        """取得结果数据并刷新最近查看时间"""
+        with self._lock:
+            if rid in self._sizes:
+                self._sizes.move_to_end(rid)
+            return self._results[rid]
+
+    def is_spilled(self, rid: str) -> bool:
+        with self._lock:
+            return rid in self._spilled
+
+    @property
+    def memory_usage(self) -> int:
+        """内存中结果数组的总字节数"""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def _enforce_budget(self, keep: Optional[str] = None):
+        """按最久未查看的顺序转存，直到内存占用不超过预算（刚登记的结果除外）"""
+        while sum(self._sizes.values()) > self.budget:
+            victim = next((rid for rid in self._sizes if rid != keep), None)
+            if victim is None:
+                break
+            self._spill(victim)
+
+    def _spill(self, rid: str):
+        """
+        把一个结果的数组和长字符串写入磁盘，并替换为只读内存映射视图
+
+        结果不会改变，转存文件一旦写出就一直有效。
+        """
+        blocks: List[Union[np.ndarray, str]] = []
+        skeleton = _extract(self._results[rid], blocks)
+        path = self.spill_dir / f"{rid}.bin"
+
+        layout: List[Tuple[int, Any, Tuple[int, ...]]] = []
+        offset = 0
+        with open(path, 'wb') as f:
+            for block in blocks:
+                data = block.encode('utf-8') if isinstance(block, str) else np.ascontiguousarray(block)
+                raw = data if isinstance(data, bytes) else data.tobytes()
+                padding = -offset % ALIGNMENT
+                f.write(b'\0' * padding)
+                offset += padding
+                f.write(raw)
+                layout.append((offset, str if isinstance(block, str) else block.dtype,
+                               len(raw) if isinstance(block, str) else block.shape))
+                offset += len(raw)
+
+        mapped = np.memmap(path, dtype=np.uint8, mode='r') if offset else np.empty(0, dtype=np.uint8)
+        views = []
+        for start, dtype, shape in layout:
+            if dtype is str:
+                views.append(SpilledText(mapped, start, shape))
+            else:
+                count = int(np.prod(shape))
+                views.append(mapped[start:start + count * np.dtype(dtype).itemsize].view(dtype).reshape(shape))
+
+        self._results[rid] = _restore(skeleton, views)
+        self._sizes.pop(rid, None)
+        self._spilled[rid] = path
+        self.spill_count += 1
+        self.logger.debug(f"计算结果 {rid} 已转存到磁盘 ({offset} 字节)")
+
+    def release(self, rid: str):
+        """不再需要某个结果时删除其数据和转存文件"""
+        with self._lock:
+            self._results.pop(rid, None)
+            self._sizes.pop(rid, None)
+            path = self._spilled.pop(rid, None)
+        if path is not None:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def set_budget(self, budget_mb: float):
+        """修改内存预算，立即按新预算转存"""
+        with self._lock:
+            self.budget = int(budget_mb * 1024 * 1024)
+            self._enforce_budget()
+
+    def shutdown(self):
+        """删除全部转存文件"""
+        with self._lock:
+            self._results.clear()
+            self._sizes.clear()
+            self._spilled.clear()
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+# 全局结果管理器
+_result_manager = None
+_result_manager_lock = threading.Lock()
+
+def get_result_manager() -> ResultManager:
+    """获取全局结果管理器（首次调用时创建）"""
+    global _result_manager
+    with _result_manager_lock:
+        if _result_manager is None:
+            _result_manager = ResultManager()
+            atexit.register(_result_manager.shutdown)
+    return _result_manager
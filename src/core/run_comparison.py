@@ -0,0 +1,198 @@
+"""
+计算结果比较模块
+按YANDF头部中的 (反应, 能级, 剩余核) 对齐两个或多个计算的反应道，插值到公共能量网格，
+一次性计算全部反应道的绝对/相对差异和 χ² 指标，并给出变化最大的反应道排名
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+from core.yandf import read_yandf_file
+from core.resampling import channels_hash, get_resampling_service
+
+# 反应道键：(反应类型, 能级编号(-1表示不区分能级), 剩余核)
+ChannelKey = Tuple[str, int, str]
+
+# 排名可用的指标
+METRICS = ('max_abs_diff', 'max_rel_diff', 'rms_rel_diff', 'chi2')
+
+
+def channel_key(header: Dict[str, Any]) -> ChannelKey:
+    """
+    由YANDF头部生成反应道键
+
+    Args:
+        header: YANDF头部字典
+
+    Returns:
+        ChannelKey: (反应类型, 能级编号, 剩余核)
+    """
+    reaction = header.get('reaction', {})
+    residual = header.get('residual', {})
+    level = residual.get('level') or reaction.get('level') or {}
+    number = level.get('number') if isinstance(level, dict) else None
+    return (str(reaction.get('type', '')),
+            int(number) if number is not None else -1,
+            str(residual.get('nuclide', '')))
+
+
+def format_channel_key(key: ChannelKey) -> str:
+    """反应道键的显示文本，如 '(n,x) Pa234 L2'"""
+    reaction, level, residual = key
+    parts = [reaction]
+    if residual:
+        parts.append(residual)
+    if level >= 0:
+        parts.append(f"L{level}")
+    return ' '.join(parts)
+
+
+def load_run_channels(directory: Union[str, Path]) -> Dict[ChannelKey, Tuple[np.ndarray, np.ndarray, str]]:
+    """
+    读取一个计算目录中全部YANDF截面文件
+
+    Args:
+        directory: 计算目录或归档目录
+
+    Returns:
+        Dict: 反应道键 -> (能量, 截面, 文件名)
+    """
+    channels = {}
+    for path in sorted(Path(directory).iterdir()):
+        if not path.is_file():
+            continue
+        with open(path, 'rb') as f:
+            if not f.read(9) == b'# header:':
+                continue
+        header, data = read_yandf_file(path)
+        if header.get('datablock', {}).get('quantity') != 'cross section' or data.shape[1] < 2:
+            continue
+        channels[channel_key(header)] = (data[:, 0], data[:, 1], path.name)
+    return channels
+
+
+class RunComparison(LoggerMixin):
+    """多个计算结果的比较"""
+
+    def __init__(self, runs: Dict[str, Dict[ChannelKey, Tuple[np.ndarray, np.ndarray, str]]],
+                 relative_uncertainty: float = 0.05, absolute_floor: float = 1e-6,
+                 method: str = 'linear'):
+        """
+        对齐并比较各计算，第一个计算作为参考
+
+        Args:
+            runs: 计算名称 -> load_run_channels() 的结果
+            relative_uncertainty: χ² 中每个计算假定的相对不确定度
+            absolute_floor: χ² 分母的绝对下限 (mb)，避免零截面处发散
+            method: 插值到公共网格的方法，见 core.resampling.METHODS
+        """
+        if len(runs) < 2:
+            raise ValueError("至少需要两个计算结果才能比较")
+
+        self.labels = list(runs)
+        self.relative_uncertainty = relative_uncertainty
+        self.absolute_floor = absolute_floor
+        self.method = method
+
+        key_sets = [set(channels) for channels in runs.values()]
+        self.channels: List[ChannelKey] = sorted(set.intersection(*key_sets))
+        self.missing: Dict[str, List[ChannelKey]] = {
+            label: sorted(set.union(*key_sets) - keys) for label, keys in zip(self.labels, key_sets)
+        }
+        self.files = {key: runs[self.labels[0]][key][2] for key in self.channels}
+
+        energies = [runs[label][key][0] for label in self.labels for key in self.channels]
+        self.energies = np.unique(np.concatenate(energies)) if energies else np.empty(0)
+
+        # values: (n_runs, n_channels, n_grid)
+        self.values = np.stack([self._interpolate(runs[label]) for label in self.labels])
+        self.logger.info(f"对齐{len(self.labels)}个计算的{len(self.channels)}个反应道，"
+                         f"公共网格{self.energies.size}个能量点")
+
+    @classmethod
+    def from_directories(cls, directories: Dict[str, Union[str, Path]], **kwargs) -> 'RunComparison':
+        """从各计算目录读取并比较"""
+        return cls({label: load_run_channels(directory) for label, directory in directories.items()}, **kwargs)
+
+    def _interpolate(self, channels: Dict[ChannelKey, Tuple[np.ndarray, np.ndarray, str]]) -> np.ndarray:
+        """把一个计算的全部反应道插值到公共网格（从目录读取的数据没有结果ID，按数据摘要缓存）"""
+        series = {key: channels[key][:2] for key in self.channels}
+        return get_resampling_service().resample(channels_hash(series), series, self.energies, self.method)
+
+    def differences(self, run: Union[int, str] = 1) -> Dict[str, np.ndarray]:
+        """
+        计算某个计算相对参考计算的逐点差异
+
+        Args:
+            run: 计算序号或名称
+
+        Returns:
+            Dict: abs_diff、rel_diff、chi2（逐点），形状均为 (n_channels, n_grid)
+        """
+        index = self.labels.index(run) if isinstance(run, str) else run
+        reference = self.values[0]
+        other = self.values[index]
+        diff = other - reference
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rel = np.where(reference != 0, diff / np.abs(reference), np.where(diff == 0, 0.0, np.nan))
+            variance = (self.relative_uncertainty ** 2 * (reference ** 2 + other ** 2)
+                        + self.absolute_floor ** 2)
+            chi2 = diff ** 2 / variance
+        return {'abs_diff': diff, 'rel_diff': rel, 'chi2': chi2}
+
+    def metrics(self, run: Union[int, str] = 1) -> Dict[str, np.ndarray]:
+        """
+        计算每个反应道的汇总指标
+
+        Returns:
+            Dict: max_abs_diff、max_rel_diff、rms_rel_diff、chi2（约化χ²），形状均为 (n_channels,)
+        """
+        diffs = self.differences(run)
+        valid = ~np.isnan(diffs['abs_diff'])
+        points = np.maximum(valid.sum(axis=1), 1)
+
+        def masked_max(values):
+            return np.where(valid.any(axis=1), np.nanmax(np.where(valid, np.abs(values), -np.inf), axis=1), np.nan)
+
+        rel = np.where(valid & ~np.isnan(diffs['rel_diff']), diffs['rel_diff'], 0.0)
+        return {
+            'max_abs_diff': masked_max(diffs['abs_diff']),
+            'max_rel_diff': masked_max(np.nan_to_num(diffs['rel_diff'], nan=0.0)),
+            'rms_rel_diff': np.sqrt((rel ** 2).sum(axis=1) / points),
+            'chi2': np.where(valid, diffs['chi2'], 0.0).sum(axis=1) / points,
+        }
+
+    def biggest_changes(self, run: Union[int, str] = 1, metric: str = 'chi2',
+                        top: Optional[int] = 20) -> List[Dict[str, Any]]:
+        """
+        按指标从大到小排列反应道
+
+        Args:
+            run: 计算序号或名称
+            metric: METRICS 中的指标名
+            top: 返回的条数，None表示全部
+
+        Returns:
+            List: 每项含 key、label、file 以及全部指标
+        """
+        if metric not in METRICS:
+            raise ValueError(f"未知的比较指标: {metric}")
+        metrics = self.metrics(run)
+        order = np.argsort(-np.nan_to_num(metrics[metric], nan=-np.inf), kind='stable')
+        if top is not None:
+            order = order[:top]
+        return [{
+            'key': self.channels[i],
+            'label': format_channel_key(self.channels[i]),
+            'file': self.files[self.channels[i]],
+            **{name: float(values[i]) for name, values in metrics.items()},
+        } for i in order]
+
+    def channel_values(self, key: ChannelKey) -> np.ndarray:
+        """某个反应道在各计算中的数据 (n_runs, n_grid)"""
+        return self.values[:, self.channels.index(key), :]
@@ -0,0 +1,159 @@
+"""
+多次计算集合模块
+把多次计算（参数扫描、蒙特卡罗抽样）中同一反应道的曲线重采样到公共能量网格上，
+提供一次绘制全部曲线用的NaN分隔数组，以及大集合用的最小/最大/百分位包络
+"""
+
+import sys
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from utils.logger import LoggerMixin
+from core.channel_aggregation import LEVEL_FILE_PATTERN
+from core.resampling import channels_hash, get_resampling_service
+
+# 总截面在反应道列表中的名称
+TOTAL_CHANNEL = 'total.tot'
+
+# 包络带默认的百分位
+ENVELOPE_PERCENTILES = (5.0, 50.0, 95.0)
+
+
+def channel_series(results: Mapping[str, Any], channel: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """一次计算中某个反应道的 (能量, 截面)，没有该反应道时返回None"""
+    if channel == TOTAL_CHANNEL:
+        series = results.get('total_cross_section')
+    else:
+        series = (results.get('reaction_channels') or {}).get(channel)
+    if not series or not len(series.get('energy', [])):
+        return None
+    return np.asarray(series['energy'], dtype=float), np.asarray(series['cross_section'], dtype=float)
+
+
+def run_channel_names(results: Mapping[str, Any]) -> List[str]:
+    """一次计算中的反应道（有总截面时 total.tot 在最前），用于写入项目索引"""
+    names = sorted(results.get('reaction_channels') or {})
+    return ([TOTAL_CHANNEL] if results.get('total_cross_section') else []) + names
+
+
+def merge_channel_names(channel_lists: Sequence[Sequence[str]]) -> List[str]:
+    """合并多次计算的反应道列表（total.tot 在最前，其余按字母顺序）"""
+    names = set()
+    for channels in channel_lists:
+        names.update(channels)
+    has_total = TOTAL_CHANNEL in names
+    names.discard(TOTAL_CHANNEL)
+    return ([TOTAL_CHANNEL] if has_total else []) + sorted(names)
+
+
+def nan_separated(grid: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    把公共网格上的多条曲线连接为一条以NaN分隔的折线（配合 pyqtgraph 的 connect='finite' 一次绘制）
+
+    Args:
+        grid: 公共网格 (n_grid,)
+        values: (n_curves, n_grid)
+
+    Returns:
+        tuple: (x, y)，长度均为 n_curves * (n_grid + 1)
+    """
+    n_curves = values.shape[0]
+    x = np.empty((n_curves, grid.size + 1))
+    y = np.empty((n_curves, grid.size + 1))
+    x[:, :-1] = grid
+    y[:, :-1] = values
+    x[:, -1] = np.nan
+    y[:, -1] = np.nan
+    return x.ravel(), y.ravel()
+
+
+def envelope(values: np.ndarray, percentiles: Sequence[float] = ENVELOPE_PERCENTILES) -> Dict[str, np.ndarray]:
+    """
+    各网格点上多条曲线的最小值、最大值和百分位（忽略NaN，全为NaN的网格点结果为NaN）
+
+    Returns:
+        Dict: 'min'、'max' 以及 'p5'、'p50' 这样的百分位键 -> (n_grid,)
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # 全为NaN的网格点
+        bands = {'min': np.nanmin(values, axis=0), 'max': np.nanmax(values, axis=0)}
+        if percentiles:
+            for percentile, band in zip(percentiles, np.nanpercentile(values, percentiles, axis=0)):
+                bands[f"p{percentile:g}"] = band
+    return bands
+
+
+class RunEnsemble(LoggerMixin):
+    """一组计算结果"""
+
+    def __init__(self, runs: Mapping[str, Mapping[str, Any]], method: str = 'linear',
+                 channels: Optional[Sequence[str]] = None):
+        """
+        Args:
+            runs: 计算ID或名称 -> 计算结果（结果字典、结果句柄或项目中惰性加载的结果）
+            method: 重采样插值方法
+            channels: 已知的反应道列表（如项目索引中记录的），给出时列出反应道不必读取结果
+        """
+        self.runs = dict(runs)
+        self.method = method
+        self.channels = list(channels) if channels is not None else None
+
+    @property
+    def labels(self) -> List[str]:
+        return list(self.runs)
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+    def channel_names(self) -> List[str]:
+        """各次计算中出现的反应道（有总截面时 total.tot 在最前）"""
+        if self.channels is not None:
+            return list(self.channels)
+        return merge_channel_names([run_channel_names(results) for results in self.runs.values()])
+
+    def level_channels(self) -> List[str]:
+        """按能级拆分的反应道（*.Lxx），小多图每个反应道一格"""
+        return [name for name in self.channel_names() if LEVEL_FILE_PATTERN.match(name)]
+
+    def stack(self, channel: str, grid: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        各次计算中某个反应道重采样到公共网格上的截面
+
+        Args:
+            channel: 反应道名称（或 total.tot）
+            grid: 公共网格，默认为各次计算能量的并集
+
+        Returns:
+            tuple: (网格, (n_runs, n_grid) 截面, 含该反应道的计算)，网格外为NaN
+        """
+        series = {label: channel_series(results, channel) for label, results in self.runs.items()}
+        series = {label: value for label, value in series.items() if value is not None}
+        # 重采样按结果ID缓存，重画和小多图不必重新插值；没有ID的结果按数据摘要缓存
+        rids = {label: self.runs[label].get('result_id') or channels_hash({channel: value})
+                for label, value in series.items()}
+        if grid is None:
+            grid = np.unique(np.concatenate([energy for energy, _ in series.values()])) \
+                if series else np.empty(0)
+        grid = np.asarray(grid, dtype=float)
+        if not series:
+            return grid, np.empty((0, grid.size)), []
+
+        service = get_resampling_service()
+        values = np.vstack([service.resample(rids[label], {channel: value}, grid, self.method)
+                            for label, value in series.items()])
+        return grid, values, list(series)
+
+    def envelope(self, channel: str, percentiles: Sequence[float] = ENVELOPE_PERCENTILES,
+                 grid: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        某个反应道的包络
+
+        Returns:
+            tuple: (网格, envelope() 的结果)
+        """
+        grid, values, _ = self.stack(channel, grid)
+        return grid, envelope(values, percentiles)
@@ -3,33 +3,53 @@ TALYS接口模块
 负责与TALYS可执行文件的交互，包括输入文件生成、计算执行和输出解析
 """
 
-import subprocess
-import tempfile
 import os
-import shutil
+import subprocess
+import threading
 import time
+import uuid
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+from typing import Dict, Any, Callable, Optional, List, Sequence
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config.settings import Settings
 from utils.logger import LoggerMixin
+from core.fission_spectra import PromptFissionSpectra
+from core.fission_barriers import FissionBarrierDataset
+from core.workdir_pool import WorkDirPool, get_workdir_pool
+from core.input_deck import InputDeck, INPUT_FILE_NAME, ENERGY_PARAMETERS
+from core.yandf import parse_yandf_header
+from core.process_monitor import ProcessMonitor, ResourceLimits
+from core.partial_results import (RESUME_ENERGY_FILE, merge_results, missing_energies,
+                                  requested_energies, salvage_results)
 
 class TalysInterface(LoggerMixin):
     """TALYS计算接口类"""
     
-    def __init__(self, executable_path: Optional[str] = None):
+    def __init__(self, executable_path: Optional[str] = None,
+                 workdir_pool: Optional[WorkDirPool] = None,
+                 resource_limits: Optional[ResourceLimits] = None):
         """
         初始化TALYS接口
         
         Args:
             executable_path: TALYS可执行文件路径，默认使用配置中的路径
+            workdir_pool: 工作目录池，默认使用全局工作目录池
+            resource_limits: TALYS进程的资源限制，默认使用配置中的设置
         """
         self.executable = executable_path or Settings.TALYS_EXECUTABLE
+        self.workdir_pool = workdir_pool or get_workdir_pool()
+        self.resource_limits = resource_limits or ResourceLimits.from_settings()
         self.temp_dir: Optional[Path] = None
         self.current_calculation = None
+        self.last_run_failed = False
+        self._stop_requested = False
+        # 计算过程中定期以资源指标调用（在监控线程中）
+        self.resource_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.last_resource_usage: Dict[str, Any] = {}
+        # 计算过程中以TALYS标准输出的每一行调用（在读取输出的线程中）
+        self.output_callback: Optional[Callable[[str], None]] = None
         
         # 验证TALYS可执行文件
         self._verify_talys_executable()
@@ -152,7 +172,7 @@ class TalysInterface(LoggerMixin):
     
     def create_temp_directory(self) -> Path:
         """
-        创建临时工作目录
+        从工作目录池取得空的工作目录
         
         Returns:
             Path: 临时目录路径
@@ -160,19 +180,16 @@ class TalysInterface(LoggerMixin):
         if self.temp_dir and self.temp_dir.exists():
             return self.temp_dir
             
-        self.temp_dir = Path(tempfile.mkdtemp(prefix="talys_calc_"))
-        self.logger.info(f"创建临时工作目录: {self.temp_dir}")
+        self.temp_dir = self.workdir_pool.acquire()
+        self.logger.info(f"使用工作目录: {self.temp_dir}")
         return self.temp_dir
     
     def cleanup_temp_directory(self):
-        """清理临时工作目录"""
-        if self.temp_dir and self.temp_dir.exists():
-            try:
-                shutil.rmtree(self.temp_dir)
-                self.logger.info(f"清理临时目录: {self.temp_dir}")
-                self.temp_dir = None
-            except Exception as e:
-                self.logger.error(f"清理临时目录失败: {e}")
+        """归还工作目录，由工作目录池在后台清理或按保留策略保留"""
+        if self.temp_dir:
+            self.workdir_pool.release(self.temp_dir, failed=self.last_run_failed)
+            self.logger.info(f"归还工作目录: {self.temp_dir}")
+            self.temp_dir = None
     
     def generate_input_file(self, parameters: Dict[str, Any]) -> Path:
         """
@@ -187,47 +204,12 @@ class TalysInterface(LoggerMixin):
         if not self.temp_dir:
             self.create_temp_directory()
             
-        input_file = self.temp_dir / "talys.inp"
+        input_file = self.temp_dir / INPUT_FILE_NAME
         
         try:
+            deck = InputDeck.from_parameters(parameters)
             with open(input_file, 'w', encoding='utf-8') as f:
-                # 文件头部注释
-                f.write("# TALYS input file generated by TALYS Visualizer\n")
-                f.write(f"# Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write("#\n\n")
-                
-                # 必需参数
-                f.write("# Required parameters\n")
-                basic_required_params = ['projectile', 'element', 'mass']
-                for param in basic_required_params:
-                    if param in parameters:
-                        f.write(f"{param} {parameters[param]}\n")
-                    else:
-                        raise ValueError(f"缺少必需参数: {param}")
-
-                # 能量参数处理
-                if 'energy' in parameters:
-                    # 单一能量模式
-                    f.write(f"energy {parameters['energy']}\n")
-                elif 'energy_mode' in parameters and parameters['energy_mode'] == 'range':
-                    # 能量范围模式
-                    f.write(f"energy {parameters['energy_min']} {parameters['energy_max']} {parameters['energy_step']}\n")
-                else:
-                    raise ValueError("缺少能量参数")
-                
-                f.write("\n")
-                
-                # 可选参数
-                f.write("# Optional parameters\n")
-                excluded_params = ['projectile', 'element', 'mass', 'energy', 'energy_min', 'energy_max', 'energy_step', 'energy_mode']
-                for key, value in parameters.items():
-                    if key not in excluded_params:
-                        # 处理布尔值
-                        if isinstance(value, bool):
-                            value = 'y' if value else 'n'
-                        f.write(f"{key} {value}\n")
-                
-                f.write("\n# End of input file\n")
+                f.write(deck.to_text())
             
             self.logger.info(f"生成TALYS输入文件: {input_file}")
             return input_file
@@ -236,23 +218,36 @@ class TalysInterface(LoggerMixin):
             self.logger.error(f"生成输入文件失败: {e}")
             raise TalysInterfaceError(f"生成输入文件失败: {e}")
     
-    def run_calculation(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def run_calculation(self, parameters: Dict[str, Any],
+                        energies: Optional[Sequence[float]] = None) -> Dict[str, Any]:
         """
         运行TALYS计算
         
+        计算超时、被取消或异常退出时，从已输出的内容中取回完成的入射能量，
+        通过 TalysCalculationError.partial_results 返回带 'partial' 标记的结果。
+        
         Args:
             parameters: 计算参数
+            energies: 只计算这些入射能量（写入能量列表文件，代替参数中的能量）
             
         Returns:
             Dict: 计算结果数据
         """
+        self.last_run_failed = True
+        self._stop_requested = False
+        monitor = None
+        process = None
+        stdout = ""
+        start_time = time.time()
         try:
             # 生成输入文件
+            if energies is not None:
+                parameters = {key: value for key, value in parameters.items() if key not in ENERGY_PARAMETERS}
+                parameters['energy'] = RESUME_ENERGY_FILE
             input_file = self.generate_input_file(parameters)
-            
-            # 切换到工作目录
-            original_dir = os.getcwd()
-            os.chdir(self.temp_dir)
+            if energies is not None:
+                with open(self.temp_dir / RESUME_ENERGY_FILE, 'w') as f:
+                    f.writelines(f"{energy:.6f}\n" for energy in energies)
             
             self.logger.info("开始TALYS计算...")
             start_time = time.time()
@@ -262,112 +257,229 @@ class TalysInterface(LoggerMixin):
             with open(input_file, 'r') as f:
                 input_content = f.read()
 
-            self.current_calculation = subprocess.Popen(
+            # gfortran默认缓冲写入管道的标准输出，进程被终止时缓冲区中的反应总结会丢失
+            env = None
+            if Settings.TALYS_UNBUFFERED_OUTPUT:
+                env = dict(os.environ, GFORTRAN_UNBUFFERED_PRECONNECTED='y')
+
+            # 在工作目录中运行（不切换进程当前目录，便于多个计算并行）
+            process = self.current_calculation = subprocess.Popen(
                 [self.executable],
+                cwd=self.temp_dir,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                env=env,
+                preexec_fn=self.resource_limits.preexec_fn()
             )
+            monitor = ProcessMonitor(process.pid, self.temp_dir,
+                                     callback=self.resource_callback).start()
 
             # 等待计算完成
-            stdout, stderr = self.current_calculation.communicate(
-                input=input_content,
-                timeout=Settings.TALYS_TIMEOUT
-            )
+            stdout, stderr = self._communicate(process, input_content, Settings.TALYS_TIMEOUT)
             
             calculation_time = time.time() - start_time
+            usage = self.last_resource_usage = monitor.stop()
+            self.logger.info(f"TALYS资源占用: 峰值内存 {usage['peak_rss_mb']:.1f} MB, "
+                             f"CPU {usage['cpu_user_s'] + usage['cpu_system_s']:.1f} s, "
+                             f"输出 {usage['output_bytes']} 字节")
             
-            if self.current_calculation.returncode == 0:
+            if process.returncode == 0:
                 self.logger.info(f"TALYS计算完成，耗时: {calculation_time:.2f}秒")
                 
                 # 解析输出文件
                 results = self.parse_output_files()
+                results['result_id'] = uuid.uuid4().hex
                 results['calculation_time'] = calculation_time
+                results['resources'] = dict(usage, limits=self.resource_limits.to_dict())
                 results['stdout'] = stdout
                 
+                self.last_run_failed = False
                 return results
             else:
-                error_msg = f"TALYS计算失败 (返回码: {self.current_calculation.returncode})"
-                if stderr:
+                reason = 'cancelled' if self._stop_requested else 'failed'
+                error_msg = "TALYS计算已取消" if self._stop_requested else \
+                    f"TALYS计算失败 (返回码: {process.returncode})"
+                if stderr and not self._stop_requested:
                     error_msg += f"\n错误信息: {stderr}"
                 self.logger.error(error_msg)
-                raise TalysCalculationError(error_msg)
+                raise TalysCalculationError(
+                    error_msg, self.salvage_partial_results(parameters, stdout, reason, energies, start_time))
                 
-        except subprocess.TimeoutExpired:
+        except subprocess.TimeoutExpired as e:
             self.logger.error("TALYS计算超时")
-            if self.current_calculation:
-                self.current_calculation.kill()
-            raise TalysCalculationError("TALYS计算超时")
+            # 先停止监控，取回的结果记录本次计算的资源占用
+            if monitor is not None:
+                self.last_resource_usage = monitor.stop()
+                monitor = None
+            # 进程已被终止，用超时前收到的输出取回已完成的能量
+            raise TalysCalculationError(
+                "TALYS计算超时",
+                self.salvage_partial_results(parameters, e.output or "", 'timeout', energies, start_time))
+        except TalysCalculationError:
+            raise
         except Exception as e:
             self.logger.error(f"TALYS计算过程中出错: {e}")
             raise TalysCalculationError(f"计算失败: {e}")
         finally:
-            os.chdir(original_dir)
+            if monitor is not None:
+                self.last_resource_usage = monitor.stop()
             self.current_calculation = None
+
+    def _communicate(self, process: subprocess.Popen, input_content: str,
+                     timeout: Optional[float]) -> tuple:
+        """
+        写入输入并逐行读取标准输出，每一行交给 output_callback
+
+        Returns:
+            tuple: (标准输出, 标准错误)
+
+        Raises:
+            subprocess.TimeoutExpired: 超时，进程已被终止，output 为超时前收到的输出
+        """
+        lines: List[str] = []
+        errors: List[str] = []
+
+        def read_stdout():
+            for line in process.stdout:
+                lines.append(line)
+                if self.output_callback is not None:
+                    try:
+                        self.output_callback(line)
+                    except Exception as e:
+                        self.logger.warning(f"处理TALYS输出失败: {e}")
+
+        readers = [threading.Thread(target=read_stdout, daemon=True),
+                   threading.Thread(target=lambda: errors.append(process.stderr.read()), daemon=True)]
+        for reader in readers:
+            reader.start()
+        try:
+            process.stdin.write(input_content)
+            process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass  # 进程已退出，返回码说明原因
+
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            for reader in readers:
+                reader.join(timeout=5)
+            raise subprocess.TimeoutExpired(process.args, timeout, output=''.join(lines))
+        for reader in readers:
+            reader.join()
+        return ''.join(lines), ''.join(errors)
+
+    def salvage_partial_results(self, parameters: Dict[str, Any], stdout: str, reason: str,
+                                energies: Optional[Sequence[float]] = None,
+                                start_time: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        从中断的计算中取回已完成入射能量的结果
+        
+        Args:
+            parameters: 计算参数
+            stdout: 中断前收到的标准输出
+            reason: 中断原因（'timeout'、'cancelled' 或 'failed'）
+            energies: 本次计算要求的入射能量，默认由参数或工作目录中的能量列表确定
+            start_time: 计算开始时间
+            
+        Returns:
+            Dict: 不完整结果，没有完成任何能量时返回None
+        """
+        try:
+            # 逐组解析，某个写了一半的文件只影响它所在的一组
+            file_results = self.parse_output_files(skip_failed=True)
+        except (TalysInterfaceError, OSError) as e:
+            self.logger.warning(f"解析中断计算的输出文件失败: {e}")
+            file_results = {}
+        requested = energies if energies is not None else requested_energies(parameters, self.temp_dir)
+        results = salvage_results(file_results, stdout, requested, reason)
+        if results is not None:
+            results['result_id'] = uuid.uuid4().hex
+            results['calculation_time'] = time.time() - start_time if start_time else 0.0
+            results['resources'] = dict(self.last_resource_usage, limits=self.resource_limits.to_dict())
+        return results
+
+    def resume_calculation(self, parameters: Dict[str, Any], previous: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        只计算不完整结果中缺失的入射能量，并与之前的结果合并
+        
+        续算再次中断时，TalysCalculationError.partial_results 为合并后的不完整结果。
+        
+        Args:
+            parameters: 原计算参数
+            previous: 带 'partial' 标记的结果
+            
+        Returns:
+            Dict: 合并后的结果
+        """
+        missing = missing_energies(previous)
+        if not missing:
+            return dict(previous)
+        self.logger.info(f"续算缺失的 {len(missing)} 个入射能量")
+        try:
+            resumed = self.run_calculation(parameters, energies=missing)
+        except TalysCalculationError as e:
+            if e.partial_results is not None:
+                e.partial_results = merge_results(previous, e.partial_results)
+            else:
+                e.partial_results = dict(previous)
+            raise
+        return merge_results(previous, resumed)
     
-    def parse_output_files(self) -> Dict[str, Any]:
+    def parse_output_files(self, skip_failed: bool = False) -> Dict[str, Any]:
         """
         解析TALYS输出文件
         
+        Args:
+            skip_failed: 某一组文件解析失败时记录警告并只跳过这一组（取回中断计算的结果时使用），
+                默认抛出异常
+        
         Returns:
             Dict: 解析后的数据
         """
         if not self.temp_dir:
             raise TalysInterfaceError("没有可用的工作目录")
         
-        results = {}
-        
-        # 解析总截面文件
         total_file = self.temp_dir / "total.tot"
-        if total_file.exists():
-            results['total_cross_section'] = self._parse_cross_section_file(total_file)
-            self.logger.debug("解析总截面文件完成")
-        
-        # 解析能谱文件
-        spectra_files = list(self.temp_dir.glob("*.spe"))
-        if spectra_files:
-            results['spectra'] = {}
-            for file in spectra_files:
-                particle = file.stem
-                results['spectra'][particle] = self._parse_spectrum_file(file)
-            self.logger.debug(f"解析{len(spectra_files)}个能谱文件完成")
-        
-        # 解析角分布文件
-        angular_files = list(self.temp_dir.glob("*.ang"))
-        if angular_files:
-            results['angular'] = {}
-            for file in angular_files:
-                energy = file.stem
-                results['angular'][energy] = self._parse_angular_file(file)
-            self.logger.debug(f"解析{len(angular_files)}个角分布文件完成")
-
-        # 解析残余核产生文件
-        residual_files = list(self.temp_dir.glob("rp*.tot"))
-        if residual_files:
-            results['residual_production'] = {}
-            for file in residual_files:
-                nucleus = file.stem
-                results['residual_production'][nucleus] = self._parse_cross_section_file(file)
-            self.logger.debug(f"解析{len(residual_files)}个残余核产生文件完成")
-
-        # 解析反应道截面文件
-        channel_files = list(self.temp_dir.glob("*.L*"))
-        if channel_files:
-            results['reaction_channels'] = {}
-            for file in channel_files:
-                channel = file.name
-                results['reaction_channels'][channel] = self._parse_cross_section_file(file)
-            self.logger.debug(f"解析{len(channel_files)}个反应道文件完成")
-
-        # 解析gamma射线产生文件
-        gamma_files = list(self.temp_dir.glob("*.gam"))
-        if gamma_files:
-            results['gamma_production'] = {}
-            for file in gamma_files:
-                transition = file.stem
-                results['gamma_production'][transition] = self._parse_spectrum_file(file)
-            self.logger.debug(f"解析{len(gamma_files)}个gamma产生文件完成")
+        groups = [
+            # 总截面
+            ('total_cross_section',
+             lambda: self._parse_cross_section_file(total_file) if total_file.exists() else None),
+            # 能谱
+            ('spectra', lambda: self._parse_files("*.spe", self._parse_spectrum_file, lambda f: f.stem)),
+            # 角分布
+            ('angular', lambda: self._parse_files("*.ang", self._parse_angular_file, lambda f: f.stem)),
+            # 残余核产生截面
+            ('residual_production',
+             lambda: self._parse_files("rp*.tot", self._parse_cross_section_file, lambda f: f.stem)),
+            # 独占反应道总截面（xs<n><p><d><t><h><a>.tot）
+            ('exclusive_channels',
+             lambda: self._parse_files("xs*.tot", self._parse_cross_section_file, lambda f: f.stem)),
+            # 反应道截面
+            ('reaction_channels',
+             lambda: self._parse_files("*.L*", self._parse_cross_section_file, lambda f: f.name)),
+            # gamma射线产生
+            ('gamma_production', lambda: self._parse_files("*.gam", self._parse_spectrum_file, lambda f: f.stem)),
+            # 瞬发裂变中子谱
+            ('pfns', lambda: PromptFissionSpectra.from_directory(self.temp_dir)),
+            # 裂变位垒
+            ('fission_barriers', lambda: FissionBarrierDataset.from_directory(self.temp_dir)),
+        ]
+
+        results = {}
+        for section, parse in groups:
+            try:
+                value = parse()
+            except Exception as e:
+                if not skip_failed:
+                    raise
+                self.logger.warning(f"解析输出文件组 {section} 失败，已跳过: {e}")
+                continue
+            if value is not None:
+                results[section] = value
 
         # 列出所有输出文件
         output_files = list(self.temp_dir.glob("*"))
@@ -375,6 +487,21 @@ class TalysInterface(LoggerMixin):
 
         self.logger.info(f"解析完成，共找到{len(results['output_files'])}个输出文件")
         return results
+
+    def _parse_files(self, pattern: str, parser: Callable[[Path], Any],
+                     name: Callable[[Path], str]) -> Optional[Dict[str, Any]]:
+        """
+        解析工作目录中与 pattern 匹配的一组文件
+
+        Returns:
+            Dict: 条目名称 -> 解析结果，没有匹配的文件时返回None
+        """
+        files = list(self.temp_dir.glob(pattern))
+        if not files:
+            return None
+        parsed = {name(file): parser(file) for file in files}
+        self.logger.debug(f"解析{len(files)}个 {pattern} 文件完成")
+        return parsed
     
     def _parse_cross_section_file(self, file_path: Path) -> Dict[str, List[float]]:
         """解析截面文件"""
@@ -406,10 +533,15 @@ class TalysInterface(LoggerMixin):
                         except ValueError:
                             continue
             
-            return {
+            parsed = {
                 'energy': energies,
                 'cross_section': cross_sections
             }
+
+            # 保留YANDF头部（反应道、ENDF_MF/ENDF_MT等信息，供导出和比较使用）
+            if lines and lines[0].startswith('# header:'):
+                parsed['header'], _ = parse_yandf_header(lines[:data_start])
+            return parsed
             
         except Exception as e:
             self.logger.error(f"解析截面文件失败 {file_path}: {e}")
@@ -490,20 +622,24 @@ class TalysInterface(LoggerMixin):
             return {'angle': [], 'cross_section': []}
     
     def stop_calculation(self):
-        """停止当前计算"""
-        if self.current_calculation and self.current_calculation.poll() is None:
+        """停止当前计算（run_calculation 随后取回已完成的能量）"""
+        process = self.current_calculation
+        if process and process.poll() is None:
             self.logger.info("停止TALYS计算")
-            self.current_calculation.terminate()
+            self._stop_requested = True
+            process.terminate()
             try:
-                self.current_calculation.wait(timeout=5)
+                process.wait(timeout=5)
             except subprocess.TimeoutExpired:
-                self.current_calculation.kill()
-            self.current_calculation = None
+                process.kill()
 
 class TalysInterfaceError(Exception):
     """TALYS接口错误"""
     pass
 
 class TalysCalculationError(Exception):
-    """TALYS计算错误"""
-    pass
+    """TALYS计算错误，partial_results 为中断时取回的不完整结果"""
+
+    def __init__(self, message: str = "", partial_results: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.partial_results = partial_results
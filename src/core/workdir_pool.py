@@ -0,0 +1,199 @@
+"""
+工作目录池模块
+预先创建并清空TALYS工作目录，用完后在后台线程中清理再回收，
+可放在tmpfs等快速文件系统上，并支持保留最近N个目录和失败计算的目录
+"""
+
+import atexit
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, List, Optional, Union
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from utils.logger import LoggerMixin
+
+
+def clear_directory(directory: Path):
+    """删除目录中的全部内容，保留目录本身"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+class WorkDirPool(LoggerMixin):
+    """TALYS工作目录池"""
+
+    def __init__(self, root: Optional[Union[str, Path]] = None,
+                 size: Optional[int] = None,
+                 keep_last: Optional[int] = None,
+                 keep_failed: Optional[bool] = None):
+        """
+        初始化目录池并预先创建空目录
+
+        Args:
+            root: 池所在的父目录，默认使用配置中的 WORKDIR_ROOT（None时为系统临时目录）
+            size: 空闲目录数量上限
+            keep_last: 保留最近多少个已完成计算的目录（不清理，便于查看输出）
+            keep_failed: 是否保留失败计算的目录
+        """
+        root = root or Settings.WORKDIR_ROOT or tempfile.gettempdir()
+        self.base_dir = Path(tempfile.mkdtemp(prefix="talys_pool_", dir=root))
+        self.size = Settings.WORKDIR_POOL_SIZE if size is None else size
+        self.keep_last = Settings.WORKDIR_KEEP_LAST if keep_last is None else keep_last
+        self.keep_failed = Settings.WORKDIR_KEEP_FAILED if keep_failed is None else keep_failed
+
+        self._lock = threading.Lock()
+        self._free: Deque[Path] = deque()
+        self._in_use: set = set()
+        self._recent: Deque[Path] = deque()
+        self.failed: List[Path] = []
+        self._counter = 0
+
+        self._cleanup_queue: "queue.Queue[Optional[Path]]" = queue.Queue()
+        self._cleaner = threading.Thread(target=self._cleanup_loop, name="WorkDirPoolCleaner", daemon=True)
+        self._cleaner.start()
+
+        for _ in range(self.size):
+            self._free.append(self._new_directory())
+        self.logger.info(f"工作目录池已创建: {self.base_dir}（{self.size}个目录）")
+
+    def _new_directory(self) -> Path:
+        """在池目录中新建一个工作目录"""
+        with self._lock:
+            self._counter += 1
+            number = self._counter
+        directory = self.base_dir / f"run_{number:06d}"
+        directory.mkdir()
+        return directory
+
+    def acquire(self) -> Path:
+        """
+        取得一个空的工作目录，池中没有空闲目录时立即新建
+
+        Returns:
+            Path: 工作目录
+        """
+        with self._lock:
+            directory = self._free.popleft() if self._free else None
+        if directory is None:
+            directory = self._new_directory()
+        with self._lock:
+            self._in_use.add(directory)
+        return directory
+
+    def release(self, directory: Union[str, Path], failed: bool = False):
+        """
+        归还工作目录，按保留策略决定保留或交给后台线程清理
+
+        Args:
+            directory: acquire() 返回的目录
+            failed: 该目录中的计算是否失败
+        """
+        directory = Path(directory)
+        to_clean: List[Path] = []
+        with self._lock:
+            self._in_use.discard(directory)
+            if failed and self.keep_failed:
+                self.failed.append(directory)
+                self.logger.info(f"保留失败计算的工作目录: {directory}")
+            elif self.keep_last > 0:
+                self._recent.append(directory)
+                while len(self._recent) > self.keep_last:
+                    to_clean.append(self._recent.popleft())
+            else:
+                to_clean.append(directory)
+
+        for path in to_clean:
+            self._cleanup_queue.put(path)
+
+    @property
+    def retained(self) -> List[Path]:
+        """当前保留的目录（最近完成的和失败的）"""
+        with self._lock:
+            return list(self._recent) + list(self.failed)
+
+    def discard_retained(self):
+        """清理全部保留的目录"""
+        with self._lock:
+            paths = list(self._recent) + self.failed
+            self._recent.clear()
+            self.failed = []
+        for path in paths:
+            self._cleanup_queue.put(path)
+
+    def _cleanup_loop(self):
+        """后台清理线程：清空目录后放回空闲队列，空闲目录已满时直接删除"""
+        while True:
+            directory = self._cleanup_queue.get()
+            try:
+                if directory is None:
+                    return
+                with self._lock:
+                    reuse = len(self._free) < self.size
+                if reuse:
+                    clear_directory(directory)
+                    with self._lock:
+                        self._free.append(directory)
+                else:
+                    shutil.rmtree(directory, ignore_errors=True)
+            except OSError as e:
+                self.logger.warning(f"清理工作目录失败 {directory}: {e}")
+            finally:
+                self._cleanup_queue.task_done()
+
+    def wait_idle(self):
+        """等待后台清理队列处理完毕"""
+        self._cleanup_queue.join()
+
+    @property
+    def free_count(self) -> int:
+        """空闲目录数"""
+        with self._lock:
+            return len(self._free)
+
+    def shutdown(self):
+        """
+        停止后台线程并删除池目录；有保留目录时只删除空闲目录，保留目录留在磁盘上
+        """
+        self._cleanup_queue.put(None)
+        self._cleaner.join()
+
+        with self._lock:
+            free = list(self._free)
+            self._free.clear()
+            keep = bool(self._recent or self.failed)
+
+        if keep:
+            for directory in free:
+                shutil.rmtree(directory, ignore_errors=True)
+            self.logger.info(f"工作目录池已关闭，保留目录位于: {self.base_dir}")
+        else:
+            shutil.rmtree(self.base_dir, ignore_errors=True)
+            self.logger.info("工作目录池已关闭")
+
+
+# 全局工作目录池
+_workdir_pool = None
+_workdir_pool_lock = threading.Lock()
+
+def get_workdir_pool() -> WorkDirPool:
+    """获取全局工作目录池（首次调用时创建）"""
+    global _workdir_pool
+    with _workdir_pool_lock:
+        if _workdir_pool is None:
+            _workdir_pool = WorkDirPool()
+            atexit.register(_workdir_pool.shutdown)
+    return _workdir_pool
@@ -0,0 +1,127 @@
+"""
+YANDF格式解析模块
+负责解析TALYS-2.0输出文件统一使用的YANDF头部（# key: value 形式）及其数据块
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Tuple, Union
+
+import numpy as np
+
+
+def _convert_value(text: str) -> Any:
+    """将头部字段的文本值转换为int/float，无法转换时保留字符串"""
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def parse_yandf_header(lines: List[str]) -> Tuple[Dict[str, Any], int]:
+    """
+    解析YANDF头部
+
+    头部中每一级缩进（两个空格）对应一层嵌套字典，"##" 开头的两行分别是
+    列名和单位，保存到 datablock 下的 column_names / column_units 中。
+
+    Args:
+        lines: 文件的文本行
+
+    Returns:
+        tuple: (头部字典, 数据区起始行号)
+    """
+    header: Dict[str, Any] = {}
+    stack: List[Tuple[int, Dict[str, Any]]] = [(-1, header)]
+    column_lines: List[List[str]] = []
+    data_start = len(lines)
+
+    for i, line in enumerate(lines):
+        if not line.startswith('#'):
+            if line.strip():
+                data_start = i
+                break
+            continue
+
+        if line.startswith('##'):
+            # 列名之间至少有两个空格，列名本身可能含单个空格（如 Isomeric ratio）
+            column_lines.append(re.split(r'\s{2,}', line[2:].strip()))
+            continue
+
+        body = line[1:].rstrip()
+        if ':' not in body:
+            continue
+        indent = (len(body) - len(body.lstrip(' '))) // 2
+        key, _, value = body.strip().partition(':')
+        key = key.strip()
+
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        parent = stack[-1][1]
+
+        if value.strip():
+            parent[key] = _convert_value(value)
+        else:
+            # 没有值的键是下一级的分组
+            child: Dict[str, Any] = {}
+            parent[key] = child
+            stack.append((indent, child))
+
+    if column_lines:
+        datablock = header.setdefault('datablock', {})
+        datablock['column_names'] = column_lines[0]
+        if len(column_lines) > 1:
+            datablock['column_units'] = [unit.strip('[]') for unit in column_lines[1]]
+
+    return header, data_start
+
+
+def read_yandf_header(file_path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    只读取YANDF文件的头部，遇到第一行数据即停止
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        Dict: 头部字典
+    """
+    lines = []
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip() and not line.startswith('#'):
+                break
+            lines.append(line)
+    header, _ = parse_yandf_header(lines)
+    return header
+
+
+def read_yandf_file(file_path: Union[str, Path]) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    读取完整的YANDF文件
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        tuple: (头部字典, 形状为 (entries, columns) 的数据数组)
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    header, data_start = parse_yandf_header(lines)
+    columns = header.get('datablock', {}).get('columns')
+    text = ''.join(lines[data_start:])
+    values = np.array(text.split(), dtype=float)
+
+    if not columns:
+        columns = len(lines[data_start].split()) if data_start < len(lines) else 1
+    rows = values.size // columns
+    return header, values[:rows * columns].reshape(rows, columns)
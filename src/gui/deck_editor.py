@@ -0,0 +1,221 @@
+"""
+TALYS输入文件编辑器
+基于 QPlainTextEdit 的编辑器：按关键字前缀树做语法高亮（只重新高亮改动过的文本块），
+行首关键字的自动补全，以及校验诊断信息的波浪下划线标注和悬停提示
+"""
+
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PyQt6.QtWidgets import QCompleter, QPlainTextEdit, QTextEdit, QToolTip
+from PyQt6.QtCore import QEvent, QStringListModel, Qt
+from PyQt6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat, QTextCursor
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from core.deck_validator import ERROR, INFO, WARNING, Diagnostic
+from core.input_schema import ELEMENT_Z, KEYWORD_ALIASES, PARTICLES, KeywordSchema, get_keyword_schema
+
+# 编辑器中最多标注的诊断条数
+MAX_ANNOTATIONS = 1000
+
+# 输入少于这么多个字符时不弹出补全
+COMPLETION_MIN_PREFIX = 2
+
+SEVERITY_COLORS = {ERROR: '#dc3545', WARNING: '#fd7e14', INFO: '#0d6efd'}
+
+_TOKEN = re.compile(r'\S+')
+_NUMBER = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)([eEdD][+-]?\d+)?$')
+
+
+def _format(color: str, bold: bool = False, italic: bool = False) -> QTextCharFormat:
+    text_format = QTextCharFormat()
+    text_format.setForeground(QColor(color))
+    if bold:
+        text_format.setFontWeight(QFont.Weight.Bold)
+    text_format.setFontItalic(italic)
+    return text_format
+
+
+class DeckHighlighter(QSyntaxHighlighter):
+    """
+    输入文件语法高亮
+
+    每行的第一个词在关键字前缀树中查找，其余的词按 y/n、数值、粒子和元素符号着色。
+    各行之间没有跨行状态，编辑时 QSyntaxHighlighter 只重新高亮改动过的文本块。
+    """
+
+    def __init__(self, document, schema: Optional[KeywordSchema] = None):
+        super().__init__(document)
+        self.trie = (schema or get_keyword_schema()).trie
+        self.formats = {
+            'required': _format('#6f42c1', bold=True),
+            'keyword': _format('#0d47a1', bold=True),
+            'alias': _format('#0d6efd'),
+            'unknown': _format('#dc3545'),
+            'flag': _format('#2e7d32'),
+            'number': _format('#d35400'),
+            'symbol': _format('#00838f'),
+            'comment': _format('#6c757d', italic=True),
+        }
+
+    def keyword_format(self, word: str, spec) -> QTextCharFormat:
+        if spec is None:
+            return self.formats['unknown']
+        if spec.group == 'required':
+            return self.formats['required']
+        return self.formats['alias' if word.lower() in KEYWORD_ALIASES else 'keyword']
+
+    def value_format(self, word: str, code: Optional[str]) -> Optional[QTextCharFormat]:
+        """参数的格式，code 为关键字签名中该位置的记号（未知时为None）"""
+        lowered = word.lower()
+        if _NUMBER.match(word):
+            return self.formats['number']
+        if code in ('p', 'P', 'c', 'e') or (code is None and (lowered in PARTICLES or lowered in ELEMENT_Z)):
+            return self.formats['symbol']  # projectile n、rvadjust n 中的 n 是粒子
+        if lowered in ('y', 'n'):
+            return self.formats['flag']
+        return None
+
+    def highlightBlock(self, text: str):
+        comment = text.find('#')
+        code = text if comment < 0 else text[:comment]
+        spec = None
+        for index, match in enumerate(_TOKEN.finditer(code)):
+            word = match.group()
+            if index == 0:
+                spec = self.trie.lookup(word)
+                text_format = self.keyword_format(word, spec)
+            else:
+                signature = spec.signature if spec is not None else ()
+                argument = signature[min(index, len(signature)) - 1].rstrip('?') if signature else None
+                text_format = self.value_format(word, argument)
+            if text_format is not None:
+                self.setFormat(match.start(), len(word), text_format)
+        if comment >= 0:
+            self.setFormat(comment, len(text) - comment, self.formats['comment'])
+
+
+class DeckEditor(QPlainTextEdit):
+    """TALYS输入文件编辑器"""
+
+    def __init__(self, parent=None, schema: Optional[KeywordSchema] = None):
+        super().__init__(parent)
+        self.schema = schema or get_keyword_schema()
+        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.highlighter = DeckHighlighter(self.document(), self.schema)
+        self.diagnostics: Dict[int, List[Diagnostic]] = {}  # 行号 -> 该行的诊断信息
+
+        # 补全列表按字母顺序，前缀匹配由 QCompleter 在有序模型上二分查找
+        self.completion_model = QStringListModel(self.schema.names(), self)
+        self.completer = QCompleter(self.completion_model, self)
+        self.completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.completer.setModelSorting(QCompleter.ModelSorting.CaseInsensitivelySortedModel)
+        self.completer.setWidget(self)
+        self.completer.activated.connect(self.insert_completion)
+
+    def keyword_prefix(self) -> Optional[str]:
+        """光标位于行首关键字末尾时返回已输入的部分，否则返回None"""
+        cursor = self.textCursor()
+        before = cursor.block().text()[:cursor.positionInBlock()]
+        stripped = before.lstrip()
+        if not stripped or any(char.isspace() or char == '#' for char in stripped):
+            return None
+        return stripped
+
+    def insert_completion(self, keyword: str):
+        """用补全的关键字替换已输入的前缀"""
+        cursor = self.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.Left, QTextCursor.MoveMode.KeepAnchor,
+                            len(self.completer.completionPrefix()))
+        cursor.insertText(keyword + ' ')
+        self.setTextCursor(cursor)
+
+    def keyPressEvent(self, event):
+        popup = self.completer.popup()
+        if popup.isVisible() and event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter, Qt.Key.Key_Tab,
+                                                 Qt.Key.Key_Escape, Qt.Key.Key_Backtab):
+            event.ignore()  # 交给补全弹窗处理
+            return
+        super().keyPressEvent(event)
+        if not event.text():
+            return
+        self.update_completion()
+
+    def update_completion(self):
+        """按光标处的关键字前缀显示或隐藏补全弹窗"""
+        popup = self.completer.popup()
+        prefix = self.keyword_prefix()
+        if prefix is None or len(prefix) < COMPLETION_MIN_PREFIX or self.schema.get(prefix) is not None:
+            popup.hide()
+            return
+        if prefix != self.completer.completionPrefix():
+            self.completer.setCompletionPrefix(prefix)
+            popup.setCurrentIndex(self.completer.completionModel().index(0, 0))
+        if self.completer.completionCount() == 0:
+            popup.hide()
+            return
+        rect = self.cursorRect()
+        rect.setWidth(popup.sizeHintForColumn(0) + popup.verticalScrollBar().sizeHint().width())
+        self.completer.complete(rect)
+
+    def set_diagnostics(self, diagnostics: List[Diagnostic]):
+        """以波浪下划线标注诊断位置，悬停时显示诊断信息"""
+        self.diagnostics = {}
+        document = self.document()
+        selections = []
+        for diagnostic in diagnostics[:MAX_ANNOTATIONS]:
+            block = document.findBlockByNumber(diagnostic.line)
+            if not block.isValid():
+                continue
+            self.diagnostics.setdefault(diagnostic.line, []).append(diagnostic)
+            start, end = diagnostic.start, diagnostic.end
+            last = max(block.length() - 1, 0)
+            if end <= start:
+                start, end = 0, last  # 整个文件的问题标注在所在行
+            cursor = QTextCursor(block)
+            cursor.setPosition(block.position() + min(start, last))
+            cursor.setPosition(block.position() + min(end, last), QTextCursor.MoveMode.KeepAnchor)
+
+            selection = QTextEdit.ExtraSelection()
+            selection.cursor = cursor
+            selection.format.setUnderlineStyle(QTextCharFormat.UnderlineStyle.WaveUnderline)
+            selection.format.setUnderlineColor(QColor(SEVERITY_COLORS[diagnostic.severity]))
+            selections.append(selection)
+        self.setExtraSelections(selections)
+
+    def go_to(self, line: int, column: int = 0):
+        """把光标移到指定行列（从0开始）"""
+        block = self.document().findBlockByNumber(line)
+        if not block.isValid():
+            return
+        cursor = QTextCursor(block)
+        cursor.setPosition(block.position() + min(column, max(block.length() - 1, 0)))
+        self.setTextCursor(cursor)
+        self.centerCursor()
+        self.setFocus()
+
+    def event(self, event):
+        if event.type() == QEvent.Type.ToolTip:
+            cursor = self.cursorForPosition(event.pos())
+            text = self.tooltip_text(cursor.blockNumber(), cursor.positionInBlock(), cursor.block().text())
+            if text:
+                QToolTip.showText(event.globalPos(), text, self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(event)
+
+    def tooltip_text(self, line: int, column: int, text: str) -> str:
+        """悬停位置的诊断信息；悬停在关键字上时附带关键字用法"""
+        messages = [diagnostic.message for diagnostic in self.diagnostics.get(line, [])
+                    if diagnostic.start <= column <= max(diagnostic.end, diagnostic.start)
+                    or diagnostic.end <= diagnostic.start]
+        match = _TOKEN.search(text.split('#', 1)[0])
+        if match and match.start() <= column <= match.end():
+            spec = self.schema.get(match.group())
+            if spec is not None:
+                messages.append(f"{spec.usage}\n{spec.description}")
+        return '\n'.join(messages)
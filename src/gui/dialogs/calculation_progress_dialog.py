@@ -12,6 +12,8 @@ from PyQt6.QtGui import *
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from utils.i18n import tr
 from core.talys_interface import TalysInterface, TalysCalculationError, TalysInterfaceError
+from core.process_monitor import format_resource_usage
+from core.live_buffer import SummaryStream
 
 class CalculationWorker(QThread):
     """计算工作线程"""
@@ -20,10 +22,15 @@ class CalculationWorker(QThread):
     progress_updated = pyqtSignal(str)  # 进度更新
     calculation_finished = pyqtSignal(dict)  # 计算完成
     calculation_failed = pyqtSignal(str)  # 计算失败
+    calculation_cancelled = pyqtSignal(object)  # 取消完成，参数为取回的不完整结果（可能为None）
+    resources_updated = pyqtSignal(dict)  # TALYS进程资源占用
     
-    def __init__(self, parameters):
+    def __init__(self, parameters, resume_from=None, live_buffer=None):
         super().__init__()
         self.parameters = parameters
+        self.resume_from = resume_from  # 续算的不完整结果
+        self.live_buffer = live_buffer  # 实时写入各入射能量反应总结的缓冲区
+        self.partial_results = None  # 中断时取回的不完整结果
         self.talys_interface = None
         self._is_cancelled = False
         
@@ -34,6 +41,9 @@ class CalculationWorker(QThread):
             
             # 创建TALYS接口
             self.talys_interface = TalysInterface()
+            self.talys_interface.resource_callback = self.resources_updated.emit
+            if self.live_buffer is not None:
+                self.talys_interface.output_callback = SummaryStream(self.live_buffer)
             
             if self._is_cancelled:
                 return
@@ -52,16 +62,27 @@ class CalculationWorker(QThread):
             self.progress_updated.emit("生成输入文件...")
             
             # 运行计算
-            self.progress_updated.emit("运行TALYS计算...")
-            results = self.talys_interface.run_calculation(self.parameters)
+            if self.resume_from is not None:
+                self.progress_updated.emit("续算缺失的入射能量...")
+                results = self.talys_interface.resume_calculation(self.parameters, self.resume_from)
+            else:
+                self.progress_updated.emit("运行TALYS计算...")
+                results = self.talys_interface.run_calculation(self.parameters)
             
             if not self._is_cancelled:
                 self.progress_updated.emit("计算完成")
                 self.calculation_finished.emit(results)
+            else:
+                self.partial_results = results  # 取消时计算恰好完成，结果照常交出
                 
         except TalysCalculationError as e:
+            # 超时或异常退出时交出已完成能量的结果；取消时通过 calculation_cancelled 交出
+            self.partial_results = e.partial_results
             if not self._is_cancelled:
-                self.calculation_failed.emit(f"计算失败: {str(e)}")
+                if e.partial_results is not None:
+                    self.calculation_finished.emit(e.partial_results)
+                else:
+                    self.calculation_failed.emit(f"计算失败: {str(e)}")
         except TalysInterfaceError as e:
             if not self._is_cancelled:
                 self.calculation_failed.emit(f"接口错误: {str(e)}")
@@ -72,6 +93,8 @@ class CalculationWorker(QThread):
             # 清理资源
             if self.talys_interface:
                 self.talys_interface.cleanup_temp_directory()
+            if self._is_cancelled:
+                self.calculation_cancelled.emit(self.partial_results)
                 
     def cancel(self):
         """取消计算"""
@@ -85,10 +108,13 @@ class CalculationProgressDialog(QDialog):
     # 信号定义
     calculation_completed = pyqtSignal(dict)  # 计算完成信号
     
-    def __init__(self, parameters, parent=None):
+    def __init__(self, parameters, parent=None, resume_from=None, live_buffer=None):
         super().__init__(parent)
         self.parameters = parameters
+        self.resume_from = resume_from
+        self.live_buffer = live_buffer
         self.worker = None
+        self.worker_done = False  # 工作线程已交出结果（完成、失败或取消）
         self.init_ui()
         self.start_calculation()
         
@@ -96,7 +122,7 @@ class CalculationProgressDialog(QDialog):
         """初始化用户界面"""
         self.setWindowTitle(tr('calculation_progress_title', "TALYS计算进度"))
         self.setModal(True)
-        self.setFixedSize(400, 200)
+        self.setFixedSize(400, 230)
         
         # 主布局
         layout = QVBoxLayout(self)
@@ -129,6 +155,16 @@ class CalculationProgressDialog(QDialog):
         """)
         layout.addWidget(self.status_label)
         
+        # 资源占用
+        self.resources_label = QLabel("")
+        self.resources_label.setStyleSheet("""
+            QLabel {
+                color: #666;
+                font-size: 11px;
+            }
+        """)
+        layout.addWidget(self.resources_label)
+        
         # 参数显示
         params_text = self.format_parameters()
         params_label = QLabel(params_text)
@@ -164,12 +200,14 @@ class CalculationProgressDialog(QDialog):
         
     def start_calculation(self):
         """开始计算"""
-        self.worker = CalculationWorker(self.parameters)
+        self.worker = CalculationWorker(self.parameters, self.resume_from, self.live_buffer)
         
         # 连接信号
         self.worker.progress_updated.connect(self.update_progress)
         self.worker.calculation_finished.connect(self.on_calculation_finished)
         self.worker.calculation_failed.connect(self.on_calculation_failed)
+        self.worker.calculation_cancelled.connect(self.on_calculation_cancelled)
+        self.worker.resources_updated.connect(self.update_resources)
         
         # 启动线程
         self.worker.start()
@@ -178,11 +216,22 @@ class CalculationProgressDialog(QDialog):
         """更新进度"""
         self.status_label.setText(message)
         
+    def update_resources(self, metrics):
+        """更新TALYS进程资源占用"""
+        self.resources_label.setText(format_resource_usage(metrics))
+        
     def on_calculation_finished(self, results):
         """计算完成"""
+        self.worker_done = True
         self.progress_bar.setRange(0, 1)
         self.progress_bar.setValue(1)
-        self.status_label.setText("计算完成！")
+        partial = results.get('partial')
+        if partial:
+            self.status_label.setText(f"计算中断，完成 {len(partial['completed'])}/{len(partial['requested'])} 个入射能量")
+        else:
+            self.status_label.setText("计算完成！")
+        if results.get('resources'):
+            self.update_resources(results['resources'])
         self.cancel_button.setText("关闭")
         
         # 发出完成信号
@@ -193,6 +242,7 @@ class CalculationProgressDialog(QDialog):
         
     def on_calculation_failed(self, error_message):
         """计算失败"""
+        self.worker_done = True
         self.progress_bar.setRange(0, 1)
         self.progress_bar.setValue(0)
         self.status_label.setText("计算失败")
@@ -203,26 +253,41 @@ class CalculationProgressDialog(QDialog):
         self.reject()
         
     def cancel_calculation(self):
-        """取消计算"""
-        if self.worker and self.worker.isRunning():
-            self.status_label.setText("正在取消...")
-            self.worker.cancel()
-            self.worker.wait(5000)  # 等待最多5秒
-        
+        """取消计算：通知工作线程停止，等它通过 calculation_cancelled 交出结果后再关闭"""
+        if self.worker and self.worker.isRunning() and not self.worker_done:
+            if self.cancel_button.isEnabled():
+                self.status_label.setText("正在取消，等待取回已完成能量的结果...")
+                self.cancel_button.setEnabled(False)
+                self.worker.cancel()
+            return
         self.reject()
-        
-    def closeEvent(self, event):
-        """关闭事件"""
+
+    def on_calculation_cancelled(self, partial_results):
+        """取消完成：交出取消前已完成能量的结果"""
+        self.worker_done = True
+        if partial_results is not None:
+            self.calculation_completed.emit(partial_results)
+        self.reject()
+
+    def done(self, result):
+        """关闭对话框（accept、reject、Esc都经过这里）：计算进行中时改为取消"""
         if self.worker and self.worker.isRunning():
-            reply = QMessageBox.question(
-                self, "确认", "计算正在进行中，确定要取消吗？",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-            )
-            
-            if reply == QMessageBox.StandardButton.Yes:
+            if not self.worker_done:
                 self.cancel_calculation()
-                event.accept()
-            else:
-                event.ignore()
+                return
+            self.worker.wait()  # 结果已交出，只剩清理工作目录
+        super().done(result)
+
+    def closeEvent(self, event):
+        """关闭事件"""
+        if self.worker and self.worker.isRunning() and not self.worker_done:
+            if self.cancel_button.isEnabled():
+                reply = QMessageBox.question(
+                    self, "确认", "计算正在进行中，确定要取消吗？",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reply == QMessageBox.StandardButton.Yes:
+                    self.cancel_calculation()
+            event.ignore()  # 取消完成后对话框自行关闭
         else:
             event.accept()
@@ -4,7 +4,7 @@
 
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Sequence
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
@@ -12,6 +12,9 @@ from PyQt6.QtGui import *
 # 添加项目根目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from utils.i18n import tr
+from gui.numpy_table_model import NumpyTableModel, NumpyFilterProxyModel, resize_columns_from_sample
+from gui.dialogs.export_dialog import ExportDialog
+from core.exporters import tables_from_results
 
 class CalculationResultsDialog(QDialog):
     """计算结果显示对话框"""
@@ -124,19 +127,11 @@ class CalculationResultsDialog(QDialog):
         # 总截面数据
         if 'total_cross_section' in self.results:
             cs_data = self.results['total_cross_section']
-            if cs_data['energy'] and cs_data['cross_section']:
-                table = QTableWidget()
-                table.setColumnCount(2)
-                table.setHorizontalHeaderLabels(["能量 (MeV)", "截面 (mb)"])
-                table.setRowCount(len(cs_data['energy']))
-                
-                for i, (energy, cs) in enumerate(zip(cs_data['energy'], cs_data['cross_section'])):
-                    table.setItem(i, 0, QTableWidgetItem(f"{energy:.3f}"))
-                    table.setItem(i, 1, QTableWidgetItem(f"{cs:.6e}"))
-                
-                table.resizeColumnsToContents()
+            if len(cs_data['energy']) and len(cs_data['cross_section']):
                 layout.addWidget(QLabel("总截面数据:"))
-                layout.addWidget(table)
+                layout.addWidget(self.create_data_table(
+                    [cs_data['energy'], cs_data['cross_section']],
+                    ["能量 (MeV)", "截面 (mb)"], ['.3f', '.6e']))
             else:
                 layout.addWidget(QLabel("未找到总截面数据"))
         
@@ -153,23 +148,10 @@ class CalculationResultsDialog(QDialog):
         spectra_tabs = QTabWidget()
         
         for particle, data in spectra_data.items():
-            if data['energy'] and data['intensity']:
-                particle_widget = QWidget()
-                particle_layout = QVBoxLayout(particle_widget)
-                
-                table = QTableWidget()
-                table.setColumnCount(2)
-                table.setHorizontalHeaderLabels(["能量 (MeV)", "强度"])
-                table.setRowCount(len(data['energy']))
-                
-                for i, (energy, intensity) in enumerate(zip(data['energy'], data['intensity'])):
-                    table.setItem(i, 0, QTableWidgetItem(f"{energy:.3f}"))
-                    table.setItem(i, 1, QTableWidgetItem(f"{intensity:.6e}"))
-                
-                table.resizeColumnsToContents()
-                particle_layout.addWidget(table)
-                
-                spectra_tabs.addTab(particle_widget, particle)
+            if len(data['energy']) and len(data['intensity']):
+                spectra_tabs.addTab(self.create_data_table(
+                    [data['energy'], data['intensity']],
+                    ["能量 (MeV)", "强度"], ['.3f', '.6e']), particle)
         
         if spectra_tabs.count() > 0:
             layout.addWidget(spectra_tabs)
@@ -178,6 +160,68 @@ class CalculationResultsDialog(QDialog):
         
         self.tab_widget.addTab(widget, "🌈 能谱")
         
+    def create_data_table(self, columns: Sequence[Sequence[float]], headers: Sequence[str],
+                          formats: Sequence[str]) -> QWidget:
+        """
+        创建基于NumPy模型的数据表格，附带按第一列数值范围筛选
+        
+        Args:
+            columns: 各列数据
+            headers: 列标题
+            formats: 各列格式字符串
+            
+        Returns:
+            QWidget: 包含筛选栏和表格视图的组件
+        """
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        model = NumpyTableModel(columns, headers, formats, widget)
+        proxy = NumpyFilterProxyModel(widget)
+        proxy.setSourceModel(model)
+        
+        # 筛选栏
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(QLabel(f"{headers[0]}:"))
+        minimum_edit = QLineEdit()
+        maximum_edit = QLineEdit()
+        for edit, placeholder in ((minimum_edit, "最小值"), (maximum_edit, "最大值")):
+            edit.setPlaceholderText(placeholder)
+            edit.setValidator(QDoubleValidator(edit))
+            edit.setMaximumWidth(120)
+            filter_layout.addWidget(edit)
+        count_label = QLabel(f"{model.rowCount()} 行")
+        filter_layout.addWidget(count_label)
+        filter_layout.addStretch()
+        layout.addLayout(filter_layout)
+        
+        def bound(edit: QLineEdit):
+            """按校验器的区域设置读取边界，小数点为逗号的区域也能正确解析"""
+            if not edit.hasAcceptableInput():
+                return None
+            value, ok = edit.validator().locale().toDouble(edit.text())
+            return value if ok else None
+
+        def apply_filter():
+            proxy.set_range_filter(0, bound(minimum_edit), bound(maximum_edit))
+            count_label.setText(f"{proxy.rowCount()} / {model.rowCount()} 行")
+        
+        minimum_edit.editingFinished.connect(apply_filter)
+        maximum_edit.editingFinished.connect(apply_filter)
+        
+        # 表格视图
+        view = QTableView()
+        view.setModel(proxy)
+        view.setSortingEnabled(True)
+        view.sortByColumn(-1, Qt.SortOrder.AscendingOrder)
+        view.setAlternatingRowColors(True)
+        view.verticalHeader().setDefaultSectionSize(view.fontMetrics().height() + 6)
+        resize_columns_from_sample(view)
+        layout.addWidget(view)
+        
+        return widget
+        
     def create_files_tab(self):
         """创建文件列表标签页"""
         widget = QWidget()
@@ -215,5 +259,8 @@ class CalculationResultsDialog(QDialog):
         
     def export_data(self):
         """导出数据"""
-        # TODO: 实现数据导出功能
-        QMessageBox.information(self, "导出", "数据导出功能开发中...")
+        tables = tables_from_results(self.results)
+        if not tables:
+            QMessageBox.information(self, "导出", "没有可导出的数据")
+            return
+        ExportDialog(tables, self).exec()
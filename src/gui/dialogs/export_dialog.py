@@ -0,0 +1,202 @@
+"""
+数据导出对话框
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Sequence
+from PyQt6.QtWidgets import *
+from PyQt6.QtCore import *
+from PyQt6.QtGui import *
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from core.exporters import ExportCancelled, ExportError, ExportTable, Exporter, create_exporter
+
+# 显示名称 -> (格式名, 目标是否为单个文件, 文件过滤器)
+EXPORT_FORMATS = {
+    "CSV": ('csv', False, ""),
+    "Parquet": ('parquet', False, ""),
+    "HDF5": ('hdf5', True, "HDF5文件 (*.h5 *.hdf5)"),
+    "ENDF-6 MF3": ('endf', True, "ENDF文件 (*.endf *.txt)"),
+}
+
+
+class ExportWorker(QThread):
+    """导出工作线程"""
+
+    # 信号定义
+    progress_updated = pyqtSignal(int, int)  # 已写出行数, 总行数
+    export_finished = pyqtSignal(list)  # 写出的文件
+    export_failed = pyqtSignal(str)  # 导出失败
+
+    def __init__(self, exporter: Exporter, tables: Sequence[ExportTable], destination: Path):
+        super().__init__()
+        self.exporter = exporter
+        self.tables = list(tables)
+        self.destination = destination
+        self._is_cancelled = False
+
+    def run(self):
+        """运行导出"""
+        try:
+            written = self.exporter.export(self.tables, self.destination,
+                                           progress_callback=self.progress_updated.emit,
+                                           should_cancel=lambda: self._is_cancelled)
+            self.export_finished.emit([str(path) for path in written])
+        except ExportCancelled:
+            self.export_failed.emit("导出已取消")
+        except Exception as e:
+            # 任何错误都要通知对话框，否则对话框会一直停在导出状态
+            self.export_failed.emit(f"导出失败: {e}")
+
+    def cancel(self):
+        """取消导出（在下一个数据块之前停止）"""
+        self._is_cancelled = True
+
+
+class ExportDialog(QDialog):
+    """数据导出对话框"""
+
+    def __init__(self, tables: Sequence[ExportTable], parent=None):
+        super().__init__(parent)
+        self.tables = list(tables)
+        self.worker = None
+        self.init_ui()
+
+    def init_ui(self):
+        """初始化用户界面"""
+        self.setWindowTitle("导出数据")
+        self.setModal(True)
+        self.resize(520, 260)
+
+        layout = QVBoxLayout(self)
+        rows = sum(table.n_rows for table in self.tables)
+        layout.addWidget(QLabel(f"待导出: {len(self.tables)} 张表，共 {rows} 行"))
+
+        form = QFormLayout()
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(list(EXPORT_FORMATS))
+        form.addRow("格式:", self.format_combo)
+
+        self.float_format_edit = QLineEdit("%.6e")
+        self.float_format_edit.setToolTip("CSV数值格式（printf风格）")
+        form.addRow("数值格式:", self.float_format_edit)
+
+        self.mat_spin = QSpinBox()
+        self.mat_spin.setRange(1, 9999)
+        self.mat_spin.setValue(9999)
+        self.mat_spin.setToolTip("ENDF材料号")
+        form.addRow("MAT:", self.mat_spin)
+
+        destination_layout = QHBoxLayout()
+        self.destination_edit = QLineEdit()
+        browse_button = QPushButton("浏览...")
+        browse_button.clicked.connect(self.browse_destination)
+        destination_layout.addWidget(self.destination_edit)
+        destination_layout.addWidget(browse_button)
+        form.addRow("目标:", destination_layout)
+        layout.addLayout(form)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.export_button = QPushButton("导出")
+        self.export_button.setDefault(True)
+        self.export_button.clicked.connect(self.start_export)
+        self.cancel_button = QPushButton("取消")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_export)
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.reject)
+        for button in (self.export_button, self.cancel_button, close_button):
+            button_layout.addWidget(button)
+        layout.addLayout(button_layout)
+
+        self.format_combo.currentTextChanged.connect(self.update_format_options)
+        self.update_format_options(self.format_combo.currentText())
+
+    def update_format_options(self, text: str):
+        """只启用当前格式适用的选项"""
+        format_name = EXPORT_FORMATS[text][0]
+        self.float_format_edit.setEnabled(format_name == 'csv')
+        self.mat_spin.setEnabled(format_name == 'endf')
+        self.destination_edit.clear()
+
+    def browse_destination(self):
+        """选择目标目录或文件"""
+        _, single_file, file_filter = EXPORT_FORMATS[self.format_combo.currentText()]
+        if single_file:
+            path, _ = QFileDialog.getSaveFileName(self, "导出到文件", "", file_filter)
+        else:
+            path = QFileDialog.getExistingDirectory(self, "导出到目录")
+        if path:
+            self.destination_edit.setText(path)
+
+    def start_export(self):
+        """在后台线程中开始导出"""
+        destination = self.destination_edit.text().strip()
+        if not destination:
+            QMessageBox.warning(self, "导出", "请选择导出目标")
+            return
+
+        format_name = EXPORT_FORMATS[self.format_combo.currentText()][0]
+        options = {}
+        if format_name == 'csv':
+            options['float_format'] = self.float_format_edit.text() or "%.6e"
+        elif format_name == 'endf':
+            options['mat'] = self.mat_spin.value()
+
+        try:
+            exporter = create_exporter(format_name, **options)
+        except ExportError as e:
+            QMessageBox.warning(self, "导出", str(e))
+            return
+
+        self.worker = ExportWorker(exporter, self.tables, Path(destination))
+        self.worker.progress_updated.connect(self.on_progress)
+        self.worker.export_finished.connect(self.on_finished)
+        self.worker.export_failed.connect(self.on_failed)
+        self.export_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("正在导出...")
+        self.worker.start()
+
+    def cancel_export(self):
+        """取消导出"""
+        if self.worker:
+            self.worker.cancel()
+
+    def on_progress(self, done: int, total: int):
+        """更新进度"""
+        self.progress_bar.setValue(done * 1000 // total if total else 1000)
+        self.status_label.setText(f"已写出 {done} / {total} 行")
+
+    def on_finished(self, written: List[str]):
+        """导出完成"""
+        self.progress_bar.setValue(1000)
+        self.status_label.setText(f"导出完成，共写出 {len(written)} 个文件")
+        self.export_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def on_failed(self, message: str):
+        """导出失败或取消"""
+        self.status_label.setText(message)
+        self.export_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+
+    def reject(self):
+        """关闭对话框前停止导出线程"""
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
+        super().reject()
@@ -0,0 +1,211 @@
+"""
+NumPy表格模型
+以NumPy列数组为数据源的 QAbstractTableModel，单元格在 data() 中按需格式化；
+排序和筛选由代理模型用NumPy整体计算行映射完成，适合显示十万行级别的截面和能谱数据
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex
+from PyQt6.QtWidgets import QTableView
+
+# 原始数值角色，供导出等需要未格式化数值的场合使用
+RawValueRole = Qt.ItemDataRole.UserRole + 1
+
+
+class NumpyTableModel(QAbstractTableModel):
+    """NumPy列数组表格模型"""
+
+    def __init__(self, columns: Sequence[Sequence[float]], headers: Sequence[str],
+                 formats: Optional[Sequence[str]] = None, parent=None):
+        """
+        初始化表格模型
+
+        Args:
+            columns: 各列数据，长度必须一致
+            headers: 列标题
+            formats: 各列的格式字符串（如 '.3f'、'.6e'），默认 '.6g'
+        """
+        super().__init__(parent)
+        self.columns: List[np.ndarray] = [np.asarray(column, dtype=float) for column in columns]
+        lengths = {column.size for column in self.columns}
+        if len(lengths) > 1:
+            raise ValueError(f"各列长度不一致: {sorted(lengths)}")
+
+        self.headers = list(headers)
+        self.formats = list(formats) if formats else ['.6g'] * len(self.columns)
+        self._row_count = lengths.pop() if lengths else 0
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format(self.columns[index.column()][index.row()], self.formats[index.column()])
+        if role == RawValueRole:
+            return float(self.columns[index.column()][index.row()])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section] if section < len(self.headers) else None
+        return str(section + 1)
+
+    def column_data(self, column: int) -> np.ndarray:
+        """获取某列的原始数组"""
+        return self.columns[column]
+
+
+class NumpyFilterProxyModel(QAbstractProxyModel):
+    """
+    NumPy表格的排序/筛选代理模型
+
+    QSortFilterProxyModel 对每一行调用 filterAcceptsRow、对每次比较调用 lessThan，
+    十万行时仅建立映射就需要数十万次Python回调。这里改为用NumPy一次算出
+    代理行到源行的映射数组：筛选是布尔掩码，排序是稳定 argsort。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._mask: Optional[np.ndarray] = None
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+        self._rows = np.empty(0, dtype=np.int64)
+        self._inverse: Optional[np.ndarray] = None
+
+    def setSourceModel(self, model: NumpyTableModel):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        self._mask = None
+        self._update_rows()
+        self.endResetModel()
+
+    def _update_rows(self):
+        """重新计算代理行到源行的映射"""
+        model = self.sourceModel()
+        if model is None:
+            self._rows = np.empty(0, dtype=np.int64)
+        else:
+            if 0 <= self._sort_column < model.columnCount():
+                rows = np.argsort(model.column_data(self._sort_column), kind='stable')
+                if self._sort_order == Qt.SortOrder.DescendingOrder:
+                    rows = rows[::-1]
+            else:
+                rows = np.arange(model.rowCount())
+            self._rows = rows if self._mask is None else rows[self._mask[rows]]
+        self._inverse = None
+
+    def set_range_filter(self, column: int, minimum: Optional[float] = None,
+                         maximum: Optional[float] = None):
+        """
+        按数值范围筛选行
+
+        Args:
+            column: 源模型列号
+            minimum: 下限，None表示不限
+            maximum: 上限，None表示不限
+        """
+        values = self.sourceModel().column_data(column)
+        mask = np.ones(values.size, dtype=bool)
+        if minimum is not None:
+            mask &= values >= minimum
+        if maximum is not None:
+            mask &= values <= maximum
+
+        self.beginResetModel()
+        self._mask = None if mask.all() else mask
+        self._update_rows()
+        self.endResetModel()
+
+    def clear_filter(self):
+        """清除筛选"""
+        self.beginResetModel()
+        self._mask = None
+        self._update_rows()
+        self.endResetModel()
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """按源模型列排序，column < 0 时恢复原始顺序"""
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        self._update_rows()
+        self.layoutChanged.emit()
+
+    def source_rows(self) -> np.ndarray:
+        """当前显示的源模型行号（已排序、已筛选）"""
+        return self._rows
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else int(self._rows.size)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        model = self.sourceModel()
+        return 0 if parent.isValid() or model is None else model.columnCount()
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < self._rows.size and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        if not proxy_index.isValid() or proxy_index.row() >= self._rows.size:
+            return QModelIndex()
+        return self.sourceModel().index(int(self._rows[proxy_index.row()]), proxy_index.column())
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        if self._inverse is None:
+            self._inverse = np.full(self.sourceModel().rowCount(), -1, dtype=np.int64)
+            self._inverse[self._rows] = np.arange(self._rows.size)
+        row = int(self._inverse[source_index.row()])
+        return self.index(row, source_index.column()) if row >= 0 else QModelIndex()
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Vertical and 0 <= section < self._rows.size:
+            section = int(self._rows[section])
+        return self.sourceModel().headerData(section, orientation, role)
+
+
+def resize_columns_from_sample(view: QTableView, sample_rows: int = 50):
+    """
+    按前若干行估算列宽，避免 resizeColumnsToContents() 遍历全部行
+
+    Args:
+        view: 表格视图
+        sample_rows: 参与估算的行数
+    """
+    model = view.model()
+    if model is None:
+        return
+
+    metrics = view.fontMetrics()
+    header = view.horizontalHeader()
+    rows = min(model.rowCount(), sample_rows)
+    padding = 2 * metrics.horizontalAdvance(' ') + 12
+
+    for column in range(model.columnCount()):
+        title = model.headerData(column, Qt.Orientation.Horizontal) or ''
+        width = header.fontMetrics().horizontalAdvance(str(title))
+        for row in range(rows):
+            text = model.data(model.index(row, column))
+            if text:
+                width = max(width, metrics.horizontalAdvance(text))
+        view.setColumnWidth(column, width + padding)
@@ -4,6 +4,7 @@ TALYS Visualizer 分栏式主窗口
 """
 
 import sys
+import json
 import logging
 from pathlib import Path
 from PyQt6.QtWidgets import *
@@ -14,13 +15,18 @@ from PyQt6.QtGui import *
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config.settings import Settings
 from utils.logger import LoggerMixin
-from utils.i18n import get_language_manager, tr
+from utils.i18n import bind, get_language_manager
 from .tabs.basic_parameters_tab import BasicParametersTab
 from .tabs.advanced_parameters_tab import AdvancedParametersTab
 from .tabs.output_options_tab import OutputOptionsTab
 from .tabs.visualization_tab import VisualizationTab
 from .tabs.expert_mode_tab import ExpertModeTab
 from .parameter_synchronizer import ParameterSynchronizer
+from .dialogs.calculation_progress_dialog import CalculationProgressDialog
+from core.project_file import Project, ProjectFileError, PROJECT_EXTENSION
+from core.result_manager import get_result_manager
+from core.live_buffer import LiveBuffer
+from core.input_deck import InputDeck
 
 class TabbedMainWindow(QMainWindow, LoggerMixin):
     """分栏式主窗口类"""
@@ -28,15 +34,17 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
     def __init__(self):
         super().__init__()
         self.parameter_sync = ParameterSynchronizer()
+        self.project = Project()
+        self.calculation_parameters = {}
+        self.partial_results = None  # 最近一次中断计算取回的不完整结果
         self.language_manager = get_language_manager()
         self.init_ui()
-        self.connect_language_signals()
         self.logger.info("分栏式主窗口初始化完成")
         
     def init_ui(self):
         """初始化用户界面"""
         # 设置窗口基本属性
-        self.setWindowTitle(f"{tr('app_title')} v{Settings.APP_VERSION}")
+        bind(self, 'app_title', setter='setWindowTitle', template=f"{{}} v{Settings.APP_VERSION}")
         self.setGeometry(100, 100, Settings.WINDOW_WIDTH, Settings.WINDOW_HEIGHT)
         self.setMinimumSize(Settings.WINDOW_MIN_WIDTH, Settings.WINDOW_MIN_HEIGHT)
         
@@ -56,7 +64,6 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
         
         # 添加各个标签页
         self.add_tabs()
-        self.update_ui_language()
         
         # 创建菜单栏
         self.create_menu_bar()
@@ -77,57 +84,59 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
         """添加所有标签页"""
         # 基础参数标签页
         self.basic_tab = BasicParametersTab()
-        self.tab_widget.addTab(self.basic_tab, "🎯 基础参数")
         self.parameter_sync.register_tab(self.basic_tab)
         
         # 高级参数标签页
         self.advanced_tab = AdvancedParametersTab()
-        self.tab_widget.addTab(self.advanced_tab, "⚙️ 高级参数")
         self.parameter_sync.register_tab(self.advanced_tab)
         
         # 输出选项标签页
         self.output_tab = OutputOptionsTab()
-        self.tab_widget.addTab(self.output_tab, "📄 输出选项")
         self.parameter_sync.register_tab(self.output_tab)
         
         # 可视化标签页
         self.visualization_tab = VisualizationTab()
-        self.tab_widget.addTab(self.visualization_tab, "📊 可视化")
         
         # 专家模式标签页
         self.expert_tab = ExpertModeTab(self.parameter_sync)
-        self.tab_widget.addTab(self.expert_tab, "🔧 专家模式")
-        
-        # 设置标签页工具提示
-        self.tab_widget.setTabToolTip(0, "设置目标核、入射粒子和基本计算参数")
-        self.tab_widget.setTabToolTip(1, "配置物理模型和高级计算选项")
-        self.tab_widget.setTabToolTip(2, "控制输出文件和数据格式")
-        self.tab_widget.setTabToolTip(3, "查看和分析计算结果")
-        self.tab_widget.setTabToolTip(4, "直接编辑TALYS输入文件和高级选项")
+
+        # 标签页标题和工具提示绑定到翻译键
+        tabs = [
+            (self.basic_tab, 'tab_basic', 'tooltip_basic_tab', "设置目标核、入射粒子和基本计算参数"),
+            (self.advanced_tab, 'tab_advanced', 'tooltip_advanced_tab', "配置物理模型和高级计算选项"),
+            (self.output_tab, 'tab_output', 'tooltip_output_tab', "控制输出文件和数据格式"),
+            (self.visualization_tab, 'tab_visualization', 'tooltip_viz_tab', "查看和分析计算结果"),
+            (self.expert_tab, 'tab_expert', 'tooltip_expert_tab', "直接编辑TALYS输入文件和高级选项"),
+        ]
+        self.tab_keys = [key for _, key, _, _ in tabs]
+        for index, (tab, key, tooltip_key, tooltip) in enumerate(tabs):
+            self.tab_widget.addTab(tab, '')
+            bind(self.tab_widget, key, setter='setTabText', args=(index,))
+            bind(self.tab_widget, tooltip_key, tooltip, setter='setTabToolTip', args=(index,))
         
     def create_menu_bar(self):
         """创建菜单栏"""
         menubar = self.menuBar()
         
         # 文件菜单
-        file_menu = menubar.addMenu(tr('menu_file'))
+        file_menu = bind(menubar.addMenu(''), 'menu_file', setter='setTitle')
         
         # 新建
-        new_action = QAction('新建项目(&N)', self)
+        new_action = bind(QAction(self), 'action_new')
         new_action.setShortcut('Ctrl+N')
         new_action.setStatusTip('创建新的计算项目')
         new_action.triggered.connect(self.new_project)
         file_menu.addAction(new_action)
         
         # 打开
-        open_action = QAction('打开项目(&O)', self)
+        open_action = bind(QAction(self), 'action_open')
         open_action.setShortcut('Ctrl+O')
         open_action.setStatusTip('打开现有项目')
         open_action.triggered.connect(self.open_project)
         file_menu.addAction(open_action)
         
         # 保存
-        save_action = QAction('保存项目(&S)', self)
+        save_action = bind(QAction(self), 'action_save')
         save_action.setShortcut('Ctrl+S')
         save_action.setStatusTip('保存当前项目')
         save_action.triggered.connect(self.save_project)
@@ -136,12 +145,12 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
         file_menu.addSeparator()
         
         # 导入/导出
-        import_action = QAction('导入参数(&I)', self)
+        import_action = bind(QAction(self), 'action_import')
         import_action.setStatusTip('从文件导入参数设置')
         import_action.triggered.connect(self.import_parameters)
         file_menu.addAction(import_action)
         
-        export_action = QAction('导出参数(&E)', self)
+        export_action = bind(QAction(self), 'action_export')
         export_action.setStatusTip('导出当前参数设置')
         export_action.triggered.connect(self.export_parameters)
         file_menu.addAction(export_action)
@@ -149,22 +158,22 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
         file_menu.addSeparator()
         
         # 退出
-        exit_action = QAction('退出(&X)', self)
+        exit_action = bind(QAction(self), 'action_exit')
         exit_action.setShortcut('Ctrl+Q')
         exit_action.setStatusTip('退出程序')
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
         
         # 计算菜单
-        calc_menu = menubar.addMenu('计算(&C)')
+        calc_menu = bind(menubar.addMenu(''), 'menu_calculate', setter='setTitle')
         
-        run_action = QAction('运行TALYS(&R)', self)
+        run_action = bind(QAction(self), 'action_run')
         run_action.setShortcut('F5')
         run_action.setStatusTip('运行TALYS计算')
         run_action.triggered.connect(self.run_calculation)
         calc_menu.addAction(run_action)
         
-        stop_action = QAction('停止计算(&T)', self)
+        stop_action = bind(QAction(self), 'action_stop')
         stop_action.setShortcut('Ctrl+Break')
         stop_action.setStatusTip('停止当前计算')
         stop_action.triggered.connect(self.stop_calculation)
@@ -172,44 +181,43 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
         
         calc_menu.addSeparator()
         
-        validate_action = QAction('验证参数(&V)', self)
+        validate_action = bind(QAction(self), 'action_validate')
         validate_action.setStatusTip('验证当前参数设置')
         validate_action.triggered.connect(self.validate_parameters)
         calc_menu.addAction(validate_action)
         
         # 视图菜单
-        view_menu = menubar.addMenu('视图(&V)')
+        view_menu = bind(menubar.addMenu(''), 'menu_view', setter='setTitle')
         
         # 标签页快速切换
-        for i in range(self.tab_widget.count()):
-            tab_name = self.tab_widget.tabText(i)
-            action = QAction(f'切换到{tab_name}(&{i+1})', self)
+        for i, key in enumerate(self.tab_keys):
+            action = bind(QAction(self), key, template=f'切换到{{}}(&{i+1})')
             action.setShortcut(f'Ctrl+{i+1}')
             action.triggered.connect(lambda checked, idx=i: self.tab_widget.setCurrentIndex(idx))
             view_menu.addAction(action)
         
         view_menu.addSeparator()
         
-        fullscreen_action = QAction('全屏模式(&F)', self)
+        fullscreen_action = bind(QAction(self), 'action_fullscreen')
         fullscreen_action.setShortcut('F11')
         fullscreen_action.setCheckable(True)
         fullscreen_action.triggered.connect(self.toggle_fullscreen)
         view_menu.addAction(fullscreen_action)
 
         # 语言菜单
-        language_menu = menubar.addMenu(tr('menu_language'))
+        language_menu = bind(menubar.addMenu(''), 'menu_language', setter='setTitle')
         self.create_language_menu(language_menu)
 
         # 帮助菜单
-        help_menu = menubar.addMenu(tr('menu_help'))
+        help_menu = bind(menubar.addMenu(''), 'menu_help', setter='setTitle')
         
-        help_action = QAction('用户手册(&H)', self)
+        help_action = bind(QAction(self), 'action_help')
         help_action.setShortcut('F1')
         help_action.setStatusTip('打开用户手册')
         help_action.triggered.connect(self.show_help)
         help_menu.addAction(help_action)
         
-        about_action = QAction('关于(&A)', self)
+        about_action = bind(QAction(self), 'action_about')
         about_action.setStatusTip('关于TALYS Visualizer')
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
@@ -283,7 +291,7 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
     def create_status_bar(self):
         """创建状态栏"""
         self.status_bar = self.statusBar()
-        self.status_bar.showMessage('就绪')
+        bind(self.status_bar, 'status_ready', setter='showMessage')
         
         # 添加进度条
         self.progress_bar = QProgressBar()
@@ -297,7 +305,7 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
         self.status_bar.addPermanentWidget(self.tab_indicator)
         
         # 添加TALYS状态标签
-        self.talys_status = QLabel('TALYS: 未连接')
+        self.talys_status = bind(QLabel(), 'status_disconnected', '未连接', template='TALYS: {}')
         self.status_bar.addPermanentWidget(self.talys_status)
     
     def apply_style(self):
@@ -382,43 +390,158 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
     def new_project(self):
         """新建项目"""
         self.logger.info("新建项目")
+        self.project.close()
+        self.project = Project()
         self.parameter_sync.reset_parameters()
+        # 原项目的结果已经释放
+        self.visualization_tab.update_visualization({})
+        self.update_project_runs()
         self.status_bar.showMessage('新建项目', 2000)
     
     def open_project(self):
         """打开项目"""
-        self.logger.info("打开项目")
-        # TODO: 实现项目文件打开逻辑
-        self.status_bar.showMessage('打开项目', 2000)
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, '打开项目', '', f'TALYS项目 (*{PROJECT_EXTENSION})')
+        if not file_path:
+            return
+        self.logger.info(f"打开项目: {file_path}")
+        try:
+            project = Project.open(file_path)
+        except ProjectFileError as e:
+            QMessageBox.critical(self, '打开项目', str(e))
+            return
+
+        self.project.close()
+        self.project = project
+        self.parameter_sync.import_from_dict(project.parameters)
+        if project.input_deck:
+            self.expert_tab.input_editor.setPlainText(project.input_deck)
+        # 结果按需读取，这里只会读取可视化页用到的分组；原项目的结果已经释放
+        self.visualization_tab.update_visualization(
+            project.run_results(list(project.runs)[-1]) if project.runs else {})
+        self.update_project_runs()
+        self.status_bar.showMessage(f'已打开项目: {Path(file_path).name}（{len(project.runs)}次计算）', 3000)
     
+    def update_project_runs(self):
+        """把项目中的各次计算交给可视化页的多次计算标签页"""
+        self.visualization_tab.set_runs({run_id: self.project.run_results(run_id) for run_id in self.project.runs},
+                                        self.project.channel_names())
+
     def save_project(self):
         """保存项目"""
-        self.logger.info("保存项目")
-        # TODO: 实现项目文件保存逻辑
-        self.status_bar.showMessage('保存项目', 2000)
+        path = self.project.path
+        if path is None:
+            file_path, _ = QFileDialog.getSaveFileName(
+                self, '保存项目', f'project{PROJECT_EXTENSION}', f'TALYS项目 (*{PROJECT_EXTENSION})')
+            if not file_path:
+                return
+            path = Path(file_path)
+        self.logger.info(f"保存项目: {path}")
+
+        parameters = self.parameter_sync.get_all_parameters()
+        self.project.parameters = self.parameter_sync.export_to_dict()
+        try:
+            self.project.input_deck = InputDeck.from_parameters(parameters).to_text()
+        except ValueError:
+            self.project.input_deck = self.expert_tab.input_editor.toPlainText()
+
+        try:
+            self.project.save(path)
+        except (OSError, ProjectFileError) as e:
+            QMessageBox.critical(self, '保存项目', f'保存失败: {e}')
+            return
+        self.status_bar.showMessage(f'项目已保存: {path.name}', 2000)
     
     def import_parameters(self):
-        """导入参数"""
-        self.logger.info("导入参数")
-        # TODO: 实现参数导入逻辑
-        self.status_bar.showMessage('导入参数', 2000)
+        """导入参数（TALYS输入文件或JSON参数文件）"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, '导入参数', '', 'TALYS输入文件 (*.inp *.txt);;JSON参数文件 (*.json);;所有文件 (*)')
+        if not file_path:
+            return
+        self.logger.info(f"导入参数: {file_path}")
+        try:
+            if file_path.endswith('.json'):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    imported = self.parameter_sync.import_from_dict(json.load(f))
+            else:
+                imported = self.parameter_sync.set_parameters(InputDeck.read(file_path).to_parameters(),
+                                                              validate=True)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, '导入参数', f'导入失败: {e}')
+            return
+        if imported is False:
+            QMessageBox.warning(self, '导入参数', '部分参数未通过验证')
+        self.status_bar.showMessage('参数已导入', 2000)
     
     def export_parameters(self):
-        """导出参数"""
-        self.logger.info("导出参数")
-        # TODO: 实现参数导出逻辑
-        self.status_bar.showMessage('导出参数', 2000)
+        """导出参数（TALYS输入文件或JSON参数文件）"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, '导出参数', 'talys.inp', 'TALYS输入文件 (*.inp);;JSON参数文件 (*.json)')
+        if not file_path:
+            return
+        self.logger.info(f"导出参数: {file_path}")
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                if file_path.endswith('.json'):
+                    json.dump(self.parameter_sync.export_to_dict(), f, ensure_ascii=False, indent=2)
+                else:
+                    f.write(InputDeck.from_parameters(self.parameter_sync.get_all_parameters()).to_text())
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, '导出参数', f'导出失败: {e}')
+            return
+        self.status_bar.showMessage('参数已导出', 2000)
     
     def run_calculation(self):
         """运行计算"""
         self.logger.info("运行TALYS计算")
-        parameters = self.parameter_sync.get_all_parameters()
+        self.calculation_parameters = self.parameter_sync.get_all_parameters()
+        self.start_calculation()
+    
+    def start_calculation(self, resume_from=None):
+        """
+        打开进度对话框运行计算，计算中断时询问是否续算缺失的入射能量
         
+        Args:
+            resume_from: 续算的不完整结果
+        """
         # 切换到可视化标签页显示结果
         self.tab_widget.setCurrentIndex(3)
         
-        # TODO: 启动计算线程
         self.status_bar.showMessage('正在运行TALYS计算...', 5000)
+        self.partial_results = None
+        # 计算进行中在截面图上实时显示已完成入射能量的反应总结
+        live_buffer = LiveBuffer()
+        self.visualization_tab.start_live_plot(live_buffer)
+        dialog = CalculationProgressDialog(self.calculation_parameters, self, resume_from=resume_from,
+                                           live_buffer=live_buffer)
+        dialog.calculation_completed.connect(self.on_calculation_completed)
+        dialog.exec()
+        dialog.deleteLater()
+        self.visualization_tab.stop_live_plot()
+        
+        partial = self.partial_results
+        if partial is not None:
+            missing = len(partial['partial']['missing'])
+            reply = QMessageBox.question(
+                self, '计算中断', f'计算结果不完整，缺少 {missing} 个入射能量。是否继续计算缺失的能量？',
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.Yes:
+                self.start_calculation(resume_from=partial)
+    
+    def on_calculation_completed(self, results: dict):
+        """计算完成：结果交给结果管理器，项目和界面只持有句柄"""
+        results = get_result_manager().add(results)
+        # 续算合并后的结果代替之前的不完整结果
+        if results.get('resumed_from') in self.project.runs:
+            self.project.remove_run(results['resumed_from'])
+        self.project.add_run(results)
+        self.visualization_tab.update_visualization(results)
+        self.update_project_runs()
+        if results.get('partial'):
+            self.partial_results = results
+            self.status_bar.showMessage(f"计算中断，已取回 {len(results['partial']['completed'])} 个入射能量的结果", 5000)
+        else:
+            self.status_bar.showMessage(f"计算完成，耗时 {results.get('calculation_time', 0):.2f} 秒", 5000)
     
     def stop_calculation(self):
         """停止计算"""
@@ -458,58 +581,13 @@ class TabbedMainWindow(QMainWindow, LoggerMixin):
         """窗口关闭事件"""
         # 停止正在进行的计算
         self.stop_calculation()
+        self.expert_tab.stop_validation()
+        self.project.close()
         
         self.logger.info("程序退出")
         event.accept()
 
-    def connect_language_signals(self):
-        """连接语言相关信号"""
-        self.language_manager.language_changed.connect(self.on_language_changed)
-
     def change_language(self, language_code: str):
         """切换语言"""
         if self.language_manager.set_language(language_code):
             self.logger.info(f"语言已切换到: {language_code}")
-
-    def on_language_changed(self, language_code: str):
-        """语言改变处理"""
-        self.update_ui_language()
-
-    def update_ui_language(self):
-        """更新UI语言"""
-        # 更新窗口标题
-        self.setWindowTitle(f"{tr('app_title')} v{Settings.APP_VERSION}")
-
-        # 更新标签页文本
-        if hasattr(self, 'tab_widget'):
-            self.tab_widget.setTabText(0, tr('tab_basic'))
-            self.tab_widget.setTabText(1, tr('tab_advanced'))
-            self.tab_widget.setTabText(2, tr('tab_output'))
-            self.tab_widget.setTabText(3, tr('tab_visualization'))
-            self.tab_widget.setTabText(4, tr('tab_expert'))
-
-            # 更新工具提示
-            self.tab_widget.setTabToolTip(0, tr('tooltip_basic_tab', "设置目标核、入射粒子和基本计算参数"))
-            self.tab_widget.setTabToolTip(1, tr('tooltip_advanced_tab', "配置物理模型和高级计算选项"))
-            self.tab_widget.setTabToolTip(2, tr('tooltip_output_tab', "控制输出文件和数据格式"))
-            self.tab_widget.setTabToolTip(3, tr('tooltip_viz_tab', "查看和分析计算结果"))
-            self.tab_widget.setTabToolTip(4, tr('tooltip_expert_tab', "直接编辑TALYS输入文件和高级选项"))
-
-        # 更新状态栏
-        if hasattr(self, 'status_bar'):
-            self.status_bar.showMessage(tr('status_ready'))
-
-        if hasattr(self, 'talys_status'):
-            self.talys_status.setText(f"TALYS: {tr('status_disconnected', '未连接')}")
-
-        # 通知所有标签页更新语言
-        if hasattr(self, 'basic_tab'):
-            self.basic_tab.update_language()
-        if hasattr(self, 'advanced_tab'):
-            self.advanced_tab.update_language()
-        if hasattr(self, 'output_tab'):
-            self.output_tab.update_language()
-        if hasattr(self, 'visualization_tab'):
-            self.visualization_tab.update_language()
-        if hasattr(self, 'expert_tab'):
-            self.expert_tab.update_language()
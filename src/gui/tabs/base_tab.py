@@ -3,11 +3,17 @@
 """
 
 import logging
+import sys
+from pathlib import Path
 from typing import Dict, Any
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
 
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+from utils.i18n import get_language_manager
+
 class BaseParameterTab(QWidget):
     """标签页基类"""
     
@@ -22,6 +28,7 @@ class BaseParameterTab(QWidget):
         self.widgets = {}  # 存储控件引用
         self.init_ui()
         self.connect_signals()
+        get_language_manager().language_changed.connect(self.update_language)
         self.logger.debug(f"{self.__class__.__name__} 初始化完成")
         
     def init_ui(self):
@@ -344,5 +351,5 @@ class BaseParameterTab(QWidget):
         QMessageBox.critical(self, title, message)
 
     def update_language(self):
-        """更新界面语言 - 子类可以重写"""
+        """切换语言后刷新动态生成的文本（静态文本用 bind() 绑定）- 子类可以重写"""
         pass
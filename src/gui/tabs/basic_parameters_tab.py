@@ -5,6 +5,7 @@
 import sys
 from pathlib import Path
 from typing import Dict, Any
+import numpy as np
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
@@ -13,8 +14,9 @@ from PyQt6.QtGui import *
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from .base_tab import BaseParameterTab
-from utils.i18n import tr
+from utils.i18n import bind, tr
 from core.talys_interface import TalysInterface, TalysCalculationError, TalysInterfaceError
+from core.mass_table import get_mass_table
 
 class BasicParametersTab(BaseParameterTab):
     """基础参数标签页"""
@@ -40,7 +42,7 @@ class BasicParametersTab(BaseParameterTab):
         scroll_layout.setSpacing(16)
         
         # 标题
-        self.title_label = QLabel(tr('basic_title'))
+        self.title_label = bind(QLabel(), 'basic_title')
         self.title_label.setStyleSheet("""
             QLabel {
                 font-size: 18px;
@@ -52,7 +54,7 @@ class BasicParametersTab(BaseParameterTab):
         scroll_layout.addWidget(self.title_label)
 
         # 说明文字
-        self.description_label = QLabel(tr('basic_description'))
+        self.description_label = bind(QLabel(), 'basic_description')
         self.description_label.setStyleSheet("""
             QLabel {
                 color: #6c757d;
@@ -81,20 +83,21 @@ class BasicParametersTab(BaseParameterTab):
         
     def create_target_group(self, parent_layout):
         """创建目标核参数组"""
-        group, group_layout = self.create_group_box(tr('group_target'))
+        group, group_layout = self.create_group_box('')
+        bind(group, 'group_target', setter='setTitle')
 
         # 创建表单布局
         form_layout = self.create_form_layout()
 
         # 原子序数
-        self.z_spinbox = self.create_spin_box(1, 118, 1, tr('tooltip_atomic_number'))
-        self.z_label = QLabel(tr('label_atomic_number'))
+        self.z_spinbox = bind(self.create_spin_box(1, 118, 1), 'tooltip_atomic_number', setter='setToolTip')
+        self.z_label = bind(QLabel(), 'label_atomic_number')
         form_layout.addRow(self.z_label, self.z_spinbox)
         self.widgets['z'] = self.z_spinbox
 
         # 质量数
-        self.a_spinbox = self.create_spin_box(1, 300, 1, tr('tooltip_mass_number'))
-        self.a_label = QLabel(tr('label_mass_number'))
+        self.a_spinbox = bind(self.create_spin_box(1, 300, 1), 'tooltip_mass_number', setter='setToolTip')
+        self.a_label = bind(QLabel(), 'label_mass_number')
         form_layout.addRow(self.a_label, self.a_spinbox)
         self.widgets['mass'] = self.a_spinbox
 
@@ -111,7 +114,7 @@ class BasicParametersTab(BaseParameterTab):
                 border-radius: 4px;
             }
         """)
-        self.element_row_label = QLabel(tr('label_element'))
+        self.element_row_label = bind(QLabel(), 'label_element')
         form_layout.addRow(self.element_row_label, self.element_label)
 
         # 核素表示
@@ -124,33 +127,44 @@ class BasicParametersTab(BaseParameterTab):
                 padding: 4px 8px;
             }
         """)
-        self.nuclide_row_label = QLabel(tr('label_nuclide'))
+        self.nuclide_row_label = bind(QLabel(), 'label_nuclide')
         form_layout.addRow(self.nuclide_row_label, self.nuclide_label)
 
+        # 核素数据（来自质量表）
+        self.nuclide_data_label = QLabel()
+        self.nuclide_data_label.setStyleSheet("""
+            QLabel {
+                color: #6c757d;
+                font-size: 11px;
+                font-family: 'Courier New', monospace;
+                padding: 4px;
+            }
+        """)
+        self.nuclide_data_row_label = bind(QLabel(), 'label_nuclide_data')
+        form_layout.addRow(self.nuclide_data_row_label, self.nuclide_data_label)
+
         # 将表单布局添加到组布局中
         group_layout.addLayout(form_layout)
         parent_layout.addWidget(group)
 
     def create_projectile_group(self, parent_layout):
         """创建入射粒子参数组"""
-        group, group_layout = self.create_group_box(tr('group_projectile'))
+        group, group_layout = self.create_group_box('')
+        bind(group, 'group_projectile', setter='setTitle')
 
         # 创建表单布局
         form_layout = self.create_form_layout()
 
         # 粒子类型
-        self.projectiles_data = [
-            (tr('projectile_neutron'), 'n'),
-            (tr('projectile_proton'), 'p'),
-            (tr('projectile_deuteron'), 'd'),
-            (tr('projectile_triton'), 't'),
-            (tr('projectile_helium3'), 'h'),
-            (tr('projectile_alpha'), 'a'),
-            (tr('projectile_gamma'), 'g')
-        ]
-
-        self.projectile_combo = self.create_combo_box(self.projectiles_data, tr('tooltip_particle_type', "选择入射粒子类型"))
-        self.projectile_label = QLabel(tr('label_particle_type'))
+        self.projectile_keys = ['projectile_neutron', 'projectile_proton', 'projectile_deuteron',
+                                'projectile_triton', 'projectile_helium3', 'projectile_alpha', 'projectile_gamma']
+        self.projectiles_data = [(tr(key), data) for key, data in zip(self.projectile_keys, 'npdthag')]
+
+        self.projectile_combo = self.create_combo_box(self.projectiles_data)
+        bind(self.projectile_combo, 'tooltip_particle_type', "选择入射粒子类型", setter='setToolTip')
+        for index, key in enumerate(self.projectile_keys):
+            bind(self.projectile_combo, key, setter='setItemText', args=(index,))
+        self.projectile_label = bind(QLabel(), 'label_particle_type')
         form_layout.addRow(self.projectile_label, self.projectile_combo)
         self.widgets['projectile'] = self.projectile_combo
 
@@ -172,13 +186,18 @@ class BasicParametersTab(BaseParameterTab):
 
     def create_energy_group(self, parent_layout):
         """创建能量参数组"""
-        group, group_layout = self.create_group_box(tr('group_energy'))
+        group, group_layout = self.create_group_box('')
+        bind(group, 'group_energy', setter='setTitle')
 
 
         # 能量模式选择
         mode_layout = QHBoxLayout()
-        self.single_energy_radio = self.create_radio_button(tr('radio_single_energy'), True, tr('tooltip_single_energy'))
-        self.energy_range_radio = self.create_radio_button(tr('radio_energy_range'), False, tr('tooltip_energy_range'))
+        self.single_energy_radio = self.create_radio_button('', True)
+        self.energy_range_radio = self.create_radio_button('', False)
+        for radio, key in ((self.single_energy_radio, 'radio_single_energy'),
+                           (self.energy_range_radio, 'radio_energy_range')):
+            bind(radio, key)
+            bind(radio, key.replace('radio_', 'tooltip_'), setter='setToolTip')
         # 启用能量范围功能
         self.energy_range_radio.setEnabled(True)
 
@@ -189,12 +208,11 @@ class BasicParametersTab(BaseParameterTab):
 
         # 单一能量输入
         single_layout = QHBoxLayout()
-        self.energy_label = QLabel(tr('label_energy'))
+        self.energy_label = bind(QLabel(), 'label_energy')
         single_layout.addWidget(self.energy_label)
 
-        self.single_energy_spinbox = self.create_double_spin_box(
-            0.001, 200.0, 1.0, 3, tr('tooltip_energy')
-        )
+        self.single_energy_spinbox = self.create_double_spin_box(0.001, 200.0, 1.0, 3)
+        bind(self.single_energy_spinbox, 'tooltip_energy', setter='setToolTip')
         self.single_energy_spinbox.setSuffix(" MeV")
         single_layout.addWidget(self.single_energy_spinbox)
         self.widgets['energy'] = self.single_energy_spinbox
@@ -205,31 +223,28 @@ class BasicParametersTab(BaseParameterTab):
         # 能量范围输入
         self.range_widget = QWidget()
         range_layout = QHBoxLayout(self.range_widget)
-        self.energy_min_label = QLabel(tr('label_min'))
+        self.energy_min_label = bind(QLabel(), 'label_min')
         range_layout.addWidget(self.energy_min_label)
 
-        self.energy_min_spinbox = self.create_double_spin_box(
-            0.001, 200.0, 1.0, 3, tr('tooltip_min_energy')
-        )
+        self.energy_min_spinbox = self.create_double_spin_box(0.001, 200.0, 1.0, 3)
+        bind(self.energy_min_spinbox, 'tooltip_min_energy', setter='setToolTip')
         self.energy_min_spinbox.setSuffix(" MeV")
         range_layout.addWidget(self.energy_min_spinbox)
 
-        self.energy_max_label = QLabel(tr('label_max'))
+        self.energy_max_label = bind(QLabel(), 'label_max')
         range_layout.addWidget(self.energy_max_label)
 
-        self.energy_max_spinbox = self.create_double_spin_box(
-            0.001, 200.0, 20.0, 3, tr('tooltip_max_energy')
-        )
+        self.energy_max_spinbox = self.create_double_spin_box(0.001, 200.0, 20.0, 3)
+        bind(self.energy_max_spinbox, 'tooltip_max_energy', setter='setToolTip')
         self.energy_max_spinbox.setSuffix(" MeV")
         range_layout.addWidget(self.energy_max_spinbox)
 
         # 能量步长
-        self.energy_step_label = QLabel(tr('label_step', "步长:"))
+        self.energy_step_label = bind(QLabel(), 'label_step', "步长:")
         range_layout.addWidget(self.energy_step_label)
 
-        self.energy_step_spinbox = self.create_double_spin_box(
-            0.001, 10.0, 1.0, 3, tr('tooltip_energy_step', "能量步长 (MeV)")
-        )
+        self.energy_step_spinbox = self.create_double_spin_box(0.001, 10.0, 1.0, 3)
+        bind(self.energy_step_spinbox, 'tooltip_energy_step', "能量步长 (MeV)", setter='setToolTip')
         self.energy_step_spinbox.setSuffix(" MeV")
         range_layout.addWidget(self.energy_step_spinbox)
 
@@ -243,7 +258,8 @@ class BasicParametersTab(BaseParameterTab):
 
     def create_calculation_group(self, parent_layout):
         """创建参数摘要组"""
-        group, group_layout = self.create_group_box(tr('label_parameter_summary'))
+        group, group_layout = self.create_group_box('')
+        bind(group, 'label_parameter_summary', setter='setTitle')
 
         # 参数摘要
         self.summary_label = QLabel()
@@ -270,6 +286,7 @@ class BasicParametersTab(BaseParameterTab):
         
         # 入射粒子改变时更新信息
         self.projectile_combo.currentTextChanged.connect(self.update_projectile_info)
+        self.projectile_combo.currentTextChanged.connect(self.update_element_info)
         
         # 能量模式切换
         self.single_energy_radio.toggled.connect(self.on_energy_mode_changed)
@@ -323,6 +340,43 @@ class BasicParametersTab(BaseParameterTab):
         symbol = elements.get(z, f'Z{z}')
         self.element_label.setText(symbol)
         self.nuclide_label.setText(f'{a}{symbol}')
+        self.update_nuclide_data(z, a)
+
+    def update_nuclide_data(self, z: int, a: int):
+        """根据质量表更新质量过剩、分离能和阈能显示"""
+        try:
+            mass_table = get_mass_table()
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"加载质量表失败: {e}")
+            self.nuclide_data_label.setText(tr('info_mass_table_unavailable'))
+            return
+
+        state = mass_table.ground_state(z, a)
+        if state is None:
+            self.nuclide_data_label.setText(tr('info_nuclide_unknown'))
+            return
+
+        if np.isnan(state['spin']):
+            spin_parity = '?'
+        else:
+            twice_spin = int(round(2 * state['spin']))
+            spin = f'{twice_spin}/2' if twice_spin % 2 else f'{twice_spin // 2}'
+            spin_parity = spin + ('+' if state['parity'] > 0 else '-')
+
+        sn = mass_table.separation_energy(z, a, 'n')
+        sp = mass_table.separation_energy(z, a, 'p')
+        projectile = self.projectile_combo.currentData() or 'n'
+        ejectiles = '2n' if projectile == 'n' else 'n'
+        threshold = mass_table.threshold_energy(z, a, projectile, ejectiles)
+
+        lines = [
+            f"Δ = {state['mass_excess']:.3f} MeV   M = {state['atomic_mass']:.6f} u   Jπ = {spin_parity}",
+            f"Sn = {sn:.3f} MeV   Sp = {sp:.3f} MeV",
+            f"E_th({projectile},{ejectiles}) = {threshold:.3f} MeV",
+        ]
+        if not mass_table.is_bound(z, a):
+            lines[0] += f"   ({tr('info_unbound')})"
+        self.nuclide_data_label.setText('\n'.join(lines))
         
     def update_projectile_info(self):
         """更新入射粒子信息"""
@@ -470,10 +524,7 @@ class BasicParametersTab(BaseParameterTab):
         self.set_default_values()
 
     def update_language(self):
-        """更新界面语言"""
-        # 更新标题和描述
-        self.title_label.setText(tr('basic_title'))
-        self.description_label.setText(tr('basic_description'))
-
-        # 更新参数摘要
+        """更新界面语言：静态文本已绑定，这里只刷新动态生成的文本"""
+        self.update_projectile_info()
+        self.update_element_info()
         self.update_parameter_summary()
@@ -4,7 +4,7 @@
 
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
@@ -13,7 +13,58 @@ from PyQt6.QtGui import *
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from .base_tab import BaseParameterTab
-from utils.i18n import tr
+from utils.i18n import bind
+from config.settings import Settings
+from core.input_deck import InputDeck
+from core.deck_validator import ERROR, INFO, WARNING, DeckValidator, Diagnostic, count_by_severity
+from gui.deck_editor import MAX_ANNOTATIONS, SEVERITY_COLORS, DeckEditor
+
+SEVERITY_LABELS = {ERROR: '错误', WARNING: '警告', INFO: '提示'}
+
+
+class DeckValidationWorker(QThread):
+    """输入文件后台校验线程：空闲时等待，每次只校验最新提交的文本"""
+
+    validation_finished = pyqtSignal(int, list)  # 文本版本号, 诊断信息
+
+    def __init__(self):
+        super().__init__()
+        self.validator = DeckValidator()  # 逐行检查结果的缓存只在本线程中使用
+        self._mutex = QMutex()
+        self._condition = QWaitCondition()
+        self._pending = None  # (版本号, 文本)
+        self._stopped = False
+
+    def submit(self, revision: int, text: str):
+        """提交要校验的文本，尚未开始校验的旧文本被丢弃"""
+        self._mutex.lock()
+        self._pending = (revision, text)
+        self._condition.wakeOne()
+        self._mutex.unlock()
+
+    def stop(self):
+        """停止线程"""
+        self._mutex.lock()
+        self._stopped = True
+        self._condition.wakeOne()
+        self._mutex.unlock()
+        self.wait()
+
+    def run(self):
+        """等待并校验提交的文本"""
+        while True:
+            self._mutex.lock()
+            while self._pending is None and not self._stopped:
+                self._condition.wait(self._mutex)
+            if self._stopped:
+                self._mutex.unlock()
+                return
+            revision, text = self._pending
+            self._pending = None
+            self._mutex.unlock()
+
+            self.validation_finished.emit(revision, self.validator.validate(text))
+
 
 class ExpertModeTab(BaseParameterTab):
     """专家模式标签页"""
@@ -30,7 +81,7 @@ class ExpertModeTab(BaseParameterTab):
         main_layout.setContentsMargins(20, 20, 20, 20)
 
         # 标题
-        title = QLabel(tr('expert_mode_title'))
+        title = bind(QLabel(), 'expert_mode_title')
         title.setStyleSheet("""
             QLabel {
                 font-size: 18px;
@@ -42,7 +93,7 @@ class ExpertModeTab(BaseParameterTab):
         main_layout.addWidget(title)
 
         # 警告信息
-        warning = QLabel(tr('expert_mode_warning'))
+        warning = bind(QLabel(), 'expert_mode_warning')
         warning.setStyleSheet("""
             QLabel {
                 color: #856404;
@@ -95,11 +146,11 @@ class ExpertModeTab(BaseParameterTab):
         
         layout.addLayout(toolbar)
         
-        # 输入文件编辑器
-        self.input_editor = QTextEdit()
+        # 输入文件编辑器（语法高亮、关键字补全）
+        self.input_editor = DeckEditor()
         self.input_editor.setFont(QFont("Courier New", 11))
         self.input_editor.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #f8f9fa;
                 border: 1px solid #dee2e6;
                 border-radius: 4px;
@@ -127,6 +178,12 @@ flagbasic y
 """)
         
         layout.addWidget(self.input_editor)
+
+        # 诊断信息列表，单击跳转到对应位置
+        self.diagnostics_list = QListWidget()
+        self.diagnostics_list.setMaximumHeight(120)
+        self.diagnostics_list.setFont(QFont("Courier New", 10))
+        layout.addWidget(self.diagnostics_list)
         
         # 状态信息
         self.input_status = QLabel("就绪")
@@ -140,6 +197,15 @@ flagbasic y
             }
         """)
         layout.addWidget(self.input_status)
+
+        # 后台校验：停止编辑一段时间后提交当前文本
+        self.input_revision = 0
+        self.diagnostics: List[Diagnostic] = []
+        self.validation_timer = QTimer(self)
+        self.validation_timer.setSingleShot(True)
+        self.validation_timer.setInterval(Settings.INPUT_VALIDATION_DELAY_MS)
+        self.validation_worker = DeckValidationWorker()
+        self.validation_worker.start()
         
         return tab
         
@@ -278,6 +344,10 @@ flagbasic y
         
         # 输入文件内容变化
         self.input_editor.textChanged.connect(self.on_input_changed)
+        self.validation_timer.timeout.connect(self.request_validation)
+        self.validation_worker.validation_finished.connect(self.on_validation_finished)
+        self.diagnostics_list.itemClicked.connect(self.jump_to_diagnostic)
+        self.request_validation()
         
         # 调试控制按钮
         self.clear_debug_button.clicked.connect(self.clear_debug_output)
@@ -322,7 +392,7 @@ flagbasic y
                 self.show_warning_message("生成输入", "参数同步器未初始化，无法获取当前参数")
                 return
 
-            params = self.parameter_sync.get_parameters()
+            params = self.parameter_sync.get_all_parameters()
 
             # 生成TALYS输入文件内容
             input_content = self.generate_talys_input(params)
@@ -338,112 +408,69 @@ flagbasic y
             self.show_error_message("生成输入", f"生成输入文件时出错：{str(e)}")
 
     def generate_talys_input(self, params: Dict[str, Any]) -> str:
-        """生成TALYS输入文件内容"""
-        from datetime import datetime
+        """生成TALYS输入文件内容（与计算时使用同一个输入卡片构建器）"""
+        deck = InputDeck.from_parameters(params)
 
-        lines = []
-
-        # 文件头注释
-        lines.append("# TALYS输入文件")
-        lines.append(f"# 由TALYS Visualizer自动生成")
-        lines.append(f"# 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
-
-        # 必需参数
-        lines.append("# 必需参数")
-        lines.append(f"projectile {params.get('projectile', 'n')}")
-        lines.append(f"element {params.get('element', 'H')}")
-        lines.append(f"mass {params.get('mass', 1)}")
-
-        # 能量参数
-        if 'energy_mode' in params and params['energy_mode'] == 'range':
-            # 能量范围模式
-            energy_min = params.get('energy_min', 1.0)
-            energy_max = params.get('energy_max', 20.0)
-            energy_step = params.get('energy_step', 1.0)
-            lines.append(f"energy {energy_min} {energy_max} {energy_step}")
-        else:
-            # 单一能量模式
-            energy = params.get('energy', 1.0)
-            lines.append(f"energy {energy}")
-
-        lines.append("")
-
-        # 输出选项
-        lines.append("# 输出选项")
-        if params.get('channels', True):
-            lines.append("channels y")
-        if params.get('outspectra', False):
-            lines.append("outspectra y")
-        if params.get('outangle', False):
-            lines.append("outangle y")
-        if params.get('outlevels', False):
-            lines.append("outlevels y")
-
-        lines.append("")
-
-        # 基础控制标志
-        lines.append("# 基础控制")
-        if params.get('flagmain', True):
-            lines.append("flagmain y")
-        if params.get('flagbasic', True):
-            lines.append("flagbasic y")
-        if params.get('flagpop', False):
-            lines.append("flagpop y")
-        if params.get('flagcheck', False):
-            lines.append("flagcheck y")
-
-        lines.append("")
-
-        # 高级模型参数（如果存在）
-        advanced_params = ['ldmodel', 'strength', 'alphaomp', 'deuteronomp', 'bins', 'maxlevelstar']
-        advanced_lines = []
-        for param in advanced_params:
-            if param in params:
-                advanced_lines.append(f"{param} {params[param]}")
-
-        if advanced_lines:
-            lines.append("# 高级模型参数")
-            lines.extend(advanced_lines)
-            lines.append("")
-
-        # 自定义参数（从专家模式标签页）
+        # 自定义参数（从专家模式标签页）覆盖同名关键字
         custom_params = self.custom_params_editor.toPlainText().strip()
         if custom_params:
-            lines.append("# 自定义参数")
-            lines.extend(custom_params.split('\n'))
-            lines.append("")
+            deck.update(InputDeck.parse(custom_params))
 
-        return '\n'.join(lines)
+        return deck.to_text()
 
     def validate_input_syntax(self):
-        """验证输入文件语法"""
-        content = self.input_editor.toPlainText()
-        
-        # 简单的语法检查
-        lines = content.split('\n')
-        errors = []
-        
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
-            if line and not line.startswith('#'):
-                parts = line.split()
-                if len(parts) < 2:
-                    errors.append(f"第{i}行: 参数格式不正确")
-                    
-        if errors:
-            error_msg = '\n'.join(errors[:10])  # 只显示前10个错误
-            if len(errors) > 10:
-                error_msg += f"\n... 还有{len(errors)-10}个错误"
-            self.show_warning_message("语法错误", error_msg)
-            self.input_status.setText(f"发现{len(errors)}个语法错误")
+        """立即校验输入文件（不等待编辑停顿）"""
+        self.validation_timer.stop()
+        self.input_status.setText("正在校验...")
+        self.request_validation()
+
+    def request_validation(self):
+        """把当前文本提交给后台校验线程"""
+        self.validation_worker.submit(self.input_revision, self.input_editor.toPlainText())
+
+    def on_validation_finished(self, revision: int, diagnostics: List[Diagnostic]):
+        """后台校验完成，文本在此期间又被修改时丢弃结果"""
+        if revision != self.input_revision:
+            return
+        self.diagnostics = diagnostics
+        self.show_diagnostics()
+
+        counts = count_by_severity(diagnostics)
+        if counts[ERROR] or counts[WARNING]:
+            self.input_status.setText(f"发现{counts[ERROR]}个错误、{counts[WARNING]}个警告")
         else:
-            self.show_info_message("语法检查", "输入文件语法正确！")
             self.input_status.setText("语法检查通过")
+
+    def show_diagnostics(self):
+        """在编辑器中标注诊断位置，并列出诊断信息"""
+        self.input_editor.set_diagnostics(self.diagnostics)
+
+        self.diagnostics_list.clear()
+        for diagnostic in self.diagnostics[:MAX_ANNOTATIONS]:
+            item = QListWidgetItem(f"第{diagnostic.line + 1}行 {SEVERITY_LABELS[diagnostic.severity]}: "
+                                   f"{diagnostic.message}")
+            item.setForeground(QColor(SEVERITY_COLORS[diagnostic.severity]))
+            item.setData(Qt.ItemDataRole.UserRole, (diagnostic.line, diagnostic.start))
+            self.diagnostics_list.addItem(item)
+        if len(self.diagnostics) > MAX_ANNOTATIONS:
+            self.diagnostics_list.addItem(f"... 还有{len(self.diagnostics) - MAX_ANNOTATIONS}条诊断信息")
+
+    def jump_to_diagnostic(self, item: QListWidgetItem):
+        """把光标移到诊断信息所在位置"""
+        location = item.data(Qt.ItemDataRole.UserRole)
+        if location:
+            self.input_editor.go_to(*location)
+
+    def stop_validation(self):
+        """停止后台校验线程（窗口关闭时调用）"""
+        self.validation_timer.stop()
+        self.validation_worker.stop()
             
     def on_input_changed(self):
-        """输入内容变化处理"""
+        """输入内容变化处理：延迟到编辑停顿后再校验"""
         self.input_status.setText("已修改")
+        self.input_revision += 1
+        self.validation_timer.start()
         
     def clear_debug_output(self):
         """清除调试输出"""
@@ -4,7 +4,10 @@
 
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pyqtgraph as pg
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
@@ -13,13 +16,34 @@ from PyQt6.QtGui import *
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from .base_tab import BaseParameterTab
-from utils.i18n import tr
+from utils.i18n import bind
+from config.settings import Settings
+from core.run_comparison import RunComparison
+from core.channel_aggregation import get_channel_aggregation
+from core.live_buffer import LiveBuffer
+from core.run_ensemble import RunEnsemble, envelope, nan_separated
+from core.output_listing import get_output_listing
+from core.exporters import tables_from_results
+from core.experimental_data import ExperimentalDataError, get_experimental_database
+from gui.dialogs.export_dialog import ExportDialog
 
 class VisualizationTab(BaseParameterTab):
     """可视化标签页"""
 
     def __init__(self):
+        self.current_results: Dict[str, Any] = {}
+        self.derived_channels: Dict[str, Dict[str, Any]] = {}
+        # 计算进行中的实时截面图
+        self.live_buffer: Optional[LiveBuffer] = None
+        self.live_curve = None
+        self.live_version = -1
+        # 项目中的各次计算
+        self.ensemble = RunEnsemble({})
+        self.ensemble_stale = False  # 计算集合已改变，多次计算标签页显示时再重画
+        self.output_listing = None
         super().__init__()
+        self.live_timer = QTimer(self)
+        self.live_timer.timeout.connect(self.refresh_live_plot)
 
     def init_ui(self):
         """初始化用户界面"""
@@ -29,7 +53,7 @@ class VisualizationTab(BaseParameterTab):
         main_layout.setContentsMargins(20, 20, 20, 20)
 
         # 标题
-        title = QLabel(tr('visualization_title'))
+        title = bind(QLabel(), 'visualization_title')
         title.setStyleSheet("""
             QLabel {
                 font-size: 18px;
@@ -41,7 +65,7 @@ class VisualizationTab(BaseParameterTab):
         main_layout.addWidget(title)
 
         # 说明文字
-        description = QLabel(tr('visualization_description'))
+        description = bind(QLabel(), 'visualization_description')
         description.setStyleSheet("""
             QLabel {
                 color: #6c757d;
@@ -73,10 +97,23 @@ class VisualizationTab(BaseParameterTab):
         self.angular_tab = self.create_angular_tab()
         self.viz_tabs.addTab(self.angular_tab, "🎯 角分布")
         
+        # 能级密度标签页
+        self.level_density_tab = self.create_level_density_tab()
+        self.viz_tabs.addTab(self.level_density_tab, "🔬 能级密度")
+
         # 文件查看器标签页
         self.file_viewer_tab = self.create_file_viewer_tab()
         self.viz_tabs.addTab(self.file_viewer_tab, "📁 文件查看")
         
+        # 多次计算标签页
+        self.ensemble_tab = self.create_ensemble_tab()
+        self.ensemble_tab.installEventFilter(self)
+        self.viz_tabs.addTab(self.ensemble_tab, "🧮 多次计算")
+
+        # 计算比较标签页
+        self.comparison_tab = self.create_comparison_tab()
+        self.viz_tabs.addTab(self.comparison_tab, "🔀 运行比较")
+        
         parent_layout.addWidget(self.viz_tabs)
         
     def create_cross_section_tab(self) -> QWidget:
@@ -96,11 +133,23 @@ class VisualizationTab(BaseParameterTab):
         toolbar.addWidget(QLabel("图表类型:"))
         toolbar.addWidget(self.plot_type_combo)
         
+        self.channel_combo = self.create_combo_box([], "选择要显示的反应道")
+        self.channel_combo.setMinimumWidth(120)
+        toolbar.addWidget(self.channel_combo)
+        
         self.log_scale_checkbox = self.create_check_box("对数坐标", False, "使用对数坐标显示")
         toolbar.addWidget(self.log_scale_checkbox)
         
+        self.experimental_checkbox = self.create_check_box(
+            "实验数据", True, "叠加本地实验数据库中与当前反应道匹配的测量数据")
+        toolbar.addWidget(self.experimental_checkbox)
+        
         toolbar.addStretch()
         
+        self.import_experimental_button = self.create_push_button(
+            "导入实验数据", False, "导入EXFOR计算格式 (C4) 文件到本地实验数据库")
+        toolbar.addWidget(self.import_experimental_button)
+        
         self.export_button = self.create_push_button("导出图表", False, "导出当前图表")
         toolbar.addWidget(self.export_button)
         
@@ -122,6 +171,15 @@ class VisualizationTab(BaseParameterTab):
         """)
         layout.addWidget(self.cross_section_placeholder)
         
+        # 截面图
+        self.cross_section_plot = pg.PlotWidget(background='w')
+        self.cross_section_plot.setLabel('bottom', "E [MeV]")
+        self.cross_section_plot.setLabel('left', "截面 [mb]")
+        self.cross_section_plot.showGrid(x=True, y=True, alpha=0.3)
+        self.cross_section_plot.addLegend()
+        self.cross_section_plot.hide()
+        layout.addWidget(self.cross_section_plot)
+        
         return tab
         
     def create_spectra_tab(self) -> QWidget:
@@ -221,6 +279,129 @@ class VisualizationTab(BaseParameterTab):
         
         return tab
         
+    def create_level_density_tab(self) -> QWidget:
+        """创建能级密度标签页"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+
+        toolbar = QHBoxLayout()
+        self.nucleus_combo = self.create_combo_box([], "标准输出中有能级密度表的原子核")
+        toolbar.addWidget(QLabel("原子核:"))
+        toolbar.addWidget(self.nucleus_combo)
+
+        self.barrier_combo = self.create_combo_box([], "基态或裂变位垒")
+        toolbar.addWidget(self.barrier_combo)
+
+        self.parity_combo = self.create_combo_box(["正宇称", "负宇称"], "能级密度的宇称")
+        toolbar.addWidget(self.parity_combo)
+
+        self.density_mode_combo = self.create_combo_box(["总能级密度", "按自旋"], "显示总能级密度或各自旋的能级密度")
+        toolbar.addWidget(self.density_mode_combo)
+        toolbar.addStretch()
+        layout.addLayout(toolbar)
+
+        self.level_density_plot = pg.PlotWidget(background='w')
+        self.level_density_plot.setLabel('bottom', "激发能 (MeV)")
+        self.level_density_plot.setLabel('left', "能级密度 (MeV⁻¹)")
+        self.level_density_plot.setLogMode(x=False, y=True)
+        self.level_density_plot.showGrid(x=True, y=True, alpha=0.3)
+        self.level_density_plot.addLegend()
+        layout.addWidget(self.level_density_plot)
+
+        return tab
+
+    def create_ensemble_tab(self) -> QWidget:
+        """创建多次计算标签页：叠加、包络带和小多图"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+
+        toolbar = QHBoxLayout()
+        self.ensemble_mode_combo = self.create_combo_box(
+            ["叠加", "包络带", "小多图"], "叠加全部曲线、画最小/最大/百分位包络，或每个分能级反应道一格")
+        toolbar.addWidget(QLabel("显示方式:"))
+        toolbar.addWidget(self.ensemble_mode_combo)
+
+        self.ensemble_channel_combo = self.create_combo_box([], "选择要显示的反应道")
+        self.ensemble_channel_combo.setMinimumWidth(120)
+        toolbar.addWidget(QLabel("反应道:"))
+        toolbar.addWidget(self.ensemble_channel_combo)
+
+        self.ensemble_log_checkbox = self.create_check_box("对数坐标", False, "使用对数坐标显示")
+        toolbar.addWidget(self.ensemble_log_checkbox)
+        toolbar.addStretch()
+        layout.addLayout(toolbar)
+
+        self.ensemble_status = QLabel("项目中的计算将在此处一起显示")
+        self.ensemble_status.setStyleSheet("color: #6c757d; font-size: 12px;")
+        layout.addWidget(self.ensemble_status)
+
+        self.ensemble_plot = pg.PlotWidget(background='w')
+        self.ensemble_plot.setLabel('bottom', "入射能量 (MeV)")
+        self.ensemble_plot.setLabel('left', "截面 (mb)")
+        self.ensemble_plot.showGrid(x=True, y=True, alpha=0.3)
+        self.ensemble_plot.addLegend()
+        layout.addWidget(self.ensemble_plot)
+
+        self.small_multiples = pg.GraphicsLayoutWidget()
+        self.small_multiples.setBackground('w')
+        self.small_multiples.hide()
+        layout.addWidget(self.small_multiples)
+
+        return tab
+
+    def create_comparison_tab(self) -> QWidget:
+        """创建计算比较标签页"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        self.run_directories: Dict[str, str] = {}
+        self.run_comparison = None
+
+        # 计算目录列表（第一个为参考计算）
+        runs_layout = QHBoxLayout()
+        self.run_list = QListWidget()
+        self.run_list.setMaximumHeight(90)
+        runs_layout.addWidget(self.run_list)
+
+        run_buttons = QVBoxLayout()
+        self.add_run_button = self.create_push_button("添加计算目录...", False, "添加一个包含TALYS输出的目录")
+        self.remove_run_button = self.create_push_button("移除", False, "移除选中的计算目录")
+        run_buttons.addWidget(self.add_run_button)
+        run_buttons.addWidget(self.remove_run_button)
+        run_buttons.addStretch()
+        runs_layout.addLayout(run_buttons)
+        layout.addLayout(runs_layout)
+
+        # 工具栏
+        toolbar = QHBoxLayout()
+        self.compare_target_combo = self.create_combo_box([], "与参考计算（列表第一项）比较的计算")
+        toolbar.addWidget(QLabel("比较对象:"))
+        toolbar.addWidget(self.compare_target_combo)
+
+        self.compare_metric_combo = self.create_combo_box(
+            ["χ²", "最大相对差", "均方根相对差", "最大绝对差"], "排序指标")
+        toolbar.addWidget(QLabel("排序:"))
+        toolbar.addWidget(self.compare_metric_combo)
+
+        self.compare_button = self.create_push_button("比较", True, "对齐反应道并计算差异")
+        toolbar.addWidget(self.compare_button)
+        toolbar.addStretch()
+        layout.addLayout(toolbar)
+
+        self.comparison_status = QLabel("添加至少两个计算目录后点击\"比较\"")
+        self.comparison_status.setStyleSheet("color: #6c757d; font-size: 12px;")
+        layout.addWidget(self.comparison_status)
+
+        # 变化最大的反应道
+        self.changes_table = QTableWidget(0, 6)
+        self.changes_table.setHorizontalHeaderLabels(
+            ["反应道", "文件", "χ²", "最大相对差", "均方根相对差", "最大绝对差 (mb)"])
+        self.changes_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.changes_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.changes_table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.changes_table)
+
+        return tab
+
     def connect_signals(self):
         """连接信号"""
         # 文件列表选择变化
@@ -228,11 +409,32 @@ class VisualizationTab(BaseParameterTab):
         
         # 图表选项变化
         self.plot_type_combo.currentTextChanged.connect(self.update_cross_section_plot)
+        self.channel_combo.currentTextChanged.connect(self.update_cross_section_plot)
         self.log_scale_checkbox.toggled.connect(self.update_cross_section_plot)
+        self.experimental_checkbox.toggled.connect(self.update_cross_section_plot)
+        self.import_experimental_button.clicked.connect(self.import_experimental_data)
         self.particle_combo.currentTextChanged.connect(self.update_spectra_plot)
+
+        # 能级密度
+        self.nucleus_combo.currentIndexChanged.connect(self.update_barrier_combo)
+        self.barrier_combo.currentIndexChanged.connect(self.update_level_density_plot)
+        self.parity_combo.currentIndexChanged.connect(self.update_level_density_plot)
+        self.density_mode_combo.currentIndexChanged.connect(self.update_level_density_plot)
+
+        # 多次计算
+        self.ensemble_mode_combo.currentIndexChanged.connect(self.update_ensemble_plot)
+        self.ensemble_channel_combo.currentTextChanged.connect(self.update_ensemble_plot)
+        self.ensemble_log_checkbox.toggled.connect(self.update_ensemble_plot)
         
         # 导出按钮
         self.export_button.clicked.connect(self.export_current_plot)
+
+        # 计算比较
+        self.add_run_button.clicked.connect(self.add_comparison_run)
+        self.remove_run_button.clicked.connect(self.remove_comparison_run)
+        self.compare_button.clicked.connect(self.compare_runs)
+        self.compare_target_combo.currentIndexChanged.connect(self.update_changes_table)
+        self.compare_metric_combo.currentIndexChanged.connect(self.update_changes_table)
         
     def on_file_selected(self, current, previous):
         """文件选择变化处理"""
@@ -241,14 +443,141 @@ class VisualizationTab(BaseParameterTab):
             # TODO: 加载并显示文件内容
             self.file_content.setPlainText(f"文件: {filename}\n\n文件内容加载功能开发中...")
             
+    def selected_cross_section(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        当前图表类型对应的截面数据
+        
+        Returns:
+            (名称, {'energy', 'cross_section', 'header'}) ，没有数据时返回None
+        """
+        index = self.plot_type_combo.currentIndex()
+        if index == 3:
+            name = self.channel_combo.currentText()
+            channel = (self.current_results.get('reaction_channels') or {}).get(name) \
+                or self.derived_channels.get(name)
+            return (name, channel) if channel else None
+
+        total = self.current_results.get('total_cross_section')
+        if not total:
+            return None
+        key = ('cross_section', 'elastic', 'nonelastic')[index]
+        if key not in total:
+            return None
+        return (self.plot_type_combo.currentText(),
+                {'energy': total['energy'], 'cross_section': total[key],
+                 'header': total.get('header') if index == 0 else None})
+
     def update_cross_section_plot(self):
-        """更新截面图"""
-        # TODO: 实现截面图更新逻辑
-        plot_type = self.plot_type_combo.currentText()
+        """更新截面图：计算结果为折线，匹配的实验数据为带误差棒的散点"""
+        self.channel_combo.setEnabled(self.plot_type_combo.currentIndex() == 3)
+        if self.live_buffer is not None:
+            # 计算进行中，按新的图表类型重新画实时曲线
+            self.live_curve = None
+            self.live_version = -1
+            self.refresh_live_plot()
+            return
+        selected = self.selected_cross_section()
+        if selected is None or not len(selected[1]['energy']):
+            self.cross_section_plot.hide()
+            self.cross_section_placeholder.setText(
+                "没有该截面的数据" if self.current_results else "运行TALYS计算后，截面图将在此处显示")
+            self.cross_section_placeholder.show()
+            return
+
+        name, series = selected
         log_scale = self.log_scale_checkbox.isChecked()
-        self.cross_section_placeholder.setText(
-            f"更新{plot_type}图表中...\n对数坐标: {'是' if log_scale else '否'}"
-        )
+        plot = self.cross_section_plot
+        plot.clear()
+        plot.setLogMode(x=False, y=log_scale)
+        plot.plot(np.asarray(series['energy'], dtype=float), np.asarray(series['cross_section'], dtype=float),
+                  pen=pg.mkPen('#1f77b4', width=2), name=f"TALYS {name}")
+
+        if self.experimental_checkbox.isChecked() and series.get('header'):
+            self.overlay_experimental_data(series['header'], log_scale)
+
+        self.cross_section_placeholder.hide()
+        plot.show()
+
+    def start_live_plot(self, buffer: LiveBuffer):
+        """
+        开始实时显示：按 LIVE_PLOT_INTERVAL_MS 检查缓冲区，有新的入射能量时重绘
+
+        Args:
+            buffer: 计算线程写入各入射能量反应总结的缓冲区
+        """
+        self.live_buffer = buffer
+        self.live_curve = None
+        self.live_version = -1
+        self.live_timer.start(Settings.LIVE_PLOT_INTERVAL_MS)
+
+    def stop_live_plot(self):
+        """停止实时显示"""
+        self.live_timer.stop()
+        self.live_buffer = None
+        self.live_curve = None
+
+    def refresh_live_plot(self):
+        """缓冲区有新数据时用其视图更新实时曲线（分反应道截面在计算结束后才有）"""
+        buffer = self.live_buffer
+        if buffer is None or buffer.version == self.live_version:
+            return
+        data, self.live_version = buffer.view()
+        index = self.plot_type_combo.currentIndex()
+        if not data.shape[1] or index == 3:
+            return
+
+        plot = self.cross_section_plot
+        if self.live_curve is None:
+            plot.clear()
+            plot.setLogMode(x=False, y=self.log_scale_checkbox.isChecked())
+            self.live_curve = plot.plot(pen=pg.mkPen('#1f77b4', width=2),
+                                        name=f"TALYS {self.plot_type_combo.currentText()}（计算中）")
+            self.cross_section_placeholder.hide()
+            plot.show()
+        column = buffer.columns.index(('cross_section', 'elastic', 'nonelastic')[index])
+        self.live_curve.setData(data[0], data[column])
+
+    def overlay_experimental_data(self, header: Dict[str, Any], log_scale: bool):
+        """叠加本地实验数据库中与YANDF头部的靶核和反应匹配的数据集"""
+        try:
+            datasets = get_experimental_database().datasets_for_header(header)
+        except ExperimentalDataError as e:
+            self.logger.warning(f"查询实验数据失败: {e}")
+            return
+
+        symbols = ['o', 's', 't', 'd', '+', 'x', 'star', 't1']
+        for index, dataset in enumerate(datasets):
+            data = dataset.data
+            energy, value, error = data[:, 0], data[:, 2], data[:, 3]
+            color = pg.intColor(index, hues=max(len(datasets), 8))
+            if log_scale:
+                # 误差棒不随坐标轴变换，需要直接给出对数坐标
+                positive = value > 0
+                energy, value, error = energy[positive], value[positive], error[positive]
+                low = np.maximum(value - error, value * 1e-3)
+                y = np.log10(value)
+                bars = pg.ErrorBarItem(x=energy, y=y, top=np.log10(value + error) - y,
+                                       bottom=y - np.log10(low), pen=color)
+            else:
+                bars = pg.ErrorBarItem(x=energy, y=value, height=2 * error, pen=color)
+            self.cross_section_plot.addItem(bars)
+            self.cross_section_plot.plot(energy, value, pen=None, symbol=symbols[index % len(symbols)],
+                                         symbolSize=6, symbolBrush=color, symbolPen=color,
+                                         name=dataset.label)
+
+    def import_experimental_data(self):
+        """导入C4格式的实验数据文件"""
+        paths, _ = QFileDialog.getOpenFileNames(
+            self, "导入实验数据", "", "EXFOR计算格式 (*.c4 *.C4 *.x4);;所有文件 (*)")
+        if not paths:
+            return
+        try:
+            count = sum(get_experimental_database().import_c4(path) for path in paths)
+        except ExperimentalDataError as e:
+            self.show_error_message("导入实验数据", str(e))
+            return
+        self.show_info_message("导入实验数据", f"已导入 {count} 个实验数据集")
+        self.update_cross_section_plot()
         
     def update_spectra_plot(self):
         """更新能谱图"""
@@ -257,12 +586,233 @@ class VisualizationTab(BaseParameterTab):
         self.spectra_placeholder.setText(f"更新{particle_type}图表中...")
         
     def export_current_plot(self):
-        """导出当前图表"""
-        # TODO: 实现图表导出功能
-        self.show_info_message("导出图表", "图表导出功能开发中...")
-        
+        """导出当前图表对应的数据"""
+        if self.viz_tabs.currentWidget() is self.spectra_tab:
+            sections = ['spectra', 'gamma_production']
+        else:
+            sections = ['total_cross_section', 'reaction_channels', 'residual_production']
+        tables = tables_from_results(self.current_results, sections)
+        if not tables:
+            self.show_info_message("导出图表", "没有可导出的数据，请先运行计算")
+            return
+        ExportDialog(tables, self).exec()
+        
+    def update_level_density_nuclides(self):
+        """由当前结果的标准输出列出有能级密度表的原子核（只建立块索引，不解析表）"""
+        self.output_listing = get_output_listing(self.current_results) if self.current_results else None
+        self.nucleus_combo.blockSignals(True)
+        self.nucleus_combo.clear()
+        if self.output_listing is not None:
+            for z, n in self.output_listing.nuclides():
+                if self.output_listing.barriers(z, n):
+                    self.nucleus_combo.addItem(f"Z={z} N={n} (A={z + n})", (z, n))
+        self.nucleus_combo.blockSignals(False)
+        self.update_barrier_combo()
+
+    def update_barrier_combo(self):
+        """列出当前原子核的基态和裂变位垒"""
+        nucleus = self.nucleus_combo.currentData()
+        self.barrier_combo.blockSignals(True)
+        self.barrier_combo.clear()
+        if nucleus is not None:
+            for barrier in self.output_listing.barriers(*nucleus):
+                self.barrier_combo.addItem("基态" if barrier == 0 else f"裂变位垒 {barrier}", barrier)
+        self.barrier_combo.blockSignals(False)
+        self.update_level_density_plot()
+
+    def update_level_density_plot(self):
+        """画当前原子核、势垒和宇称的能级密度（只解析这一个表）"""
+        plot = self.level_density_plot.getPlotItem()
+        plot.clear()
+        nucleus = self.nucleus_combo.currentData()
+        barrier = self.barrier_combo.currentData()
+        if nucleus is None or barrier is None:
+            return
+        parity = 1 if self.parity_combo.currentIndex() == 0 else -1
+        try:
+            table = self.output_listing.level_density(*nucleus, parity=parity, barrier=barrier)
+        except KeyError:
+            return
+
+        if self.density_mode_combo.currentIndex() == 0:
+            plot.plot(table.ex, table.total, pen=pg.mkPen('#1f77b4', width=2), name="总能级密度")
+        else:
+            for column, spin in enumerate(table.spins):
+                plot.plot(table.ex, table.rho[:, column], name=f"J={spin:g}",
+                          pen=pg.mkPen(pg.intColor(column, hues=max(len(table.spins), 8)), width=1.5))
+
+    def set_runs(self, runs: Dict[str, Dict[str, Any]], channels: Optional[List[str]] = None):
+        """
+        设置多次计算标签页显示的计算
+
+        只更新反应道列表；曲线在多次计算标签页显示时才重画，之前不读取任何结果。
+
+        Args:
+            runs: 计算ID -> 计算结果（项目中的结果按需读取）
+            channels: 项目索引中记录的反应道，None时从结果中读取
+        """
+        self.ensemble = RunEnsemble(runs, channels=channels)
+        current = self.ensemble_channel_combo.currentText()
+        self.ensemble_channel_combo.blockSignals(True)
+        self.ensemble_channel_combo.clear()
+        self.ensemble_channel_combo.addItems(self.ensemble.channel_names() if len(self.ensemble) else [])
+        if current:
+            self.ensemble_channel_combo.setCurrentText(current)
+        self.ensemble_channel_combo.blockSignals(False)
+        self.ensemble_stale = True
+        if self.ensemble_tab.isVisible():
+            self.update_ensemble_plot()
+
+    def eventFilter(self, watched, event):
+        """多次计算标签页显示时重画已改变的计算集合"""
+        if watched is self.ensemble_tab and event.type() == QEvent.Type.Show and self.ensemble_stale:
+            self.update_ensemble_plot()
+        return super().eventFilter(watched, event)
+
+    def update_ensemble_plot(self):
+        """按显示方式重画多次计算"""
+        self.ensemble_stale = False
+        mode = self.ensemble_mode_combo.currentIndex()
+        self.ensemble_channel_combo.setEnabled(mode != 2)
+        self.ensemble_plot.setVisible(mode != 2)
+        self.small_multiples.setVisible(mode == 2)
+        if not len(self.ensemble):
+            self.ensemble_plot.clear()
+            self.small_multiples.clear()
+            self.ensemble_status.setText("项目中的计算将在此处一起显示")
+            return
+        if mode == 2:
+            self.draw_small_multiples()
+            return
+
+        plot = self.ensemble_plot.getPlotItem()
+        plot.clear()
+        plot.setLogMode(x=False, y=self.ensemble_log_checkbox.isChecked())
+        channel = self.ensemble_channel_combo.currentText()
+        if not channel:
+            return
+        grid, values, labels = self.ensemble.stack(channel)
+        if mode == 1 or len(labels) > Settings.ENSEMBLE_OVERLAY_LIMIT:
+            self.draw_envelope(plot, grid, values)
+            self.ensemble_status.setText(f"{channel}: {len(labels)} 次计算的包络")
+        else:
+            self.draw_overlay(plot, grid, values)
+            self.ensemble_status.setText(f"{channel}: {len(labels)} 次计算")
+
+    def draw_overlay(self, plot: pg.PlotItem, grid: np.ndarray, values: np.ndarray):
+        """全部曲线连成一条NaN分隔的折线，一次绘制"""
+        if not values.size:
+            return
+        x, y = nan_separated(grid, values)
+        plot.plot(x, y, connect='finite', pen=pg.mkPen((31, 119, 180, 120), width=1),
+                  name=f"{values.shape[0]} 次计算")
+
+    def draw_envelope(self, plot: pg.PlotItem, grid: np.ndarray, values: np.ndarray):
+        """最小/最大和5%–95%百分位包络带，加中位数曲线"""
+        if not values.size:
+            return
+        bands = envelope(values, (5.0, 50.0, 95.0))
+        finite = np.isfinite(bands['min'])
+        grid = grid[finite]
+        for low, high, color, name in (('min', 'max', (31, 119, 180, 50), "最小–最大"),
+                                       ('p5', 'p95', (31, 119, 180, 110), "5%–95%")):
+            lower = pg.PlotDataItem(grid, bands[low][finite], pen=None)
+            upper = pg.PlotDataItem(grid, bands[high][finite], pen=None)
+            plot.addItem(lower)
+            plot.addItem(upper)
+            fill = pg.FillBetweenItem(lower, upper, brush=pg.mkBrush(color))
+            plot.addItem(fill)
+            if plot.legend is not None:
+                plot.legend.addItem(fill, name)
+        plot.plot(grid, bands['p50'][finite], pen=pg.mkPen('#1f77b4', width=2), name="中位数")
+
+    def draw_small_multiples(self):
+        """每个分能级反应道一格；计算数目超过叠加上限时画包络带"""
+        self.small_multiples.clear()
+        channels = self.ensemble.level_channels()
+        shown = channels[:Settings.SMALL_MULTIPLES_MAX]
+        columns = max(int(np.ceil(np.sqrt(len(shown)))), 1)
+        log_scale = self.ensemble_log_checkbox.isChecked()
+        for index, channel in enumerate(shown):
+            plot = self.small_multiples.addPlot(row=index // columns, col=index % columns, title=channel)
+            plot.setLogMode(x=False, y=log_scale)
+            plot.hideButtons()
+            grid, values, labels = self.ensemble.stack(channel)
+            if len(labels) > Settings.ENSEMBLE_OVERLAY_LIMIT:
+                self.draw_envelope(plot, grid, values)
+            else:
+                self.draw_overlay(plot, grid, values)
+        text = f"{len(self.ensemble)} 次计算，{len(shown)} 个分能级反应道"
+        if len(shown) < len(channels):
+            text += f"（共 {len(channels)} 个，只显示前 {len(shown)} 个）"
+        self.ensemble_status.setText(text)
+
+    def add_comparison_run(self):
+        """添加一个计算目录"""
+        directory = QFileDialog.getExistingDirectory(self, "选择TALYS计算目录")
+        if not directory:
+            return
+        label = Path(directory).name
+        while label in self.run_directories:
+            label += "'"
+        self.run_directories[label] = directory
+        self.run_list.addItem(f"{label}  ({directory})")
+
+    def remove_comparison_run(self):
+        """移除选中的计算目录"""
+        row = self.run_list.currentRow()
+        if row < 0:
+            return
+        label = list(self.run_directories)[row]
+        del self.run_directories[label]
+        self.run_list.takeItem(row)
+
+    def compare_runs(self):
+        """读取各计算目录并比较"""
+        if len(self.run_directories) < 2:
+            self.show_warning_message("运行比较", "至少需要两个计算目录")
+            return
+        try:
+            self.set_comparison(RunComparison.from_directories(self.run_directories))
+        except (OSError, ValueError) as e:
+            self.show_error_message("运行比较", f"比较失败: {e}")
+
+    def set_comparison(self, comparison: RunComparison):
+        """显示比较结果"""
+        self.run_comparison = comparison
+        self.compare_target_combo.blockSignals(True)
+        self.compare_target_combo.clear()
+        self.compare_target_combo.addItems(comparison.labels[1:])
+        self.compare_target_combo.blockSignals(False)
+
+        missing = sum(len(keys) for keys in comparison.missing.values())
+        self.comparison_status.setText(
+            f"参考计算: {comparison.labels[0]}，共同反应道 {len(comparison.channels)} 个，"
+            f"公共能量点 {comparison.energies.size} 个"
+            + (f"，{missing} 个反应道未在所有计算中出现" if missing else ""))
+        self.update_changes_table()
+
+    def update_changes_table(self):
+        """按所选指标列出变化最大的反应道"""
+        if self.run_comparison is None or self.compare_target_combo.count() == 0:
+            return
+        metric = ('chi2', 'max_rel_diff', 'rms_rel_diff', 'max_abs_diff')[self.compare_metric_combo.currentIndex()]
+        changes = self.run_comparison.biggest_changes(self.compare_target_combo.currentIndex() + 1,
+                                                      metric, top=None)
+        self.changes_table.setRowCount(len(changes))
+        for row, change in enumerate(changes):
+            cells = [change['label'], change['file'], f"{change['chi2']:.4g}",
+                     f"{change['max_rel_diff']:.2%}", f"{change['rms_rel_diff']:.2%}",
+                     f"{change['max_abs_diff']:.4g}"]
+            for column, text in enumerate(cells):
+                self.changes_table.setItem(row, column, QTableWidgetItem(text))
+        self.changes_table.resizeColumnsToContents()
+
     def update_visualization(self, results: Dict[str, Any]):
         """更新可视化内容"""
+        self.stop_live_plot()
+        self.current_results = results
+
         # 更新文件列表
         output_files = results.get('output_files', [])
         self.file_list.clear()
@@ -270,8 +820,17 @@ class VisualizationTab(BaseParameterTab):
             self.file_list.addItem(file)
             
         # 更新截面图
-        if 'total_cross_section' in results:
-            self.cross_section_placeholder.setText("截面数据已加载，图表生成中...")
+        self.channel_combo.blockSignals(True)
+        self.channel_combo.clear()
+        self.channel_combo.addItems(sorted(results.get('reaction_channels') or {}))
+        # 分立能级之和、连续区、残余核总截面和同质异能比
+        self.derived_channels = get_channel_aggregation(results).derived_channels() if results else {}
+        self.channel_combo.addItems(sorted(self.derived_channels))
+        self.channel_combo.blockSignals(False)
+        self.update_level_density_nuclides()
+        if 'total_cross_section' not in results and self.channel_combo.count():
+            self.plot_type_combo.setCurrentIndex(3)
+        self.update_cross_section_plot()
             
         # 切换到截面图标签页
         self.viz_tabs.setCurrentIndex(0)
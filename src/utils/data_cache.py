@@ -0,0 +1,40 @@
+"""
+数据文件缓存工具
+为大型数据文件（质量表、光学势参数库等）的解析结果提供磁盘缓存路径
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+from typing import Optional, Union
+
+# 添加config目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+
+
+def get_cache_file(source: Union[str, Path], tag: str, suffix: str,
+                   cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    """
+    获取源文件对应的缓存文件路径
+
+    缓存文件名包含源文件绝对路径、大小和修改时间的摘要，源文件变化后
+    自动得到新的缓存路径，旧缓存不会被误用。
+
+    Args:
+        source: 源数据文件
+        tag: 缓存类别，如 'mass' 或 'omp'
+        suffix: 缓存文件后缀，如 '.npz'
+        cache_dir: 缓存目录，默认使用配置中的 CACHE_DIR
+
+    Returns:
+        Path: 缓存文件路径（不保证存在）
+    """
+    source = Path(source)
+    stat = source.stat()
+    key = f"{source.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    directory = Path(cache_dir) if cache_dir else Settings.CACHE_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory / f"{tag}_{source.stem}_{digest}{suffix}"
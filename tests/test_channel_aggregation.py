@@ -0,0 +1,94 @@
+"""
+反应道汇总单元测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.channel_aggregation import (ChannelAggregation, exclusive_channel_name,
+                                      get_channel_aggregation)
+from core.talys_interface import TalysInterface
+
+TEST_DIR = Path(__file__).parent.parent / "test_talys"
+
+
+class TestChannelAggregation(unittest.TestCase):
+    """反应道汇总测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        """解析测试计算的输出文件"""
+        talys = TalysInterface()
+        talys.temp_dir = TEST_DIR
+        cls.results = talys.parse_output_files()
+        cls.results['result_id'] = 'aggregation'
+        talys.temp_dir = None
+        cls.channels = cls.results['reaction_channels']
+
+    def test_exclusive_channel_name(self):
+        """测试独占反应道文件名"""
+        self.assertEqual(exclusive_channel_name('n'), 'xs100000')
+        self.assertEqual(exclusive_channel_name('a'), 'xs000001')
+        self.assertEqual(exclusive_channel_name('g'), 'xs000000')
+        self.assertIsNone(exclusive_channel_name('x'))
+
+    def test_level_sums(self):
+        """测试分立能级求和与逐个文件相加一致"""
+        aggregation = ChannelAggregation(self.results)
+        self.assertIn('nn', aggregation.families)
+        self.assertEqual(aggregation.residuals, ['rp091234'])
+
+        names = [name for name in self.channels if name.startswith('nn.L')]
+        expected = np.sum([self.channels[name]['cross_section'] for name in names], axis=0)
+        energy, inelastic = aggregation.inelastic()
+        np.testing.assert_allclose(energy, self.channels['nn.L01']['energy'])
+        np.testing.assert_allclose(inelastic, expected)
+
+        # 非弹性道包含第0能级
+        expected = np.sum([self.channels[f"np.L{level:02d}"]['cross_section'] for level in range(11)], axis=0)
+        np.testing.assert_allclose(aggregation.discrete_sum('np')[1], expected)
+        self.assertIsNone(aggregation.continuum('np'))
+
+    def test_continuum(self):
+        """测试连续区截面为独占反应道总截面减去分立能级之和"""
+        energy, discrete = ChannelAggregation(self.results).discrete_sum('np')
+        results = dict(self.results, exclusive_channels={
+            'xs010000': {'energy': energy, 'cross_section': discrete + 5.0}})
+        aggregation = ChannelAggregation(results)
+        np.testing.assert_allclose(aggregation.continuum('np')[1], 5.0)
+        self.assertIn('np.con', aggregation.derived_channels())
+
+    def test_isomeric_ratios(self):
+        """测试残余核总截面和同质异能比"""
+        aggregation = ChannelAggregation(self.results)
+        ground = np.asarray(self.channels['rp091234.L00']['cross_section'])
+        isomer = np.asarray(self.channels['rp091234.L02']['cross_section'])
+        _, total = aggregation.residual_total('rp091234')
+        np.testing.assert_allclose(total, ground + isomer)
+
+        ratios = aggregation.isomeric_ratios('rp091234')
+        self.assertEqual(list(ratios), [2])
+        expected = np.divide(isomer, total, out=np.zeros_like(total), where=total > 0)
+        np.testing.assert_allclose(ratios[2], expected)
+        self.assertTrue(np.all((ratios[2] >= 0) & (ratios[2] <= 1)))
+
+        derived = aggregation.derived_channels()
+        self.assertIn('rp091234.tot', derived)
+        np.testing.assert_allclose(derived['rp091234.L02.ratio']['cross_section'], expected)
+
+    def test_cache(self):
+        """测试同一计算结果只汇总一次"""
+        results = dict(self.results, result_id='aggregation-test')
+        first = get_channel_aggregation(results)
+        self.assertIs(get_channel_aggregation(results), first)
+        self.assertIsNot(get_channel_aggregation(dict(results, result_id='other')), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
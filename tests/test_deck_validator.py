@@ -0,0 +1,135 @@
+"""
+输入文件校验单元测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.deck_validator import ERROR, INFO, WARNING, DeckValidator, count_by_severity
+from core.input_schema import KeywordSchema, KeywordTrie, get_keyword_schema
+
+VALID_DECK = """# TALYS input
+projectile n
+element Pa
+mass 233
+energy 1 5 0.5   # 能量范围
+ldmodel 2
+rvadjust n 1.05
+rvadjust p 0.98
+ctable 91 233 0.5
+fymodel 1
+"""
+
+
+class TestKeywordSchema(unittest.TestCase):
+    """关键字表测试类"""
+
+    def test_document_defaults(self):
+        """测试合并默认参数文档中的默认值、取值范围和新关键字"""
+        schema = get_keyword_schema()
+        self.assertEqual(schema.get('strength').default, 9)
+        self.assertEqual(schema.get('ldmodel').valid_range, (1, 6))
+        self.assertIs(schema.get('localomp').default, True)
+        self.assertEqual(schema.get('ldmodelCN').signature, ('i',))
+        self.assertEqual(schema.get('ctable').usage, 'ctable Z A f [i]')
+        self.assertIn('flagmain', schema)
+
+    def test_trie(self):
+        """测试关键字前缀树的完整匹配和前缀补全"""
+        trie = KeywordTrie()
+        for word in ('ldmodel', 'ldmodelCN', 'localomp', 'a'):
+            trie.insert(word, word)
+        self.assertEqual(trie.lookup('LDMODEL'), 'ldmodel')
+        self.assertIsNone(trie.lookup('ldmod'))
+        self.assertEqual(trie.complete('ld'), ['ldmodel', 'ldmodelCN'])
+        self.assertEqual(trie.complete('l'), ['ldmodel', 'ldmodelCN', 'localomp'])
+        self.assertEqual(trie.complete('x'), [])
+
+        schema = get_keyword_schema()
+        self.assertEqual(schema.trie.lookup('strengthM1').name, 'strengthM1')
+        self.assertEqual([spec.name for spec in schema.trie.complete('outp')],
+                         ['outpopulation', 'outpreequilibrium'])
+
+    def test_missing_document(self):
+        """测试默认参数文档不存在时只使用内置表"""
+        schema = KeywordSchema(Path(__file__).parent / "missing.md")
+        self.assertNotIn('flagmain', schema)
+        self.assertIn('outmain', schema)
+
+
+class TestDeckValidator(unittest.TestCase):
+    """输入文件校验测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.validator = DeckValidator()
+
+    def messages(self, text):
+        return [(d.line, d.severity, d.message) for d in self.validator.validate(text)]
+
+    def test_valid_deck(self):
+        """测试正确的输入文件没有诊断信息"""
+        self.assertEqual(self.messages(VALID_DECK), [])
+
+    def test_sample_input(self):
+        """测试仓库中的示例输入文件和较少见的关键字没有错误"""
+        sample = Path(__file__).parent.parent / 'test_talys' / 'inp'
+        self.assertEqual(self.messages(sample.read_text()), [])
+        extra = ("nbins 30\nm2constant 1.2\ncpang y\nelow y\nmassdis y\nfisfeed y\n"
+                 "sgr 91 233 300. E1 1\nradiounit mci\nTirrad 2 d\n")
+        self.assertEqual(self.messages(VALID_DECK + extra), [])
+
+    def test_line_checks(self):
+        """测试关键字、类型、取值范围和粒子的检查，以及诊断位置"""
+        text = VALID_DECK + "ldmodel 7\nbins x\nrvadjust q 1.0\nldmodl 2\noutmain\nflagmain y\n"
+        diagnostics = self.validator.validate(text)
+        by_line = {d.line: d for d in diagnostics}
+        self.assertIn('超出范围', by_line[10].message)
+        self.assertEqual((by_line[10].start, by_line[10].end), (8, 9))
+        self.assertEqual(by_line[11].severity, ERROR)
+        self.assertIn("未知粒子 'q'", by_line[12].message)
+        self.assertIn('是否为 ldmodel', by_line[13].message)
+        self.assertIn('缺少参数', by_line[14].message)
+        self.assertEqual(by_line[15].severity, INFO)
+
+    def test_energy(self):
+        """测试能量：单个值、范围和能量文件"""
+        base = "projectile n\nelement Fe\nmass 56\n"
+        self.assertEqual(self.messages(base + "energy energies.txt\n"), [])
+        messages = [message for _, _, message in self.messages(base + "energy 5 1 0\n")]
+        self.assertEqual(len(messages), 2)
+        self.assertIn('大于最大值', messages[0])
+        self.assertIn('步长', messages[1])
+        self.assertIn('超出范围', self.messages(base + "energy 2000\n")[0][2])
+
+    def test_document_checks(self):
+        """测试必需关键字、重复关键字和关键字之间的依赖"""
+        messages = self.messages("projectile n\nelement Fe\nmass 20\nbins 40\nbins 50\n"
+                                 "fymodel 2\nendfdetail y\n")
+        self.assertIn((0, ERROR, '缺少必需关键字: energy'), messages)
+        self.assertIn((2, ERROR, '质量数 20 小于原子序数 26'), messages)
+        self.assertIn((3, WARNING, 'bins 在第5行重复设置，此行被覆盖'), messages)
+        self.assertIn((5, WARNING, 'fymodel 只在 fission y 时生效'), messages)
+        self.assertIn((6, WARNING, 'endfdetail 只在 endf y 时生效'), messages)
+        # 锕系核默认开启裂变，不同粒子的调整系数可以各写一行
+        self.assertEqual(count_by_severity(self.validator.validate(VALID_DECK))[WARNING], 0)
+
+    def test_incremental(self):
+        """测试再次校验时只检查改动过的行"""
+        lines = VALID_DECK.splitlines() + [f"rvadjust n {1 + i * 1e-4:.4f}" for i in range(2000)]
+        text = '\n'.join(lines)
+        self.validator.validate(text)
+        self.assertGreater(self.validator.checked_lines, 2000)
+
+        lines[5] = "ldmodel 9"
+        diagnostics = self.validator.validate('\n'.join(lines))
+        self.assertEqual(self.validator.checked_lines, 1)
+        self.assertIn((5, ERROR), [(d.line, d.severity) for d in diagnostics])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+ECIS输入卡片读取单元测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.ecis_deck import EcisDeck
+
+ECIS_FILE = Path(__file__).parent.parent / 'test_talys' / 'ecis.inp'
+
+
+class TestEcisDeck(unittest.TestCase):
+    """ECIS卡片测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.deck = EcisDeck(ECIS_FILE)
+
+    def test_index(self):
+        """测试块索引"""
+        self.assertEqual(len(self.deck), 96)
+        self.assertAlmostEqual(self.deck.energies[0], 0.001)
+        self.assertAlmostEqual(self.deck.energies[-1], 14.0)
+        self.assertTrue((np.diff(self.deck.energies) > 0).all())
+        self.assertTrue(self.deck.read_text(-1).rstrip().endswith('180.00000'))
+
+    def test_lazy_parse(self):
+        """测试按需解析并缓存"""
+        self.assertEqual(len(self.deck._blocks), 0)
+        block = self.deck.block_for_energy(14.0)
+        self.assertEqual(list(self.deck._blocks), [95])
+        self.assertIs(self.deck.block(95), block)
+
+    def test_block_content(self):
+        """测试块内容"""
+        block = self.deck.block(0)
+        self.assertEqual(block['projectile'], 'neutron')
+        self.assertEqual(block['target'], '233Pa')
+        self.assertEqual(block['iref'], 2408)
+        self.assertEqual(block['control'], [7, 20, 20, 7])
+        self.assertEqual(block['flags'][0].size, 50)
+        self.assertEqual(block['potentials'].shape, (7, 8, 3))
+        np.testing.assert_allclose(block['angles'], [0.0, 20.0, 180.0])
+        np.testing.assert_allclose(block['deformation'][1], [0.192, 0.117, 0.003])
+
+        levels = self.deck.level_table(0)
+        self.assertEqual(levels.shape, (7, 3))
+        self.assertEqual(levels[0, 2], 0.0)
+        self.assertAlmostEqual(levels[1, 2], 0.07049)
+        self.assertAlmostEqual(block['kinematics'][0], 0.001)
+
+    def test_out_of_range(self):
+        """测试越界块序号"""
+        with self.assertRaises(IndexError):
+            self.deck.block(96)
+
+
+if __name__ == '__main__':
+    unittest.main()
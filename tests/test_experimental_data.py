@@ -0,0 +1,153 @@
+"""
+实验数据库单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.experimental_data import (ExperimentalDatabase, ExperimentalDataError, parse_c4,
+                                    projectile_symbol, reaction_name)
+from core.yandf import read_yandf_header
+
+TEST_DIR = Path(__file__).parent.parent / "test_talys"
+
+
+def c4_line(projectile: int, target: int, mf: int, mt: int, values, reference: str,
+            accession: str, subaccession: str, product_meta: str = ' ') -> str:
+    """按C4固定列格式构造一行"""
+    fields = ''.join(f"{value:9.3E}" if isinstance(value, float) else f"{value:>9}" for value in values)
+    fields = fields.ljust(72)
+    return (f"{projectile:5d}{target:6d} {mf:3d}{mt:4d}{product_meta}  {fields}   "
+            f"{reference:<25}{accession:<5}{subaccession:<3} \n")
+
+
+C4_TEXT = ''.join([
+    "#  C4 test file\n",
+    # Pa-233 (n,n_3)，能量单位eV，截面单位b；第二行使用省略E的Fortran写法
+    c4_line(1, 91233, 3, 53, [1.2e6, 0.0, 8.0, 0.4], "A.Smith (1975)", "12345", "002"),
+    c4_line(1, 91233, 3, 53, ["1.0000+6", 0.0, 7.0, 0.35], "A.Smith (1975)", "12345", "002"),
+    c4_line(1, 91233, 3, 53, [1.5e6, 0.0, 9.0, 0.5], "B.Jones (1990)", "23456", "003"),
+    # Pa-233 (n,a_0) 和 U-235 (p,n)
+    c4_line(1, 91233, 3, 800, [1.0e6, 0.0, 1.0e-3, 1.0e-4], "C.Lee (2001)", "34567", "004"),
+    c4_line(1001, 92235, 3, 4, [5.0e6, 0.0, 0.1, 0.01], "D.Kim (2010)", "45678", "005"),
+])
+
+# Pa-233 (n,x) 残余核产生截面：产物ZA在 ELV/HL 列
+PRODUCTION_TEXT = ''.join([
+    c4_line(1, 91233, 3, 5, [1.0e6, 0.0, 0.5, 0.05, '', '', '91234', ''], "E.Wu (2015)", "56789", "002", 'G'),
+    c4_line(1, 91233, 3, 5, [1.0e6, 0.0, 0.2, 0.02, '', '', '91234', ''], "E.Wu (2015)", "56789", "002", 'M'),
+    c4_line(1, 91233, 3, 5, [2.0e7, 0.0, 0.1, 0.01, '', '', '90231', ''], "E.Wu (2015)", "56789", "002"),
+    c4_line(1, 91233, 3, 5, [2.0e7, 0.0, 0.1, 0.01], "F.Ng (2016)", "67890", "002"),  # 没有产物，跳过
+])
+
+
+class TestExperimentalData(unittest.TestCase):
+    """实验数据库测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="talys_test_exfor_"))
+        self.c4_file = self.temp_dir / "pa233.c4"
+        self.c4_file.write_text(C4_TEXT)
+        self.database = ExperimentalDatabase(self.temp_dir / "db")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.database.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reaction_name(self):
+        """测试由MT得到反应名"""
+        self.assertEqual(reaction_name('n', 53), '(n,n_3)')
+        self.assertEqual(reaction_name('n', 800), '(n,a_0)')
+        self.assertEqual(reaction_name('n', 603), '(n,p_3)')
+        self.assertEqual(reaction_name('n', 16), '(n,2n)')
+        self.assertEqual(reaction_name('p', 999), '(p,MT999)')
+        self.assertEqual(projectile_symbol(1001), 'p')
+        with self.assertRaises(ExperimentalDataError):
+            projectile_symbol(6012)
+
+    def test_parse_c4(self):
+        """测试按EXFOR编号分组"""
+        groups = parse_c4(C4_TEXT.splitlines())
+        self.assertEqual(len(groups), 4)
+        first = next(iter(groups.values()))
+        self.assertEqual(first['meta']['reaction'], '(n,n_3)')
+        self.assertEqual(first['meta']['year'], 1975)
+        self.assertEqual(len(first['rows']), 2)
+
+    def test_import_and_query(self):
+        """测试导入后按靶核、入射粒子和MT查询"""
+        self.assertEqual(self.database.import_c4(self.c4_file), 4)
+        self.assertEqual(len(self.database), 4)
+
+        datasets = self.database.query(91, 233, 'n', mt=53)
+        self.assertEqual([d.accession for d in datasets], ['12345', '23456'])
+        smith = datasets[0]
+        self.assertEqual(smith.label, "A.Smith (1975) [12345.002]")
+        # 按能量排序，换算为MeV和mb
+        np.testing.assert_allclose(smith.energy, [1.0, 1.2])
+        np.testing.assert_allclose(smith.value, [7000.0, 8000.0])
+        np.testing.assert_allclose(smith.uncertainty, [350.0, 400.0])
+
+        self.assertEqual(len(self.database.query(91, 233, 'n', reaction='(n,a_0)')), 1)
+        self.assertEqual(len(self.database.query(92, 235, 'p', mt=4)), 1)
+        self.assertEqual(self.database.query(92, 235, 'n', mt=4), [])
+
+        # 再次导入覆盖同一数据集
+        self.assertEqual(self.database.import_c4(self.c4_file), 4)
+        self.assertEqual(len(self.database), 4)
+
+    def test_datasets_for_header(self):
+        """测试按YANDF头部匹配实验数据"""
+        self.database.import_directory(self.temp_dir)
+        header = read_yandf_header(TEST_DIR / "nn.L03")
+        self.assertEqual([d.accession for d in self.database.datasets_for_header(header)], ['12345', '23456'])
+        header = read_yandf_header(TEST_DIR / "na.L00")
+        self.assertEqual(len(self.database.datasets_for_header(header)), 1)
+        self.assertEqual(self.database.datasets_for_header(read_yandf_header(TEST_DIR / "nn.L01")), [])
+        self.assertEqual(self.database.datasets_for_header({}), [])
+
+    def test_production_cross_sections(self):
+        """测试残余核产生截面按产物和同质异能态匹配"""
+        groups = parse_c4(PRODUCTION_TEXT.splitlines())
+        self.assertEqual([(g['meta']['product_z'], g['meta']['product_a']) for g in groups.values()],
+                         [(91, 234), (91, 234), (90, 231)])
+
+        self.c4_file.write_text(C4_TEXT + PRODUCTION_TEXT)
+        self.database.import_directory(self.temp_dir)
+        ground = self.database.datasets_for_header(read_yandf_header(TEST_DIR / "rp091234.L00"))
+        isomer = self.database.datasets_for_header(read_yandf_header(TEST_DIR / "rp091234.L02"))
+        self.assertEqual([d.product_meta for d in ground], ['G'])
+        self.assertEqual([d.product_meta for d in isomer], ['M'])
+        np.testing.assert_allclose(isomer[0].value, [200.0])
+
+        header = read_yandf_header(TEST_DIR / "rp091234.L00")
+        header['residual'] = {'Z': 90, 'A': 231, 'nuclide': 'Th231'}  # 总产生截面
+        self.assertEqual([d.product_a for d in self.database.datasets_for_header(header)], [231])
+        header['residual'] = {'Z': 89, 'A': 230, 'nuclide': 'Ac230'}
+        self.assertEqual(self.database.datasets_for_header(header), [])
+
+    def test_persistence_and_remove(self):
+        """测试重新打开数据库和删除数据集"""
+        self.database.import_c4(self.c4_file)
+        self.database.close()
+
+        self.database = ExperimentalDatabase(self.temp_dir / "db")
+        dataset = self.database.query(91, 233, 'n', mt=800)[0]
+        self.assertEqual(dataset.n_points, 1)
+        self.database.remove(dataset)
+        self.assertEqual(self.database.query(91, 233, 'n', mt=800), [])
+        self.assertFalse((self.database.data_dir / dataset.file).exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
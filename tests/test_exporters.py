@@ -0,0 +1,131 @@
+"""
+数据导出单元测试
+"""
+
+import importlib.util
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import core.exporters as exporters
+from core.exporters import (CsvExporter, EndfMf3Exporter, ExportCancelled, ExportError, ExportTable,
+                            create_exporter, endf_float, tables_from_directory)
+from core.yandf import read_yandf_file
+
+TEST_DIR = Path(__file__).parent.parent / "test_talys"
+
+
+class TestExporters(unittest.TestCase):
+    """数据导出测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.output_dir = Path(tempfile.mkdtemp(prefix="talys_test_export_"))
+        self.chunk_rows = exporters.CHUNK_ROWS
+        exporters.CHUNK_ROWS = 4
+
+    def tearDown(self):
+        """测试后清理"""
+        exporters.CHUNK_ROWS = self.chunk_rows
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def test_yandf_table_chunks(self):
+        """测试按块读取YANDF文件与整体读取一致"""
+        table = ExportTable.from_yandf(TEST_DIR / "nn.L03")
+        self.assertEqual(table.columns, ['E', 'xs', 'Direct', 'Compound'])
+        self.assertEqual(table.endf_id, (3, 53))
+        chunks = list(table.chunks())
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 2])
+        _, expected = read_yandf_file(TEST_DIR / "nn.L03")
+        np.testing.assert_array_equal(np.vstack(chunks), expected)
+
+    def test_csv_round_trip(self):
+        """测试CSV导出及进度回调"""
+        energy = np.linspace(1.0, 2.0, 10)
+        table = ExportTable.from_arrays('test', {'E': energy, 'xs': energy ** 2}, ['MeV', 'mb'])
+        progress = []
+        written = CsvExporter(float_format='%.10g').export(
+            [table], self.output_dir, progress_callback=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(written, [self.output_dir / "test.csv"])
+        with open(written[0], encoding='utf-8') as f:
+            self.assertEqual(f.readline().strip(), "E [MeV],xs [mb]")
+        data = np.loadtxt(written[0], delimiter=',', skiprows=1)
+        np.testing.assert_allclose(data, np.column_stack([energy, energy ** 2]))
+        self.assertEqual(progress, [(4, 10), (8, 10), (10, 10)])
+
+        # 无效的数值格式在创建导出器时报错，而不是在导出线程中
+        for float_format in ('%.6e%', '%.3f %.3f', 'mb'):
+            with self.assertRaises(ExportError):
+                create_exporter('csv', float_format=float_format)
+
+    def test_cancel(self):
+        """测试取消导出"""
+        tables = tables_from_directory(TEST_DIR)
+        with self.assertRaises(ExportCancelled):
+            CsvExporter().export(tables, self.output_dir, should_cancel=lambda: True)
+
+    def test_endf_float(self):
+        """测试ENDF浮点数格式"""
+        self.assertEqual(endf_float(1.0e6), " 1.000000+6")
+        self.assertEqual(endf_float(-2.5e-10), "-2.50000-10")
+        self.assertEqual(endf_float(0.0), " 0.000000+0")
+
+    def test_endf_mf3(self):
+        """测试MF3导出：按MT排序，单位换算为eV和b"""
+        tables = [ExportTable.from_yandf(TEST_DIR / name) for name in ("nn.L03", "nn.L01", "na.L00")]
+        path = self.output_dir / "out.endf"
+        EndfMf3Exporter(mat=9137).export(tables, path)
+
+        with open(path, encoding='ascii') as f:
+            lines = f.read().splitlines()
+        self.assertTrue(all(len(line) == 80 for line in lines))
+        mts = list(dict.fromkeys(int(line[72:75]) for line in lines[1:] if line[70:72] == ' 3'))
+        self.assertEqual([mt for mt in mts if mt], [51, 53, 800])
+
+        mt53 = [line for line in lines if line[70:75] == ' 3 53']
+        self.assertEqual(mt53[0][:11], " 9.123300+4")
+        self.assertEqual(int(mt53[2][:11]), 6)
+        self.assertEqual(mt53[3][:44], " 1.000000+6 7.046060+0 1.200000+6 8.269070+0")
+        self.assertEqual(lines[-1][66:70], "  -1")
+
+    def test_endf_requires_ids(self):
+        """测试没有ENDF编号的表无法导出为MF3"""
+        table = ExportTable.from_arrays('plain', {'E': [1.0], 'xs': [2.0]})
+        with self.assertRaises(ExportError):
+            EndfMf3Exporter().export([table], self.output_dir / "out.endf")
+        with self.assertRaises(ExportError):
+            create_exporter('xlsx')
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), "需要pyarrow")
+    def test_parquet(self):
+        """测试Parquet导出"""
+        import pyarrow.parquet as pq
+
+        written = create_exporter('parquet').export([ExportTable.from_yandf(TEST_DIR / "nn.L03")],
+                                                    self.output_dir)
+        table = pq.read_table(written[0])
+        self.assertEqual(table.num_rows, 6)
+        self.assertAlmostEqual(table.column('xs')[0].as_py(), 7046.06)
+
+    @unittest.skipUnless(importlib.util.find_spec('h5py'), "需要h5py")
+    def test_hdf5(self):
+        """测试HDF5导出"""
+        import h5py
+
+        path = self.output_dir / "out.h5"
+        create_exporter('hdf5').export(tables_from_directory(TEST_DIR)[:3], path)
+        with h5py.File(path, 'r') as f:
+            self.assertEqual(len(f), 3)
+            self.assertEqual(f['na.L00'].shape[1], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
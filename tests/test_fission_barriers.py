@@ -0,0 +1,60 @@
+"""
+裂变位垒文件解析单元测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.fission_barriers import FissionBarrierDataset
+
+TEST_DATA_DIR = Path(__file__).parent.parent / 'test_talys'
+
+
+class TestFissionBarrierDataset(unittest.TestCase):
+    """裂变位垒数据集测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dataset = FissionBarrierDataset.from_directory(TEST_DATA_DIR)
+
+    def test_nuclei(self):
+        """测试核素和极值点数量"""
+        self.assertEqual(len(self.dataset.nuclei), 7)
+        self.assertEqual(len(self.dataset.for_nucleus(90, 230)), 5)
+        self.assertEqual(len(self.dataset.for_nucleus(91, 233)), 3)
+
+    def test_get(self):
+        """测试按 (Z, A, 极值点) 查找"""
+        record = self.dataset.get(91, 233, 3)
+        self.assertAlmostEqual(record['deformation'], 1.255)
+        self.assertAlmostEqual(record['height'], 5.93082047)
+        self.assertAlmostEqual(record['width_err'], 0.279326677)
+        self.assertIsNone(self.dataset.get(91, 233, 4))
+
+    def test_parameter_table(self):
+        """测试参数表对缺失极值点补NaN"""
+        nuclei, heights = self.dataset.parameter_table('height')
+        self.assertEqual(heights.shape, (7, 5))
+        row = np.flatnonzero((nuclei[:, 0] == 91) & (nuclei[:, 1] == 233))[0]
+        self.assertTrue(np.isnan(heights[row, 3:]).all())
+
+    def test_transmission_curves(self):
+        """测试透射系数曲线"""
+        energies, values = self.dataset.transmission_curves(90, 230)
+        self.assertEqual(values.shape, (40, 3))
+        self.assertAlmostEqual(energies[0], 0.187)
+        self.assertTrue((np.diff(energies) > 0).all())
+
+    def test_empty_directory(self):
+        """测试没有wkb文件的目录"""
+        self.assertIsNone(FissionBarrierDataset.from_directory(Path(__file__).parent))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+瞬发裂变中子谱解析单元测试
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.fission_spectra import PromptFissionSpectra
+from core.yandf import read_yandf_file
+
+TEST_DATA_DIR = Path(__file__).parent.parent / 'test_talys'
+
+
+class TestPromptFissionSpectra(unittest.TestCase):
+    """PFNS数据集测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pfns = PromptFissionSpectra.from_directory(TEST_DATA_DIR)
+
+    def test_shape_and_header(self):
+        """测试数组形状和头部信息"""
+        self.assertEqual(self.pfns.data.shape, (6, 243, 4))
+        np.testing.assert_allclose(self.pfns.e_incident, [1.0, 1.2, 1.4, 1.6, 1.8, 2.0])
+        self.assertAlmostEqual(self.pfns.e_average[0], 1.990589)
+        self.assertEqual(self.pfns.column_names[1], 'spectrum')
+        self.assertEqual(self.pfns.nuclide, 'Pa233')
+
+    def test_matches_single_file(self):
+        """测试堆叠结果与单文件读取一致"""
+        _, data = read_yandf_file(TEST_DATA_DIR / 'pfns0001.400.fis')
+        np.testing.assert_array_equal(self.pfns.data[2], data)
+
+    def test_interpolation(self):
+        """测试入射能量插值"""
+        result = self.pfns.interpolate([1.0, 1.1, 5.0])
+        self.assertEqual(result.shape, (3, 243, 4))
+        np.testing.assert_array_equal(result[0], self.pfns.data[0])
+        np.testing.assert_allclose(result[1], 0.5 * (self.pfns.data[0] + self.pfns.data[1]))
+        np.testing.assert_array_equal(result[2], self.pfns.data[-1])
+
+    def test_truncated_file(self):
+        """测试计算中断时写了一半的文件：只填充已写出的行，头部不完整的文件跳过"""
+        directory = Path(tempfile.mkdtemp(prefix="talys_test_pfns_"))
+        try:
+            for path in TEST_DATA_DIR.glob(PromptFissionSpectra.FILE_PATTERN):
+                shutil.copy(path, directory)
+            text = (directory / 'pfns0002.000.fis').read_text(encoding='utf-8')
+            lines = text.splitlines(keepends=True)
+            data_start = next(i for i, line in enumerate(lines) if not line.startswith('#'))
+            # 17行完整数据，第18行在数字中间截断
+            truncated = ''.join(lines[:data_start + 17]) + lines[data_start + 17][:30]
+            (directory / 'pfns0002.000.fis').write_text(truncated, encoding='utf-8')
+            (directory / 'pfns0001.800.fis').write_text(''.join(lines[:5]), encoding='utf-8')
+
+            pfns = PromptFissionSpectra.from_directory(directory)
+            self.assertEqual(pfns.data.shape, (5, 243, 4))
+            np.testing.assert_allclose(pfns.e_incident, [1.0, 1.2, 1.4, 1.6, 2.0])
+            np.testing.assert_array_equal(pfns.data[-1, :17], self.pfns.data[-1, :17])
+            self.assertTrue(np.isnan(pfns.data[-1, 17:]).all())
+            np.testing.assert_array_equal(pfns.data[:4], self.pfns.data[:4])
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def test_missing_directory(self):
+        """测试没有PFNS文件的目录"""
+        self.assertIsNone(PromptFissionSpectra.from_directory(Path(__file__).parent))
+
+
+if __name__ == '__main__':
+    unittest.main()
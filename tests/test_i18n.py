@@ -0,0 +1,78 @@
+"""
+国际化模块单元测试
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from PyQt6.QtCore import QObject
+from utils.i18n import LanguageManager, build_translations, compile_catalogue, load_catalogue
+
+
+class TestLanguageManager(unittest.TestCase):
+    """语言管理器测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.write('en', {'app_title': 'Visualizer', 'tab_basic': 'Basic'})
+        self.write('zh', {'app_title': '可视化'})
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, language, translations):
+        with open(self.temp_dir / f"{language}.json", 'w', encoding='utf-8') as f:
+            json.dump(translations, f, ensure_ascii=False)
+
+    def test_fallback(self):
+        """测试缺失的键用英文补齐"""
+        self.assertEqual(build_translations('zh', self.temp_dir),
+                         {'app_title': '可视化', 'tab_basic': 'Basic'})
+
+    def test_catalogue(self):
+        """测试编译目录的读取，以及源文件更新后目录失效"""
+        path = compile_catalogue('zh', self.temp_dir)
+        self.write('zh', {'app_title': '已修改'})
+        os.utime(path, ns=(1, 1))  # 源文件比目录新
+        self.assertEqual(load_catalogue('zh', self.temp_dir)['app_title'], '已修改')
+
+        compile_catalogue('zh', self.temp_dir)
+        self.write('zh', {'app_title': '未编译'})
+        os.utime(self.temp_dir / 'zh.json', ns=(1, 1))  # 目录比源文件新
+        self.assertEqual(load_catalogue('zh', self.temp_dir),
+                         {'app_title': '已修改', 'tab_basic': 'Basic'})
+
+    def test_lazy_loading(self):
+        """测试语言在第一次使用时才加载"""
+        manager = LanguageManager(self.temp_dir)
+        self.assertEqual(manager.translations, {})
+        self.assertEqual(manager.tr('tab_basic'), 'Basic')
+        self.assertEqual(manager.tr('missing', '默认'), '默认')
+        self.assertEqual(manager.tr('missing'), 'missing')
+        self.assertEqual(list(manager.translations), ['en'])
+
+    def test_bindings(self):
+        """测试切换语言时更新绑定的文本，并移除已销毁对象的绑定"""
+        manager = LanguageManager(self.temp_dir)
+        label = manager.bind(QObject(), 'app_title', setter='setObjectName', template='{} v1')
+        manager.bind(QObject(), 'tab_basic', setter='setObjectName')
+        self.assertEqual(label.objectName(), 'Visualizer v1')
+
+        self.assertTrue(manager.set_language('zh'))
+        self.assertEqual(label.objectName(), '可视化 v1')
+        self.assertEqual(len(manager._bindings), 1)
+        self.assertFalse(manager.set_language('fr'))
+
+
+if __name__ == '__main__':
+    unittest.main()
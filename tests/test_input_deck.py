@@ -0,0 +1,95 @@
+"""
+TALYS输入卡片构建单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.input_deck import InputDeck, build_deck, build_decks, write_decks, format_value
+
+INPUT_FILE = Path(__file__).parent.parent / 'test_talys' / 'inp'
+BASE_PARAMETERS = {'projectile': 'n', 'element': 'Pa', 'mass': 233, 'energy': 1.0,
+                   'ldmodel': 1, 'channels': True}
+
+
+class TestInputDeck(unittest.TestCase):
+    """输入卡片测试类"""
+
+    def test_format_value(self):
+        """测试数值格式化"""
+        self.assertEqual(format_value(True), 'y')
+        self.assertEqual(format_value(2.0), '2')
+        self.assertEqual(format_value(1.05), '1.05')
+        self.assertEqual(format_value((1, 2, 0.2)), '1 2 0.2')
+
+    def test_canonical_order(self):
+        """测试规范顺序与参数字典顺序无关"""
+        text = build_deck(BASE_PARAMETERS, header=False)
+        self.assertEqual(text.splitlines(), ['projectile n', 'element Pa', 'mass 233', 'energy 1',
+                                             'channels y', 'ldmodel 1'])
+        reordered = dict(reversed(list(BASE_PARAMETERS.items())))
+        self.assertEqual(build_deck(reordered), build_deck(BASE_PARAMETERS))
+
+    def test_energy_range(self):
+        """测试能量范围参数"""
+        parameters = {'projectile': 'n', 'element': 'Pa', 'mass': 233,
+                      'energy_mode': 'range', 'energy_min': 1, 'energy_max': 2, 'energy_step': 0.2}
+        self.assertIn('energy 1 2 0.2\n', build_deck(parameters))
+        with self.assertRaises(ValueError):
+            build_deck({'projectile': 'n', 'element': 'Pa', 'mass': 233})
+
+    def test_round_trip(self):
+        """测试解析已有输入文件并往返转换"""
+        deck = InputDeck.read(INPUT_FILE)
+        self.assertEqual(deck.keywords()[:4], ['projectile', 'element', 'mass', 'energy'])
+
+        parameters = deck.to_parameters()
+        self.assertEqual(parameters['projectile'], 'n')
+        self.assertEqual(parameters['energy_mode'], 'range')
+        self.assertIs(parameters['widthfluc'], True)
+        self.assertEqual(parameters['jlmmode'], 3)
+
+        rebuilt = InputDeck.from_parameters(parameters)
+        self.assertEqual(rebuilt, deck)
+        self.assertEqual(rebuilt.cache_key(), deck.cache_key())
+        self.assertEqual(InputDeck.parse(deck.to_text()), deck)
+
+    def test_repeated_keywords(self):
+        """测试重复关键字和覆盖"""
+        deck = InputDeck.parse("projectile n\nrvadjust n 1.05\nrvadjust p 0.98  # 注释\n")
+        self.assertEqual(deck.to_parameters()['rvadjust'], ['n 1.05', 'p 0.98'])
+
+        deck.update(InputDeck.parse("rvadjust n 1.10"))
+        self.assertEqual([text for keyword, text in deck.entries if keyword == 'rvadjust'], ['n 1.10'])
+
+    def test_bulk_generation(self):
+        """测试批量生成和写入工作目录"""
+        points = [{'ldmodel': model, 'strength': strength} for model in (1, 2) for strength in (1, 9)]
+        decks = list(build_decks(BASE_PARAMETERS, points))
+        self.assertEqual(len({key for key, _ in decks}), 4)
+        self.assertEqual(decks[3][1], build_deck({**BASE_PARAMETERS, 'ldmodel': 2, 'strength': 9}))
+
+        ranged = next(build_decks(BASE_PARAMETERS, [{'energy_mode': 'range', 'energy_min': 1,
+                                                     'energy_max': 5, 'energy_step': 1}]))
+        self.assertIn('energy 1 5 1\n', ranged[1])
+
+        root = Path(tempfile.mkdtemp(prefix="talys_test_decks_"))
+        try:
+            directories = [root / str(i) for i in range(len(points))]
+            for directory in directories:
+                directory.mkdir()
+            keys = write_decks(BASE_PARAMETERS, points, directories)
+            self.assertEqual(keys, [key for key, _ in decks])
+            self.assertEqual(InputDeck.read(directories[0] / 'talys.inp').to_parameters()['strength'], 1)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
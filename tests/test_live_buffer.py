@@ -0,0 +1,100 @@
+"""
+实时结果缓冲单元测试
+"""
+
+import stat
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.live_buffer import LiveBuffer, SummaryStream
+from core.partial_results import parse_reaction_summaries
+from core.talys_interface import TalysInterface
+from core.workdir_pool import WorkDirPool
+
+TEST_DIR = Path(__file__).parent.parent / "test_talys"
+ENERGIES = [1.0, 1.2, 1.4, 1.6, 1.8, 2.0]
+
+
+class TestLiveBuffer(unittest.TestCase):
+    """实时结果缓冲测试类"""
+
+    def test_growth(self):
+        """测试写满后扩容，之前取得的视图不受影响"""
+        buffer = LiveBuffer(('x', 'y'), capacity=2)
+        buffer.append([1.0, 10.0])
+        buffer.append([2.0, 20.0])
+        before, version = buffer.view()
+        buffer.extend(np.array([[3.0, 30.0], [4.0, 40.0], [5.0, 50.0]]))
+        self.assertGreaterEqual(buffer.capacity, 5)
+        self.assertGreater(buffer.version, version)
+        np.testing.assert_allclose(before, [[1.0, 2.0], [10.0, 20.0]])
+        np.testing.assert_allclose(buffer.column('y'), [10.0, 20.0, 30.0, 40.0, 50.0])
+        with self.assertRaises(ValueError):
+            buffer.append([1.0])
+
+    def test_ring(self):
+        """测试环形缓冲区只保留最新的数据并按写入顺序返回"""
+        buffer = LiveBuffer(('x',), max_points=3)
+        for value in range(5):
+            buffer.append([value])
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.capacity, 3)
+        np.testing.assert_allclose(buffer.column('x'), [2.0, 3.0, 4.0])
+        buffer.extend(np.arange(10.0).reshape(-1, 1))
+        np.testing.assert_allclose(buffer.column('x'), [7.0, 8.0, 9.0])
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+
+    def test_summary_stream(self):
+        """测试逐行输入标准输出，得到各入射能量的反应总结"""
+        text = (TEST_DIR / "out").read_text(encoding='utf-8', errors='replace')
+        buffer = LiveBuffer()
+        stream = SummaryStream(buffer)
+        for line in text.splitlines(keepends=True):
+            stream(line)
+
+        summaries = parse_reaction_summaries(text)
+        np.testing.assert_allclose(buffer.column('energy'), ENERGIES)
+        np.testing.assert_allclose(buffer.column('cross_section'), [summaries[e]['total'] for e in ENERGIES])
+        np.testing.assert_allclose(buffer.column('elastic'), [summaries[e]['elastic'] for e in ENERGIES])
+
+
+class TestLiveOutput(unittest.TestCase):
+    """计算过程中逐行读取标准输出的测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="talys_test_live_"))
+        self.executable = self.temp_dir / "fake_talys"
+        self.executable.write_text(
+            f"#!{sys.executable}\nimport sys\nsys.stdin.read()\n"
+            f"sys.stdout.write(open({str((TEST_DIR / 'out').resolve())!r}).read())\n")
+        self.executable.chmod(self.executable.stat().st_mode | stat.S_IEXEC)
+        self.pool = WorkDirPool(root=self.temp_dir, size=0)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.pool.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_output_callback(self):
+        """测试计算过程中标准输出的每一行交给回调"""
+        talys = TalysInterface(str(self.executable), workdir_pool=self.pool)
+        buffer = LiveBuffer()
+        talys.output_callback = SummaryStream(buffer)
+        results = talys.run_calculation({'projectile': 'n', 'element': 'Pa', 'mass': 233, 'energy': 1.0})
+        talys.cleanup_temp_directory()
+        np.testing.assert_allclose(buffer.column('energy'), ENERGIES)
+        self.assertEqual(results['stdout'], (TEST_DIR / "out").read_text(encoding='utf-8', errors='replace'))
+
+
+if __name__ == '__main__':
+    unittest.main()
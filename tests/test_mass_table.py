@@ -0,0 +1,109 @@
+"""
+基态质量表单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from config.settings import Settings
+import core.mass_table as mass_table
+from core.mass_table import MassTable, decode_spin_parity, default_mass_table_file, get_mass_table
+
+MASS_FILE = Path(__file__).parent.parent / 'test_talys' / 'gs-mass-sp.dat'
+
+
+class TestMassTable(unittest.TestCase):
+    """质量表测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = Path(tempfile.mkdtemp(prefix="talys_test_cache_"))
+        cls.table = MassTable(MASS_FILE, cache_dir=cls.cache_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
+
+    def test_parse(self):
+        """测试解析结果"""
+        self.assertEqual(len(self.table), 9151)
+        self.assertEqual(self.table.mass_excess(6, 12), 0.0)
+        self.assertAlmostEqual(self.table.mass_excess(0, 1), 8.071388)
+        self.assertTrue(np.isnan(self.table.mass_excess(200, 500)))
+        self.assertFalse(self.table.contains(91, 999))
+
+    def test_cache(self):
+        """测试缓存与直接解析一致"""
+        cached = MassTable(MASS_FILE, cache_dir=self.cache_dir)
+        np.testing.assert_array_equal(cached.mass_excess_values, self.table.mass_excess_values)
+        np.testing.assert_array_equal(cached.grid, self.table.grid)
+
+    def test_spin_parity(self):
+        """测试自旋宇称解码"""
+        spin, parity = decode_spin_parity(np.array([100.5, -98.5, 9999.0]))
+        np.testing.assert_array_equal(parity, [1, -1, 0])
+        self.assertEqual(spin[1], 1.5)
+        self.assertTrue(np.isnan(spin[2]))
+
+        state = self.table.ground_state(91, 233)
+        self.assertEqual((state['spin'], state['parity']), (1.5, -1))
+
+    def test_separation_and_threshold(self):
+        """测试分离能和阈能"""
+        sn = self.table.separation_energy([91, 92], [234, 236], 'n')
+        self.assertEqual(sn.shape, (2,))
+        self.assertAlmostEqual(self.table.reaction_q_value(91, 233, 'n', '2n'),
+                               -float(self.table.separation_energy(91, 233, 'n')))
+        # 7Li(p,n) 阈能约 1.880 MeV
+        self.assertAlmostEqual(self.table.threshold_energy(3, 7, 'p', 'n'), 1.880, places=2)
+        self.assertEqual(self.table.threshold_energy(91, 233, 'n', 'g'), 0.0)
+
+    def test_default_file(self):
+        """测试默认质量表取自TALYS结构数据库，或配置的文件"""
+        saved = (Settings.TALYS_STRUCTURE_DIR, Settings.MASS_TABLE_FILE, Settings.TALYS_EXECUTABLE)
+        try:
+            Settings.MASS_TABLE_FILE = None
+            Settings.TALYS_STRUCTURE_DIR = self.cache_dir
+            self.assertEqual(default_mass_table_file(), self.cache_dir / 'masses' / 'gs-mass-sp.dat')
+
+            Settings.MASS_TABLE_FILE = MASS_FILE
+            self.assertEqual(default_mass_table_file(), MASS_FILE)
+
+            Settings.MASS_TABLE_FILE = Settings.TALYS_STRUCTURE_DIR = None
+            Settings.TALYS_EXECUTABLE = 'talys-not-installed'
+            with self.assertRaises(FileNotFoundError):
+                MassTable(cache_dir=self.cache_dir)
+        finally:
+            Settings.TALYS_STRUCTURE_DIR, Settings.MASS_TABLE_FILE, Settings.TALYS_EXECUTABLE = saved
+
+    def test_failure_cached(self):
+        """测试找不到质量表时记下错误，修改配置后重新加载"""
+        saved = (Settings.TALYS_STRUCTURE_DIR, Settings.MASS_TABLE_FILE, Settings.TALYS_EXECUTABLE)
+        try:
+            mass_table._mass_table = mass_table._mass_table_failure = None
+            Settings.MASS_TABLE_FILE = Settings.TALYS_STRUCTURE_DIR = None
+            Settings.TALYS_EXECUTABLE = 'talys-not-installed'
+            with self.assertRaises(FileNotFoundError) as first:
+                get_mass_table()
+            with self.assertRaises(FileNotFoundError) as second:
+                get_mass_table()
+            self.assertIs(second.exception, first.exception)
+
+            Settings.MASS_TABLE_FILE = MASS_FILE
+            self.assertEqual(len(get_mass_table()), len(self.table))
+            self.assertIsNone(mass_table._mass_table_failure)
+        finally:
+            Settings.TALYS_STRUCTURE_DIR, Settings.MASS_TABLE_FILE, Settings.TALYS_EXECUTABLE = saved
+            mass_table._mass_table = mass_table._mass_table_failure = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+蒙特卡罗不确定度传播单元测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.monte_carlo import (MonteCarloDriver, StreamingStatistics, P2Quantile,
+                              Normal, Uniform, LogNormal, Choice)
+
+BASE_PARAMETERS = {'projectile': 'n', 'element': 'Pa', 'mass': 233, 'energy': 1.0}
+ENERGIES = np.array([1.0, 1.5, 2.0])
+
+
+def fake_runner(parameters, channels):
+    """截面随参数线性变化，代替TALYS计算"""
+    if parameters['rvadjust'] < 0:
+        raise RuntimeError("模拟计算失败")
+    return {'total.tot': (ENERGIES, 100.0 * parameters['rvadjust'] * ENERGIES + parameters['ldmodel'])}
+
+
+class TestStreamingStatistics(unittest.TestCase):
+    """流式统计量测试类"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.samples = rng.multivariate_normal([1.0, 2.0, 3.0],
+                                               [[1.0, 0.5, 0.0], [0.5, 2.0, 0.3], [0.0, 0.3, 0.5]], 4000)
+
+    def test_welford(self):
+        """测试均值、方差和协方差与批量计算一致"""
+        statistics = StreamingStatistics(ENERGIES)
+        for row in self.samples:
+            statistics.add(row)
+        np.testing.assert_allclose(statistics.mean, self.samples.mean(axis=0))
+        np.testing.assert_allclose(statistics.variance, self.samples.var(axis=0, ddof=1))
+        np.testing.assert_allclose(statistics.covariance, np.cov(self.samples, rowvar=False))
+        np.testing.assert_allclose(np.diag(statistics.correlation), 1.0)
+
+    def test_p2_quantile(self):
+        """测试P²分位数接近精确分位数"""
+        for p in (0.05, 0.5, 0.95):
+            estimator = P2Quantile(p, 3)
+            for row in self.samples:
+                estimator.add(row)
+            exact = np.quantile(self.samples, p, axis=0)
+            np.testing.assert_allclose(estimator.value, exact, atol=0.1)
+
+    def test_few_samples(self):
+        """测试样本不足5个时的分位数"""
+        estimator = P2Quantile(0.5, 1)
+        for value in (3.0, 1.0, 2.0):
+            estimator.add(np.array([value]))
+        self.assertEqual(estimator.value[0], 2.0)
+
+    def test_interpolation(self):
+        """测试不同能量网格的样本插值到统计网格"""
+        statistics = StreamingStatistics(ENERGIES, covariance=False)
+        statistics.add(np.array([0.0, 2.0]), energies=np.array([1.0, 2.0]))
+        np.testing.assert_allclose(statistics.mean, [0.0, 1.0, 2.0])
+        self.assertIsNone(statistics.covariance)
+
+    def test_partial_grids(self):
+        """测试能量网格宽度不同的样本：未覆盖的点只是少一个样本，不会污染统计量"""
+        statistics = StreamingStatistics(ENERGIES)
+        narrow = np.array([1.0, 1.5])
+        for row in self.samples:
+            if row[0] > 1.0:
+                statistics.add(row[:2], energies=narrow)  # 不覆盖最后一个能量点
+            else:
+                statistics.add(row)
+        full = self.samples[self.samples[:, 0] <= 1.0]
+        np.testing.assert_array_equal(statistics.counts, [4000, 4000, len(full)])
+        np.testing.assert_allclose(statistics.mean[:2], self.samples[:, :2].mean(axis=0))
+        np.testing.assert_allclose(statistics.mean[2], full[:, 2].mean())
+        np.testing.assert_allclose(statistics.variance[2], full[:, 2].var(ddof=1))
+        np.testing.assert_allclose(statistics.covariance[:2, :2], np.cov(self.samples[:, :2], rowvar=False))
+        np.testing.assert_allclose(statistics.covariance[0, 2], np.cov(full[:, 0], full[:, 2])[0, 1])
+        np.testing.assert_allclose(statistics.quantile(0.5)[:2], np.median(self.samples[:, :2], axis=0), atol=0.1)
+        np.testing.assert_allclose(statistics.quantile(0.5)[2], np.median(full[:, 2]), atol=0.1)
+        self.assertFalse(np.isnan(statistics.quantile(0.95)).any())
+
+        empty = StreamingStatistics(ENERGIES)
+        empty.add(np.array([1.0, 2.0]), energies=np.array([1.0, 1.5]))
+        self.assertTrue(np.isnan(empty.mean[2]))
+        self.assertTrue(np.isnan(empty.quantile(0.5)[2]))
+
+
+class TestMonteCarloDriver(unittest.TestCase):
+    """蒙特卡罗驱动测试类"""
+
+    def test_distributions(self):
+        """测试参数分布抽样"""
+        rng = np.random.default_rng(0)
+        self.assertTrue(all(0.9 <= Normal(1.0, 0.5, 0.9, 1.1).sample(rng) <= 1.1 for _ in range(100)))
+        self.assertTrue(all(2 <= Uniform(2, 3).sample(rng) <= 3 for _ in range(100)))
+        self.assertGreater(LogNormal(1.0, 0.1).sample(rng), 0)
+        self.assertIn(Choice([1, 2, 5]).sample(rng), (1, 2, 5))
+
+    def test_run(self):
+        """测试抽样、统计和失败计数"""
+        driver = MonteCarloDriver(BASE_PARAMETERS,
+                                  {'rvadjust': Normal(1.0, 0.02), 'ldmodel': Choice([1, 2])},
+                                  ['total.tot'], max_workers=3, runner=fake_runner)
+        progress = []
+        statistics = driver.run(300, seed=1, progress_callback=lambda done, total: progress.append(done))
+
+        self.assertEqual(driver.completed, 300)
+        self.assertEqual(progress[-1], 300)
+        summary = driver.summary('total.tot')
+        np.testing.assert_allclose(summary['mean'], 100.0 * ENERGIES + 1.5, rtol=0.01)
+        # 截面的标准差主要来自 rvadjust：100 * 0.02 * E
+        np.testing.assert_allclose(summary['std'], np.sqrt((2.0 * ENERGIES) ** 2 + 0.25), rtol=0.15)
+        self.assertLess(summary['q0.05'][0], summary['q0.95'][0])
+        # 各能量点完全相关
+        self.assertGreater(statistics['total.tot'].correlation[0, 2], 0.9)
+        self.assertEqual(driver.parameter_statistics.count, 300)
+
+        failing = MonteCarloDriver(BASE_PARAMETERS, {'rvadjust': Uniform(-1.0, -0.5), 'ldmodel': Choice([1])},
+                                   ['total.tot'], max_workers=2, runner=fake_runner)
+        failing.run(5, seed=1)
+        self.assertEqual((failing.completed, failing.failed), (0, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+NumPy表格模型单元测试
+"""
+
+import os
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt6.QtCore import Qt, QModelIndex
+from PyQt6.QtWidgets import QApplication, QTableView
+from gui.numpy_table_model import (NumpyFilterProxyModel, NumpyTableModel, RawValueRole,
+                                   resize_columns_from_sample)
+
+ENERGY = np.array([2.0, 1.0, 4.0, 3.0, 1.0])
+CROSS_SECTION = np.array([20.5, 10.25, 40.126, 30.0, 15.0])
+
+
+class TestNumpyTableModel(unittest.TestCase):
+    """NumPy表格模型测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.model = NumpyTableModel([ENERGY, CROSS_SECTION], ['E', 'xs'], ['.2f', '.3e'])
+        self.proxy = NumpyFilterProxyModel()
+        self.proxy.setSourceModel(self.model)
+
+    def proxy_column(self, column: int) -> list:
+        """代理模型某列的原始数值"""
+        return [self.proxy.data(self.proxy.index(row, column), RawValueRole)
+                for row in range(self.proxy.rowCount())]
+
+    def test_counts(self):
+        """测试行数、列数和列长度检查"""
+        self.assertEqual((self.model.rowCount(), self.model.columnCount()), (5, 2))
+        self.assertEqual(self.model.rowCount(self.model.index(0, 0)), 0)
+        self.assertEqual((self.proxy.rowCount(), self.proxy.columnCount()), (5, 2))
+        self.assertEqual(NumpyTableModel([], []).rowCount(), 0)
+        with self.assertRaises(ValueError):
+            NumpyTableModel([ENERGY, CROSS_SECTION[:3]], ['E', 'xs'])
+
+    def test_data(self):
+        """测试单元格格式化、原始数值和表头"""
+        index = self.model.index(2, 1)
+        self.assertEqual(self.model.data(index), '4.013e+01')
+        self.assertEqual(self.model.data(self.model.index(1, 0)), '1.00')
+        self.assertEqual(self.model.data(index, RawValueRole), 40.126)
+        self.assertIsNone(self.model.data(QModelIndex()))
+        self.assertIsNone(self.model.data(index, Qt.ItemDataRole.ToolTipRole))
+        self.assertEqual(NumpyTableModel([ENERGY], ['E']).data(self.model.index(0, 0)), '2')
+
+        self.assertEqual(self.model.headerData(1, Qt.Orientation.Horizontal), 'xs')
+        self.assertIsNone(self.model.headerData(5, Qt.Orientation.Horizontal))
+        self.assertEqual(self.model.headerData(0, Qt.Orientation.Vertical), '1')
+
+    def test_sort(self):
+        """测试稳定排序、降序和恢复原始顺序"""
+        self.proxy.sort(0)
+        self.assertEqual(self.proxy_column(0), [1.0, 1.0, 2.0, 3.0, 4.0])
+        # 稳定排序：相同能量保持源模型中的顺序
+        self.assertEqual(self.proxy_column(1)[:2], [10.25, 15.0])
+        # 行表头显示源模型行号
+        self.assertEqual(self.proxy.headerData(0, Qt.Orientation.Vertical), '2')
+
+        self.proxy.sort(1, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.proxy_column(1), sorted(CROSS_SECTION, reverse=True))
+
+        self.proxy.sort(-1)
+        np.testing.assert_array_equal(self.proxy.source_rows(), np.arange(5))
+
+    def test_filter(self):
+        """测试数值范围筛选与排序组合"""
+        self.proxy.set_range_filter(0, minimum=1.5)
+        self.assertEqual(self.proxy.rowCount(), 3)
+        self.proxy.sort(0, Qt.SortOrder.DescendingOrder)
+        self.assertEqual(self.proxy_column(0), [4.0, 3.0, 2.0])
+
+        self.proxy.set_range_filter(1, maximum=15.0)
+        self.assertEqual(self.proxy_column(1), [15.0, 10.25])
+
+        self.proxy.clear_filter()
+        self.assertEqual(self.proxy.rowCount(), 5)
+        self.assertFalse(self.proxy.index(5, 0).isValid())
+
+    def test_mapping(self):
+        """测试代理索引与源索引的相互映射"""
+        self.proxy.sort(0)
+        self.proxy.set_range_filter(0, maximum=3.0)
+        for row in range(self.proxy.rowCount()):
+            proxy_index = self.proxy.index(row, 1)
+            source_index = self.proxy.mapToSource(proxy_index)
+            self.assertEqual(source_index.row(), int(self.proxy.source_rows()[row]))
+            self.assertEqual(source_index.column(), 1)
+            self.assertEqual(self.proxy.mapFromSource(source_index), proxy_index)
+
+        # 被筛掉的源行没有对应的代理行
+        self.assertFalse(self.proxy.mapFromSource(self.model.index(2, 0)).isValid())
+        self.assertFalse(self.proxy.mapToSource(QModelIndex()).isValid())
+        self.assertFalse(self.proxy.mapFromSource(QModelIndex()).isValid())
+
+    def test_column_widths(self):
+        """测试按样本行估算列宽"""
+        view = QTableView()
+        view.setModel(self.proxy)
+        resize_columns_from_sample(view, sample_rows=2)
+        self.assertGreater(view.columnWidth(1), view.fontMetrics().horizontalAdvance('4.013e+01'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+RIPL光学势参数库单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.omp_database import OpticalModelDatabase, fortran_float
+
+OMP_FILE = Path(__file__).parent.parent / 'test_talys' / 'om-parameter-u.dat'
+
+
+class TestOpticalModelDatabase(unittest.TestCase):
+    """光学势参数库测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="talys_test_cache_"))
+        self.database = OpticalModelDatabase(OMP_FILE, cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_fortran_float(self):
+        """测试Fortran指数写法"""
+        self.assertEqual(fortran_float('.00000+0'), 0.0)
+        self.assertAlmostEqual(fortran_float('-3.00000-1'), -0.3)
+        self.assertAlmostEqual(fortran_float(' 1.26000'), 1.26)
+        self.assertAlmostEqual(fortran_float('0.254D+02'), 25.4)
+
+    def test_index(self):
+        """测试索引内容和缓存"""
+        self.assertEqual(len(self.database), 582)
+        self.assertEqual(len(list(self.cache_dir.glob('omp_*.npy'))), 1)
+
+        cached = OpticalModelDatabase(OMP_FILE, cache_dir=self.cache_dir)
+        self.assertTrue((cached.index == self.database.index).all())
+
+    def test_candidates(self):
+        """测试按核素列出候选光学势"""
+        candidates = self.database.candidates(91, 233, 'n')
+        self.assertIn(2408, candidates['iref'])
+        self.assertTrue((candidates['projectile'] == 'n').all())
+
+    def test_read_entry(self):
+        """测试解析单个条目"""
+        entry = self.database.find(93, 237, 'n', 1)
+        self.assertEqual(entry['author'], 'P.G.Young and E.D.Arthur')
+        self.assertEqual(entry['imodel'], 1)
+        self.assertEqual(len(entry['potentials']['imag_volume']), 2)
+
+        real_volume = entry['potentials']['real_volume'][0]
+        self.assertAlmostEqual(real_volume['energy_max'], 30.0)
+        self.assertAlmostEqual(real_volume['rco'][0], 1.26)
+        self.assertAlmostEqual(real_volume['pot'][1], -0.3)
+
+        self.assertIsNone(self.database.find(1, 1, 'n', 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
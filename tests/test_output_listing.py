@@ -0,0 +1,104 @@
+"""
+TALYS输出清单读取单元测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.output_listing import DISCRETE_LEVELS, LEVEL_DENSITY, OutputListing, get_output_listing
+
+TEST_DIR = Path(__file__).parent.parent / "test_talys"
+
+
+class TestOutputListing(unittest.TestCase):
+    """输出清单读取测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.listing = OutputListing(TEST_DIR / "out")
+
+    def tearDown(self):
+        """测试后清理"""
+        self.listing.close()
+
+    def test_index(self):
+        """测试块索引"""
+        self.assertEqual(self.listing.nuclides(), [(91, 142), (91, 143)])
+        self.assertEqual(self.listing.barriers(91, 142), [0, 1, 2])
+        self.assertEqual(self.listing.barriers(91, 143), [0, 1, 2, 3])
+        kinds = self.listing.index['kind']
+        self.assertEqual(int(np.sum(kinds == DISCRETE_LEVELS)), 2)
+        self.assertEqual(int(np.sum(kinds == LEVEL_DENSITY)), 7)
+        # 尚未解析任何块
+        self.assertEqual(self.listing._blocks, {})
+
+    def test_discrete_levels(self):
+        """测试分立能级表和γ分支比"""
+        table = self.listing.discrete_levels(91, 142)
+        levels = table['levels']
+        self.assertEqual(len(levels), 31)
+        self.assertEqual(levels[0]['jp'], '3/2-*')
+        self.assertAlmostEqual(levels[0]['lifetime'], 2.331e6)
+        self.assertEqual(levels[0]['parity'], -1)
+        self.assertAlmostEqual(levels[4]['energy'], 0.0865)
+        self.assertEqual(levels[4]['parity'], 1)
+        self.assertTrue(np.isnan(levels[1]['lifetime']))
+        self.assertEqual(levels[18]['jp'], '(5/2+,11/2-)')
+        self.assertEqual(levels[18]['assignment'], 'J')
+
+        # 赋值标记列中的说明不是自旋宇称
+        levels = self.listing.discrete_levels(91, 143)['levels']
+        self.assertEqual((levels[0]['jp'], levels[0]['assignment']), ('4+', ''))
+        self.assertEqual(levels[1]['jp'], '(3+)')
+        self.assertEqual((levels[2]['jp'], levels[2]['assignment']), ('', 'X'))
+        self.assertEqual((levels[3]['jp'], levels[3]['assignment']), ('', 'JP level density'))
+        self.assertAlmostEqual(levels[3]['spin'], 3.0)
+
+        branching = table['branching']
+        level3 = branching[branching['level'] == 3]
+        np.testing.assert_array_equal(level3['final'], [1, 0])
+        np.testing.assert_allclose(level3['ratio'], [72.54, 27.46])
+        with self.assertRaises(KeyError):
+            self.listing.discrete_levels(92, 143)
+
+    def test_level_density(self):
+        """测试按宇称的能级密度表"""
+        table = self.listing.level_density(91, 142, parity=1)
+        self.assertEqual(table.mass, 233)
+        np.testing.assert_allclose(table.spins, np.arange(0.5, 9.0))
+        self.assertEqual(table.rho.shape, (len(table.ex), 9))
+        self.assertAlmostEqual(table.ex[0], 0.25)
+        self.assertAlmostEqual(table.total[0], 33.58)
+        self.assertAlmostEqual(table.rho[0, 0], 2.021)
+        self.assertTrue(np.all(np.isnan(table.a)))
+
+        negative = self.listing.level_density(91, 142, parity=-1)
+        self.assertAlmostEqual(negative.total[0], 37.55)
+
+        # 费米气体模型的位垒：宇称无关，有 a、sigma 和集体增强因子
+        barrier = self.listing.level_density(91, 143, parity=-1, barrier=3)
+        self.assertEqual(barrier.parity, 0)
+        self.assertAlmostEqual(barrier.a[0], 14.187)
+        self.assertAlmostEqual(barrier.total[0], 254.4)
+        self.assertEqual(sorted(barrier.extra), ['Kcoll', 'Krot', 'Kvib'])
+
+        self.assertEqual(len(self.listing.level_densities()), 13)
+
+    def test_from_results(self):
+        """测试由计算结果的标准输出建立清单（按 result_id 缓存）"""
+        results = {'result_id': 'listing-test', 'stdout': (TEST_DIR / "out").read_text(errors='replace')}
+        listing = get_output_listing(results)
+        self.assertIs(get_output_listing(results), listing)
+        np.testing.assert_allclose(listing.level_density(91, 143).total,
+                                   self.listing.level_density(91, 143).total)
+        self.assertEqual(len(get_output_listing({'result_id': 'empty'})), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
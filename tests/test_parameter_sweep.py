@@ -0,0 +1,152 @@
+"""
+参数扫描单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+import threading
+import time
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.parameter_sweep import (ParameterSweep, Range, full_factorial, latin_hypercube,
+                                  random_design, point_key, read_channels)
+
+TEST_DATA_DIR = Path(__file__).parent.parent / 'test_talys'
+BASE_PARAMETERS = {'projectile': 'n', 'element': 'Pa', 'mass': 233, 'energy': 1.0}
+
+
+class TestDesigns(unittest.TestCase):
+    """设计生成测试类"""
+
+    def test_full_factorial(self):
+        """测试全因子设计"""
+        points = list(full_factorial({'ldmodel': [1, 2, 3], 'strength': [1, 9]}))
+        self.assertEqual(len(points), 6)
+        self.assertEqual(points[-1], {'ldmodel': 3, 'strength': 9})
+        with self.assertRaises(ValueError):
+            list(full_factorial({'rvadjust': Range(0.9, 1.1)}))
+
+    def test_latin_hypercube(self):
+        """测试拉丁超立方设计的分层性"""
+        points = list(latin_hypercube({'rvadjust': Range(0.9, 1.1), 'ldmodel': [1, 2, 3, 4]},
+                                      n_points=8, seed=1))
+        self.assertEqual(len(points), 8)
+        values = np.sort([point['rvadjust'] for point in points])
+        # 每个分层恰好一个样本
+        np.testing.assert_array_equal(((values - 0.9) / 0.2 * 8).astype(int), np.arange(8))
+        counts = np.bincount([point['ldmodel'] for point in points], minlength=5)[1:]
+        np.testing.assert_array_equal(counts, [2, 2, 2, 2])
+
+    def test_random_design(self):
+        """测试随机设计可复现且对数范围正确"""
+        space = {'gnorm': Range(0.1, 10.0, log=True)}
+        first = list(random_design(space, 20, seed=3))
+        self.assertEqual(first, list(random_design(space, 20, seed=3)))
+        self.assertTrue(all(0.1 <= point['gnorm'] <= 10.0 for point in first))
+
+    def test_point_key(self):
+        """测试参数键与顺序和数值写法无关"""
+        self.assertEqual(point_key({**BASE_PARAMETERS, 'ldmodel': 1, 'channels': True}),
+                         point_key({'channels': True, 'ldmodel': 1.0, **BASE_PARAMETERS}))
+        self.assertNotEqual(point_key({**BASE_PARAMETERS, 'ldmodel': 1}),
+                            point_key({**BASE_PARAMETERS, 'ldmodel': 2}))
+
+
+class TestParameterSweep(unittest.TestCase):
+    """扫描引擎测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="talys_test_sweep_"))
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def fake_runner(self, parameters, channels):
+        """用参数构造确定的截面曲线，代替TALYS计算"""
+        with self.lock:
+            self.calls.append(parameters)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            if parameters['ldmodel'] == 6:
+                raise RuntimeError("模拟计算失败")
+            energy = np.array([1.0, 1.5, 2.0]) if parameters['strength'] == 1 else np.array([1.0, 2.0])
+            return {'total.tot': (energy, energy * parameters['ldmodel'] + parameters['strength'])}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def make_sweep(self):
+        return ParameterSweep(BASE_PARAMETERS, ['total.tot', 'nn.L01'], max_workers=2,
+                              cache_dir=self.cache_dir, runner=self.fake_runner)
+
+    def test_run_and_aggregate(self):
+        """测试运行、汇总和失败记录"""
+        design = full_factorial({'ldmodel': [1, 2, 6], 'strength': [1, 2]})
+        result = self.make_sweep().run(design)
+
+        self.assertEqual(result.values.shape, (6, 2, 3))
+        np.testing.assert_array_equal(result.energies, [1.0, 1.5, 2.0])
+        np.testing.assert_array_equal(result.channel('total.tot')[1], [3.0, np.nan, 4.0])
+        self.assertTrue(np.isnan(result.channel('nn.L01')).all())
+        self.assertEqual(len(result.failures), 2)
+        self.assertLessEqual(self.max_active, 2)
+
+    def test_dedupe(self):
+        """测试重复参数点和已缓存参数点不再计算"""
+        design = [{'ldmodel': 1, 'strength': 1}, {'ldmodel': 1.0, 'strength': 1}, {'ldmodel': 2, 'strength': 1}]
+        result = self.make_sweep().run(design)
+        self.assertEqual(len(self.calls), 2)
+        np.testing.assert_array_equal(result.values[0], result.values[1])
+
+        # 新的扫描对象从磁盘缓存复用结果
+        again = self.make_sweep().run(design)
+        self.assertEqual(len(self.calls), 2)
+        np.testing.assert_array_equal(again.values, result.values)
+
+    def test_dedupe_in_flight(self):
+        """测试与在途计算相同的参数点等该计算完成后再结束，并一起记为失败"""
+        returned = []
+
+        def slow_runner(parameters, channels):
+            time.sleep(0.05)
+            try:
+                return self.fake_runner(parameters, channels)
+            finally:
+                returned.append(parameters)
+
+        progress = []
+        sweep = ParameterSweep(BASE_PARAMETERS, ['total.tot'], max_workers=2, use_cache=False,
+                               runner=slow_runner)
+        design = [{'ldmodel': 6, 'strength': 1}, {'ldmodel': 6.0, 'strength': 1}]
+        result = sweep.run(design, lambda count, point: progress.append((count, len(returned))))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(progress, [(1, 1), (2, 1)])
+        self.assertEqual(set(result.keys), set(result.failures))
+        self.assertTrue(np.isnan(result.values).all())
+
+    def test_read_channels(self):
+        """测试从输出目录读取反应道"""
+        data = read_channels(TEST_DATA_DIR, ['nn.L01', 'missing.tot'])
+        self.assertEqual(list(data), ['nn.L01'])
+        energy, value = data['nn.L01']
+        self.assertEqual(energy.shape, (6,))
+        self.assertEqual(value.shape, (6,))
+
+
+if __name__ == '__main__':
+    unittest.main()
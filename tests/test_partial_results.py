@@ -0,0 +1,192 @@
+"""
+不完整计算结果单元测试
+"""
+
+import stat
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from config.settings import Settings
+from core.partial_results import (merge_results, missing_energies, parse_reaction_summaries,
+                                  requested_energies, salvage_results, summaries_to_results)
+from core.fission_spectra import PromptFissionSpectra
+from core.talys_interface import TalysInterface, TalysCalculationError
+from core.workdir_pool import WorkDirPool
+
+TEST_DIR = Path(__file__).parent.parent / "test_talys"
+ENERGIES = [1.0, 1.2, 1.4, 1.6, 1.8, 2.0]
+PARAMETERS = {'projectile': 'n', 'element': 'Pa', 'mass': 233,
+              'energy_mode': 'range', 'energy_min': 1, 'energy_max': 2, 'energy_step': 0.2}
+
+# 模拟TALYS：首次计算输出前3个能量后挂起，续算时输出能量列表文件中的能量后正常结束
+FAKE_TALYS = """
+import re, sys, time
+deck = sys.stdin.read()
+text = open({out!r}).read()
+blocks = re.split(r'(?= #+ RESULTS FOR E=)', text)
+if 'resume_energies' in deck:
+    energies = [float(line) for line in open('resume_energies')]
+    for block in blocks[1:]:
+        energy = float(re.search(r'RESULTS FOR E=\\s*(\\S+)', block).group(1))
+        if any(abs(energy - e) < 1e-6 for e in energies):
+            sys.stdout.write(block)
+else:
+    sys.stdout.write(''.join(blocks[:4]))
+    sys.stdout.write(blocks[4][:200])
+    sys.stdout.flush()
+    time.sleep(30)
+"""
+
+
+def read_output() -> str:
+    with open(TEST_DIR / "out", encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+def truncated_output() -> str:
+    """在第4个能量的反应总结中间截断的标准输出"""
+    text = read_output()
+    start = text.index("REACTION SUMMARY FOR E=   1.60000")
+    return text[:start + 400]
+
+
+class TestPartialResults(unittest.TestCase):
+    """不完整计算结果测试类"""
+
+    def test_parse_reaction_summaries(self):
+        """测试解析完整输出中的反应总结"""
+        summaries = parse_reaction_summaries(read_output())
+        self.assertEqual(sorted(summaries), ENERGIES)
+        self.assertAlmostEqual(summaries[1.0]['total'], 5496.05)
+        self.assertAlmostEqual(summaries[1.0]['elastic'], 3073.16)
+        self.assertAlmostEqual(summaries[1.0]['residual'][(91, 233)], 9825.23)
+
+        # 被截断的块不计入
+        self.assertEqual(sorted(parse_reaction_summaries(truncated_output())), ENERGIES[:3])
+
+    def test_requested_energies(self):
+        """测试确定要求的入射能量"""
+        np.testing.assert_allclose(requested_energies(PARAMETERS), ENERGIES)
+        np.testing.assert_allclose(requested_energies({'energy': '1 2 0.2'}), ENERGIES)
+        np.testing.assert_allclose(requested_energies({'energy': 14.0}), [14.0])
+        np.testing.assert_allclose(requested_energies({'energy': 14.0}, TEST_DIR), ENERGIES)
+        self.assertEqual(requested_energies({'energy': 'my_energies'}).size, 0)
+
+    def test_salvage_and_merge(self):
+        """测试取回已完成能量的结果并与续算结果合并"""
+        file_results = {'reaction_channels': {'nn.L01': {'energy': ENERGIES, 'cross_section': [1.0] * 6}}}
+        partial = salvage_results(file_results, truncated_output(), ENERGIES, 'timeout')
+        self.assertEqual(partial['partial']['reason'], 'timeout')
+        self.assertEqual(partial['partial']['completed'], ENERGIES[:3])
+        self.assertEqual(missing_energies(partial), ENERGIES[3:])
+        self.assertEqual(partial['total_cross_section']['energy'], ENERGIES[:3])
+        self.assertEqual(partial['reaction_channels']['nn.L01']['energy'], ENERGIES[:3])
+        self.assertIsNone(salvage_results({}, "no summaries", ENERGIES, 'failed'))
+
+        summaries = parse_reaction_summaries(read_output())
+        resumed = summaries_to_results({e: summaries[e] for e in ENERGIES[3:]})
+        resumed['result_id'] = 'resumed'
+        merged = merge_results(dict(partial, result_id='first'), resumed)
+        self.assertNotIn('partial', merged)
+        self.assertEqual(merged['resumed_from'], 'first')
+        self.assertEqual(merged['result_id'], 'resumed')
+        np.testing.assert_allclose(merged['total_cross_section']['energy'], ENERGIES)
+        np.testing.assert_allclose(merged['total_cross_section']['cross_section'],
+                                   [summaries[e]['total'] for e in ENERGIES])
+        np.testing.assert_allclose(merged['residual_production']['rp091233']['energy'], ENERGIES)
+
+
+    def test_merge_file_sections(self):
+        """测试续算后保留中断前的能谱、输出文件列表和裂变中子谱"""
+        pfns = PromptFissionSpectra.from_directory(TEST_DIR)
+        file_results = {'spectra': {'nspec0001.000.tot': {'energy': [0.1], 'spectrum': [1.0]}},
+                        'output_files': ['total.tot', 'nspec0001.000.tot'], 'pfns': pfns}
+        partial = salvage_results(file_results, truncated_output(), ENERGIES, 'timeout')
+        np.testing.assert_allclose(partial['pfns'].e_incident, ENERGIES[:3])
+
+        resumed = {'spectra': {'nspec0002.000.tot': {'energy': [0.1], 'spectrum': [2.0]}},
+                   'output_files': ['total.tot', 'nspec0002.000.tot'], 'pfns': pfns.select(ENERGIES[3:]),
+                   'stdout': ''}
+        merged = merge_results(partial, resumed)
+        self.assertEqual(sorted(merged['spectra']), ['nspec0001.000.tot', 'nspec0002.000.tot'])
+        self.assertEqual(merged['output_files'], ['nspec0001.000.tot', 'nspec0002.000.tot', 'total.tot'])
+        np.testing.assert_allclose(merged['pfns'].e_incident, ENERGIES)
+        np.testing.assert_array_equal(merged['pfns'].data, pfns.data)
+        self.assertNotIn('partial', merged)
+
+
+class TestTimeoutSalvage(unittest.TestCase):
+    """超时后取回结果并续算的测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="talys_test_partial_"))
+        self.executable = self.temp_dir / "fake_talys"
+        self.executable.write_text(f"#!{sys.executable}\n" +
+                                   FAKE_TALYS.format(out=str((TEST_DIR / "out").resolve())))
+        self.executable.chmod(self.executable.stat().st_mode | stat.S_IEXEC)
+        self.pool = WorkDirPool(root=self.temp_dir, size=0)
+        self.timeout = Settings.TALYS_TIMEOUT
+        Settings.TALYS_TIMEOUT = 2
+
+    def tearDown(self):
+        """测试后清理"""
+        Settings.TALYS_TIMEOUT = self.timeout
+        self.pool.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_timeout_and_resume(self):
+        """测试超时后取回3个能量，续算其余3个能量"""
+        talys = TalysInterface(str(self.executable), workdir_pool=self.pool)
+        with self.assertRaises(TalysCalculationError) as context:
+            talys.run_calculation(PARAMETERS)
+        talys.cleanup_temp_directory()
+
+        partial = context.exception.partial_results
+        self.assertIsNotNone(partial)
+        self.assertEqual(partial['partial']['completed'], ENERGIES[:3])
+        # 资源占用来自本次计算（监控在取回结果之前停止）
+        self.assertEqual(partial['resources']['wall_time_s'], talys.last_resource_usage['wall_time_s'])
+        self.assertGreater(partial['resources']['output_bytes'], 0)
+        self.assertGreater(partial['resources']['wall_time_s'], 1.5)
+
+        results = talys.resume_calculation(PARAMETERS, partial)
+        talys.cleanup_temp_directory()
+        self.assertNotIn('partial', results)
+        self.assertEqual(results['resumed_from'], partial['result_id'])
+        np.testing.assert_allclose(results['total_cross_section']['energy'], ENERGIES)
+
+
+    def test_salvage_skips_broken_group(self):
+        """测试某一组输出文件无法解析时，其余各组的结果仍然取回"""
+        workdir = self.temp_dir / "work"
+        shutil.copytree(TEST_DIR, workdir)
+        (workdir / "wkb1").write_text("truncated\n")  # 写了一半、无法确定核素的位垒文件
+
+        talys = TalysInterface(str(self.executable), workdir_pool=self.pool)
+        talys.temp_dir = workdir
+        try:
+            with self.assertRaises(ValueError):
+                talys.parse_output_files()
+            results = talys.salvage_partial_results(PARAMETERS, (TEST_DIR / "out").read_text(errors='replace'),
+                                                    'timeout', energies=ENERGIES)
+        finally:
+            # 测试目录不属于工作目录池，不能交给 cleanup_temp_directory
+            talys.temp_dir = None
+
+        self.assertNotIn('fission_barriers', results)
+        self.assertIn('nn.L01', results['reaction_channels'])
+        self.assertIn('pfns', results)
+        self.assertIn('wkb1', results['output_files'])
+
+
+if __name__ == '__main__':
+    unittest.main()
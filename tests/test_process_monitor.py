@@ -0,0 +1,106 @@
+"""
+进程资源监控单元测试
+"""
+
+import os
+import stat
+import subprocess
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from config.settings import Settings
+from core.process_monitor import (ProcessMonitor, ResourceLimits, directory_size,
+                                  format_resource_usage, read_proc_sample)
+from core.talys_interface import TalysInterface
+from core.workdir_pool import WorkDirPool
+
+HAS_PROC = Path("/proc/self/status").exists()
+
+# 分配约64MB内存、写出1MB输出文件后退出的子进程
+CHILD_SCRIPT = """
+import sys, time
+data = bytearray(64 * 1024 * 1024)
+for i in range(0, len(data), 4096):
+    data[i] = 1
+with open('output.dat', 'wb') as f:
+    f.write(b'x' * 1024 * 1024)
+time.sleep(0.3)
+"""
+
+
+@unittest.skipUnless(HAS_PROC, "需要/proc文件系统")
+class TestProcessMonitor(unittest.TestCase):
+    """进程资源监控测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.workdir = Path(tempfile.mkdtemp(prefix="talys_test_monitor_"))
+        self.interval = Settings.PROCESS_SAMPLE_INTERVAL
+        Settings.PROCESS_SAMPLE_INTERVAL = 0.05
+
+    def tearDown(self):
+        """测试后清理"""
+        Settings.PROCESS_SAMPLE_INTERVAL = self.interval
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def test_read_proc_sample(self):
+        """测试读取当前进程的资源占用"""
+        sample = read_proc_sample(os.getpid())
+        self.assertGreater(sample['rss_bytes'], 0)
+        self.assertGreaterEqual(sample['peak_rss_bytes'], sample['rss_bytes'])
+        self.assertGreaterEqual(sample['cpu_user'], 0.0)
+        self.assertIsNone(read_proc_sample(2 ** 22 + 1))
+
+    def test_monitor_child(self):
+        """测试采样子进程的内存和输出"""
+        updates = []
+        process = subprocess.Popen([sys.executable, '-c', CHILD_SCRIPT], cwd=self.workdir)
+        monitor = ProcessMonitor(process.pid, self.workdir, callback=updates.append).start()
+        process.wait()
+        metrics = monitor.stop()
+
+        self.assertGreater(metrics['samples'], 1)
+        self.assertGreater(metrics['peak_rss_mb'], 60)
+        self.assertEqual(metrics['output_bytes'], 1024 * 1024)
+        self.assertEqual(directory_size(self.workdir), 1024 * 1024)
+        self.assertTrue(updates)
+        self.assertIn("峰值", format_resource_usage(metrics))
+
+    def test_memory_limit(self):
+        """测试地址空间上限使子进程分配内存失败"""
+        limits = ResourceLimits(memory_mb=32, nice=1)
+        self.assertTrue(limits.active)
+        process = subprocess.run([sys.executable, '-c', CHILD_SCRIPT], cwd=self.workdir,
+                                 capture_output=True, preexec_fn=limits.preexec_fn())
+        self.assertNotEqual(process.returncode, 0)
+        self.assertIsNone(ResourceLimits().preexec_fn())
+
+    def test_talys_interface_records_resources(self):
+        """测试计算结果中记录资源指标"""
+        executable = self.workdir / "fake_talys"
+        executable.write_text(f"#!{sys.executable}\nimport sys\nsys.stdin.read()\n{CHILD_SCRIPT}")
+        executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+
+        pool = WorkDirPool(root=self.workdir, size=0)
+        talys = TalysInterface(str(executable), workdir_pool=pool,
+                               resource_limits=ResourceLimits(cpu_affinity=[0]))
+        try:
+            results = talys.run_calculation({'projectile': 'n', 'element': 'H', 'mass': 1, 'energy': '1.0'})
+        finally:
+            talys.cleanup_temp_directory()
+            pool.shutdown()
+
+        resources = results['resources']
+        self.assertGreater(resources['peak_rss_mb'], 60)
+        self.assertGreaterEqual(resources['output_bytes'], 1024 * 1024)
+        self.assertEqual(resources['limits']['cpu_affinity'], [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+"""
+项目文件单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+import zipfile
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.fission_barriers import FissionBarrierDataset
+from core.fission_spectra import PromptFissionSpectra
+from core.project_file import Project, ProjectFileError, LazyRunResults
+from core.result_manager import ResultManager
+
+TEST_DIR = Path(__file__).parent.parent / 'test_talys'
+
+
+def make_results(scale: float = 1.0) -> dict:
+    """构造一次计算的结果"""
+    energy = np.linspace(1.0, 2.0, 6)
+    return {
+        'total_cross_section': {'energy': energy.tolist(), 'cross_section': (scale * energy).tolist()},
+        'reaction_channels': {
+            'nn.L01': {'energy': energy.tolist(), 'cross_section': (scale * energy ** 2).tolist(),
+                       'header': {'reaction': {'type': '(n,n_1)', 'ENDF_MF': 3, 'ENDF_MT': 51}}},
+        },
+        'output_files': ['total.tot', 'nn.L01'],
+        'calculation_time': 1.25,
+        'stdout': 'TALYS finished',
+        'monitor': object(),
+    }
+
+
+class TestProjectFile(unittest.TestCase):
+    """项目文件测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="talys_test_project_"))
+        self.path = self.temp_dir / "test.tvproj"
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """测试保存和打开项目"""
+        project = Project({'parameters': {'element': 'Pa', 'mass': 233}}, "projectile n\n")
+        run_id = project.add_run(make_results(), label="基准")
+        project.save(self.path)
+        project.close()
+
+        opened = Project.open(self.path)
+        try:
+            self.assertEqual(opened.parameters['parameters']['mass'], 233)
+            self.assertEqual(opened.input_deck, "projectile n\n")
+            self.assertEqual(opened.runs[run_id].label, "基准")
+            self.assertEqual(opened.runs[run_id].summary['calculation_time'], 1.25)
+
+            results = opened.run_results(run_id)
+            self.assertIsInstance(results, LazyRunResults)
+            # 无法序列化的对象不保存
+            self.assertNotIn('monitor', results)
+            self.assertEqual(results.loaded_sections, [])
+            # 反应道列表取自索引，不读取结果
+            self.assertEqual(opened.channel_names(), ['total.tot', 'nn.L01'])
+            self.assertEqual(results.loaded_sections, [])
+
+            channel = results['reaction_channels']['nn.L01']
+            np.testing.assert_allclose(channel['cross_section'], np.linspace(1.0, 2.0, 6) ** 2)
+            self.assertEqual(channel['header']['reaction']['ENDF_MT'], 51)
+            self.assertEqual(results.loaded_sections, ['reaction_channels'])
+            self.assertEqual(results['output_files'], ['total.tot', 'nn.L01'])
+            self.assertEqual(results.get('stdout'), 'TALYS finished')
+        finally:
+            opened.close()
+
+    def test_fission_datasets(self):
+        """测试裂变中子谱和裂变位垒以数组形式保存"""
+        results = make_results()
+        results['pfns'] = PromptFissionSpectra.from_directory(TEST_DIR)
+        results['fission_barriers'] = FissionBarrierDataset.from_directory(TEST_DIR)
+        project = Project()
+        run_id = project.add_run(results)
+        project.save(self.path)
+        project.close()
+
+        opened = Project.open(self.path)
+        try:
+            loaded = opened.run_results(run_id)
+            pfns = loaded['pfns']
+            self.assertIsInstance(pfns, PromptFissionSpectra)
+            np.testing.assert_array_equal(pfns.data, results['pfns'].data)
+            np.testing.assert_array_equal(pfns.e_incident, results['pfns'].e_incident)
+            self.assertEqual(pfns.column_names, results['pfns'].column_names)
+            self.assertEqual(pfns.nuclide, 'Pa233')
+
+            barriers = loaded['fission_barriers']
+            self.assertIsInstance(barriers, FissionBarrierDataset)
+            np.testing.assert_array_equal(barriers.extrema, results['fission_barriers'].extrema)
+            np.testing.assert_array_equal(barriers.transmissions, results['fission_barriers'].transmissions)
+            np.testing.assert_array_equal(barriers.nuclei, results['fission_barriers'].nuclei)
+        finally:
+            opened.close()
+
+    def test_resave_copies_runs(self):
+        """测试再次保存时复制已有计算且不读取其数据"""
+        project = Project()
+        first = project.add_run(make_results(1.0))
+        project.save(self.path)
+
+        second = project.add_run(make_results(2.0))
+        project.save()
+        self.assertEqual(project.run_results(first).loaded_sections, [])
+
+        with zipfile.ZipFile(self.path) as archive:
+            members = archive.namelist()
+        self.assertEqual(len([m for m in members if m.endswith('.bin')]), 4)
+
+        opened = Project.open(self.path)
+        try:
+            self.assertEqual(list(opened.runs), [first, second])
+            np.testing.assert_allclose(opened.run_results(second)['total_cross_section']['cross_section'],
+                                       2.0 * np.linspace(1.0, 2.0, 6))
+        finally:
+            opened.close()
+            project.close()
+
+    def test_remove_run(self):
+        """测试删除计算"""
+        project = Project()
+        run_id = project.add_run(make_results())
+        project.remove_run(run_id)
+        project.save(self.path)
+        project.close()
+
+        opened = Project.open(self.path)
+        self.assertEqual(len(opened.runs), 0)
+        opened.close()
+
+    def test_release_handles(self):
+        """测试删除计算和关闭项目时释放结果管理器中的结果及转存文件"""
+        manager = ResultManager(budget_mb=0, spill_dir=self.temp_dir)
+        project = Project()
+        first = project.add_run(manager.add(make_results()))
+        second = project.add_run(manager.add(make_results(2.0)))
+        manager.set_budget(0)
+        spill_files = [manager.spill_dir / f"{run_id}.bin" for run_id in (first, second)]
+        self.assertTrue(all(path.exists() for path in spill_files))
+
+        project.remove_run(first)
+        self.assertFalse(spill_files[0].exists())
+        with self.assertRaises(KeyError):
+            manager.get(first)
+
+        project.save(self.path)
+        project.close()
+        self.assertFalse(spill_files[1].exists())
+        with self.assertRaises(KeyError):
+            manager.get(second)
+        manager.shutdown()
+
+    def test_failed_save(self):
+        """测试保存失败时删除临时文件，原文件保持不变"""
+        project = Project()
+        project.add_run(make_results())
+        project.save(self.path)
+        saved = self.path.read_bytes()
+        project.close()
+
+        # 项目文件已关闭，复制已保存的计算失败
+        with self.assertRaises(ProjectFileError):
+            project.save(self.path)
+        self.assertFalse(self.path.with_name(self.path.name + ".tmp").exists())
+        self.assertEqual(self.path.read_bytes(), saved)
+
+    def test_invalid_file(self):
+        """测试打开无效文件"""
+        self.path.write_text("not a project")
+        with self.assertRaises(ProjectFileError):
+            Project.open(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+公共网格重采样单元测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+from types import MappingProxyType
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.resampling import (ResamplingService, batched_interp, channels_hash, grid_hash, resample_stack,
+                             result_id, stack_channels)
+from core.talys_interface import TalysInterface
+
+TEST_DIR = Path(__file__).parent.parent / "test_talys"
+
+
+class TestResampling(unittest.TestCase):
+    """重采样测试类"""
+
+    def random_stack(self, rows: int, seed: int = 3):
+        """生成不同网格的随机曲线及逐行 np.interp 的参考结果"""
+        rng = np.random.default_rng(seed)
+        grid = np.linspace(-1.0, 11.0, 97)
+        channels = []
+        expected = []
+        for _ in range(rows):
+            x = np.unique(rng.uniform(0.0, 10.0, rng.integers(1, 16)))
+            y = rng.normal(size=x.size)
+            channels.append((x, y))
+            reference = np.interp(grid, x, y)
+            reference[(grid < x[0]) | (grid > x[-1])] = np.nan
+            expected.append(reference)
+        return grid, channels, np.array(expected)
+
+    def test_batched_interp(self):
+        """测试批量插值与逐行 np.interp 一致"""
+        grid, channels, expected = self.random_stack(20)
+        xp, fp = stack_channels(channels)
+        np.testing.assert_allclose(batched_interp(grid, xp, fp), expected)
+
+    def test_loglog(self):
+        """测试双对数插值对幂律精确，端点为零的区间退回线性"""
+        x = np.array([1.0, 10.0, 100.0])
+        xp, fp = stack_channels([(x, x ** -2), (x, np.array([0.0, 1.0, 2.0]))])
+        grid = np.array([3.0, 30.0])
+        result = resample_stack(xp, fp, grid, 'loglog')
+        np.testing.assert_allclose(result[0], grid ** -2)
+        np.testing.assert_allclose(result[1], [2.0 / 9.0, 3.0 ** np.log10(2.0)])
+
+    def test_pchip(self):
+        """测试PCHIP插值与逐条计算一致，且不超出数据范围"""
+        from scipy.interpolate import PchipInterpolator
+
+        x = np.linspace(1.0, 5.0, 9)
+        curves = [(x, np.tanh(x - 3.0)), (x, x ** 2), (x[2:], np.sqrt(x[2:]))]
+        grid = np.linspace(0.5, 5.5, 41)
+        xp, fp = stack_channels(curves)
+        result = resample_stack(xp, fp, grid, 'pchip')
+        for row, (cx, cy) in enumerate(curves):
+            np.testing.assert_allclose(result[row], PchipInterpolator(cx, cy, extrapolate=False)(grid))
+        self.assertTrue(np.isnan(result[:, 0]).all())
+
+        with self.assertRaises(ValueError):
+            resample_stack(xp, fp, grid, 'cubic')
+
+    def test_service_cache(self):
+        """测试重采样结果按 (结果ID, 网格) 缓存"""
+        service = ResamplingService(max_entries=2)
+        grid, channels, expected = self.random_stack(5)
+        named = {f"c{i}": channel for i, channel in enumerate(channels)}
+
+        first = service.resample('run1', named, grid)
+        np.testing.assert_allclose(first, expected)
+        self.assertIs(service.resample('run1', named, grid.copy()), first)
+        self.assertEqual(service.hits, 1)
+        self.assertFalse(first.flags.writeable)
+
+        # 不同网格是不同的缓存项，超过上限时淘汰最早的
+        service.resample('run1', named, grid[::2])
+        service.resample('run2', named, grid)
+        self.assertIsNot(service.resample('run1', named, grid), first)
+
+        service.invalidate('run1')
+        self.assertNotEqual(grid_hash(grid), grid_hash(grid[::2]))
+        self.assertEqual(channels_hash(named), channels_hash(dict(named)))
+        self.assertNotEqual(channels_hash(named), channels_hash({'c0': named['c1']}))
+
+    def test_result_id(self):
+        """测试读取结果ID，没有ID时报错而不修改结果"""
+        self.assertEqual(result_id(MappingProxyType({'result_id': 'run1'})), 'run1')
+        results = {}
+        with self.assertRaises(KeyError):
+            result_id(results)
+        self.assertEqual(results, {})
+
+    def test_resample_results(self):
+        """测试重采样计算结果中的能级反应道"""
+        interface = TalysInterface()
+        interface.temp_dir = TEST_DIR
+        try:
+            results = interface.parse_output_files()
+        finally:
+            # 测试数据目录不属于工作目录池，不能交给 cleanup_temp_directory
+            interface.temp_dir = None
+        results['result_id'] = 'test'
+
+        grid = np.linspace(1.0, 2.0, 11)
+        names, stack = ResamplingService().resample_results(results, grid, names=['nn.L03', 'nn.L01'])
+        self.assertEqual(names, ['nn.L03', 'nn.L01'])
+        self.assertEqual(stack.shape, (2, 11))
+        self.assertAlmostEqual(stack[0, 0], 7046.06)
+        self.assertAlmostEqual(stack[1, -1], 324.421)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+计算结果管理单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import core.result_manager as result_manager
+from core.fission_barriers import FissionBarrierDataset
+from core.fission_spectra import PromptFissionSpectra
+from core.result_manager import ResultHandle, ResultManager, compact, nbytes
+
+TEST_DIR = Path(__file__).parent.parent / 'test_talys'
+
+
+def make_results(result_id: str, points: int = 1000, stdout: str = "TALYS finished") -> dict:
+    """构造一次计算的结果"""
+    energy = np.linspace(1.0, 20.0, points)
+    return {
+        'result_id': result_id,
+        'total_cross_section': {'energy': energy.tolist(), 'cross_section': (2.0 * energy).tolist()},
+        'reaction_channels': {'nn.L01': {'energy': energy, 'cross_section': energy ** 2,
+                                         'header': {'reaction': {'type': '(n,n_1)'}}}},
+        'output_files': ['total.tot', 'nn.L01'],
+        'calculation_time': 1.5,
+        'stdout': stdout,
+    }
+
+
+class TestResultManager(unittest.TestCase):
+    """计算结果管理测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="talys_test_results_"))
+        # 每个结果约40KB，预算只够放下一个
+        self.manager = ResultManager(budget_mb=0.05, spill_dir=self.temp_dir)
+
+    def tearDown(self):
+        """测试后清理"""
+        self.manager.shutdown()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_compact(self):
+        """测试数值列表转换为数组"""
+        data = compact({'a': [1, 2.5], 'b': ['x', 'y'], 'c': [True, False]})
+        self.assertIsInstance(data['a'], np.ndarray)
+        self.assertEqual(data['b'], ['x', 'y'])
+        self.assertEqual(data['c'], [True, False])
+        self.assertEqual(nbytes(data), 16 + 2)
+
+    def test_spill_oldest(self):
+        """测试超出预算时转存最久未查看的结果"""
+        first = self.manager.add(make_results('first'))
+        self.assertIsInstance(first, ResultHandle)
+        self.assertFalse(first.spilled)
+
+        second = self.manager.add(make_results('second'))
+        self.assertTrue(first.spilled)
+        self.assertFalse(second.spilled)
+        self.assertLessEqual(self.manager.memory_usage, self.manager.budget)
+        self.assertTrue((self.manager.spill_dir / "first.bin").exists())
+
+        # 转存后的数据通过只读内存映射访问，内容不变
+        channel = first['reaction_channels']['nn.L01']
+        self.assertIsInstance(channel['cross_section'].base, np.memmap)
+        self.assertFalse(channel['cross_section'].flags.writeable)
+        np.testing.assert_array_equal(channel['cross_section'], np.linspace(1.0, 20.0, 1000) ** 2)
+        self.assertEqual(channel['header']['reaction']['type'], '(n,n_1)')
+        self.assertEqual(first['output_files'], ['total.tot', 'nn.L01'])
+        self.assertEqual(set(first), set(make_results('x')))
+
+        # 查看 second 之后再加入新结果，second 保留在内存中
+        third = self.manager.add(make_results('third'))
+        self.assertTrue(second.spilled)
+        self.assertFalse(third.spilled)
+        self.assertEqual(self.manager.spill_count, 2)
+
+    def test_long_string_spilled(self):
+        """测试长字符串也转存到磁盘"""
+        stdout = "界面" * result_manager.SPILL_STRING_BYTES
+        handle = self.manager.add(make_results('long', points=10, stdout=stdout))
+        self.manager.set_budget(0)
+        self.assertTrue(handle.spilled)
+        self.assertEqual(self.manager.memory_usage, 0)
+        self.assertEqual(handle['stdout'], stdout)
+        self.assertEqual(handle.get('calculation_time'), 1.5)
+
+    def test_fission_datasets(self):
+        """测试裂变中子谱和裂变位垒计入预算，并随结果转存"""
+        results = make_results('fission', points=10)
+        pfns = results['pfns'] = PromptFissionSpectra.from_directory(TEST_DIR)
+        barriers = results['fission_barriers'] = FissionBarrierDataset.from_directory(TEST_DIR)
+        self.assertGreaterEqual(nbytes(results), pfns.data.nbytes + barriers.extrema.nbytes)
+
+        handle = self.manager.add(results)
+        self.manager.set_budget(0)
+        self.assertTrue(handle.spilled)
+        self.assertEqual(self.manager.memory_usage, 0)
+
+        spilled = handle['pfns']
+        self.assertIsInstance(spilled, PromptFissionSpectra)
+        self.assertIsInstance(spilled.data.base, np.memmap)
+        np.testing.assert_array_equal(spilled.data, pfns.data)
+        self.assertEqual(spilled.column_names, pfns.column_names)
+        np.testing.assert_array_equal(handle['fission_barriers'].extrema, barriers.extrema)
+        np.testing.assert_array_equal(handle['fission_barriers'].transmission_curves(91, 234)[1],
+                                      barriers.transmission_curves(91, 234)[1])
+
+    def test_assign_id(self):
+        """测试登记没有ID的结果时分配ID，不修改调用者的字典"""
+        results = make_results('unused', points=10)
+        del results['result_id']
+        handle = self.manager.add(results)
+        self.assertNotIn('result_id', results)
+        self.assertEqual(handle['result_id'], handle.result_id)
+        self.assertEqual(self.manager.get(handle.result_id).result_id, handle.result_id)
+
+    def test_release_and_shutdown(self):
+        """测试释放结果和删除转存目录"""
+        self.manager.add(make_results('first'))
+        self.manager.add(make_results('second'))
+        path = self.manager.spill_dir / "first.bin"
+        self.assertTrue(path.exists())
+
+        self.manager.release('first')
+        self.assertFalse(path.exists())
+        with self.assertRaises(KeyError):
+            self.manager.get('first')
+        self.assertEqual(self.manager.get('second').result_id, 'second')
+
+        self.manager.shutdown()
+        self.assertFalse(self.manager.spill_dir.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+计算结果比较单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.resampling import get_resampling_service
+from core.run_comparison import RunComparison, channel_key, format_channel_key, load_run_channels
+
+TEST_DIR = Path(__file__).parent.parent / "test_talys"
+
+
+class TestRunComparison(unittest.TestCase):
+    """计算结果比较测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.channels = load_run_channels(TEST_DIR)
+
+    def test_load_channels(self):
+        """测试按YANDF头部读取截面反应道"""
+        self.assertEqual(len(self.channels), 73)
+        energy, value, name = self.channels[('(n,n_3)', 3, '')]
+        self.assertEqual(name, 'nn.L03')
+        np.testing.assert_allclose(energy, [1.0, 1.2, 1.4, 1.6, 1.8, 2.0])
+        self.assertAlmostEqual(value[0], 7046.06)
+
+    def test_channel_key(self):
+        """测试反应道键"""
+        header = {'reaction': {'type': '(n,x)'}, 'residual': {'nuclide': 'Pa234', 'level': {'number': 2}}}
+        self.assertEqual(channel_key(header), ('(n,x)', 2, 'Pa234'))
+        self.assertEqual(format_channel_key(channel_key(header)), '(n,x) Pa234 L2')
+        self.assertEqual(channel_key({'reaction': {'type': '(n,tot)'}}), ('(n,tot)', -1, ''))
+
+    def test_identical_runs(self):
+        """测试相同计算的差异为零"""
+        service = get_resampling_service()
+        service.clear()
+        hits = service.hits
+        comparison = RunComparison({'a': self.channels, 'b': self.channels})
+        # 数据相同的计算共用一份重采样结果
+        self.assertEqual(service.hits, hits + 1)
+        metrics = comparison.metrics('b')
+        self.assertTrue(np.all(metrics['max_abs_diff'] == 0))
+        self.assertTrue(np.all(metrics['chi2'] == 0))
+
+    def test_biggest_changes(self):
+        """测试变化最大的反应道排在最前"""
+        key = ('(n,n_3)', 3, '')
+        modified = dict(self.channels)
+        energy, value, name = modified[key]
+        modified[key] = (energy, value * 1.2, name)
+
+        comparison = RunComparison({'ref': self.channels, 'mod': modified})
+        changes = comparison.biggest_changes('mod', 'max_rel_diff', top=3)
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(changes[0]['key'], key)
+        self.assertEqual(changes[0]['file'], 'nn.L03')
+        self.assertAlmostEqual(changes[0]['max_rel_diff'], 0.2)
+        self.assertAlmostEqual(changes[0]['rms_rel_diff'], 0.2)
+        self.assertEqual(changes[1]['max_rel_diff'], 0.0)
+
+        with self.assertRaises(ValueError):
+            comparison.biggest_changes(metric='unknown')
+
+    def test_from_directories(self):
+        """测试从目录比较，缺少的反应道单独列出"""
+        copy_dir = Path(tempfile.mkdtemp(prefix="talys_test_compare_"))
+        try:
+            for path in TEST_DIR.glob("nn.L*"):
+                shutil.copy(path, copy_dir)
+            (copy_dir / "nn.L01").unlink()
+
+            comparison = RunComparison.from_directories({'full': TEST_DIR, 'copy': copy_dir})
+            self.assertNotIn(('(n,n_1)', 1, ''), comparison.channels)
+            self.assertIn(('(n,n_1)', 1, ''), comparison.missing['copy'])
+            self.assertIn(('(n,a_0)', 0, ''), comparison.missing['copy'])
+            self.assertEqual(comparison.values.shape,
+                             (2, len(comparison.channels), comparison.energies.size))
+        finally:
+            shutil.rmtree(copy_dir, ignore_errors=True)
+
+    def test_requires_two_runs(self):
+        """测试少于两个计算时报错"""
+        with self.assertRaises(ValueError):
+            RunComparison({'a': self.channels})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+多次计算集合单元测试
+"""
+
+import unittest
+from pathlib import Path
+import sys
+
+import numpy as np
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.resampling import get_resampling_service
+from core.run_ensemble import TOTAL_CHANNEL, RunEnsemble, envelope, nan_separated
+
+
+def make_run(scale: float, energy=(1.0, 2.0, 3.0)) -> dict:
+    """构造一次计算的结果：截面为 scale * 能量"""
+    energy = np.asarray(energy)
+    return {'total_cross_section': {'energy': energy, 'cross_section': scale * energy},
+            'reaction_channels': {'nn.L01': {'energy': energy, 'cross_section': scale * energy},
+                                  'ng.tot': {'energy': energy, 'cross_section': energy}}}
+
+
+class TestRunEnsemble(unittest.TestCase):
+    """多次计算集合测试类"""
+
+    def test_nan_separated(self):
+        """测试多条曲线连接为NaN分隔的一条折线"""
+        x, y = nan_separated(np.array([1.0, 2.0]), np.array([[1.0, 2.0], [3.0, 4.0]]))
+        np.testing.assert_array_equal(x, [1.0, 2.0, np.nan, 1.0, 2.0, np.nan])
+        np.testing.assert_array_equal(y, [1.0, 2.0, np.nan, 3.0, 4.0, np.nan])
+
+    def test_envelope(self):
+        """测试包络忽略NaN"""
+        values = np.array([[1.0, np.nan], [2.0, np.nan], [3.0, 5.0]])
+        bands = envelope(values, (50.0,))
+        np.testing.assert_allclose(bands['min'], [1.0, 5.0])
+        np.testing.assert_allclose(bands['max'], [3.0, 5.0])
+        np.testing.assert_allclose(bands['p50'], [2.0, 5.0])
+        self.assertTrue(np.isnan(envelope(np.full((2, 1), np.nan))['min'][0]))
+
+    def test_stack(self):
+        """测试不同能量网格的计算重采样到公共网格"""
+        runs = {f"run{i}": make_run(float(i)) for i in range(1, 101)}
+        runs['shifted'] = make_run(1.0, energy=(2.0, 4.0))
+        ensemble = RunEnsemble(runs)
+        self.assertEqual(ensemble.channel_names(), [TOTAL_CHANNEL, 'ng.tot', 'nn.L01'])
+        self.assertEqual(ensemble.level_channels(), ['nn.L01'])
+        # 给出反应道列表时不读取结果
+        self.assertEqual(RunEnsemble({'empty': {}}, channels=['nn.L02']).level_channels(), ['nn.L02'])
+
+        grid, values, labels = ensemble.stack('nn.L01')
+        np.testing.assert_allclose(grid, [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(values.shape, (101, 4))
+        self.assertEqual(labels[-1], 'shifted')
+        np.testing.assert_allclose(values[1], [2.0, 4.0, 6.0, np.nan])
+        np.testing.assert_allclose(values[-1], [np.nan, 2.0, 3.0, 4.0])
+
+        grid, bands = ensemble.envelope(TOTAL_CHANNEL)
+        np.testing.assert_allclose(bands['min'][:3], [1.0, 2.0, 3.0])
+        np.testing.assert_allclose(bands['max'][:3], [100.0, 200.0, 300.0])
+        self.assertEqual(ensemble.stack('missing')[1].shape, (0, 0))
+
+    def test_stack_cache(self):
+        """测试重画时各次计算的重采样结果取自缓存"""
+        runs = {f"run{i}": dict(make_run(float(i)), result_id=f"run{i}") for i in range(1, 6)}
+        ensemble = RunEnsemble(runs)
+        service = get_resampling_service()
+        service.clear()
+        first = ensemble.stack('nn.L01')[1]
+        hits = service.hits
+        np.testing.assert_array_equal(ensemble.stack('nn.L01')[1], first)
+        self.assertEqual(service.hits, hits + 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+工作目录池单元测试
+"""
+
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# 添加src目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from core.workdir_pool import WorkDirPool
+
+
+class TestWorkDirPool(unittest.TestCase):
+    """工作目录池测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.root = Path(tempfile.mkdtemp(prefix="talys_test_pool_"))
+
+    def tearDown(self):
+        """测试后清理"""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def fill(self, directory: Path):
+        """模拟一次计算的输出"""
+        (directory / "talys.inp").write_text("projectile n\n")
+        (directory / "sub").mkdir()
+        (directory / "sub" / "file").write_text("x")
+
+    def test_reuse(self):
+        """测试目录清空后回收复用"""
+        pool = WorkDirPool(self.root, size=2, keep_last=0, keep_failed=False)
+        self.assertEqual(pool.free_count, 2)
+
+        directory = pool.acquire()
+        self.fill(directory)
+        pool.release(directory)
+        pool.wait_idle()
+
+        self.assertEqual(pool.free_count, 2)
+        self.assertTrue(directory.exists())
+        self.assertEqual(list(directory.iterdir()), [])
+
+        acquired = {pool.acquire() for _ in range(3)}
+        self.assertEqual(len(acquired), 3)
+        pool.shutdown()
+        self.assertFalse(pool.base_dir.exists())
+
+    def test_overflow_deleted(self):
+        """测试空闲目录已满时多余目录被删除"""
+        pool = WorkDirPool(self.root, size=1, keep_last=0, keep_failed=False)
+        first, second = pool.acquire(), pool.acquire()
+        pool.release(first)
+        pool.release(second)
+        pool.wait_idle()
+        self.assertEqual(pool.free_count, 1)
+        self.assertEqual(len(list(pool.base_dir.iterdir())), 1)
+        pool.shutdown()
+
+    def test_retention(self):
+        """测试保留最近N个目录和失败目录"""
+        pool = WorkDirPool(self.root, size=1, keep_last=2, keep_failed=True)
+        directories = [pool.acquire() for _ in range(4)]
+        for directory in directories:
+            self.fill(directory)
+
+        pool.release(directories[0], failed=True)
+        for directory in directories[1:]:
+            pool.release(directory)
+        pool.wait_idle()
+
+        self.assertEqual(pool.failed, [directories[0]])
+        self.assertEqual(set(pool.retained), {directories[0], directories[2], directories[3]})
+        self.assertTrue((directories[3] / "talys.inp").exists())
+        self.assertFalse((directories[1] / "talys.inp").exists())
+
+        pool.shutdown()
+        self.assertTrue((directories[0] / "talys.inp").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()